@@ -53,7 +53,7 @@ CREATE TABLE movimientos_inventario (
     id_movimiento INT AUTO_INCREMENT PRIMARY KEY,
     id_insumo INT NOT NULL,
     tipo_movimiento ENUM('entrada', 'salida', 'ajuste', 'perdida') NOT NULL,
-    cantidad DECIMAL(10,2) NOT NULL,
+    cantidad DECIMAL(10,2) NOT NULL, -- Positiva, salvo en 'ajuste': con signo (positivo suma stock, negativo resta y cuenta como pérdida)
     costo_unitario DECIMAL(10,2),
     fecha_movimiento DATETIME DEFAULT CURRENT_TIMESTAMP,
     motivo VARCHAR(200),
@@ -61,9 +61,24 @@ CREATE TABLE movimientos_inventario (
     FOREIGN KEY (id_insumo) REFERENCES insumos(id_insumo),
     FOREIGN KEY (id_proveedor) REFERENCES proveedores(id_proveedor)
 );
+CREATE INDEX idx_movimiento_fecha ON movimientos_inventario(fecha_movimiento, id_insumo);
+
+CREATE TABLE pedidos (
+    id_pedido INT AUTO_INCREMENT PRIMARY KEY,
+    fecha_pedido DATE NOT NULL,
+    canal_venta ENUM('whatsapp', 'delivery_app', 'telefono', 'local') NOT NULL,
+    total_pedido DECIMAL(12,2) NOT NULL,
+    cantidad_lineas INT NOT NULL,
+    fecha_registro DATETIME DEFAULT CURRENT_TIMESTAMP,
+    clave_idempotencia CHAR(32) NULL, -- Clave de la venta en la cola local del TPV; evita duplicarla al re-sincronizar.
+    UNIQUE KEY uq_pedido_clave_idempotencia (clave_idempotencia)
+);
+CREATE INDEX idx_pedido_fecha ON pedidos(fecha_pedido, canal_venta);
+CREATE INDEX idx_pedido_registro ON pedidos(fecha_registro); -- Marca de la exportación incremental.
 
 CREATE TABLE ventas (
     id_venta INT AUTO_INCREMENT PRIMARY KEY,
+    id_pedido INT,
     fecha_venta DATE NOT NULL,
     id_producto INT NOT NULL,
     cantidad INT NOT NULL,
@@ -72,9 +87,38 @@ CREATE TABLE ventas (
     total_venta DECIMAL(10,2) NOT NULL,
     canal_venta ENUM('whatsapp', 'delivery_app', 'telefono', 'local') NOT NULL,
     fecha_importacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_pedido) REFERENCES pedidos(id_pedido),
+    FOREIGN KEY (id_producto) REFERENCES productos(id_producto)
+);
+CREATE INDEX idx_venta_pedido ON ventas(id_pedido, id_producto);
+CREATE INDEX idx_venta_importacion ON ventas(fecha_importacion); -- Marca de la exportación incremental.
+
+-- Resumen diario de ventas: lo mantienen registrar_venta_db y los importadores en la misma transacción
+-- que inserta en ventas, y se reconstruye con `python mantenimiento.py reconstruir-ventas-diarias`.
+CREATE TABLE ventas_diarias (
+    fecha DATE NOT NULL,
+    id_producto INT NOT NULL,
+    canal_venta ENUM('whatsapp', 'delivery_app', 'telefono', 'local') NOT NULL,
+    unidades INT NOT NULL DEFAULT 0,
+    ingreso DECIMAL(14,2) NOT NULL DEFAULT 0,
+    cmv DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, id_producto, canal_venta),
     FOREIGN KEY (id_producto) REFERENCES productos(id_producto)
 );
 
+-- Cierre diario de inventario por insumo: la aplicación guarda al ingresar los días cerrados que falten y
+-- el historial se completa con `python mantenimiento.py snapshot-inventario --desde ... --hasta ...`.
+-- inventario_en_fecha parte del snapshot más cercano y solo reaplica los movimientos intermedios.
+CREATE TABLE inventario_snapshots (
+    fecha DATE NOT NULL,
+    id_insumo INT NOT NULL,
+    stock DECIMAL(10,2) NOT NULL,
+    costo_promedio DECIMAL(10,2) NOT NULL,
+    valor DECIMAL(14,2) NOT NULL,
+    PRIMARY KEY (fecha, id_insumo),
+    FOREIGN KEY (id_insumo) REFERENCES insumos(id_insumo)
+);
+
 CREATE TABLE alertas_stock (
     id_alerta INT AUTO_INCREMENT PRIMARY KEY,
     id_insumo INT NOT NULL,
@@ -83,8 +127,10 @@ CREATE TABLE alertas_stock (
     nivel_minimo DECIMAL(10,2) NOT NULL,
     fecha_alerta DATETIME DEFAULT CURRENT_TIMESTAMP,
     leida BOOLEAN DEFAULT FALSE,
+    fecha_resolucion DATETIME NULL, -- NULL = alerta abierta; la completa evaluar_alertas_stock al reponer o cambiar de nivel
     FOREIGN KEY (id_insumo) REFERENCES insumos(id_insumo)
 );
+CREATE INDEX idx_alerta_abierta ON alertas_stock(fecha_resolucion, id_insumo);
 
 CREATE TABLE gastos_operativos (
     id_gasto INT AUTO_INCREMENT PRIMARY KEY,
@@ -105,6 +151,16 @@ CREATE TABLE usuarios (
     activo BOOLEAN DEFAULT TRUE
 );
 
+-- Contador de escrituras por tabla y por el primer día de negocio que alcanzan (1000-01-01 = fecha desconocida).
+-- Lo incrementan las rutas de escritura de la aplicación y de mantenimiento.py tras cada commit; la caché de
+-- reportes y las pantallas comparan SUM(version) de sus tablas hasta la fecha que leen (una consulta por la PK).
+CREATE TABLE versiones_tablas (
+    tabla VARCHAR(64) NOT NULL,
+    fecha DATE NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tabla, fecha)
+);
+
 -- 2. INSERCIONES (CORREGIDAS)
 
 INSERT INTO proveedores (nombre, contacto, telefono) VALUES
@@ -882,6 +938,10 @@ INSERT INTO ventas (fecha_venta, id_producto, cantidad, precio_unitario, costo_u
 ('2024-07-15', 23, 1, 4900, 1700, 4900, 'local'),
 ('2024-07-15', 58, 2, 4500, 1400, 9000, 'delivery_app');
 
+INSERT INTO ventas_diarias (fecha, id_producto, canal_venta, unidades, ingreso, cmv)
+SELECT fecha_venta, id_producto, canal_venta, SUM(cantidad), SUM(total_venta), SUM(cantidad * costo_unitario_calculado)
+FROM ventas GROUP BY fecha_venta, id_producto, canal_venta;
+
 
 INSERT INTO alertas_stock (id_insumo, tipo_alerta, nivel_actual, nivel_minimo, leida) VALUES
 (1, 'sin_stock', 0.00, 5.00, FALSE),           -- Salmón AGOTADO
@@ -894,6 +954,7 @@ INSERT INTO alertas_stock (id_insumo, tipo_alerta, nivel_actual, nivel_minimo, l
 -- Alertas resueltas (ya fueron leídas y atendidas)
 (4, 'stock_minimo', 8.00, 2.00, TRUE),         -- Camarón - ya se repuso
 (6, 'stock_critico', 12.00, 15.00, TRUE);      -- Arroz - ya se repuso
+UPDATE alertas_stock SET fecha_resolucion = fecha_alerta WHERE id_alerta IN (7, 8); -- Camarón y Arroz ya repuestos
 
 
 INSERT INTO gastos_operativos (fecha_gasto, categoria, descripcion, monto, usuario_registro) VALUES
@@ -0,0 +1,480 @@
+"""Generador de datos sintéticos y banco de pruebas de rendimiento (sin interfaz gráfica).
+
+Uso:
+    python benchmark.py generar --escala 10k|1m|10m [--semilla 42] [--dias 365]
+    python benchmark.py medir [--repeticiones 5] [--salida resultados.json] [--sin-db]
+    python benchmark.py arranque [--repeticiones 5] [--presupuesto-ms 1500]
+    python benchmark.py comparar base.json nuevo.json
+    python benchmark.py estres [--terminales 3] [--segundos 30] [--productos 5]
+
+`generar` AGREGA filas a pedidos, ventas, movimientos_inventario y gastos_operativos: use una base
+dedicada (por defecto atai_sushi_bench: el script `BDD_AtaiSushi (2).sql` con ese nombre de base),
+nunca la de producción. `estres` también confirma ventas de verdad (y descuenta stock) en esa base.
+Los datos salen de los productos, recetas e insumos reales de esa base, con la misma semilla
+siempre se genera el mismo historial, y la escala indica la cantidad de líneas de venta.
+"""
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import main
+from mantenimiento import conectar
+
+ESCALAS = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+CANALES = ["local", "delivery_app", "whatsapp", "telefono"]
+PESOS_CANALES = [45, 30, 20, 5]
+LINEAS_POR_PEDIDO = [1, 2, 2, 3, 3, 4, 5]  # ~2,9 líneas por pedido
+FACTOR_DIA_SEMANA = [0.7, 0.8, 0.9, 1.0, 1.6, 1.7, 1.2]  # lunes .. domingo
+GASTOS_FIJOS = [("arriendo", "Arriendo local", 1_800_000), ("sueldos", "Remuneraciones", 6_500_000), ("servicios_basicos", "Luz, agua y gas", 450_000)]
+GASTOS_VARIABLES = [("marketing", "Publicidad en redes", 15_000, 120_000), ("otros", "Insumos de aseo y menores", 3_000, 40_000)]
+LINEAS_POR_GASTO = 20  # gastos_operativos crece a 1/20 de las líneas de venta
+LOTE_INSERCION = 5000
+TAMANOS_CARRITO = [1, 5, 12, 30]
+LINEAS_IMPORTACION = [1000, 10000]  # Un día normal de delivery_app + whatsapp y uno de alto volumen.
+RANGOS_REPORTE = [30, 365]
+PRESUPUESTO_ARRANQUE_MS = 1500  # Desde que se lanza el proceso hasta que la ventana de ingreso está lista.
+REDONDEO_STOCK = 0.005  # insumos.stock_actual es DECIMAL(10,2): cada descuento puede redondear hasta media centésima.
+
+
+# --- GENERADOR DE DATOS ---
+def cargar_catalogo(conexion):
+    productos = main.consultar_db(conexion, "SELECT id_producto, precio_venta FROM productos WHERE activo = TRUE ORDER BY id_producto")
+    recetas = main.consultar_db(conexion, "SELECT id_producto, id_insumo, cantidad_requerida FROM recetas")
+    insumos = main.consultar_db(conexion, "SELECT id_insumo, costo_promedio, id_proveedor_principal FROM insumos WHERE activo = TRUE ORDER BY id_insumo")
+    return productos, recetas, insumos
+
+
+class GeneradorHistorial:
+    """Arma el historial día por día (pedidos, ventas, consumo, compras semanales, mermas y gastos) y lo inserta por lotes."""
+    def __init__(self, conexion, lineas_objetivo, semilla, dias):
+        self.conexion = conexion; self.lineas_objetivo = lineas_objetivo; self.azar = random.Random(semilla); self.dias = dias
+        productos, recetas, insumos = cargar_catalogo(conexion)
+        if not productos or not insumos: raise RuntimeError("La base no tiene productos o insumos activos: cargue primero BDD_AtaiSushi (2).sql.")
+        self.ids_productos = [fila[0] for fila in productos]; self.precios = {fila[0]: float(fila[1]) for fila in productos}
+        # Popularidad tipo Zipf con un orden aleatorio (reproducible) de los productos.
+        ranking = self.ids_productos[:]; self.azar.shuffle(ranking)
+        self.pesos_productos = [1 / (ranking.index(id_p) + 1) ** 0.8 for id_p in self.ids_productos]
+        self.costos = {fila[0]: float(fila[1]) for fila in insumos}; self.proveedores = {fila[0]: fila[2] for fila in insumos}
+        self.recetas = {}
+        for id_producto, id_insumo, cantidad in recetas:
+            if id_insumo in self.costos: self.recetas.setdefault(id_producto, []).append((id_insumo, float(cantidad)))
+        self.cmv = {id_p: sum(cantidad * self.costos[id_i] for id_i, cantidad in self.recetas.get(id_p, [])) for id_p in self.ids_productos}
+        self.id_pedido = main.consultar_db(conexion, "SELECT COALESCE(MAX(id_pedido), 0) FROM pedidos")[0][0]
+        self.pedidos = []; self.ventas = []; self.movimientos = []; self.gastos = []; self.consumo_semana = {}
+        self.totales = {'pedidos': 0, 'ventas': 0, 'movimientos_inventario': 0, 'gastos_operativos': 0}
+
+    def generar(self):
+        hasta = datetime.date.today() - datetime.timedelta(days=1); desde = hasta - datetime.timedelta(days=self.dias - 1)
+        fechas = [desde + datetime.timedelta(days=n) for n in range(self.dias)]
+        peso_total = sum(FACTOR_DIA_SEMANA[fecha.weekday()] for fecha in fechas)
+        pedidos_totales = self.lineas_objetivo / (sum(LINEAS_POR_PEDIDO) / len(LINEAS_POR_PEDIDO))
+        gastos_por_dia = max(0.0, self.lineas_objetivo / LINEAS_POR_GASTO - len(GASTOS_FIJOS) * self.dias / 30) / self.dias
+        for numero_dia, fecha in enumerate(fechas):
+            esperados = pedidos_totales * FACTOR_DIA_SEMANA[fecha.weekday()] / peso_total
+            for _ in range(int(esperados) + (self.azar.random() < esperados % 1)):
+                if self.totales['ventas'] + len(self.ventas) >= self.lineas_objetivo: break
+                self.agregar_pedido(fecha)
+            self.agregar_inventario_del_dia(fecha, numero_dia)
+            self.agregar_gastos_del_dia(fecha, gastos_por_dia)
+            if len(self.ventas) + len(self.movimientos) >= LOTE_INSERCION: self.volcar(fecha)
+        self.volcar(hasta)
+        return self.totales
+
+    def hora(self, fecha):
+        return datetime.datetime.combine(fecha, datetime.time(12)) + datetime.timedelta(seconds=self.azar.randrange(11 * 3600))
+
+    def agregar_pedido(self, fecha):
+        self.id_pedido += 1; canal = self.azar.choices(CANALES, PESOS_CANALES)[0]
+        productos = self.azar.choices(self.ids_productos, self.pesos_productos, k=self.azar.choice(LINEAS_POR_PEDIDO))
+        consumo = {}; total_pedido = 0.0; momento = self.hora(fecha)
+        for id_producto in productos:
+            cantidad = self.azar.choices([1, 2, 3], [70, 22, 8])[0]; precio = self.precios[id_producto]
+            self.ventas.append((self.id_pedido, fecha, id_producto, cantidad, precio, round(self.cmv[id_producto], 2), cantidad * precio, canal, momento))
+            total_pedido += cantidad * precio
+            for id_insumo, requerido in self.recetas.get(id_producto, []): consumo[id_insumo] = consumo.get(id_insumo, 0.0) + requerido * cantidad
+        self.pedidos.append((self.id_pedido, fecha, canal, total_pedido, len(productos), momento))
+        for id_insumo, cantidad in sorted(consumo.items()):
+            self.movimientos.append((id_insumo, 'salida', round(cantidad, 2), None, momento, 'Consumo por Venta TPV', None))
+            self.consumo_semana[id_insumo] = self.consumo_semana.get(id_insumo, 0.0) + cantidad
+
+    def agregar_inventario_del_dia(self, fecha, numero_dia):
+        # Cada insumo se repone una vez por semana (en un día fijo según su id) por lo consumido más un 10%.
+        for id_insumo in self.costos:
+            if (id_insumo + numero_dia) % 7 == 0 and self.consumo_semana.get(id_insumo):
+                cantidad = round(self.consumo_semana.pop(id_insumo) * 1.1, 2); costo = round(self.costos[id_insumo] * self.azar.uniform(0.92, 1.08), 2)
+                self.movimientos.append((id_insumo, 'entrada', cantidad, costo, datetime.datetime.combine(fecha, datetime.time(10)), 'Compra registrada', self.proveedores[id_insumo]))
+        if self.azar.random() < 0.3:
+            id_insumo = self.azar.choice(list(self.costos))
+            self.movimientos.append((id_insumo, 'perdida', round(self.azar.uniform(0.05, 1.0), 2), None, datetime.datetime.combine(fecha, datetime.time(23)), 'Merma: vencimiento', None))
+
+    def agregar_gastos_del_dia(self, fecha, gastos_por_dia):
+        if fecha.day == 1:
+            for categoria, descripcion, monto in GASTOS_FIJOS: self.gastos.append((fecha, categoria, descripcion, monto, 'benchmark'))
+        for _ in range(int(gastos_por_dia) + (self.azar.random() < gastos_por_dia % 1)):
+            categoria, descripcion, minimo, maximo = self.azar.choice(GASTOS_VARIABLES)
+            self.gastos.append((fecha, categoria, descripcion, round(self.azar.uniform(minimo, maximo), -2), 'benchmark'))
+
+    def volcar(self, fecha):
+        with self.conexion.cursor() as cursor:
+            for tabla, columnas, filas in (("pedidos", "id_pedido, fecha_pedido, canal_venta, total_pedido, cantidad_lineas, fecha_registro", self.pedidos),
+                                           ("ventas", "id_pedido, fecha_venta, id_producto, cantidad, precio_unitario, costo_unitario_calculado, total_venta, canal_venta, fecha_importacion", self.ventas),
+                                           ("movimientos_inventario", "id_insumo, tipo_movimiento, cantidad, costo_unitario, fecha_movimiento, motivo, id_proveedor", self.movimientos),
+                                           ("gastos_operativos", "fecha_gasto, categoria, descripcion, monto, usuario_registro", self.gastos)):
+                if not filas: continue
+                marcadores = ", ".join(["%s"] * len(filas[0]))
+                for inicio in range(0, len(filas), LOTE_INSERCION): cursor.executemany(f"INSERT INTO {tabla} ({columnas}) VALUES ({marcadores})", filas[inicio:inicio + LOTE_INSERCION])
+                self.totales[tabla] += len(filas)
+        self.conexion.commit()
+        self.pedidos = []; self.ventas = []; self.movimientos = []; self.gastos = []
+        print(f"  {fecha}: {self.totales['ventas']:,} ventas, {self.totales['movimientos_inventario']:,} movimientos, {self.totales['gastos_operativos']:,} gastos", flush=True)
+
+
+def generar(args):
+    conexion = conectar(args)
+    print(f"Generando {ESCALAS[args.escala]:,} líneas de venta en {args.dias} días (semilla {args.semilla}) en '{args.base_datos}'...")
+    inicio = time.perf_counter()
+    totales = GeneradorHistorial(conexion, ESCALAS[args.escala], args.semilla, args.dias).generar()
+    ok, filas = main.reconstruir_ventas_diarias(conexion)
+    if not ok: print(f"Fallo al reconstruir ventas_diarias: {filas}"); return 1
+    # Los cierres de inventario existentes ya no cuadran con el historial nuevo: se rehacen los recientes.
+    with conexion.cursor() as cursor: cursor.execute("DELETE FROM inventario_snapshots")
+    conexion.commit(); main.completar_snapshots_inventario(conexion)
+    print(f"Listo en {time.perf_counter() - inicio:,.1f} s: " + ", ".join(f"{tabla} +{n:,}" for tabla, n in totales.items()) + f", ventas_diarias {filas:,} filas.")
+    return 0
+
+
+# --- BANCO DE PRUEBAS ---
+def round_trips(): return sum(n for _, n, _, _ in main.METRICAS_CONSULTAS.por_origen())
+
+
+def cronometrar(caso, parametros, funcion, repeticiones):
+    funcion()  # Calentamiento (imports diferidos, cachés, planes de consulta): no se mide.
+    tiempos = []; antes = round_trips()
+    for _ in range(repeticiones):
+        inicio = time.perf_counter(); funcion(); tiempos.append((time.perf_counter() - inicio) * 1000)
+    return resumir(caso, parametros, tiempos, (round_trips() - antes) / repeticiones)
+
+
+def resumir(caso, parametros, tiempos, round_trips_por_iteracion=0.0):
+    tiempos = sorted(tiempos)
+    fila = {'caso': caso, 'parametros': parametros, 'repeticiones': len(tiempos), 'min_ms': tiempos[0], 'mediana_ms': statistics.median(tiempos),
+            'p95_ms': main.percentil(tiempos, 95), 'max_ms': tiempos[-1], 'round_trips': round_trips_por_iteracion}
+    print(f"{caso:<36} {parametros:<30} mediana {fila['mediana_ms']:>10,.2f} ms   p95 {fila['p95_ms']:>10,.2f} ms   {fila['round_trips']:>6,.1f} round trips")
+    return fila
+
+
+def medir_arranque():
+    """Lanza `python main.py` en un proceso nuevo y retorna los ms hasta que la ventana de ingreso quedó lista."""
+    entorno = dict(os.environ, ATAI_MEDIR_ARRANQUE="1")
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")): entorno.setdefault("QT_QPA_PLATFORM", "offscreen")
+    inicio = time.time()
+    salida = subprocess.run([sys.executable, "main.py"], cwd=os.path.dirname(os.path.abspath(__file__)), env=entorno, capture_output=True, text=True, timeout=120).stdout
+    marca = re.search(r"^ARRANQUE ([0-9.]+)$", salida, re.M)
+    if marca is None: raise RuntimeError("main.py terminó sin informar el arranque.")
+    return (float(marca.group(1)) - inicio) * 1000
+
+
+def casos_arranque(repeticiones):
+    medir_arranque()  # Calentamiento: la primera ejecución paga la caché de disco y los .pyc.
+    return [resumir("arranque en frío", "main.py hasta login", [medir_arranque() for _ in range(repeticiones)])]
+
+
+def arranque(args):
+    fila = casos_arranque(args.repeticiones)[0]
+    if fila['mediana_ms'] > args.presupuesto_ms: print(f"FUERA DE PRESUPUESTO: mediana {fila['mediana_ms']:,.0f} ms > {args.presupuesto_ms:,.0f} ms."); return 1
+    print(f"Dentro del presupuesto de {args.presupuesto_ms:,.0f} ms.")
+    return 0
+
+
+def casos_funciones_puras(repeticiones):
+    """calcular_reposicion y MatrizCostos con entradas sintéticas de tamaño fijo (no requieren base de datos)."""
+    azar = random.Random(1); resultados = []
+    for dias, productos, insumos in ((90, 50, 40), (365, 200, 120)):
+        ventas = [(d, p, azar.randint(0, 8)) for d in range(dias) for p in range(1, productos + 1)]
+        recetas = [(p, azar.randint(1, insumos), azar.random()) for p in range(1, productos + 1) for _ in range(6)]
+        stock = [(i, azar.random() * 20, 5) for i in range(1, insumos + 1)]
+        resultados.append(cronometrar("calcular_reposicion", f"{dias}d x {productos}p x {insumos}i", lambda: main.calcular_reposicion(dias, ventas, recetas, stock), repeticiones))
+    for productos, insumos in ((100, 60), (1000, 400)):
+        filas_productos = [(p, f"Producto {p}", azar.uniform(3000, 15000)) for p in range(1, productos + 1)]
+        filas_insumos = [(i, f"Insumo {i}", azar.uniform(500, 20000)) for i in range(1, insumos + 1)]
+        recetas = [(p, azar.randint(1, insumos), azar.uniform(0.01, 0.3)) for p in range(1, productos + 1) for _ in range(6)]
+        matriz = main.MatrizCostos(filas_productos, filas_insumos, recetas); variaciones = {i: 15.0 for i in range(1, insumos + 1, 7)}
+        resultados.append(cronometrar("MatrizCostos", f"{productos}p x {insumos}i", lambda: main.MatrizCostos(filas_productos, filas_insumos, recetas), repeticiones))
+        resultados.append(cronometrar("MatrizCostos.escenario", f"{productos}p x {insumos}i", lambda: matriz.escenario(variaciones), repeticiones))
+    return resultados
+
+
+def casos_reportes(conexion, repeticiones):
+    """Los reportes se miden sin CACHE_REPORTES (el cálculo real) y, aparte, la respuesta de la caché para un período cerrado."""
+    fin = main.como_fecha(main.consultar_db(conexion, "SELECT MAX(fecha_venta) FROM ventas")[0][0] or datetime.date.today())
+    resultados = []; main.CACHE_REPORTES.activa = False
+    for dias in RANGOS_REPORTE:
+        fi = str(fin - datetime.timedelta(days=dias - 1)); ff = str(fin); rango = f"{dias} días"
+        resultados.append(cronometrar("calcular_resumen_financiero", rango, lambda: main.calcular_resumen_financiero(conexion, fi, ff), repeticiones))
+        resultados.append(cronometrar("calcular_margen", rango, lambda: main.calcular_margen(conexion, fi, ff), repeticiones))
+        resultados.append(cronometrar("analizar_canasta", rango, lambda: main.analizar_canasta(conexion, fi, ff), repeticiones))
+        resultados.append(cronometrar("pronosticar_reposicion", rango, lambda: main.pronosticar_reposicion(conexion, fi, ff), repeticiones))
+        resultados.append(cronometrar("inventario_en_fecha", f"hace {dias} días", lambda: main.inventario_en_fecha(conexion, fi), repeticiones))
+    productos = main.consultar_db(conexion, "SELECT id_producto, nombre, precio_venta FROM productos WHERE activo = TRUE ORDER BY id_producto")
+    insumos = main.consultar_db(conexion, "SELECT id_insumo, nombre, costo_promedio FROM insumos ORDER BY id_insumo")
+    recetas = main.consultar_db(conexion, "SELECT id_producto, id_insumo, cantidad_requerida FROM recetas")
+    resultados.append(cronometrar("MatrizCostos (menú real)", f"{len(productos)}p x {len(insumos)}i", lambda: main.MatrizCostos(productos, insumos, recetas), repeticiones))
+    inicio = str(datetime.date(fin.year - 2 + (fin.month == 12), fin.month % 12 + 1, 1)); rango = "24 meses, 1 consulta"  # Los 24 meses calendario que terminan en `fin`.
+    for caso, funcion in (("comparar_eerr_mensual", main.comparar_eerr_mensual), ("comparar_top_productos_semanal", main.comparar_top_productos_semanal),
+                          ("comparar_mismo_dia_semana", main.comparar_mismo_dia_semana)):
+        resultados.append(cronometrar(caso, rango, lambda: funcion(conexion, inicio, str(fin)), repeticiones))
+    main.CACHE_REPORTES.activa = True
+    ff = min(fin, datetime.date.today() - datetime.timedelta(days=1)); fi = str(ff - datetime.timedelta(days=RANGOS_REPORTE[-1] - 1)); ff = str(ff)
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = main.CacheReportes(main.VERSIONES_TABLAS, os.path.join(directorio, "cache_benchmark.sqlite3"))
+        anterior, main.CACHE_REPORTES = main.CACHE_REPORTES, cache
+        try:
+            resultados.append(cronometrar("calcular_resumen_financiero (caché)", f"{RANGOS_REPORTE[-1]} días cerrados", lambda: main.calcular_resumen_financiero(conexion, fi, ff), repeticiones))
+            resultados.append(cronometrar("calcular_margen (caché)", f"{RANGOS_REPORTE[-1]} días cerrados", lambda: main.calcular_margen(conexion, fi, ff), repeticiones))
+        finally:
+            main.CACHE_REPORTES = anterior; cache.conexion().close()
+    return resultados
+
+
+def casos_venta(conexion, repeticiones):
+    """finalizar_venta (caché + cola local, lo que espera la cajera) y su réplica en MySQL con registrar_venta_db (revertida)."""
+    productos = main.consultar_db(conexion, "SELECT id_producto, nombre, precio_venta FROM productos WHERE activo = TRUE ORDER BY id_producto")
+    main.CACHE_RECETAS.cargar_filas(main.consultar_db(conexion, "SELECT id_producto, id_insumo, cantidad_requerida FROM recetas"),
+                                    main.consultar_db(conexion, "SELECT id_insumo, costo_promedio, stock_actual FROM insumos"))
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        cola = main.ColaVentasLocal(os.path.join(directorio, "cola_benchmark.sqlite3"))
+        for tamano in TAMANOS_CARRITO:
+            pedido = [{'id_producto': id_p, 'nombre': nombre, 'cantidad': 1, 'precio_unitario': float(precio), 'total_item': float(precio), 'cmv_item': 0.0}
+                      for id_p, nombre, precio in (productos[n % len(productos)] for n in range(tamano))]
+
+            def finalizar_venta():
+                main.CACHE_RECETAS.faltantes(pedido); cola.encolar(pedido, "local", str(datetime.date.today()), main.CACHE_RECETAS.consumo(pedido))
+
+            def registrar_en_mysql():
+                try:
+                    with conexion.cursor() as cursor: main.registrar_venta_db(cursor, pedido, "local", validar_stock=False)
+                finally: conexion.rollback()
+            resultados.append(cronometrar("finalizar_venta (cola local)", f"{tamano} líneas", finalizar_venta, repeticiones))
+            resultados.append(cronometrar("registrar_venta_db (réplica)", f"{tamano} líneas", registrar_en_mysql, repeticiones))
+        cola.conexion().close()
+    return resultados
+
+
+def casos_importacion(conexion, repeticiones):
+    """importar_pedidos_externos sobre un CSV sintético: lectura, mapeo y explosión de recetas, y la transacción completa (revertida)."""
+    productos = main.consultar_db(conexion, "SELECT nombre FROM productos WHERE activo = TRUE ORDER BY id_producto")
+    azar = random.Random(42); hoy = datetime.date.today(); resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for lineas in LINEAS_IMPORTACION:
+            ruta = os.path.join(directorio, f"pedidos_{lineas}.csv")
+            with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+                escritor = csv.writer(archivo); escritor.writerow(["pedido", "fecha", "canal", "producto", "cantidad"])
+                escritor.writerows([f"B{n // 3}", hoy, azar.choice(main.CANALES_IMPORTACION), azar.choice(productos)[0], azar.randint(1, 3)] for n in range(lineas))
+
+            def importar():
+                pedidos, informe = main.agrupar_pedidos_externos(conexion, main.leer_pedidos_externos(ruta))
+                try:
+                    with conexion.cursor() as cursor: main.importar_pedidos_db(cursor, pedidos, informe, permitir_faltantes=True)
+                finally: conexion.rollback()
+            resultados.append(cronometrar("importar_pedidos_externos (revertida)", f"{lineas:,} líneas", importar, repeticiones))
+    return resultados
+
+
+def casos_exportacion(conexion, repeticiones):
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for tabla in ("ventas", "movimientos_inventario"):
+            ruta = os.path.join(directorio, f"{tabla}.csv.gz")
+            resultados.append(cronometrar("exportar_tabla_csv", f"{tabla} (gzip)", lambda: main.exportar_tabla_csv(conexion, tabla, ruta, comprimir=True), repeticiones))
+        try: import pyarrow  # noqa: F401
+        except ImportError: print("pyarrow no está instalado: se omite la exportación columnar.")
+        else:
+            for tabla in ("ventas", "movimientos_inventario"):
+                destino = os.path.join(directorio, "columnar")
+                resultados.append(cronometrar("exportar_tabla_columnar", f"{tabla} (parquet)", lambda: main.exportar_tabla_columnar(conexion, tabla, destino, "parquet"), repeticiones))
+    return resultados
+
+
+def version_codigo():
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    try: commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=carpeta, capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError): commit = None
+    with open(os.path.join(carpeta, "main.py"), "rb") as archivo: huella = hashlib.sha1(archivo.read()).hexdigest()[:12]
+    return {'commit': commit, 'main_sha1': huella}
+
+
+def medir(args):
+    resultados = []; filas = {}
+    print("Arranque:"); resultados += casos_arranque(args.repeticiones)
+    print("Funciones puras:"); resultados += casos_funciones_puras(args.repeticiones)
+    if not args.sin_db:
+        conexion = conectar(args)
+        filas = {tabla: int(n or 0) for tabla, n in main.consultar_db(conexion, "SELECT table_name, table_rows FROM information_schema.tables WHERE table_schema = %s", (args.base_datos,))}
+        print(f"Base '{args.base_datos}': ~{filas.get('ventas', 0):,} ventas, ~{filas.get('movimientos_inventario', 0):,} movimientos.")
+        print("Reportes:"); resultados += casos_reportes(conexion, args.repeticiones)
+        print("Venta:"); resultados += casos_venta(conexion, args.repeticiones)
+        print("Importación de pedidos:"); resultados += casos_importacion(conexion, args.repeticiones)
+        print("Exportaciones:"); resultados += casos_exportacion(conexion, args.repeticiones_exportacion)
+    informe = {'version': version_codigo(), 'fecha': datetime.datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+               'plataforma': platform.platform(), 'base_datos': None if args.sin_db else args.base_datos, 'filas_aproximadas': filas, 'resultados': resultados}
+    with open(args.salida, "w", encoding="utf-8") as archivo: json.dump(informe, archivo, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {args.salida}.")
+    return 0
+
+
+def estres(args):
+    """Simula N terminales vendiendo a la vez los mismos productos por el camino real de la caja: cada una con
+    su conexión y su propia cola local (ColaVentasLocal.encolar y después sincronizar_cola_ventas).
+
+    Reporta ventas/s, latencia p50/p95 de encolar + sincronizar, ventas registradas sin stock suficiente y
+    rechazadas al replicar, deadlocks, esperas agotadas y reintentos, y la deriva del stock final respecto del
+    stock inicial menos el consumo de las ventas replicadas. Sale con código 1 si algún insumo tiene una deriva
+    mayor al redondeo de DECIMAL(10,2) (actualizaciones perdidas) o quedó negativo sin que ninguna venta lo
+    haya informado como faltante.
+    """
+    conexion = conectar(args)
+    productos = main.consultar_db(conexion, """
+        SELECT p.id_producto, p.nombre, p.precio_venta FROM productos p JOIN recetas r ON r.id_producto = p.id_producto
+        WHERE p.activo = TRUE GROUP BY p.id_producto, p.nombre, p.precio_venta ORDER BY COUNT(*) DESC, p.id_producto LIMIT %s""", (args.productos,))
+    if not productos: print("La base no tiene productos activos con receta."); return 1
+    if not main.CACHE_RECETAS.cargar(conexion): print("No se pudieron cargar las recetas."); return 1
+    stock_inicial = {id_insumo: float(stock) for id_insumo, stock in main.consultar_db(conexion, "SELECT id_insumo, stock_actual FROM insumos")}
+    consumo_confirmado = {}; ventas_por_insumo = {}; latencias = []; conteo = {"ventas": 0, "sin_stock": 0, "rechazadas": 0, "fallidas": 0, "en_cola": 0}; candado = threading.Lock()
+    insumos_informados = set()
+    main.CONTENCION.update(deadlocks=0, esperas_agotadas=0, reintentos=0)
+    directorio_colas = tempfile.TemporaryDirectory(prefix="estres_colas_")
+    fin = time.monotonic() + args.segundos
+
+    def terminal(numero):
+        azar = random.Random(args.semilla + numero); conexion_terminal = main.abrir_conexion()
+        cola = main.ColaVentasLocal(os.path.join(directorio_colas.name, f"cola_{numero}.sqlite3")); encoladas = {}
+        try:
+            while time.monotonic() < fin:
+                pedido = []
+                for id_producto, nombre, precio in azar.sample(productos, azar.randint(1, min(3, len(productos)))):
+                    cantidad = azar.randint(1, 3)
+                    pedido.append({'id_producto': id_producto, 'nombre': nombre, 'cantidad': cantidad, 'precio_unitario': float(precio), 'total_item': float(precio) * cantidad})
+                consumo = main.CACHE_RECETAS.consumo(pedido)
+                inicio = time.perf_counter()
+                encoladas[cola.encolar(pedido, "local", datetime.date.today().isoformat(), consumo)] = consumo
+                try: main.sincronizar_cola_ventas(conexion_terminal, cola)
+                except main.pymysql.MySQLError as e:
+                    with candado: conteo["fallidas"] += 1
+                    print(f"Terminal {numero}: {e}")  # La venta queda en cola y se reintenta con la siguiente.
+                else:
+                    with candado: latencias.append((time.perf_counter() - inicio) * 1000)
+            try: main.sincronizar_cola_ventas(conexion_terminal, cola)
+            except main.pymysql.MySQLError as e: print(f"Terminal {numero}: {e}")
+        finally: conexion_terminal.close()
+        # El balance sale de la cola, como en la caja: lo que no quedó pendiente ni rechazado está en MySQL.
+        rechazadas = {clave for clave, *_ in cola.rechazadas()}; pendientes = {clave for clave, *_ in cola.pendientes(len(encoladas) or 1)}; sin_stock = cola.ventas_sin_stock()
+        with candado:
+            conteo["rechazadas"] += len(rechazadas); conteo["en_cola"] += len(pendientes); conteo["sin_stock"] += len(sin_stock)
+            insumos_informados.update(id_insumo for *_, faltantes, _ in sin_stock for id_insumo in faltantes)
+            for clave, consumo in encoladas.items():
+                if clave in rechazadas or clave in pendientes: continue
+                conteo["ventas"] += 1
+                for id_insumo, cantidad in consumo.items():
+                    consumo_confirmado[id_insumo] = consumo_confirmado.get(id_insumo, 0.0) + cantidad; ventas_por_insumo[id_insumo] = ventas_por_insumo.get(id_insumo, 0) + 1
+
+    print(f"{args.terminales} terminales vendiendo {len(productos)} productos en disputa durante {args.segundos} s...")
+    hilos = [threading.Thread(target=terminal, args=(numero,)) for numero in range(args.terminales)]
+    inicio = time.monotonic()
+    for hilo in hilos: hilo.start()
+    for hilo in hilos: hilo.join()
+    duracion = time.monotonic() - inicio; directorio_colas.cleanup()
+    stock_final = {id_insumo: float(stock) for id_insumo, stock in main.consultar_db(conexion, "SELECT id_insumo, stock_actual FROM insumos")}
+    deriva = {id_insumo: stock_final[id_insumo] - (stock_inicial[id_insumo] - consumo) for id_insumo, consumo in consumo_confirmado.items()}
+    fuera_de_redondeo = {id_insumo: valor for id_insumo, valor in deriva.items() if abs(valor) > REDONDEO_STOCK * ventas_por_insumo[id_insumo] + 1e-9}
+    negativos = sorted(id_insumo for id_insumo in consumo_confirmado if stock_final[id_insumo] < 0)
+    negativos_sin_aviso = [id_insumo for id_insumo in negativos if id_insumo not in insumos_informados]
+    latencias.sort()
+    informe = {'terminales': args.terminales, 'segundos': round(duracion, 2), 'ventas': conteo["ventas"], 'ventas_por_segundo': conteo["ventas"] / duracion,
+               'sin_stock': conteo["sin_stock"], 'rechazadas': conteo["rechazadas"], 'fallidas': conteo["fallidas"], 'en_cola': conteo["en_cola"], 'p50_ms': main.percentil(latencias, 50) if latencias else 0.0,
+               'p95_ms': main.percentil(latencias, 95) if latencias else 0.0, **main.CONTENCION,
+               'deriva_maxima': max((abs(valor) for valor in deriva.values()), default=0.0), 'insumos_con_deriva': sorted(fuera_de_redondeo), 'insumos_negativos': negativos, 'negativos_sin_aviso': negativos_sin_aviso}
+    print(f"Ventas replicadas: {informe['ventas']:,} ({informe['ventas_por_segundo']:,.1f}/s); registradas sin stock: {informe['sin_stock']:,}; rechazadas: {informe['rechazadas']:,}; "
+          f"sincronizaciones fallidas: {informe['fallidas']:,}; aún en cola: {informe['en_cola']:,}")
+    print(f"Cobro + sincronización: p50 {informe['p50_ms']:,.1f} ms   p95 {informe['p95_ms']:,.1f} ms")
+    print(f"Deadlocks: {informe['deadlocks']}   esperas agotadas: {informe['esperas_agotadas']}   reintentos: {informe['reintentos']}")
+    print(f"Deriva de stock: máx {informe['deriva_maxima']:.3f} en {len(deriva)} insumos; fuera del redondeo: {len(fuera_de_redondeo)}; negativos: {len(negativos)} ({len(negativos_sin_aviso)} sin aviso)")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo: json.dump(informe, archivo, ensure_ascii=False, indent=2)
+    return 1 if fuera_de_redondeo or negativos_sin_aviso else 0
+
+
+def comparar(args):
+    with open(args.base, encoding="utf-8") as archivo: base = json.load(archivo)
+    with open(args.nuevo, encoding="utf-8") as archivo: nuevo = json.load(archivo)
+    anteriores = {(fila['caso'], fila['parametros']): fila for fila in base['resultados']}
+    version = lambda informe: f"{informe['version']['commit'] or 'sin git'} / main.py {informe['version']['main_sha1']} ({informe['fecha']})"
+    print(f"Base: {version(base)}  ->  Nuevo: {version(nuevo)}")
+    regresiones = 0
+    for fila in nuevo['resultados']:
+        anterior = anteriores.get((fila['caso'], fila['parametros']))
+        if anterior is None: print(f"{fila['caso']:<36} {fila['parametros']:<30} (nuevo) {fila['mediana_ms']:,.2f} ms"); continue
+        cambio = (fila['mediana_ms'] - anterior['mediana_ms']) / anterior['mediana_ms'] * 100 if anterior['mediana_ms'] else 0.0
+        marca = "  <-- REGRESIÓN" if cambio > args.tolerancia else ("  mejora" if cambio < -args.tolerancia else "")
+        regresiones += cambio > args.tolerancia
+        print(f"{fila['caso']:<36} {fila['parametros']:<30} {anterior['mediana_ms']:>10,.2f} -> {fila['mediana_ms']:>10,.2f} ms ({cambio:+6.1f}%)  "
+              f"round trips {anterior['round_trips']:,.1f} -> {fila['round_trips']:,.1f}{marca}")
+    return 1 if regresiones else 0
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Datos sintéticos y mediciones de rendimiento de Atai Sushi SIG.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--usuario", default="root")
+    parser.add_argument("--clave", default=None, help="Si se omite se solicita por consola.")
+    parser.add_argument("--base-datos", default="atai_sushi_bench", help="Base dedicada a las mediciones (por defecto atai_sushi_bench).")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_generar = subparsers.add_parser("generar", help="Agrega un historial sintético de ventas, movimientos y gastos.")
+    p_generar.add_argument("--escala", choices=ESCALAS, default="10k", help="Líneas de venta a generar.")
+    p_generar.add_argument("--semilla", type=int, default=42)
+    p_generar.add_argument("--dias", type=int, default=365, help="Días de historial, terminando ayer.")
+    p_generar.set_defaults(funcion=generar)
+
+    p_medir = subparsers.add_parser("medir", help="Mide reportes, venta, exportaciones y funciones puras.")
+    p_medir.add_argument("--repeticiones", type=int, default=5)
+    p_medir.add_argument("--repeticiones-exportacion", type=int, default=1)
+    p_medir.add_argument("--salida", default=f"benchmark_{datetime.datetime.now():%Y%m%d_%H%M%S}.json")
+    p_medir.add_argument("--sin-db", action="store_true", help="Solo funciones puras (calcular_reposicion, MatrizCostos).")
+    p_medir.set_defaults(funcion=medir)
+
+    p_arranque = subparsers.add_parser("arranque", help="Mide el arranque en frío de la aplicación contra un presupuesto (código 1 si lo excede).")
+    p_arranque.add_argument("--repeticiones", type=int, default=5)
+    p_arranque.add_argument("--presupuesto-ms", type=float, default=PRESUPUESTO_ARRANQUE_MS)
+    p_arranque.set_defaults(funcion=arranque)
+
+    p_estres = subparsers.add_parser("estres", help="Simula varias terminales vendiendo a la vez y verifica que el stock no se pierda ni quede negativo.")
+    p_estres.add_argument("--terminales", type=int, default=3)
+    p_estres.add_argument("--segundos", type=float, default=30)
+    p_estres.add_argument("--productos", type=int, default=5, help="Productos en disputa (los de receta más larga).")
+    p_estres.add_argument("--semilla", type=int, default=42)
+    p_estres.add_argument("--salida", default=None, help="Archivo JSON con el informe.")
+    p_estres.set_defaults(funcion=estres)
+
+    p_comparar = subparsers.add_parser("comparar", help="Compara dos archivos de resultados (sale con código 1 si hay regresiones).")
+    p_comparar.add_argument("base"); p_comparar.add_argument("nuevo")
+    p_comparar.add_argument("--tolerancia", type=float, default=10.0, help="Variación %% de la mediana que se considera regresión.")
+    p_comparar.set_defaults(funcion=comparar)
+    return parser
+
+
+if __name__ == "__main__":
+    args = crear_parser().parse_args()
+    sys.exit(args.funcion(args))
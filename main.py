@@ -1,11 +1,214 @@
 import sys
 import pymysql
-import csv 
 import os 
-from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox, QWidget, QVBoxLayout, QLabel, QTableWidgetItem, QCheckBox, QFileDialog, QListWidgetItem, QPushButton
-from PyQt5.uic import loadUi
+import hashlib
+import importlib
+import json
+import datetime
+import decimal
+import queue
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QCheckBox, QFileDialog, QListWidgetItem, QPushButton, QDateEdit, QComboBox, QLineEdit, QSpinBox, QDoubleSpinBox, QTableView
 from PyQt5.QtGui import QColor, QBrush
-from PyQt5.QtCore import Qt, QDate, QCoreApplication, QDateTime 
+from PyQt5.QtCore import Qt, QDate, QCoreApplication, QDateTime, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel 
+
+
+# --- INTERFACES COMPILADAS (.ui -> Python) ---
+CARPETA_UI_COMPILADA = "ui_compilada"
+_UI_VERIFICADAS = set()
+
+
+def firma_ui(ruta_ui):
+    with open(ruta_ui, "rb") as archivo: return hashlib.sha1(archivo.read().replace(b"\r\n", b"\n")).hexdigest()  # Independiente del fin de línea.
+
+
+def ruta_ui_compilada(nombre_ui): return os.path.join(CARPETA_UI_COMPILADA, f"ui_{os.path.splitext(nombre_ui)[0].lower()}.py")
+
+
+def cargar_ui(nombre_ui, ventana):
+    """Reemplazo de loadUi: arma la ventana con la clase generada por `python mantenimiento.py compilar-ui`.
+
+    El módulo compilado se importa recién al abrir esa ventana por primera vez y solo se usa si su
+    FIRMA_UI coincide con el .ui actual; si falta o quedó desactualizado se parsea el .ui como antes.
+    """
+    try:
+        modulo = importlib.import_module(f"{CARPETA_UI_COMPILADA}.{os.path.splitext(os.path.basename(ruta_ui_compilada(nombre_ui)))[0]}")
+        if nombre_ui not in _UI_VERIFICADAS:
+            try: vigente = modulo.FIRMA_UI == firma_ui(nombre_ui)
+            except OSError: vigente = True  # Se distribuyó solo la versión compilada.
+            if not vigente: raise ImportError(f"{nombre_ui} cambió desde la última compilación")
+            _UI_VERIFICADAS.add(nombre_ui)
+    except ImportError:
+        from PyQt5.uic import loadUi
+        return loadUi(nombre_ui, ventana)
+    ui = modulo.ClaseUi(); ui.setupUi(ventana)
+    vars(ventana).update(vars(ui))  # Igual que loadUi: los widgets quedan como atributos de la ventana.
+    return ventana
+
+
+def compilar_interfaces(verificar=False):
+    """Compila cada .ui de la carpeta actual a CARPETA_UI_COMPILADA con su firma SHA-1.
+
+    Retorna [(nombre_ui, estado)] con estado 'al día', 'compilada' o, si verificar=True (no escribe nada),
+    'desactualizada' / 'faltante'.
+    """
+    import glob
+    import io
+    from PyQt5.uic import compileUi
+    if not verificar:
+        os.makedirs(CARPETA_UI_COMPILADA, exist_ok=True)
+        inicial = os.path.join(CARPETA_UI_COMPILADA, "__init__.py")
+        if not os.path.exists(inicial):
+            with open(inicial, "w", encoding="utf-8") as archivo: archivo.write('"""Clases generadas desde los .ui con `python mantenimiento.py compilar-ui`. No editar a mano."""\n')
+    estados = []
+    for nombre_ui in sorted(glob.glob("*.ui")):
+        firma = firma_ui(nombre_ui); ruta = ruta_ui_compilada(nombre_ui); actual = None
+        if os.path.exists(ruta):
+            with open(ruta, encoding="utf-8") as archivo: actual = re.search(r'^FIRMA_UI = "([0-9a-f]+)"$', archivo.read(), re.M)
+        if actual and actual.group(1) == firma: estados.append((nombre_ui, "al día")); continue
+        if verificar: estados.append((nombre_ui, "desactualizada" if os.path.exists(ruta) else "faltante")); continue
+        codigo = io.StringIO()
+        with open(nombre_ui, encoding="utf-8") as fuente: compileUi(fuente, codigo)
+        clase = re.search(r"^class (Ui_\w+)\(object\):", codigo.getvalue(), re.M).group(1)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(f"# Generado desde {nombre_ui} con `python mantenimiento.py compilar-ui`. No editar a mano.\n")
+            archivo.write(codigo.getvalue()); archivo.write(f'\n\nFIRMA_UI = "{firma}"\nClaseUi = {clase}\n')
+        estados.append((nombre_ui, "compilada"))
+    return estados
+
+
+# --- VERSIONES DE TABLAS (MySQL) Y CACHÉ DE REPORTES (SQLite local) ---
+# Archivos locales (cola del TPV, caché, log) junto a main.py y no en el directorio de trabajo: abrir la aplicación
+# desde otra carpeta no debe dejar ventas encoladas en una cola que la caja ya no lee.
+DIRECTORIO_DATOS = os.environ.get("ATAI_DIRECTORIO_DATOS") or os.path.dirname(os.path.abspath(__file__))
+RUTA_CACHE_REPORTES = os.path.join(DIRECTORIO_DATOS, "cache_reportes.sqlite3")
+CAPACIDAD_CACHE_REPORTES = 200
+DIAS_VIGENCIA_CACHE_REPORTES = 90
+VERSION_ESQUEMA_CACHE_REPORTES = 2  # Al cambiar el formato guardado, los archivos anteriores se descartan enteros.
+FECHA_DESCONOCIDA = "1000-01-01"  # Escritura sin fecha de negocio conocida: alcanza a todos los períodos.
+TABLAS_STOCK = ("insumos", "movimientos_inventario", "alertas_stock")
+TABLAS_VENTA = ("pedidos", "ventas", "ventas_diarias") + TABLAS_STOCK
+_TABLA_ESCRITA = re.compile(r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)", re.I)
+
+
+ESQUEMA_CACHE_REPORTES = f"""
+DROP TABLE IF EXISTS versiones_tablas; DROP TABLE IF EXISTS escrituras_pasadas; DROP TABLE IF EXISTS resultados_reportes;
+CREATE TABLE resultados_reportes (base TEXT NOT NULL, reporte TEXT NOT NULL, fecha_inicio TEXT NOT NULL, fecha_fin TEXT NOT NULL, firma INTEGER NOT NULL,
+    creado REAL NOT NULL, usado REAL NOT NULL, datos TEXT NOT NULL, PRIMARY KEY (base, reporte, fecha_inicio, fecha_fin));
+PRAGMA user_version = {VERSION_ESQUEMA_CACHE_REPORTES};
+"""
+
+
+def base_actual(): return f"{PARAMETROS_CONEXION.get('host', '')}/{PARAMETROS_CONEXION.get('database', '')}"
+
+
+class VersionesTablas:
+    """Contador de escrituras por (tabla, primer día de negocio alcanzado) en la tabla versiones_tablas de MySQL,
+    incrementado por las rutas de escritura de la aplicación y de mantenimiento.py tras cada commit.
+
+    Al estar en el servidor ve las escrituras de todas las terminales. `firma` es SUM(version) de las tablas
+    hasta una fecha, en una consulta por la clave primaria: solo crece, así que cualquier escritura que alcance
+    esa fecha la cambia. Si la tabla no existe o un incremento falla, `disponible` pasa a False y las
+    pantallas y CACHE_REPORTES vuelven a consultar siempre.
+    """
+    def __init__(self): self.disponible = True
+
+    def tocar(self, conexion, *tablas, desde=None):
+        """Registra una escritura ya confirmada; `desde` es el primer día de negocio que alcanza (None: desconocido, todo el historial)."""
+        fecha = str(como_fecha(desde)) if desde else FECHA_DESCONOCIDA
+        try:
+            with conexion.cursor() as cursor:  # Orden fijo de filas: sin deadlocks entre terminales.
+                cursor.executemany("INSERT INTO versiones_tablas (tabla, fecha, version) VALUES (%s, %s, 1) ON DUPLICATE KEY UPDATE version = version + 1",
+                                   [(tabla, fecha) for tabla in sorted(set(tablas))])
+            conexion.commit()
+        except pymysql.MySQLError:
+            self.disponible = False
+            try: conexion.rollback()
+            except pymysql.MySQLError: pass
+
+    def firma(self, conexion, tablas, hasta="9999-12-31"):
+        """Total de escrituras en `tablas` con datos hasta la fecha `hasta`; sin registro de cambios, un valor distinto cada vez."""
+        if self.disponible:
+            try: return int(consultar_db(conexion, f"SELECT COALESCE(SUM(version), 0) FROM versiones_tablas WHERE tabla IN ({', '.join(['%s'] * len(tablas))}) AND fecha <= %s",
+                                         (*tablas, str(hasta)))[0][0])
+            except pymysql.err.ProgrammingError: self.disponible = False  # Base sin versiones_tablas.
+            except pymysql.MySQLError: pass
+        return object()
+
+
+def a_json(valor):
+    """Decimal, fechas y conjuntos de las filas de un reporte como valores JSON (los mismos que muestran las pantallas)."""
+    if isinstance(valor, decimal.Decimal): return float(valor)
+    if isinstance(valor, (datetime.date, datetime.datetime)): return str(valor)
+    if isinstance(valor, (set, frozenset)): return sorted(valor)
+    raise TypeError(f"{type(valor).__name__} no se puede guardar en la caché de reportes")
+
+
+class CacheReportes:
+    """Resultados de reportes por (reporte, fecha_inicio, fecha_fin) en un archivo SQLite local, con desalojo LRU.
+
+    Cada resultado se guarda como JSON junto a la firma de VERSIONES_TABLAS de las tablas que leyó hasta
+    fecha_fin, tomada antes de consultar: sirve mientras esa firma no cambie. Un período cerrado solo se
+    recalcula si llegan datos con fecha dentro de él; el período en curso, tras cualquier escritura del día.
+    El resultado se entrega siempre en su forma JSON (listas, float, fechas como texto), se haya calculado o no.
+    """
+    def __init__(self, versiones, ruta=RUTA_CACHE_REPORTES, capacidad=CAPACIDAD_CACHE_REPORTES):
+        self.versiones = versiones; self.ruta = ruta; self.capacidad = capacidad; self.local = threading.local()
+        self.activa = os.environ.get("ATAI_CACHE_REPORTES", "1") != "0"; self.aciertos = 0; self.fallos = 0
+
+    def conexion(self):
+        import sqlite3
+        conexion = getattr(self.local, 'conexion', None)
+        if conexion is None:
+            conexion = self.local.conexion = sqlite3.connect(self.ruta, timeout=10); conexion.execute("PRAGMA journal_mode=WAL")
+            if conexion.execute("PRAGMA user_version").fetchone()[0] != VERSION_ESQUEMA_CACHE_REPORTES: conexion.executescript(ESQUEMA_CACHE_REPORTES)
+        return conexion
+
+    def resolver(self, conexion, reporte, fecha_inicio, fecha_fin, tablas, calcular):
+        """Retorna el resultado guardado si sigue vigente; si no, llama a calcular() (sin argumentos) y lo guarda."""
+        fecha_inicio, fecha_fin = str(fecha_inicio), str(fecha_fin)
+        if not (self.activa and self.versiones.disponible): return calcular()
+        firma = self.versiones.firma(conexion, tablas, fecha_fin)
+        hay_guardado, resultado = self._vigente(reporte, fecha_inicio, fecha_fin, firma)
+        if hay_guardado: self.aciertos += 1; return resultado
+        self.fallos += 1; datos = json.dumps(calcular(), default=a_json)
+        if isinstance(firma, int): self._guardar(reporte, fecha_inicio, fecha_fin, firma, datos)
+        return json.loads(datos)
+
+    def _vigente(self, reporte, fecha_inicio, fecha_fin, firma):
+        import sqlite3
+        if not isinstance(firma, int): return False, None
+        try:
+            conexion = self.conexion(); clave = (base_actual(), reporte, fecha_inicio, fecha_fin)
+            fila = conexion.execute("SELECT datos FROM resultados_reportes WHERE base = ? AND reporte = ? AND fecha_inicio = ? AND fecha_fin = ? AND firma = ?", (*clave, firma)).fetchone()
+            if fila is None: return False, None
+            resultado = json.loads(fila[0])
+            with conexion: conexion.execute("UPDATE resultados_reportes SET usado = ? WHERE base = ? AND reporte = ? AND fecha_inicio = ? AND fecha_fin = ?", (time.time(), *clave))
+            return True, resultado
+        except (sqlite3.Error, ValueError): return False, None  # Archivo dañado: se recalcula.
+
+    def _guardar(self, reporte, fecha_inicio, fecha_fin, firma, datos):
+        import sqlite3
+        ahora = time.time()
+        try:
+            with self.conexion() as conexion:
+                conexion.execute("INSERT OR REPLACE INTO resultados_reportes (base, reporte, fecha_inicio, fecha_fin, firma, creado, usado, datos) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (base_actual(), reporte, fecha_inicio, fecha_fin, firma, ahora, ahora, datos))
+                conexion.execute("DELETE FROM resultados_reportes WHERE creado < ? OR rowid NOT IN (SELECT rowid FROM resultados_reportes ORDER BY usado DESC LIMIT ?)",
+                                 (ahora - DIAS_VIGENCIA_CACHE_REPORTES * 86400, self.capacidad))
+        except sqlite3.Error: pass
+
+    def limpiar(self):
+        with self.conexion() as conexion: return conexion.execute("DELETE FROM resultados_reportes WHERE base = ?", (base_actual(),)).rowcount
+
+
+VERSIONES_TABLAS = VersionesTablas()
+CACHE_REPORTES = CacheReportes(VERSIONES_TABLAS)
 
 
 # --- FUNCIÓN AUXILIAR DE CONSULTA (Reusable) ---
@@ -18,6 +221,8 @@ def ejecutar_consulta_db(conexion, query, params=None, fetch=False):
         conexion.commit()
         if fetch:
             return True, cursor.fetchall()
+        tabla_escrita = _TABLA_ESCRITA.match(query)
+        if tabla_escrita: VERSIONES_TABLAS.tocar(conexion, tabla_escrita.group(1).lower())
         return True, cursor.lastrowid
     except pymysql.MySQLError as e:
         QMessageBox.critical(None, "Error de Base de Datos", f"Operación fallida:\n{str(e)}")
@@ -32,16 +237,1777 @@ def ejecutar_consulta_db(conexion, query, params=None, fetch=False):
             cursor.close()
 
 
+# --- RESUMEN DIARIO DE VENTAS (ventas_diarias) ---
+def acumular_ventas_diarias(cursor, registros):
+    """Suma líneas de venta (fecha, id_producto, canal_venta, unidades, ingreso, cmv) al resumen diario.
+
+    Debe llamarse con el mismo cursor y dentro de la misma transacción que inserta las filas en ventas.
+    """
+    acumulado = {}
+    for fecha, id_producto, canal_venta, unidades, ingreso, cmv in registros:
+        totales = acumulado.setdefault((fecha, id_producto, canal_venta), [0, 0.0, 0.0])
+        totales[0] += unidades; totales[1] += ingreso; totales[2] += cmv
+    if not acumulado: return
+    query = """
+    INSERT INTO ventas_diarias (fecha, id_producto, canal_venta, unidades, ingreso, cmv) VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE unidades = unidades + VALUES(unidades), ingreso = ingreso + VALUES(ingreso), cmv = cmv + VALUES(cmv)
+    """
+    cursor.executemany(query, [clave + tuple(totales) for clave, totales in sorted(acumulado.items())])  # Orden fijo de claves: sin deadlocks entre terminales.
+
+
+def reconstruir_ventas_diarias(conexion, fecha_inicio=None, fecha_fin=None):
+    """Recalcula ventas_diarias desde ventas (todo el historial o solo un rango) en una transacción."""
+    filtro = "WHERE fecha_venta BETWEEN %s AND %s" if fecha_inicio and fecha_fin else ""
+    params = (fecha_inicio, fecha_fin) if filtro else None
+    try:
+        with conexion.cursor() as cursor:
+            cursor.execute("DELETE FROM ventas_diarias" + (" WHERE fecha BETWEEN %s AND %s" if filtro else ""), params)
+            cursor.execute(f"""
+            INSERT INTO ventas_diarias (fecha, id_producto, canal_venta, unidades, ingreso, cmv)
+            SELECT fecha_venta, id_producto, canal_venta, SUM(cantidad), SUM(total_venta), SUM(cantidad * costo_unitario_calculado)
+            FROM ventas {filtro}
+            GROUP BY fecha_venta, id_producto, canal_venta
+            """, params)
+            filas = cursor.rowcount
+        conexion.commit(); VERSIONES_TABLAS.tocar(conexion, "ventas_diarias", desde=fecha_inicio if filtro else None)
+        return True, filas
+    except pymysql.MySQLError as e:
+        conexion.rollback()
+        return False, str(e)
+
+
+# --- CONTENCIÓN ENTRE TERMINALES ---
+ERRORES_REINTENTABLES = {1213: "deadlocks", 1205: "esperas_agotadas"}  # ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT
+REINTENTOS_TRANSACCION = 3
+CONTENCION = {"deadlocks": 0, "esperas_agotadas": 0, "reintentos": 0}
+_CANDADO_CONTENCION = threading.Lock()
+
+
+def bloquear_insumos(cursor, ids_insumos):
+    """Bloquea (FOR UPDATE) las filas de insumos en orden de id_insumo y retorna {id_insumo: (costo_promedio, stock_actual)}.
+
+    Todas las transacciones que descuentan stock toman los bloqueos en el mismo orden, así dos terminales
+    que venden insumos en común se esperan en vez de bloquearse mutuamente.
+    """
+    ids_insumos = sorted(set(ids_insumos))
+    if not ids_insumos: return {}
+    cursor.execute(f"SELECT id_insumo, costo_promedio, stock_actual FROM insumos WHERE id_insumo IN ({', '.join(['%s'] * len(ids_insumos))}) ORDER BY id_insumo FOR UPDATE", ids_insumos)
+    return {id_insumo: (float(costo), float(stock)) for id_insumo, costo, stock in cursor.fetchall()}
+
+
+def descontar_stock_db(cursor, consumo_por_insumo, condicional=True):
+    """Descuenta {id_insumo: cantidad} del stock con un solo UPDATE relativo (CASE por insumo).
+
+    Condicional: si otra transacción sin bloqueo bajó el stock, no se descuenta de menos y retorna False
+    (ninguna fila queda bajo cero). Sin condición el stock puede quedar negativo. No hace COMMIT.
+    """
+    ids_insumos = sorted(consumo_por_insumo)
+    if not ids_insumos: return True
+    casos = " ".join(["WHEN %s THEN %s"] * len(ids_insumos)); marcadores = ", ".join(["%s"] * len(ids_insumos))
+    query_update_stock = f"UPDATE insumos SET stock_actual = stock_actual - CASE id_insumo {casos} END WHERE id_insumo IN ({marcadores})"
+    params = [valor for id_insumo in ids_insumos for valor in (id_insumo, consumo_por_insumo[id_insumo])]
+    if not condicional: cursor.execute(query_update_stock, params + ids_insumos); return True
+    cursor.execute(query_update_stock + f" AND stock_actual >= CASE id_insumo {casos} END", params + ids_insumos + params)
+    return cursor.rowcount == sum(1 for id_insumo in ids_insumos if consumo_por_insumo[id_insumo])
+
+
+def en_transaccion(conexion, funcion, reintentos=REINTENTOS_TRANSACCION):
+    """Ejecuta funcion(cursor) y hace COMMIT; si InnoDB la elige como víctima de un deadlock o se agota la espera
+    de un bloqueo, revierte y la repite (hasta `reintentos` veces, con espera creciente). Los casos quedan en CONTENCION.
+
+    Si funcion retorna (False, mensaje) se revierte sin reintentar. Retorna lo que retorne funcion; los demás errores se propagan tras el ROLLBACK.
+    """
+    import random
+    for intento in range(reintentos + 1):
+        try:
+            with conexion.cursor() as cursor: resultado = funcion(cursor)
+            if isinstance(resultado, tuple) and resultado and resultado[0] is False: conexion.rollback()
+            else: conexion.commit()
+            return resultado
+        except pymysql.err.OperationalError as e:
+            conexion.rollback(); tipo = ERRORES_REINTENTABLES.get(e.args[0])
+            if tipo is None: raise
+            with _CANDADO_CONTENCION: CONTENCION[tipo] += 1
+            if intento == reintentos: raise
+            with _CANDADO_CONTENCION: CONTENCION["reintentos"] += 1
+            time.sleep(0.02 * 2 ** intento * (1 + random.random()))
+        except Exception:
+            conexion.rollback(); raise
+
+
+def registrar_perdida_db(cursor, id_insumo, cantidad, motivo):
+    """Da de baja `cantidad` de un insumo con un descuento relativo condicional (sin leer y reescribir el stock).
+
+    No hace COMMIT; retorna (True, None) o (False, mensaje) antes de escribir nada.
+    """
+    cursor.execute("UPDATE insumos SET stock_actual = stock_actual - %s WHERE id_insumo = %s AND stock_actual >= %s", (cantidad, id_insumo, cantidad))
+    if cursor.rowcount != 1:
+        cursor.execute("SELECT stock_actual FROM insumos WHERE id_insumo = %s", (id_insumo,)); fila = cursor.fetchone()
+        if fila is None: return False, f"El insumo ID {id_insumo} no existe."
+        return False, f"La pérdida ({cantidad}) es mayor al stock actual ({float(fila[0])})."
+    cursor.execute("INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, motivo) VALUES (%s, 'perdida', %s, %s)", (id_insumo, cantidad, motivo))
+    evaluar_alertas_stock(cursor, [id_insumo])
+    return True, None
+
+
+# --- CHECKOUT EN BLOQUE (Set-based) ---
+def registrar_venta_db(cursor, pedido, canal_venta, fecha_venta=None, clave_idempotencia=None, validar_stock=True):
+    """Registra un pedido completo (cabecera + ventas + salidas + stock) con un número fijo de sentencias.
+
+    Antes: 1 SELECT de receta por línea, SELECT + INSERT + UPDATE por insumo y 1 INSERT por línea
+    (un pedido de 12 líneas con ~25 insumos distintos = 12 + 75 + 12 = 99 round trips + COMMIT).
+    Ahora: 1 SELECT (explosión del carrito), 1 INSERT en pedidos, 1 INSERT multi-fila en ventas,
+    1 INSERT multi-fila en ventas_diarias, 1 INSERT multi-fila en movimientos_inventario y
+    1 UPDATE de stock = 6 round trips, más el bloqueo de los insumos, la reevaluación de sus alertas + COMMIT.
+    Varias terminales pueden vender los mismos insumos a la vez: las filas de insumos se bloquean
+    (FOR UPDATE) en orden de id_insumo antes de validar, y el descuento es relativo y condicional.
+    No hace COMMIT; retorna (True, (id_pedido, consumo_por_insumo, faltantes)) o, si falta stock,
+    (False, mensaje) antes de escribir nada. La réplica de la cola local del TPV pasa la clave de
+    idempotencia y validar_stock=False: la venta ya se cobró, así que se registra aunque otra terminal
+    haya consumido el stock, y faltantes = {id_insumo: (requerido, disponible)} informa lo que quedó negativo.
+    """
+    fecha_venta = fecha_venta or datetime.date.today().isoformat()
+    ids_productos = sorted({item['id_producto'] for item in pedido})
+    marcadores = ", ".join(["%s"] * len(ids_productos))
+    cursor.execute(f"SELECT id_producto, id_insumo, cantidad_requerida FROM recetas WHERE id_producto IN ({marcadores})", ids_productos)
+    filas_receta = cursor.fetchall()
+    insumos = bloquear_insumos(cursor, {id_insumo for _, id_insumo, _ in filas_receta})
+    recetas = {}; stock_insumos = {}
+    for id_producto, id_insumo, req_por_unidad in filas_receta:
+        costo_unitario, stock_actual = insumos[id_insumo]
+        recetas.setdefault(id_producto, []).append((id_insumo, float(req_por_unidad), costo_unitario))
+        stock_insumos[id_insumo] = stock_actual
+
+    consumo_total_insumos = {}; venta_registros = []
+    for item in pedido:
+        prod_id = item['id_producto']; cantidad_vendida = item['cantidad']; item_cmv = 0.0
+        for id_insumo, req_por_unidad, costo_unitario in recetas.get(prod_id, []):
+            item_cmv += req_por_unidad * costo_unitario
+            consumo_total_insumos[id_insumo] = consumo_total_insumos.get(id_insumo, 0) + req_por_unidad * cantidad_vendida
+        venta_registros.append([fecha_venta, prod_id, cantidad_vendida, item['precio_unitario'], round(item_cmv, 2), item['total_item'], canal_venta])
+
+    # El carrito se valida completo (consumo acumulado por insumo) antes de la primera escritura.
+    faltantes = {id_insumo: (consumo_total_insumos[id_insumo], stock_insumos[id_insumo]) for id_insumo in sorted(consumo_total_insumos) if stock_insumos[id_insumo] < consumo_total_insumos[id_insumo]}
+    if validar_stock and faltantes:
+        id_insumo = min(faltantes); return False, f"STOCK INSUFICIENTE para Insumo ID {id_insumo} ({stock_insumos[id_insumo]:.2f}). Venta abortada."
+
+    query_insert_pedido = "INSERT INTO pedidos (fecha_pedido, canal_venta, total_pedido, cantidad_lineas, clave_idempotencia) VALUES (%s, %s, %s, %s, %s)"
+    cursor.execute(query_insert_pedido, (fecha_venta, canal_venta, sum(item['total_item'] for item in pedido), len(pedido), clave_idempotencia))
+    id_pedido = cursor.lastrowid
+    query_insert_venta = "INSERT INTO ventas (id_pedido, fecha_venta, id_producto, cantidad, precio_unitario, costo_unitario_calculado, total_venta, canal_venta) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+    cursor.executemany(query_insert_venta, [[id_pedido] + registro for registro in venta_registros])
+    acumular_ventas_diarias(cursor, [(fecha, prod_id, canal, cantidad, total, cantidad * cmv) for fecha, prod_id, cantidad, _, cmv, total, canal in venta_registros])
+    if consumo_total_insumos:
+        ids_insumos = sorted(consumo_total_insumos)
+        query_insert_mov = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, motivo) VALUES (%s, 'salida', %s, 'Consumo por Venta TPV')"
+        cursor.executemany(query_insert_mov, [(id_insumo, consumo_total_insumos[id_insumo]) for id_insumo in ids_insumos])
+        if not descontar_stock_db(cursor, consumo_total_insumos, condicional=validar_stock): return False, "El stock cambió durante la venta. Venta abortada."
+        evaluar_alertas_stock(cursor, ids_insumos)
+    return True, (id_pedido, consumo_total_insumos, faltantes)
+
+
+# --- RECEPCIÓN DE COMPRAS EN BLOQUE ---
+def registrar_recepcion_db(cursor, id_proveedor, lineas, motivo="Compra registrada"):
+    """Registra las líneas (id_insumo, cantidad, costo_unitario) de una factura de proveedor con un número fijo de sentencias.
+
+    1 SELECT de validación, 1 INSERT multi-fila de movimientos 'entrada' (con id_proveedor) y 1 UPDATE que
+    recalcula stock y costo promedio ponderado de todos los insumos en SQL, relativo al valor vigente de la
+    fila, de modo que dos terminales recibiendo a la vez no se pisan. Si id_proveedor es None se usa el
+    proveedor principal de cada insumo.
+    No hace COMMIT; retorna (True, cantidad_por_insumo) o (False, mensaje) antes de escribir nada.
+    """
+    if not lineas: return False, "La factura no tiene líneas."
+    recibido = {}  # id_insumo -> [cantidad, valor]
+    for id_insumo, cantidad, costo_unitario in lineas:
+        acumulado = recibido.setdefault(id_insumo, [0.0, 0.0]); acumulado[0] += cantidad; acumulado[1] += cantidad * costo_unitario
+    ids_insumos = sorted(recibido); marcadores = ", ".join(["%s"] * len(ids_insumos))
+    cursor.execute(f"SELECT id_insumo, id_proveedor_principal FROM insumos WHERE activo = TRUE AND id_insumo IN ({marcadores})", ids_insumos)
+    proveedor_principal = dict(cursor.fetchall())
+    inexistentes = [id_insumo for id_insumo in ids_insumos if id_insumo not in proveedor_principal]
+    if inexistentes: return False, f"Insumos inexistentes o inactivos: {', '.join(map(str, inexistentes))}. Recepción abortada."
+
+    query_insert_mov = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, costo_unitario, motivo, id_proveedor) VALUES (%s, 'entrada', %s, %s, %s, %s)"
+    cursor.executemany(query_insert_mov, [(id_insumo, cantidad, costo_unitario, motivo, id_proveedor if id_proveedor is not None else proveedor_principal[id_insumo])
+                                          for id_insumo, cantidad, costo_unitario in lineas])
+    casos = "CASE id_insumo " + " ".join(["WHEN %s THEN %s"] * len(ids_insumos)) + " END"
+    cantidades = [valor for id_insumo in ids_insumos for valor in (id_insumo, recibido[id_insumo][0])]
+    valores = [valor for id_insumo in ids_insumos for valor in (id_insumo, recibido[id_insumo][1])]
+    # En un UPDATE de una sola tabla MySQL asigna de izquierda a derecha: costo_promedio se calcula con el stock anterior.
+    query_update = f"""
+    UPDATE insumos SET
+        costo_promedio = CASE WHEN stock_actual + {casos} > 0
+                              THEN (stock_actual * costo_promedio + {casos}) / (stock_actual + {casos})
+                              ELSE {casos} / {casos} END,
+        stock_actual = stock_actual + {casos}
+    WHERE id_insumo IN ({marcadores})
+    """
+    cursor.execute(query_update, cantidades + valores + cantidades + valores + cantidades + cantidades + ids_insumos)
+    evaluar_alertas_stock(cursor, ids_insumos)
+    return True, {id_insumo: recibido[id_insumo][0] for id_insumo in ids_insumos}
+
+
+# --- IMPORTACIÓN DE PEDIDOS EXTERNOS (delivery_app / whatsapp) ---
+CANALES_IMPORTACION = ("delivery_app", "whatsapp")
+COLUMNAS_IMPORTACION = {'pedido': ('pedido', 'id_pedido', 'id_orden', 'orden'), 'fecha': ('fecha', 'fecha_venta', 'fecha_pedido'), 'canal': ('canal', 'canal_venta'),
+                        'producto': ('id_producto', 'producto', 'nombre'), 'cantidad': ('cantidad',), 'precio': ('precio_unitario', 'precio')}
+TAMANO_LOTE_IMPORTACION = 1000  # Pedidos por INSERT multi-fila.
+TAMANO_MAXIMO_JSON_IMPORTACION = 20 * 1024 * 1024  # Bytes: un .json se carga completo; los archivos más grandes van como CSV o JSON Lines.
+
+
+@dataclass
+class InformeImportacion:
+    """Resultado (o simulación) de la importación de un archivo de pedidos externos."""
+    fecha_importacion: datetime.datetime
+    lineas: int = 0
+    pedidos: int = 0
+    ya_importados: int = 0
+    unidades: int = 0
+    total: float = 0.0
+    cmv: float = 0.0
+    desde: datetime.date = None
+    hasta: datetime.date = None
+    errores: list = field(default_factory=list)     # "Línea N: ..." (sin producto, canal, fecha, cantidad o precio inválidos)
+    sin_mapear: dict = field(default_factory=dict)  # texto del producto en el archivo -> líneas que lo usan
+    faltantes: dict = field(default_factory=dict)   # id_insumo -> (nombre, requerido, disponible)
+    consumo: dict = field(default_factory=dict)     # id_insumo -> cantidad descontada (o a descontar)
+
+    @property
+    def importable(self): return not self.errores and not self.sin_mapear
+
+    def resumen(self):
+        partes = [f"{self.lineas} líneas leídas: {self.pedidos} pedidos nuevos ({self.unidades} unidades, $ {self.total:,.0f}, CMV $ {self.cmv:,.0f})"
+                  + (f" del {self.desde} al {self.hasta}" if self.desde else "") + (f"; {self.ya_importados} ya importados antes." if self.ya_importados else ".")]
+        if self.sin_mapear:
+            partes.append(f"Productos sin mapear ({len(self.sin_mapear)}):")
+            partes += [f"  '{texto}': {lineas} línea(s)" for texto, lineas in sorted(self.sin_mapear.items(), key=lambda par: -par[1])[:20]]
+        if self.errores: partes.append(f"Líneas con errores ({len(self.errores)}):"); partes += [f"  {error}" for error in self.errores[:20]]
+        if self.faltantes:
+            partes.append(f"Stock insuficiente ({len(self.faltantes)} insumos):")
+            partes += [f"  {nombre} (ID {id_insumo}): requiere {requerido:.2f}, hay {disponible:.2f}" for id_insumo, (nombre, requerido, disponible) in sorted(self.faltantes.items())]
+        return "\n".join(partes)
+
+
+def leer_pedidos_externos(ruta):
+    """Lee un archivo de pedidos (CSV con ',' o ';', JSON o JSON Lines) como generador de líneas.
+
+    Genera dicts {numero_linea, pedido, fecha, canal, producto, cantidad, precio}; los campos ausentes quedan en None.
+    El CSV y el JSON Lines (.jsonl / .ndjson: un objeto por línea) se leen fila a fila sin cargar el archivo; el .json
+    se carga completo, así que se rechaza por encima de TAMANO_MAXIMO_JSON_IMPORTACION. Cada registro JSON es una línea
+    o un pedido con sus líneas en "lineas"/"items" (heredan los campos del pedido), y el .json puede ser una lista de
+    registros o un objeto con ella en "pedidos"/"lineas". Lanza ValueError si el CSV no tiene columnas de producto y
+    cantidad, si el .json supera el límite o si un registro no es un objeto JSON válido.
+    """
+    import csv
+    def normalizar(numero, campos, coma_decimal=False):
+        campos = {str(clave).strip().lower(): valor for clave, valor in campos.items() if clave is not None}
+        linea = {clave: next((campos[alias] for alias in alias_validos if campos.get(alias) not in (None, "")), None) for clave, alias_validos in COLUMNAS_IMPORTACION.items()}
+        if coma_decimal:
+            for clave in ('cantidad', 'precio'):
+                if isinstance(linea[clave], str): linea[clave] = linea[clave].replace(',', '.')
+        linea['numero_linea'] = numero
+        return linea
+
+    def desplegar(registros):
+        numero = 0
+        for registro in registros:
+            if not isinstance(registro, dict): raise ValueError(f"Registro {numero + 1}: se esperaba un objeto JSON.")
+            hijas = registro.get("lineas") or registro.get("items")
+            for linea in hijas or [registro]:
+                numero += 1; yield normalizar(numero, {**registro, **linea} if hijas else linea)
+
+    def registros_json_lines(archivo):
+        for numero, texto in enumerate(archivo, 1):
+            if not texto.strip(): continue
+            try: yield json.loads(texto)
+            except ValueError as e: raise ValueError(f"Línea {numero}: JSON inválido ({e}).")
+
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        with open(ruta, encoding='utf-8-sig') as archivo: yield from desplegar(registros_json_lines(archivo))
+        return
+    if extension == ".json":
+        if os.path.getsize(ruta) > TAMANO_MAXIMO_JSON_IMPORTACION:
+            raise ValueError(f"El JSON supera {TAMANO_MAXIMO_JSON_IMPORTACION // (1024 * 1024)} MB; expórtelo como CSV o JSON Lines (.jsonl, un objeto por línea).")
+        with open(ruta, encoding='utf-8-sig') as archivo: datos = json.load(archivo)
+        if isinstance(datos, dict): datos = datos.get("pedidos") or datos.get("lineas") or []
+        yield from desplegar(datos)
+        return
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        muestra = archivo.read(4096); archivo.seek(0)
+        separador = ';' if muestra.count(';') > muestra.count(',') else ','
+        lector = csv.DictReader(archivo, delimiter=separador)
+        encabezados = {campo.strip().lower() for campo in lector.fieldnames or []}
+        if not all(encabezados & set(COLUMNAS_IMPORTACION[clave]) for clave in ('producto', 'cantidad')):
+            raise ValueError("El archivo debe tener columnas producto (o id_producto) y cantidad.")
+        for numero, fila in enumerate(lector, 1): yield normalizar(numero, fila, coma_decimal=separador == ';')
+
+
+def agrupar_pedidos_externos(conexion, lineas, canal_venta="delivery_app"):
+    """Mapea productos (por id o nombre) y agrupa las líneas por pedido: retorna (pedidos, InformeImportacion).
+
+    pedidos = {clave_idempotencia: {'fecha', 'canal', 'items': [(id_producto, cantidad, precio_unitario)]}}. Las líneas de un
+    mismo pedido del archivo comparten la clave md5("canal:fecha:pedido"), así reimportar el archivo no duplica ventas
+    y un número de pedido que la aplicación reutiliza otro día no se toma por repetido; las líneas sin número de pedido
+    son un pedido cada una (sin esa protección). El precio por defecto es precio_venta.
+    """
+    import uuid
+    informe = InformeImportacion(fecha_importacion=datetime.datetime.now().replace(microsecond=0))
+    productos = consultar_db(conexion, "SELECT id_producto, nombre, precio_venta FROM productos WHERE activo = TRUE")
+    precios = {id_producto: float(precio) for id_producto, _, precio in productos}
+    por_nombre = {nombre.strip().lower(): id_producto for id_producto, nombre, _ in productos}
+    pedidos = {}; fechas_pedido = {}; hoy = datetime.date.today()
+    for linea in lineas:
+        informe.lineas += 1; numero = linea['numero_linea']
+        texto = str(linea['producto'] or "").strip()
+        if not texto: informe.errores.append(f"Línea {numero}: sin producto."); continue
+        id_producto = int(texto) if texto.isdigit() else por_nombre.get(texto.lower())
+        if id_producto not in precios: informe.sin_mapear[texto] = informe.sin_mapear.get(texto, 0) + 1; continue
+        canal = str(linea['canal'] or canal_venta).strip().lower()
+        if canal not in CANALES_IMPORTACION: informe.errores.append(f"Línea {numero}: canal '{canal}' no importable ({' o '.join(CANALES_IMPORTACION)})."); continue
+        try:
+            fecha = como_fecha(linea['fecha']) if linea['fecha'] else hoy
+            cantidad = float(str(linea['cantidad']).strip())
+            precio = float(str(linea['precio']).strip()) if linea['precio'] is not None else precios[id_producto]
+        except ValueError: informe.errores.append(f"Línea {numero}: fecha, cantidad o precio inválidos."); continue
+        if fecha > hoy: informe.errores.append(f"Línea {numero}: fecha futura ({fecha})."); continue
+        if cantidad <= 0 or not cantidad.is_integer() or precio < 0: informe.errores.append(f"Línea {numero}: la cantidad debe ser un entero positivo y el precio no negativo."); continue
+        referencia = str(linea['pedido']).strip() if linea['pedido'] is not None else ""
+        if referencia and fechas_pedido.setdefault((canal, referencia), fecha) != fecha:
+            informe.errores.append(f"Línea {numero}: el pedido {referencia} ({canal}) ya tiene líneas con fecha {fechas_pedido[(canal, referencia)]}."); continue
+        clave = hashlib.md5(f"{canal}:{fecha.isoformat()}:{referencia}".encode("utf-8")).hexdigest() if referencia else uuid.uuid4().hex
+        pedidos.setdefault(clave, {'fecha': fecha, 'canal': canal, 'items': []})['items'].append((id_producto, int(cantidad), precio))
+    return pedidos, informe
+
+
+def importar_pedidos_db(cursor, pedidos, informe, simular=False, permitir_faltantes=False):
+    """Registra los pedidos agrupados por agrupar_pedidos_externos con un número de sentencias que no depende de las líneas.
+
+    1 SELECT de claves ya importadas y 1 INSERT de pedidos + 1 SELECT de sus ids + 1 INSERT de ventas (con
+    fecha_importacion) por bloque de TAMANO_LOTE_IMPORTACION pedidos; 1 SELECT explota todas las recetas, y
+    ventas_diarias, las salidas (una por canal e insumo) y el stock se escriben una sola vez para todo el archivo.
+    Con simular=True solo lee (sin FOR UPDATE). No hace COMMIT; retorna (True, informe) o, si falta stock y no se
+    permite, (False, informe) antes de escribir nada. Con permitir_faltantes el stock puede quedar negativo.
+    """
+    claves = list(pedidos); aplicadas = set()
+    for inicio in range(0, len(claves), TAMANO_LOTE_IMPORTACION):
+        bloque = claves[inicio:inicio + TAMANO_LOTE_IMPORTACION]
+        cursor.execute(f"SELECT clave_idempotencia FROM pedidos WHERE clave_idempotencia IN ({', '.join(['%s'] * len(bloque))})", bloque)
+        aplicadas.update(fila[0] for fila in cursor.fetchall())
+    nuevos = [clave for clave in claves if clave not in aplicadas]
+    ids_productos = sorted({id_producto for clave in nuevos for id_producto, _, _ in pedidos[clave]['items']})
+    recetas = {}
+    if ids_productos:
+        cursor.execute(f"SELECT id_producto, id_insumo, cantidad_requerida FROM recetas WHERE id_producto IN ({', '.join(['%s'] * len(ids_productos))})", ids_productos)
+        for id_producto, id_insumo, requerido in cursor.fetchall(): recetas.setdefault(id_producto, []).append((id_insumo, float(requerido)))
+    ids_insumos = sorted({id_insumo for lineas_receta in recetas.values() for id_insumo, _ in lineas_receta})
+    if simular and ids_insumos:
+        cursor.execute(f"SELECT id_insumo, costo_promedio, stock_actual FROM insumos WHERE id_insumo IN ({', '.join(['%s'] * len(ids_insumos))})", ids_insumos)
+        insumos = {id_insumo: (float(costo), float(stock)) for id_insumo, costo, stock in cursor.fetchall()}
+    else: insumos = bloquear_insumos(cursor, ids_insumos)
+    cmv_unitario = {id_producto: round(sum(requerido * insumos.get(id_insumo, (0.0, 0.0))[0] for id_insumo, requerido in lineas_receta), 2) for id_producto, lineas_receta in recetas.items()}
+
+    consumo = {}  # (canal, id_insumo) -> cantidad
+    for clave in nuevos:
+        canal = pedidos[clave]['canal']
+        for id_producto, cantidad, _ in pedidos[clave]['items']:
+            for id_insumo, requerido in recetas.get(id_producto, []): consumo[(canal, id_insumo)] = consumo.get((canal, id_insumo), 0.0) + requerido * cantidad
+    consumo_por_insumo = {}
+    for (_, id_insumo), cantidad in consumo.items(): consumo_por_insumo[id_insumo] = consumo_por_insumo.get(id_insumo, 0.0) + cantidad
+    faltantes = {id_insumo: requerido for id_insumo, requerido in consumo_por_insumo.items() if insumos.get(id_insumo, (0.0, 0.0))[1] < requerido}
+    nombres = {}
+    if faltantes:
+        cursor.execute(f"SELECT id_insumo, nombre FROM insumos WHERE id_insumo IN ({', '.join(['%s'] * len(faltantes))})", sorted(faltantes)); nombres = dict(cursor.fetchall())
+    items = [(pedidos[clave], id_producto, cantidad, precio) for clave in nuevos for id_producto, cantidad, precio in pedidos[clave]['items']]
+    fechas = [pedidos[clave]['fecha'] for clave in nuevos]
+    informe.pedidos = len(nuevos); informe.ya_importados = len(aplicadas); informe.consumo = consumo_por_insumo
+    informe.unidades = sum(cantidad for _, _, cantidad, _ in items); informe.total = sum(cantidad * precio for _, _, cantidad, precio in items)
+    informe.cmv = sum(cantidad * cmv_unitario.get(id_producto, 0.0) for _, id_producto, cantidad, _ in items)
+    informe.desde, informe.hasta = (min(fechas), max(fechas)) if fechas else (None, None)
+    informe.faltantes = {id_insumo: (nombres.get(id_insumo, f"Insumo {id_insumo}"), requerido, insumos.get(id_insumo, (0.0, 0.0))[1]) for id_insumo, requerido in faltantes.items()}
+    if faltantes and not permitir_faltantes: return False, informe
+    if simular or not nuevos: return True, informe
+
+    query_insert_pedido = "INSERT INTO pedidos (fecha_pedido, canal_venta, total_pedido, cantidad_lineas, clave_idempotencia) VALUES (%s, %s, %s, %s, %s)"
+    query_insert_venta = """INSERT INTO ventas (id_pedido, fecha_venta, id_producto, cantidad, precio_unitario, costo_unitario_calculado, total_venta, canal_venta, fecha_importacion)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+    registros_diarios = []
+    for inicio in range(0, len(nuevos), TAMANO_LOTE_IMPORTACION):
+        bloque = nuevos[inicio:inicio + TAMANO_LOTE_IMPORTACION]
+        cursor.executemany(query_insert_pedido, [(pedido['fecha'], pedido['canal'], sum(cantidad * precio for _, cantidad, precio in pedido['items']), len(pedido['items']), clave)
+                                                 for clave, pedido in ((clave, pedidos[clave]) for clave in bloque)])
+        cursor.execute(f"SELECT clave_idempotencia, id_pedido FROM pedidos WHERE clave_idempotencia IN ({', '.join(['%s'] * len(bloque))})", bloque)
+        ids_pedidos = dict(cursor.fetchall())
+        ventas = [(ids_pedidos[clave], pedidos[clave]['fecha'], id_producto, cantidad, precio, cmv_unitario.get(id_producto, 0.0), cantidad * precio, pedidos[clave]['canal'], informe.fecha_importacion)
+                  for clave in bloque for id_producto, cantidad, precio in pedidos[clave]['items']]
+        cursor.executemany(query_insert_venta, ventas)
+        registros_diarios += [(fecha, id_producto, canal, cantidad, total, cantidad * cmv) for _, fecha, id_producto, cantidad, _, cmv, total, canal, _ in ventas]
+    acumular_ventas_diarias(cursor, registros_diarios)
+    if consumo:
+        query_insert_mov = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, motivo) VALUES (%s, 'salida', %s, %s)"
+        cursor.executemany(query_insert_mov, [(id_insumo, cantidad, f"Consumo por importación {canal} {informe.fecha_importacion:%Y-%m-%d %H:%M}") for (canal, id_insumo), cantidad in sorted(consumo.items())])
+        if not descontar_stock_db(cursor, consumo_por_insumo, condicional=not permitir_faltantes): return False, informe
+        evaluar_alertas_stock(cursor, sorted(consumo_por_insumo))
+    return True, informe
+
+
+def importar_pedidos_externos(conexion, lineas, canal_venta="delivery_app", simular=False, permitir_faltantes=False):
+    """Importa (o simula) un archivo de pedidos de delivery_app / whatsapp en una sola transacción.
+
+    No escribe nada si hay líneas inválidas, productos sin mapear o (salvo permitir_faltantes) stock insuficiente;
+    en todos los casos retorna (ok, InformeImportacion), y la simulación informa los faltantes de stock de las líneas
+    válidas aunque otras no se puedan importar. Los errores de MySQL se propagan tras el ROLLBACK.
+    """
+    pedidos, informe = agrupar_pedidos_externos(conexion, lineas, canal_venta)
+    if not informe.importable and not simular: return False, informe
+    ok, informe = en_transaccion(conexion, lambda cursor: importar_pedidos_db(cursor, pedidos, informe, simular, permitir_faltantes))
+    ok = ok and informe.importable
+    if ok and not simular and informe.pedidos:
+        VERSIONES_TABLAS.tocar(conexion, *TABLAS_VENTA, desde=informe.desde)
+        for id_insumo in informe.consumo: CACHE_RECETAS.invalidar_insumo(id_insumo)
+    return ok, informe
+
+
+# --- ALERTAS DE STOCK INCREMENTALES (alertas_stock) ---
+UMBRAL_STOCK_CRITICO = 0.5  # Fracción de stock_minimo bajo la cual la alerta pasa de 'stock_minimo' a 'stock_critico'.
+ETIQUETAS_ALERTA = {'sin_stock': "SIN STOCK", 'stock_critico': "CRÍTICO", 'stock_minimo': "EN MÍNIMO"}
+
+
+def tipo_alerta_stock(stock_actual, stock_minimo):
+    if stock_actual <= 0: return 'sin_stock'
+    if stock_actual <= stock_minimo * UMBRAL_STOCK_CRITICO: return 'stock_critico'
+    if stock_actual <= stock_minimo: return 'stock_minimo'
+    return None
+
+
+def evaluar_alertas_stock(cursor, ids_insumos):
+    """Reevalúa las alertas solo de los insumos tocados por una transacción (mismo cursor, sin COMMIT).
+
+    Abre una alerta cuando el insumo cruza un umbral, actualiza nivel_actual si sigue en el mismo nivel y
+    marca fecha_resolucion en la anterior cuando cambia de nivel o se repone: 1 SELECT + hasta 3 escrituras.
+    Retorna el cambio neto de alertas abiertas.
+    """
+    ids_insumos = sorted(set(ids_insumos))
+    if not ids_insumos: return 0
+    marcadores = ", ".join(["%s"] * len(ids_insumos))
+    cursor.execute(f"""
+    SELECT i.id_insumo, i.stock_actual, i.stock_minimo, a.id_alerta, a.tipo_alerta
+    FROM insumos i LEFT JOIN alertas_stock a ON a.id_insumo = i.id_insumo AND a.fecha_resolucion IS NULL
+    WHERE i.id_insumo IN ({marcadores})
+    """, ids_insumos)
+    estado = {}
+    for id_insumo, stock_actual, stock_minimo, id_alerta, tipo_abierto in cursor.fetchall():
+        actual = estado.setdefault(id_insumo, [float(stock_actual), float(stock_minimo), []])
+        if id_alerta is not None: actual[2].append((id_alerta, tipo_abierto))
+    a_resolver = []; a_actualizar = []; a_abrir = []
+    for id_insumo, (stock_actual, stock_minimo, abiertas) in estado.items():
+        tipo = tipo_alerta_stock(stock_actual, stock_minimo)
+        vigente = next((id_alerta for id_alerta, tipo_abierto in abiertas if tipo_abierto == tipo), None)
+        a_resolver += [id_alerta for id_alerta, _ in abiertas if id_alerta != vigente]
+        if vigente is not None: a_actualizar.append((vigente, stock_actual))
+        elif tipo is not None: a_abrir.append((id_insumo, tipo, stock_actual, stock_minimo))
+    if a_resolver:
+        cursor.execute(f"UPDATE alertas_stock SET fecha_resolucion = CURRENT_TIMESTAMP WHERE id_alerta IN ({', '.join(['%s'] * len(a_resolver))})", a_resolver)
+    if a_actualizar:
+        casos = " ".join(["WHEN %s THEN %s"] * len(a_actualizar))
+        cursor.execute(f"UPDATE alertas_stock SET nivel_actual = CASE id_alerta {casos} END WHERE id_alerta IN ({', '.join(['%s'] * len(a_actualizar))})",
+                       [valor for par in a_actualizar for valor in par] + [id_alerta for id_alerta, _ in a_actualizar])
+    if a_abrir:
+        cursor.executemany("INSERT INTO alertas_stock (id_insumo, tipo_alerta, nivel_actual, nivel_minimo) VALUES (%s, %s, %s, %s)", a_abrir)
+    return len(a_abrir) - len(a_resolver)
+
+
+def reconstruir_alertas_stock(conexion):
+    """Reevalúa las alertas de todos los insumos activos en una transacción (puesta en marcha o reparación)."""
+    try:
+        with conexion.cursor() as cursor:
+            cursor.execute("SELECT id_insumo FROM insumos WHERE activo = TRUE")
+            cambio = evaluar_alertas_stock(cursor, [fila[0] for fila in cursor.fetchall()])
+        conexion.commit(); VERSIONES_TABLAS.tocar(conexion, "alertas_stock", desde=datetime.date.today())
+        return True, cambio
+    except pymysql.MySQLError as e:
+        conexion.rollback()
+        return False, str(e)
+
+
+class MonitorAlertas:
+    """Alertas abiertas en memoria: {id_insumo: (tipo_alerta, nivel_actual, nivel_minimo, nombre, unidad)}.
+    Se carga una vez en O(alertas) y después solo se releen los insumos que tocó cada transacción."""
+    CONSULTA = """
+    SELECT a.id_insumo, a.tipo_alerta, a.nivel_actual, a.nivel_minimo, i.nombre, i.unidad_medida
+    FROM alertas_stock a JOIN insumos i ON a.id_insumo = i.id_insumo
+    WHERE a.fecha_resolucion IS NULL
+    """
+
+    def __init__(self): self.activas = {}
+
+    def cargar(self, conexion):
+        ok, filas = ejecutar_consulta_db(conexion, self.CONSULTA, fetch=True)
+        if ok: self.activas = {fila[0]: tuple(fila[1:]) for fila in filas}
+
+    def refrescar(self, conexion, ids_insumos):
+        ids_insumos = sorted(set(ids_insumos))
+        if not ids_insumos: return
+        ok, filas = ejecutar_consulta_db(conexion, self.CONSULTA + f" AND a.id_insumo IN ({', '.join(['%s'] * len(ids_insumos))})", ids_insumos, fetch=True)
+        if not ok: return
+        for id_insumo in ids_insumos: self.activas.pop(id_insumo, None)
+        for fila in filas: self.activas[fila[0]] = tuple(fila[1:])
+
+    @property
+    def criticos(self): return len(self.activas)
+
+
+ALERTAS_STOCK = MonitorAlertas()
+
+
+# --- CACHÉ DE RECETAS (BOM) Y COSTOS DEL TPV ---
+class CacheRecetas:
+    """Caché en memoria de recetas (producto -> [(id_insumo, cantidad_requerida)]) y de costo/stock por insumo.
+
+    Se carga completa una sola vez; RecetasWindow y ControlStockWindow marcan como sucias solo las
+    entradas que modifican y `refrescar` recarga únicamente esas antes de volver a usar la caché.
+    """
+    def __init__(self):
+        self.recetas = {}; self.insumos = {}; self.cargada = False
+        self.productos_sucios = set(); self.insumos_sucios = set()
+        self.pendiente = {}  # Consumo de ventas en la cola local del TPV que MySQL todavía no refleja.
+
+    def cargar(self, conexion):
+        ok_r, recetas = ejecutar_consulta_db(conexion, "SELECT id_producto, id_insumo, cantidad_requerida FROM recetas", fetch=True)
+        ok_i, insumos = ejecutar_consulta_db(conexion, "SELECT id_insumo, costo_promedio, stock_actual FROM insumos", fetch=True)
+        if not (ok_r and ok_i): return False
+        self.cargar_filas(recetas, insumos)
+        return True
+
+    def cargar_filas(self, recetas, insumos):
+        """Carga la caché desde filas (id_producto, id_insumo, cantidad) y (id_insumo, costo, stock del servidor)."""
+        self.recetas = {}
+        for id_producto, id_insumo, cantidad in recetas: self.recetas.setdefault(id_producto, []).append((id_insumo, float(cantidad)))
+        self.insumos = {id_i: self._insumo(id_i, costo, stock) for id_i, costo, stock in insumos}
+        self.productos_sucios.clear(); self.insumos_sucios.clear(); self.cargada = True
+
+    def filas(self):
+        """Inverso de cargar_filas (con el stock tal como lo tiene el servidor), para la copia local del catálogo."""
+        recetas = [(id_producto, id_insumo, cantidad) for id_producto, lineas in self.recetas.items() for id_insumo, cantidad in lineas]
+        insumos = [(id_i, datos['costo_promedio'], datos['stock_actual'] + self.pendiente.get(id_i, 0.0)) for id_i, datos in self.insumos.items()]
+        return recetas, insumos
+
+    def _insumo(self, id_insumo, costo, stock):
+        return {'costo_promedio': float(costo), 'stock_actual': float(stock) - self.pendiente.get(id_insumo, 0.0)}
+
+    def refrescar(self, conexion):
+        """Carga la caché la primera vez; después solo recarga los productos e insumos invalidados."""
+        if not self.cargada: return self.cargar(conexion)
+        if self.productos_sucios:
+            ids = sorted(self.productos_sucios); marcadores = ", ".join(["%s"] * len(ids))
+            ok, filas = ejecutar_consulta_db(conexion, f"SELECT id_producto, id_insumo, cantidad_requerida FROM recetas WHERE id_producto IN ({marcadores})", ids, fetch=True)
+            if not ok: return False
+            for id_producto in ids: self.recetas[id_producto] = []
+            for id_producto, id_insumo, cantidad in filas:
+                self.recetas[id_producto].append((id_insumo, float(cantidad)))
+                if id_insumo not in self.insumos: self.insumos_sucios.add(id_insumo)
+            self.productos_sucios.clear()
+        if self.insumos_sucios:
+            ids = sorted(self.insumos_sucios); marcadores = ", ".join(["%s"] * len(ids))
+            ok, filas = ejecutar_consulta_db(conexion, f"SELECT id_insumo, costo_promedio, stock_actual FROM insumos WHERE id_insumo IN ({marcadores})", ids, fetch=True)
+            if not ok: return False
+            for id_i, costo, stock in filas: self.insumos[id_i] = self._insumo(id_i, costo, stock)
+            self.insumos_sucios.clear()
+        return True
+
+    def invalidar_producto(self, id_producto): self.productos_sucios.add(id_producto)
+    def invalidar_insumo(self, id_insumo): self.insumos_sucios.add(id_insumo)
+
+    def descontar_stock(self, consumo_por_insumo):
+        """Aplica en memoria el consumo de una venta ya confirmada en la base de datos."""
+        for id_insumo, consumo in consumo_por_insumo.items():
+            if id_insumo in self.insumos: self.insumos[id_insumo]['stock_actual'] -= consumo
+
+    def registrar_pendiente(self, consumo_por_insumo):
+        """Aplica el consumo de una venta guardada en la cola local; queda pendiente hasta que se replique en MySQL."""
+        self.descontar_stock(consumo_por_insumo)
+        for id_insumo, consumo in consumo_por_insumo.items(): self.pendiente[id_insumo] = self.pendiente.get(id_insumo, 0.0) + consumo
+
+    def confirmar_pendiente(self, consumo_por_insumo):
+        """El consumo ya está en MySQL: deja de descontarse al recargar insumos desde el servidor."""
+        for id_insumo, consumo in consumo_por_insumo.items():
+            restante = self.pendiente.get(id_insumo, 0.0) - consumo
+            if restante > 1e-9: self.pendiente[id_insumo] = restante
+            else: self.pendiente.pop(id_insumo, None)
+
+    def cmv_unitario(self, id_producto):
+        return sum(cantidad * self.insumos[id_insumo]['costo_promedio'] for id_insumo, cantidad in self.recetas.get(id_producto, []) if id_insumo in self.insumos)
+
+    def consumo(self, pedido):
+        consumo = {}
+        for item in pedido:
+            for id_insumo, cantidad in self.recetas.get(item['id_producto'], []): consumo[id_insumo] = consumo.get(id_insumo, 0) + cantidad * item['cantidad']
+        return consumo
+
+    def faltantes(self, pedido):
+        """Retorna {id_insumo: (requerido, disponible)} para los insumos que el pedido completo no alcanza a cubrir."""
+        consumo = self.consumo(pedido)
+        return {id_i: (req, self.insumos.get(id_i, {}).get('stock_actual', 0.0)) for id_i, req in consumo.items() if self.insumos.get(id_i, {}).get('stock_actual', 0.0) < req}
+
+
+CACHE_RECETAS = CacheRecetas()
+
+
+# --- ANÁLISIS DE CANASTA (Matriz dispersa pedido x producto) ---
+def analizar_canasta(conexion, fecha_inicio, fecha_fin, min_pedidos=2):
+    """Calcula co-ocurrencia, soporte, confianza y lift de pares de productos, y ticket promedio por canal.
+
+    Los pedidos se cargan como una matriz binaria dispersa X (pedido x producto); la co-ocurrencia
+    de todos los pares sale de un solo producto Xᵀ·X, sin recorrer pedidos en Python.
+    Sin interacción con la GUI (corre en POOL_REPORTES): retorna (True, {'n_pedidos', 'pares', 'canales'})
+    o (False, mensaje) si faltan numpy/scipy; los errores de MySQL se propagan.
+    """
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError:
+        return False, "El análisis de canasta requiere numpy y scipy (pip install numpy scipy)."
+    query_lineas = """
+    SELECT DISTINCT v.id_pedido, v.id_producto
+    FROM ventas v JOIN pedidos p ON v.id_pedido = p.id_pedido
+    WHERE p.fecha_pedido BETWEEN %s AND %s
+    """
+    lineas = consultar_db(conexion, query_lineas, (fecha_inicio, fecha_fin))
+    query_canales = """
+    SELECT canal_venta, COUNT(*), AVG(total_pedido), SUM(total_pedido), AVG(cantidad_lineas)
+    FROM pedidos
+    WHERE fecha_pedido BETWEEN %s AND %s
+    GROUP BY canal_venta ORDER BY SUM(total_pedido) DESC
+    """
+    canales = [(canal, int(n), float(ticket), float(total), float(items)) for canal, n, ticket, total, items in consultar_db(conexion, query_canales, (fecha_inicio, fecha_fin))]
+    if not lineas: return True, {'n_pedidos': 0, 'pares': [], 'canales': canales}
+
+    datos = np.asarray(lineas, dtype=np.int64)
+    _, filas = np.unique(datos[:, 0], return_inverse=True)
+    productos, columnas = np.unique(datos[:, 1], return_inverse=True)
+    n_pedidos = int(filas.max()) + 1
+    X = sparse.csr_matrix((np.ones(len(datos), dtype=np.int32), (filas, columnas)), shape=(n_pedidos, len(productos)))
+    coocurrencia = (X.T @ X).tocoo()
+    conteo_producto = np.asarray(X.sum(axis=0)).ravel()
+
+    mascara = (coocurrencia.row < coocurrencia.col) & (coocurrencia.data >= min_pedidos)
+    a, b, conteo = coocurrencia.row[mascara], coocurrencia.col[mascara], coocurrencia.data[mascara].astype(np.float64)
+    soporte = conteo / n_pedidos
+    confianza = conteo / conteo_producto[a]
+    lift = soporte / ((conteo_producto[a] / n_pedidos) * (conteo_producto[b] / n_pedidos))
+    orden = np.lexsort((-lift, -conteo))
+    pares = [(int(productos[a[k]]), int(productos[b[k]]), int(conteo[k]), float(soporte[k]), float(confianza[k]), float(lift[k])) for k in orden]
+    return True, {'n_pedidos': n_pedidos, 'pares': pares, 'canales': canales}
+
+
+# --- PRONÓSTICO DE CONSUMO Y REPOSICIÓN (Matrices NumPy) ---
+Z_NIVEL_SERVICIO = 1.65  # ~95% de ciclos de reposición sin quiebre con demanda normal
+VENTANA_MEDIA_MOVIL = 14
+ALFA_SUAVIZADO = 0.3
+
+
+def calcular_reposicion(dias, ventas, recetas, insumos, dias_entrega=2, dias_cobertura=7, alfa=ALFA_SUAVIZADO, ventana=VENTANA_MEDIA_MOVIL):
+    """Núcleo vectorizado del pronóstico, sin acceso a la BD.
+
+    ventas: [(indice_dia, id_producto, unidades)]; recetas: [(id_producto, id_insumo, cantidad)];
+    insumos: [(id_insumo, stock_actual, stock_minimo)]. El consumo diario por insumo sale de un solo
+    producto de matrices C (día x insumo) = S (día x producto) · R (producto x insumo), y la media móvil,
+    el suavizado exponencial y la desviación se calculan por columnas sobre C.
+    Retorna un dict de arreglos alineados con `insumos`.
+    """
+    import numpy as np
+    ids_insumos = np.array([fila[0] for fila in insumos], dtype=np.int64)
+    niveles = np.asarray([fila[1:3] for fila in insumos], dtype=np.float64).reshape(-1, 2)
+    stock, minimo = niveles[:, 0], niveles[:, 1]
+    ventas = np.asarray(ventas, dtype=np.float64).reshape(-1, 3); recetas = np.asarray(recetas, dtype=np.float64).reshape(-1, 3)
+    ids_productos = np.unique(np.concatenate([ventas[:, 1], recetas[:, 0]]).astype(np.int64))
+
+    S = np.zeros((dias, len(ids_productos)))
+    np.add.at(S, (ventas[:, 0].astype(np.int64), np.searchsorted(ids_productos, ventas[:, 1].astype(np.int64))), ventas[:, 2])
+    orden = np.argsort(ids_insumos); ids_ordenados = ids_insumos[orden]
+    posicion = np.searchsorted(ids_ordenados, recetas[:, 1].astype(np.int64)).clip(0, max(len(ids_ordenados) - 1, 0))
+    activo = (ids_ordenados[posicion] == recetas[:, 1]) if len(ids_ordenados) else np.zeros(len(recetas), dtype=bool)
+    R = np.zeros((len(ids_productos), len(ids_insumos)))
+    np.add.at(R, (np.searchsorted(ids_productos, recetas[activo, 0].astype(np.int64)), orden[posicion[activo]]), recetas[activo, 2])
+
+    C = S @ R
+    media_movil = C[-ventana:].mean(axis=0)
+    pesos = alfa * (1 - alfa) ** np.arange(dias - 1, -1, -1); pesos[0] = (1 - alfa) ** (dias - 1)
+    suavizado = pesos @ C
+    desviacion = C.std(axis=0, ddof=1) if dias > 1 else np.zeros(len(ids_insumos))
+    stock_seguridad = Z_NIVEL_SERVICIO * desviacion * np.sqrt(dias_entrega)
+    punto_reorden = suavizado * dias_entrega + stock_seguridad
+    nivel_objetivo = np.maximum(suavizado * (dias_entrega + dias_cobertura) + stock_seguridad, minimo)
+    cantidad = np.where((stock <= punto_reorden) | (stock <= minimo), np.maximum(nivel_objetivo - stock, 0), 0)
+    return {'consumo_total': C.sum(axis=0), 'media_movil': media_movil, 'suavizado': suavizado, 'stock_seguridad': stock_seguridad,
+            'punto_reorden': punto_reorden, 'cantidad_sugerida': cantidad}
+
+
+def pronosticar_reposicion(conexion, fecha_inicio, fecha_fin, dias_entrega=2, dias_cobertura=7):
+    """Pronóstico de consumo y compra sugerida por insumo, agrupada por proveedor principal (apto para hilos de trabajo).
+
+    Se agrupa por id_proveedor_principal (dos proveedores con el mismo nombre no se mezclan); el nombre es solo para mostrar.
+    Retorna {'dias', 'lineas': [(proveedor, id_insumo, nombre, unidad, stock, media_movil, suavizado,
+    stock_seguridad, punto_reorden, cantidad_sugerida, costo_estimado)], 'proveedores': [(id_proveedor, proveedor, insumos_a_pedir, costo)]}.
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise RuntimeError("El pronóstico de reposición requiere numpy (pip install numpy).")
+    inicio, fin = como_fecha(fecha_inicio), como_fecha(fecha_fin)
+    dias = (fin - inicio).days + 1
+    if dias <= 0: raise ValueError("La fecha inicial debe ser anterior a la final.")
+    ventas = consultar_db(conexion, "SELECT DATEDIFF(fecha, %s), id_producto, SUM(unidades) FROM ventas_diarias WHERE fecha BETWEEN %s AND %s GROUP BY fecha, id_producto", (inicio, inicio, fin))
+    recetas = consultar_db(conexion, "SELECT id_producto, id_insumo, cantidad_requerida FROM recetas")
+    insumos = consultar_db(conexion, """
+    SELECT i.id_insumo, i.nombre, i.unidad_medida, i.stock_actual, i.stock_minimo, i.costo_promedio, p.id_proveedor, COALESCE(p.nombre, 'Sin proveedor')
+    FROM insumos i LEFT JOIN proveedores p ON i.id_proveedor_principal = p.id_proveedor
+    WHERE i.activo = TRUE ORDER BY p.id_proveedor IS NULL, p.nombre, p.id_proveedor, i.nombre
+    """)
+    r = calcular_reposicion(dias, ventas, recetas, [(fila[0], fila[3], fila[4]) for fila in insumos], dias_entrega, dias_cobertura)
+    lineas = []; proveedores = {}
+    for k, (id_insumo, nombre, unidad, stock, _, costo, id_proveedor, proveedor) in enumerate(insumos):
+        cantidad = float(r['cantidad_sugerida'][k]); costo_estimado = cantidad * float(costo)
+        lineas.append((proveedor, id_insumo, nombre, unidad, float(stock), float(r['media_movil'][k]), float(r['suavizado'][k]),
+                       float(r['stock_seguridad'][k]), float(r['punto_reorden'][k]), cantidad, costo_estimado))
+        if cantidad > 0:
+            total = proveedores.setdefault(id_proveedor, [proveedor, 0, 0.0]); total[1] += 1; total[2] += costo_estimado
+    return {'dias': dias, 'lineas': lineas, 'proveedores': [(id_proveedor, proveedor, n, costo) for id_proveedor, (proveedor, n, costo) in proveedores.items()]}
+
+
+
+
+# --- COSTEO DE MENÚ COMPLETO (Matriz producto x insumo) ---
+MARGEN_MINIMO_PCT = 40  # Margen de contribución mínimo que resaltan Margen, Recetas y el costeo de menú
+
+
+class MatrizCostos:
+    """Recetas de todos los productos activos como matriz R (producto x insumo) y costos promedio como vector c.
+    El CMV de todo el menú es un solo producto R·c, y un escenario what-if solo cambia c."""
+    def __init__(self, productos, insumos, recetas):
+        import numpy as np
+        self.ids_productos = np.array([fila[0] for fila in productos], dtype=np.int64); self.nombres_productos = [fila[1] for fila in productos]
+        self.precios = np.array([float(fila[2]) for fila in productos])
+        self.ids_insumos = np.array([fila[0] for fila in insumos], dtype=np.int64); self.nombres_insumos = {fila[0]: fila[1] for fila in insumos}
+        self.costos = np.array([float(fila[2]) for fila in insumos])
+        recetas = np.asarray(recetas, dtype=np.float64).reshape(-1, 3)
+        fila = np.searchsorted(self.ids_productos, recetas[:, 0].astype(np.int64)).clip(0, max(len(self.ids_productos) - 1, 0))
+        col = np.searchsorted(self.ids_insumos, recetas[:, 1].astype(np.int64)).clip(0, max(len(self.ids_insumos) - 1, 0))
+        valida = (self.ids_productos[fila] == recetas[:, 0]) & (self.ids_insumos[col] == recetas[:, 1]) if len(self.ids_productos) and len(self.ids_insumos) else np.zeros(len(recetas), dtype=bool)
+        self.R = np.zeros((len(self.ids_productos), len(self.ids_insumos)))
+        np.add.at(self.R, (fila[valida], col[valida]), recetas[valida, 2])
+
+    def costear(self, variaciones=None):
+        """variaciones: {id_insumo: variación % del costo_promedio} -> (cmv, margen_pct) de cada producto.
+        Los id_insumo que no están en la matriz (inexistentes o inactivos) se ignoran."""
+        import numpy as np
+        costos = self.costos.copy()
+        if variaciones and len(self.ids_insumos):
+            ids = np.array(list(variaciones), dtype=np.int64)
+            col = np.searchsorted(self.ids_insumos, ids).clip(0, len(self.ids_insumos) - 1); valida = self.ids_insumos[col] == ids
+            costos[col[valida]] *= 1 + np.array(list(variaciones.values()), dtype=np.float64)[valida] / 100
+        cmv = self.R @ costos
+        margen_pct = np.divide((self.precios - cmv) * 100, self.precios, out=np.zeros_like(cmv), where=self.precios > 0)
+        return cmv, margen_pct
+
+    def escenario(self, variaciones=None):
+        """[(id_producto, nombre, precio, cmv_actual, margen_actual, cmv_simulado, margen_simulado)] ordenadas por margen simulado."""
+        import numpy as np
+        cmv_actual, margen_actual = self.costear(); cmv, margen = self.costear(variaciones)
+        return [(int(self.ids_productos[k]), self.nombres_productos[k], float(self.precios[k]), float(cmv_actual[k]), float(margen_actual[k]), float(cmv[k]), float(margen[k]))
+                for k in np.argsort(margen, kind="stable")]
+
+
+def cargar_matriz_costos(conexion):
+    """Retorna (True, MatrizCostos) con todo el menú activo o (False, mensaje)."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False, "El costeo de menú requiere numpy (pip install numpy)."
+    ok, productos = ejecutar_consulta_db(conexion, "SELECT id_producto, nombre, precio_venta FROM productos WHERE activo = TRUE ORDER BY id_producto", fetch=True)
+    if not ok: return False, productos
+    ok, insumos = ejecutar_consulta_db(conexion, "SELECT id_insumo, nombre, costo_promedio FROM insumos ORDER BY id_insumo", fetch=True)
+    if not ok: return False, insumos
+    ok, recetas = ejecutar_consulta_db(conexion, "SELECT id_producto, id_insumo, cantidad_requerida FROM recetas", fetch=True)
+    if not ok: return False, recetas
+    return True, MatrizCostos(productos, insumos, recetas)
+
+
+# --- INSTRUMENTACIÓN DE CONSULTAS ---
+UMBRAL_CONSULTA_LENTA_MS = float(os.environ.get("ATAI_UMBRAL_CONSULTA_LENTA_MS", "250"))
+RUTA_LOG_CONSULTAS_LENTAS = os.path.join(DIRECTORIO_DATOS, "consultas_lentas.log")
+MUESTRAS_POR_PLANTILLA = 2000  # Latencias recientes que se conservan por plantilla para los percentiles.
+_NORMALIZACION_SQL = [(re.compile(r"\s+"), " "), (re.compile(r"'(?:[^'\\]|\\.)*'"), "?"), (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"), (re.compile(r"%s"), "?"),
+                      (re.compile(r"\?(?:\s*,\s*\?)+"), "?, ..."), (re.compile(r"(?:WHEN \? THEN \? )+"), "WHEN ? THEN ? ... "),
+                      (re.compile(r"\([?., ]+\)(?:\s*,\s*\([?., ]+\))+"), "(?, ...), ...")]
+ORIGEN_CONSULTAS = threading.local()  # Pantalla, reporte o tarea en curso en cada hilo: se fija una vez por acción, no por sentencia.
+
+
+def plantilla_sql(query):
+    """Reduce una sentencia a su plantilla (literales, marcadores y listas de largo variable colapsados) para agrupar mediciones."""
+    plantilla = query.decode(errors="replace") if isinstance(query, bytes) else str(query)
+    for patron, reemplazo in _NORMALIZACION_SQL: plantilla = patron.sub(reemplazo, plantilla)
+    return plantilla.strip()[:300]
+
+
+def origen_consulta():
+    """Pantalla, reporte o tarea de fondo que originó la sentencia en este hilo (el último origen_consultas abierto en él)."""
+    return getattr(ORIGEN_CONSULTAS, 'nombre', None) or "(desconocido)"
+
+
+@contextmanager
+def origen_consultas(nombre):
+    """Atribuye a `nombre` las sentencias que ejecute este hilo dentro del bloque (tareas de fondo, comandos de consola)."""
+    anterior = getattr(ORIGEN_CONSULTAS, 'nombre', None); ORIGEN_CONSULTAS.nombre = nombre
+    try: yield
+    finally: ORIGEN_CONSULTAS.nombre = anterior
+
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados: return 0.0
+    return valores_ordenados[min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))]
+
+
+class MetricasConsultas:
+    """Latencia, filas y origen de cada sentencia enviada a MySQL, agregados por plantilla y por origen (pantalla, reporte o tarea de fondo).
+
+    Las sentencias que superan umbral_lenta_ms se agregan además a RUTA_LOG_CONSULTAS_LENTAS.
+    Es segura entre hilos: la GUI, los reportes y la sincronización del TPV registran en la misma instancia.
+    """
+    def __init__(self, umbral_lenta_ms=UMBRAL_CONSULTA_LENTA_MS, ruta_log=RUTA_LOG_CONSULTAS_LENTAS):
+        self.umbral_lenta_ms = umbral_lenta_ms; self.ruta_log = ruta_log; self.candado = threading.Lock()
+        self.plantillas = {}; self.origenes = {}; self.desde = datetime.datetime.now()
+
+    def registrar(self, query, segundos, filas, origen):
+        plantilla = plantilla_sql(query); ms = segundos * 1000; lenta = ms >= self.umbral_lenta_ms
+        with self.candado:
+            datos = self.plantillas.get(plantilla)
+            if datos is None: datos = self.plantillas[plantilla] = {'llamadas': 0, 'filas': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'muestras': deque(maxlen=MUESTRAS_POR_PLANTILLA), 'origenes': set()}
+            datos['llamadas'] += 1; datos['filas'] += filas; datos['total_ms'] += ms; datos['max_ms'] = max(datos['max_ms'], ms)
+            datos['muestras'].append(ms); datos['origenes'].add(origen)
+            por_origen = self.origenes.setdefault(origen, [0, 0.0, 0]); por_origen[0] += 1; por_origen[1] += ms; por_origen[2] += lenta
+        if not lenta: return
+        try:  # Fuera del candado: un disco lento no frena a los demás hilos que consultan.
+            with open(self.ruta_log, "a", encoding="utf-8") as log:
+                log.write(f"{datetime.datetime.now().isoformat(timespec='milliseconds')}\t{ms:.1f} ms\t{filas} filas\t{origen}\t{plantilla}\n")
+        except OSError: pass
+
+    def resumen(self):
+        """Una fila por plantilla, de mayor a menor tiempo total: percentiles sobre las últimas MUESTRAS_POR_PLANTILLA ejecuciones."""
+        with self.candado: copia = [(plantilla, dict(datos, muestras=sorted(datos['muestras']), origenes=sorted(datos['origenes']))) for plantilla, datos in self.plantillas.items()]
+        filas = [{'plantilla': plantilla, 'llamadas': d['llamadas'], 'filas_promedio': d['filas'] / d['llamadas'], 'total_ms': d['total_ms'],
+                  'p50_ms': percentil(d['muestras'], 50), 'p95_ms': percentil(d['muestras'], 95), 'p99_ms': percentil(d['muestras'], 99), 'max_ms': d['max_ms'],
+                  'origenes': ", ".join(d['origenes'])} for plantilla, d in copia]
+        return sorted(filas, key=lambda fila: fila['total_ms'], reverse=True)
+
+    def por_origen(self):
+        """[(origen, round trips, ms totales, sentencias lentas)] de mayor a menor cantidad de round trips."""
+        with self.candado: return sorted(((origen, n, ms, lentas) for origen, (n, ms, lentas) in self.origenes.items()), key=lambda fila: fila[1], reverse=True)
+
+    def exportar(self, ruta):
+        """Escribe el resumen por plantilla en JSON o CSV según la extensión de `ruta`."""
+        import csv
+        resumen = self.resumen()
+        if ruta.lower().endswith(".json"):
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump({'desde': self.desde.isoformat(timespec='seconds'), 'hasta': datetime.datetime.now().isoformat(timespec='seconds'),
+                           'umbral_lenta_ms': self.umbral_lenta_ms, 'plantillas': resumen,
+                           'origenes': [{'origen': o, 'round_trips': n, 'total_ms': ms, 'lentas': lentas} for o, n, ms, lentas in self.por_origen()]}, archivo, ensure_ascii=False, indent=2)
+        else:
+            campos = ['plantilla', 'llamadas', 'filas_promedio', 'total_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'origenes']
+            with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+                escritor = csv.DictWriter(archivo, fieldnames=campos); escritor.writeheader(); escritor.writerows(resumen)
+
+    def reiniciar(self):
+        with self.candado: self.plantillas = {}; self.origenes = {}; self.desde = datetime.datetime.now()
+
+
+METRICAS_CONSULTAS = MetricasConsultas()
+
+
+class CursorInstrumentado(pymysql.cursors.Cursor):
+    """Cursor de pymysql que informa a METRICAS_CONSULTAS cada execute/executemany (un lote cuenta como un round trip)."""
+    _midiendo = False
+
+    def _medir(self, ejecutar, query, args):
+        if self._midiendo: return ejecutar(query, args)  # executemany de pymysql llama a execute por dentro.
+        self._midiendo = True; inicio = time.perf_counter()
+        try: return ejecutar(query, args)
+        finally:
+            self._midiendo = False
+            METRICAS_CONSULTAS.registrar(query, time.perf_counter() - inicio, max(self.rowcount or 0, 0), origen_consulta())
+
+    def execute(self, query, args=None): return self._medir(super().execute, query, args)
+    def executemany(self, query, args): return self._medir(super().executemany, query, args)
+
+
+class CursorInstrumentadoSS(pymysql.cursors.SSCursor):
+    """Variante sin buffer (exportaciones): mide desde el execute hasta el close, contando las filas leídas."""
+    _medicion = None
+
+    def execute(self, query, args=None):
+        self._medicion = [query, time.perf_counter(), 0, origen_consulta()]
+        return super().execute(query, args)
+
+    def fetchone(self):
+        fila = super().fetchone()
+        if fila is not None and self._medicion: self._medicion[2] += 1
+        return fila
+
+    def fetchmany(self, size=None):
+        filas = super().fetchmany(size)
+        if self._medicion: self._medicion[2] += len(filas)
+        return filas
+
+    def fetchall(self):
+        filas = super().fetchall()
+        if self._medicion: self._medicion[2] += len(filas)
+        return filas
+
+    def close(self):
+        try: super().close()
+        finally:
+            if self._medicion:
+                query, inicio, filas, origen = self._medicion; self._medicion = None
+                METRICAS_CONSULTAS.registrar(query, time.perf_counter() - inicio, filas, origen)
+
+
+# --- EJECUCIÓN DE REPORTES EN SEGUNDO PLANO ---
+PARAMETROS_CONEXION = {}
+
+
+def abrir_conexion():
+    """Abre una conexión nueva con las credenciales ingresadas en IngresoDBWindow (con cursores instrumentados)."""
+    return pymysql.connect(cursorclass=CursorInstrumentado, **PARAMETROS_CONEXION)
+
+
+# --- POOL DE CONEXIONES ---
+TAMANO_POOL_CONEXIONES = int(os.environ.get("ATAI_POOL_CONEXIONES", "5"))  # GUI + 2 hilos de reportes + exportación + sincronización del TPV.
+ESPERA_POOL_SEGUNDOS = 10
+PING_TRAS_INACTIVIDAD = 60  # Segundos sin uso tras los cuales se verifica la conexión del hilo antes de usarla.
+
+
+class PoolConexiones:
+    """Pool de conexiones pymysql creado al ingresar, que reemplaza a la conexión única compartida.
+
+    Se usa en lugar de una conexión: cursor(), commit() y rollback() operan sobre la conexión que el
+    hilo que llama tiene tomada del pool (la GUI conserva la suya). Los trabajos puntuales en hilos
+    (reportes, exportaciones) usan `with pool.prestar() as conexion:` y la devuelven al terminar.
+    Toda conexión se verifica con ping al tomarla y se reconecta si el servidor la cerró (wait_timeout)."""
+    def __init__(self, tamano=TAMANO_POOL_CONEXIONES):
+        self.tamano = max(1, tamano); self.libres = queue.LifoQueue(); self.abiertas = 0
+        self.candado = threading.Lock(); self.local = threading.local()
+        self.libres.put(self._abrir())  # Valida las credenciales en el ingreso.
+
+    def _abrir(self):
+        with self.candado:
+            if self.abiertas >= self.tamano: return None
+            self.abiertas += 1
+        try: return abrir_conexion()
+        except Exception:
+            with self.candado: self.abiertas -= 1
+            raise
+
+    def _descartar(self, conexion):
+        with self.candado: self.abiertas -= 1
+        try: conexion.close()
+        except Exception: pass
+
+    def _verificar(self, conexion):
+        try: conexion.ping(reconnect=True); return conexion
+        except pymysql.MySQLError: self._descartar(conexion)
+        return self._abrir() or self.tomar()
+
+    def tomar(self):
+        try: conexion = self.libres.get_nowait()
+        except queue.Empty:
+            conexion = self._abrir()
+            if conexion is not None: return conexion
+            try: conexion = self.libres.get(timeout=ESPERA_POOL_SEGUNDOS)
+            except queue.Empty: raise pymysql.err.OperationalError(0, f"Las {self.tamano} conexiones del pool están ocupadas.")
+        return self._verificar(conexion)
+
+    def devolver(self, conexion):
+        try: conexion.rollback()  # Ninguna transacción a medias vuelve al pool.
+        except Exception: self._descartar(conexion); return
+        self.libres.put(conexion)
+
+    @contextmanager
+    def prestar(self):
+        conexion = self.tomar()
+        try: yield conexion
+        finally: self.devolver(conexion)
+
+    def conexion_del_hilo(self):
+        conexion = getattr(self.local, 'conexion', None); ahora = time.monotonic()
+        if conexion is None: conexion = self.tomar()
+        elif not conexion.open or ahora - self.local.ultimo_uso > PING_TRAS_INACTIVIDAD: conexion = self._verificar(conexion)
+        self.local.conexion = conexion; self.local.ultimo_uso = ahora
+        return conexion
+
+    def cursor(self, *args): return self.conexion_del_hilo().cursor(*args)
+    def commit(self): self.conexion_del_hilo().commit()
+    def rollback(self): self.conexion_del_hilo().rollback()
+    def thread_id(self): return self.conexion_del_hilo().thread_id()
+
+    def cerrar(self):
+        while True:
+            try: self._descartar(self.libres.get_nowait())
+            except queue.Empty: break
+        conexion = getattr(self.local, 'conexion', None)
+        if conexion is not None: self.local.conexion = None; self._descartar(conexion)
+
+
+def consultar_db(conexion, query, params=None):
+    """Ejecuta un SELECT sin interacción con la GUI (apto para hilos de trabajo); los errores se propagan."""
+    with conexion.cursor() as cursor:
+        cursor.execute(query, params)
+        filas = cursor.fetchall()
+    conexion.commit()
+    return filas
+
+
+class SenalesReporte(QObject):
+    """Señales con las que los hilos de trabajo entregan resultados a la GUI."""
+    terminado = pyqtSignal(int, object)
+    fallido = pyqtSignal(int, str)
+
+
+class TareaReporte(QRunnable):
+    """Ejecuta una función de reporte con una conexión prestada por el pool mientras dura la tarea.
+    Sus sentencias se atribuyen a `origen` (la pantalla y la función que la lanzaron)."""
+    def __init__(self, generacion, senales, pool, origen, funcion, *args):
+        super().__init__()
+        self.generacion = generacion; self.senales = senales; self.pool = pool; self.origen = origen; self.funcion = funcion; self.args = args
+        self.cancelada = False; self.id_hilo_mysql = None; self.candado = threading.Lock()
+
+    def run(self):
+        if self.cancelada: return
+        try:
+            with self.pool.prestar() as conexion:
+                with self.candado: self.id_hilo_mysql = conexion.thread_id()
+                # Se olvida el hilo antes de devolver la conexión: después puede prestarse a otra tarea y un KILL QUERY la alcanzaría.
+                try:
+                    with origen_consultas(self.origen): resultado = self.funcion(conexion, *self.args)
+                finally:
+                    with self.candado: self.id_hilo_mysql = None
+        except Exception as e:
+            resultado = None; error = str(e)
+        else:
+            error = None
+        if self.cancelada: return
+        if error is None: self.senales.terminado.emit(self.generacion, resultado)
+        else: self.senales.fallido.emit(self.generacion, error)
+
+    def cancelar(self, conexion_control):
+        """Marca la tarea como reemplazada y aborta en el servidor la consulta que esté corriendo."""
+        with self.candado:
+            self.cancelada = True
+            if self.id_hilo_mysql is None: return
+            try:
+                with conexion_control.cursor() as cursor: cursor.execute("KILL QUERY %s", (self.id_hilo_mysql,))
+            except pymysql.MySQLError: pass
+
+
+POOL_REPORTES = QThreadPool(); POOL_REPORTES.setMaxThreadCount(2); POOL_REPORTES.setExpiryTimeout(-1)
+
+
+class EjecutorReportes:
+    """Lanza un reporte en POOL_REPORTES, muestra el estado de carga y descarta las ejecuciones reemplazadas.
+    El botón que se deshabilita mientras corre es `boton_generar_reporte` de la ventana, salvo que se indique otro."""
+    def __init__(self, ventana, al_terminar, boton=None):
+        self.ventana = ventana; self.al_terminar = al_terminar; self.generacion = 0; self.tarea_actual = None
+        self.boton = boton or ventana.boton_generar_reporte; self.texto_boton = self.boton.text()
+        self.senales = SenalesReporte(); self.senales.terminado.connect(self._terminado); self.senales.fallido.connect(self._fallido)
+
+    def lanzar(self, funcion, *args):
+        if self.tarea_actual is not None: self.tarea_actual.cancelar(self.ventana.conexion)
+        self.generacion += 1
+        origen = f"{type(self.ventana).__name__}.{getattr(funcion, '__name__', 'reporte')}"
+        self.tarea_actual = TareaReporte(self.generacion, self.senales, self.ventana.conexion, origen, funcion, *args)
+        self.boton.setEnabled(False); self.boton.setText("⏳ Generando...")
+        self.ventana.statusbar.showMessage("⏳ Generando reporte...")
+        POOL_REPORTES.start(self.tarea_actual)
+
+    def _fin_de_carga(self, generacion):
+        if generacion != self.generacion: return False
+        self.tarea_actual = None
+        self.boton.setEnabled(True); self.boton.setText(self.texto_boton)
+        return True
+
+    def _terminado(self, generacion, resultado):
+        if not self._fin_de_carga(generacion): return
+        self.al_terminar(resultado)
+        self.ventana.statusbar.showMessage(f"Reporte generado a las {QDateTime.currentDateTime().toString('HH:mm:ss')}.")
+
+    def _fallido(self, generacion, error):
+        if not self._fin_de_carga(generacion): return
+        self.ventana.statusbar.clearMessage()
+        QMessageBox.critical(self.ventana, "Error de Base de Datos", f"No se pudo generar el reporte:\n{error}")
+
+
+# --- COLA LOCAL DE VENTAS DEL TPV (SQLite) ---
+RUTA_COLA_VENTAS = os.path.join(DIRECTORIO_DATOS, "cola_tpv.sqlite3")
+VERSION_ESQUEMA_COLA_VENTAS = 1  # 1: columna `base` en las ventas encoladas y rechazadas.
+TAMANO_LOTE_SINCRONIZACION = 50
+INTERVALO_SINCRONIZACION_MS = 15000
+MAX_INTENTOS_SINCRONIZACION = 5  # Lotes fallidos por contención antes de replicar la cola venta por venta.
+ERRORES_CONEXION = {0, 2003, 2006, 2013, 2055}  # Pool ocupado, servidor inaccesible, conexión perdida: nunca es culpa de la venta.
+ERRORES_VENTA_MALFORMADA = (pymysql.err.IntegrityError, pymysql.err.DataError, KeyError, TypeError, ValueError)  # La venta nunca entrará: va a ventas_rechazadas.
+
+ESQUEMA_COLA_VENTAS = """
+CREATE TABLE IF NOT EXISTS ventas_pendientes (clave TEXT PRIMARY KEY, fecha_venta TEXT NOT NULL, canal_venta TEXT NOT NULL, pedido TEXT NOT NULL,
+    consumo TEXT NOT NULL, creada TEXT DEFAULT CURRENT_TIMESTAMP, intentos INTEGER DEFAULT 0, ultimo_error TEXT, base TEXT NOT NULL DEFAULT '');
+CREATE TABLE IF NOT EXISTS ventas_rechazadas (clave TEXT PRIMARY KEY, fecha_venta TEXT NOT NULL, canal_venta TEXT NOT NULL, pedido TEXT NOT NULL,
+    consumo TEXT NOT NULL, creada TEXT, intentos INTEGER, error TEXT, rechazada TEXT DEFAULT CURRENT_TIMESTAMP, base TEXT NOT NULL DEFAULT '');
+CREATE TABLE IF NOT EXISTS ventas_sin_stock (clave TEXT PRIMARY KEY, fecha_venta TEXT NOT NULL, canal_venta TEXT NOT NULL, pedido TEXT NOT NULL,
+    faltantes TEXT NOT NULL, registrada TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS estado (clave TEXT PRIMARY KEY, valor TEXT);
+CREATE TABLE IF NOT EXISTS catalogo_categorias (id_categoria INTEGER PRIMARY KEY, nombre TEXT);
+CREATE TABLE IF NOT EXISTS catalogo_productos (id_producto INTEGER PRIMARY KEY, nombre TEXT, precio_venta REAL, id_categoria INTEGER);
+CREATE TABLE IF NOT EXISTS catalogo_recetas (id_producto INTEGER, id_insumo INTEGER, cantidad_requerida REAL);
+CREATE TABLE IF NOT EXISTS catalogo_insumos (id_insumo INTEGER PRIMARY KEY, costo_promedio REAL, stock_actual REAL);
+"""
+
+
+class ColaVentasLocal:
+    """Cola de escritura del TPV en un archivo SQLite local (modo WAL).
+
+    La venta queda confirmada en disco al instante, sin esperar al servidor, y SincronizadorVentas la
+    replica después en MySQL. Cada venta guarda la base (host/database) en que se cobró y solo se replica en
+    esa; las encoladas antes de registrar la base (base = '') van a la primera que sincronice. Guarda también
+    una copia del catálogo y las recetas para seguir vendiendo si el servidor no responde. Cada hilo abre su
+    propia conexión SQLite.
+    """
+    def __init__(self, ruta=RUTA_COLA_VENTAS):
+        self.ruta = ruta; self.local = threading.local()
+
+    def conexion(self):
+        import sqlite3
+        conexion = getattr(self.local, 'conexion', None)
+        if conexion is None:
+            conexion = self.local.conexion = sqlite3.connect(self.ruta, timeout=10)
+            conexion.execute("PRAGMA journal_mode=WAL"); conexion.executescript(ESQUEMA_COLA_VENTAS)
+            if conexion.execute("PRAGMA user_version").fetchone()[0] < VERSION_ESQUEMA_COLA_VENTAS:  # Cola de una versión anterior: se conservan sus ventas.
+                with conexion:
+                    for tabla in ("ventas_pendientes", "ventas_rechazadas"):
+                        if "base" not in {columna[1] for columna in conexion.execute(f"PRAGMA table_info({tabla})")}:
+                            conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN base TEXT NOT NULL DEFAULT ''")
+                    conexion.execute(f"PRAGMA user_version = {VERSION_ESQUEMA_COLA_VENTAS}")
+        return conexion
+
+    def encolar(self, pedido, canal_venta, fecha_venta, consumo):
+        """Guarda la venta para la base actual con una clave de idempotencia nueva y la retorna."""
+        import uuid
+        clave = uuid.uuid4().hex
+        with self.conexion() as conexion:
+            conexion.execute("INSERT INTO ventas_pendientes (clave, fecha_venta, canal_venta, pedido, consumo, base) VALUES (?, ?, ?, ?, ?, ?)",
+                             (clave, fecha_venta, canal_venta, json.dumps(pedido), json.dumps(consumo), base_actual()))
+        return clave
+
+    def pendientes(self, limite):
+        """Las `limite` ventas más antiguas de la base actual; una fila ilegible pasa directo a ventas_rechazadas."""
+        ventas = []
+        for clave, fecha, canal, pedido, consumo in self.conexion().execute("SELECT clave, fecha_venta, canal_venta, pedido, consumo FROM ventas_pendientes WHERE base IN (?, '') ORDER BY rowid LIMIT ?",
+                                                                            (base_actual(), limite)).fetchall():
+            try: ventas.append((clave, fecha, canal, json.loads(pedido), {int(id_i): float(cantidad) for id_i, cantidad in json.loads(consumo).items()}))
+            except (ValueError, TypeError, AttributeError) as e: self.rechazar(clave, f"Venta ilegible en la cola: {e}")
+        return ventas
+
+    def confirmar(self, claves):
+        with self.conexion() as conexion: conexion.executemany("DELETE FROM ventas_pendientes WHERE clave = ?", [(clave,) for clave in claves])
+
+    def registrar_fallo(self, claves, error, contar=True):
+        """Anota el error en las ventas; si `contar`, suma un intento. Retorna el máximo de intentos entre ellas."""
+        with self.conexion() as conexion:
+            conexion.executemany("UPDATE ventas_pendientes SET intentos = intentos + ?, ultimo_error = ? WHERE clave = ?", [(int(contar), error, clave) for clave in claves])
+            return conexion.execute(f"SELECT COALESCE(MAX(intentos), 0) FROM ventas_pendientes WHERE clave IN ({', '.join(['?'] * len(claves))})", claves).fetchone()[0]
+
+    def rechazar(self, clave, error):
+        """Saca de la cola una venta malformada (que MySQL nunca aceptará) y la deja en ventas_rechazadas (no bloquea a las siguientes)."""
+        with self.conexion() as conexion:
+            conexion.execute("""INSERT OR REPLACE INTO ventas_rechazadas (clave, fecha_venta, canal_venta, pedido, consumo, creada, intentos, error, base)
+                                SELECT clave, fecha_venta, canal_venta, pedido, consumo, creada, intentos, ?, base FROM ventas_pendientes WHERE clave = ?""", (error, clave))
+            conexion.execute("DELETE FROM ventas_pendientes WHERE clave = ?", (clave,))
+
+    def rechazadas(self):
+        """[(clave, fecha_venta, canal_venta, pedido, error, rechazada)] de la más reciente a la más antigua."""
+        filas = self.conexion().execute("SELECT clave, fecha_venta, canal_venta, pedido, error, rechazada FROM ventas_rechazadas ORDER BY rowid DESC").fetchall()
+        return [(clave, fecha, canal, json.loads(pedido), error, rechazada) for clave, fecha, canal, pedido, error, rechazada in filas]
+
+    def cantidad_rechazadas(self): return self.conexion().execute("SELECT COUNT(*) FROM ventas_rechazadas").fetchone()[0]
+
+    def reencolar_rechazadas(self):
+        """Devuelve las ventas rechazadas a la cola (tras corregir la causa) con los intentos en cero; retorna cuántas."""
+        with self.conexion() as conexion:
+            cursor = conexion.execute("""INSERT OR IGNORE INTO ventas_pendientes (clave, fecha_venta, canal_venta, pedido, consumo, creada, base)
+                                         SELECT clave, fecha_venta, canal_venta, pedido, consumo, creada, base FROM ventas_rechazadas ORDER BY rowid""")
+            conexion.execute("DELETE FROM ventas_rechazadas")
+            return cursor.rowcount
+
+    def anotar_sin_stock(self, clave, fecha_venta, canal_venta, pedido, faltantes):
+        """Deja constancia de una venta ya cobrada que MySQL registró con stock insuficiente (el insumo quedó negativo)."""
+        with self.conexion() as conexion:
+            conexion.execute("INSERT OR REPLACE INTO ventas_sin_stock (clave, fecha_venta, canal_venta, pedido, faltantes) VALUES (?, ?, ?, ?, ?)",
+                             (clave, fecha_venta, canal_venta, json.dumps(pedido), json.dumps(faltantes)))
+
+    def ventas_sin_stock(self):
+        """[(clave, fecha_venta, canal_venta, pedido, {id_insumo: (requerido, disponible)}, registrada)] de la más reciente a la más antigua."""
+        filas = self.conexion().execute("SELECT clave, fecha_venta, canal_venta, pedido, faltantes, registrada FROM ventas_sin_stock ORDER BY rowid DESC").fetchall()
+        return [(clave, fecha, canal, json.loads(pedido), {int(id_i): tuple(valores) for id_i, valores in json.loads(faltantes).items()}, registrada)
+                for clave, fecha, canal, pedido, faltantes, registrada in filas]
+
+    def cantidad_sin_stock(self): return self.conexion().execute("SELECT COUNT(*) FROM ventas_sin_stock").fetchone()[0]
+
+    def marcar_sincronizacion(self):
+        with self.conexion() as conexion: conexion.execute("INSERT OR REPLACE INTO estado (clave, valor) VALUES ('ultima_sincronizacion', ?)", (datetime.datetime.now().isoformat(timespec='seconds'),))
+
+    def ultima_sincronizacion(self):
+        fila = self.conexion().execute("SELECT valor FROM estado WHERE clave = 'ultima_sincronizacion'").fetchone()
+        return datetime.datetime.fromisoformat(fila[0]) if fila else None
+
+    def profundidad(self): return self.conexion().execute("SELECT COUNT(*) FROM ventas_pendientes WHERE base IN (?, '')", (base_actual(),)).fetchone()[0]
+
+    def consumo_pendiente(self):
+        total = {}
+        for (consumo,) in self.conexion().execute("SELECT consumo FROM ventas_pendientes WHERE base IN (?, '')", (base_actual(),)):
+            for id_insumo, cantidad in json.loads(consumo).items(): total[int(id_insumo)] = total.get(int(id_insumo), 0.0) + cantidad
+        return total
+
+    def guardar_catalogo(self, categorias, productos, recetas, insumos):
+        with self.conexion() as conexion:
+            for tabla, filas in (("catalogo_categorias", categorias), ("catalogo_productos", productos), ("catalogo_recetas", recetas), ("catalogo_insumos", insumos)):
+                conexion.execute(f"DELETE FROM {tabla}")
+                if filas: conexion.executemany(f"INSERT INTO {tabla} VALUES ({', '.join(['?'] * len(filas[0]))})", [tuple(float(v) if isinstance(v, decimal.Decimal) else v for v in fila) for fila in filas])
+
+    def cargar_catalogo(self):
+        """Retorna (categorias, productos, recetas, insumos) de la última copia, o None si nunca se guardó."""
+        conexion = self.conexion()
+        productos = conexion.execute("SELECT id_producto, nombre, precio_venta, id_categoria FROM catalogo_productos").fetchall()
+        if not productos: return None
+        return (conexion.execute("SELECT id_categoria, nombre FROM catalogo_categorias ORDER BY nombre").fetchall(), productos,
+                conexion.execute("SELECT id_producto, id_insumo, cantidad_requerida FROM catalogo_recetas").fetchall(),
+                conexion.execute("SELECT id_insumo, costo_promedio, stock_actual FROM catalogo_insumos").fetchall())
+
+
+COLA_VENTAS = ColaVentasLocal()
+
+
+def es_error_de_conexion(error):
+    """El servidor no respondió (caído, conexión perdida, pool ocupado): se reintenta sin límite y sin culpar a la venta."""
+    return isinstance(error, pymysql.err.InterfaceError) or (isinstance(error, pymysql.err.OperationalError) and bool(error.args) and error.args[0] in ERRORES_CONEXION)
+
+
+def sincronizar_cola_ventas(conexion, cola, tamano_lote=TAMANO_LOTE_SINCRONIZACION):
+    """Replica en MySQL las ventas de la cola local, un lote por transacción (sin interacción con la GUI).
+
+    pedidos.clave_idempotencia es UNIQUE: antes de cada lote se consultan las claves ya aplicadas, así
+    que reintentar un lote cuyo COMMIT llegó al servidor pero no alcanzó a borrarse de la cola no
+    duplica ventas ni consumo. Las ventas ya se cobraron: se registran aunque otra terminal haya consumido
+    el stock (validar_stock=False, como importar con permitir_faltantes) y quedan en ventas_sin_stock de la
+    cola para avisar en caja. Si el lote falla por una venta malformada (ERRORES_VENTA_MALFORMADA: un
+    producto ya eliminado, datos que MySQL no acepta) o falla MAX_INTENTOS_SINCRONIZACION veces por
+    contención, se replica venta por venta y solo la malformada pasa a ventas_rechazadas.
+    Retorna el consumo por insumo que dejó de estar pendiente (replicado o rechazado); los demás errores
+    se registran en la cola y se propagan.
+    """
+    consumo_resuelto = {}
+    def resolver(ventas):
+        for *_, consumo in ventas:
+            for id_insumo, cantidad in consumo.items(): consumo_resuelto[id_insumo] = consumo_resuelto.get(id_insumo, 0.0) + cantidad
+
+    def replicar(ventas):
+        claves = [clave for clave, *_ in ventas]; sin_stock = {}
+        def replicar_ventas(cursor):
+            sin_stock.clear()  # en_transaccion puede repetir la función tras un deadlock.
+            cursor.execute(f"SELECT clave_idempotencia FROM pedidos WHERE clave_idempotencia IN ({', '.join(['%s'] * len(claves))})", claves)
+            aplicadas = {fila[0] for fila in cursor.fetchall()}
+            bloquear_insumos(cursor, {id_insumo for *_, consumo in ventas for id_insumo in consumo})  # Todo el lote en orden, no venta por venta.
+            for clave, fecha_venta, canal_venta, pedido, _ in ventas:
+                if clave in aplicadas: continue
+                _, (_, _, faltantes) = registrar_venta_db(cursor, pedido, canal_venta, fecha_venta, clave_idempotencia=clave, validar_stock=False)
+                if faltantes: sin_stock[clave] = faltantes
+        en_transaccion(conexion, replicar_ventas)
+        VERSIONES_TABLAS.tocar(conexion, *TABLAS_VENTA, desde=min(como_fecha(fecha_venta) for _, fecha_venta, *_ in ventas))
+        for clave, fecha_venta, canal_venta, pedido, _ in ventas:
+            if clave in sin_stock: cola.anotar_sin_stock(clave, fecha_venta, canal_venta, pedido, sin_stock[clave])
+        cola.confirmar(claves); resolver(ventas)
+
+    while True:
+        lote = cola.pendientes(tamano_lote)
+        if not lote: break
+        claves = [clave for clave, *_ in lote]
+        try: replicar(lote); continue
+        except Exception as e:
+            conexion_caida = es_error_de_conexion(e); intentos = cola.registrar_fallo(claves, str(e), contar=not conexion_caida)
+            contencion = isinstance(e, pymysql.err.OperationalError) and e.args[0] in ERRORES_REINTENTABLES
+            if not (isinstance(e, ERRORES_VENTA_MALFORMADA) or (contencion and intentos >= MAX_INTENTOS_SINCRONIZACION)): raise
+        pendiente = None
+        for venta in lote:  # Aislar la venta malformada: las demás se replican de a una.
+            try: replicar([venta])
+            except Exception as e:
+                if es_error_de_conexion(e): cola.registrar_fallo([venta[0]], str(e), contar=False); raise
+                if not isinstance(e, ERRORES_VENTA_MALFORMADA): pendiente = e; continue  # No es culpa de la venta: queda en cola.
+                cola.rechazar(venta[0], str(e)); resolver([venta])
+        if pendiente: raise pendiente
+    cola.marcar_sincronizacion()
+    return consumo_resuelto
+
+
+class SenalesSincronizacion(QObject):
+    terminado = pyqtSignal(object)
+    fallido = pyqtSignal(str, bool)
+
+
+class TareaSincronizacion(QRunnable):
+    """Vacía la cola local del TPV con una conexión prestada por el pool."""
+    def __init__(self, pool, cola, senales):
+        super().__init__()
+        self.pool = pool; self.cola = cola; self.senales = senales
+
+    def run(self):
+        try:
+            with self.pool.prestar() as conexion, origen_consultas("sincronizar_cola_ventas"): consumo = sincronizar_cola_ventas(conexion, self.cola)
+        except Exception as e: self.senales.fallido.emit(str(e), es_error_de_conexion(e))
+        else: self.senales.terminado.emit(consumo)
+
+
+POOL_SINCRONIZACION = QThreadPool(); POOL_SINCRONIZACION.setMaxThreadCount(1); POOL_SINCRONIZACION.setExpiryTimeout(-1)
+
+
+class SincronizadorVentas(QObject):
+    """Replica la cola local del TPV en segundo plano cada INTERVALO_SINCRONIZACION_MS y después de cada venta."""
+    actualizado = pyqtSignal()
+    rechazadas = pyqtSignal(list)  # Ventas malformadas que la base de datos no aceptó en esta sincronización (para avisar en caja).
+    sin_stock = pyqtSignal(list)  # Ventas registradas en esta sincronización con stock insuficiente (el insumo quedó negativo).
+
+    def __init__(self, conexion, cola, parent=None):
+        super().__init__(parent)
+        self.conexion = conexion; self.cola = cola; self.en_curso = False; self.repetir = False; self.ultimo_error = None; self.servidor_caido = False
+        self.rechazadas_avisadas = cola.cantidad_rechazadas(); self.sin_stock_avisadas = cola.cantidad_sin_stock()
+        CACHE_RECETAS.pendiente = cola.consumo_pendiente()
+        self.senales = SenalesSincronizacion(); self.senales.terminado.connect(self._terminado); self.senales.fallido.connect(self._fallido)
+        self.timer = QTimer(self); self.timer.timeout.connect(self.sincronizar); self.timer.start(INTERVALO_SINCRONIZACION_MS)
+        self.sincronizar()
+
+    def sincronizar(self):
+        if self.en_curso: self.repetir = True; return
+        if not self.cola.profundidad(): return
+        self.en_curso = True
+        POOL_SINCRONIZACION.start(TareaSincronizacion(self.conexion, self.cola, self.senales))
+
+    def _terminado(self, consumo):
+        self.en_curso = False; self.ultimo_error = None
+        CACHE_RECETAS.confirmar_pendiente(consumo)
+        if consumo: ALERTAS_STOCK.refrescar(self.conexion, consumo)
+        self.actualizado.emit(); self.avisar()
+        if self.repetir: self.repetir = False; self.sincronizar()
+
+    def _fallido(self, error, servidor_caido):
+        self.en_curso = False; self.repetir = False; self.ultimo_error = error; self.servidor_caido = servidor_caido
+        self.actualizado.emit(); self.avisar()
+
+    def avisar(self):
+        total = self.cola.cantidad_rechazadas(); nuevas = total - self.rechazadas_avisadas; self.rechazadas_avisadas = total
+        if nuevas > 0: self.rechazadas.emit(self.cola.rechazadas()[:nuevas])
+        total = self.cola.cantidad_sin_stock(); nuevas = total - self.sin_stock_avisadas; self.sin_stock_avisadas = total
+        if nuevas > 0: self.sin_stock.emit(self.cola.ventas_sin_stock()[:nuevas])
+
+    def estado(self):
+        ultima = self.cola.ultima_sincronizacion(); rechazadas = self.cola.cantidad_rechazadas()
+        texto = f"🗂️ Ventas por sincronizar: {self.cola.profundidad()} | Última sincronización: {ultima.strftime('%d-%m %H:%M:%S') if ultima else 'nunca'}"
+        if self.ultimo_error: texto += f" | ⚠️ {'Servidor no disponible' if self.servidor_caido else 'Error al sincronizar (se reintentará)'}: {self.ultimo_error}"
+        if rechazadas: texto += f" | ⛔ {rechazadas} venta(s) rechazada(s) por la base de datos, último motivo: {self.cola.rechazadas()[0][4]}"
+        return texto
+
+
+# --- SNAPSHOTS DE INVENTARIO (stock y valor a una fecha) ---
+SIGNO_MOVIMIENTO = "CASE WHEN tipo_movimiento IN ('entrada', 'ajuste') THEN cantidad ELSE -cantidad END"  # 'ajuste' ya guarda la cantidad con su signo.
+DIAS_MAXIMOS_SNAPSHOT = 31
+
+
+def como_fecha(valor): return valor if isinstance(valor, datetime.date) else datetime.date.fromisoformat(str(valor)[:10])
+
+
+def inventario_en_fecha(conexion, fecha):
+    """Stock y costo promedio de cada insumo activo al cierre de `fecha`: {id_insumo: (stock, costo_promedio)}.
+
+    Parte del ancla más cercana (snapshot anterior, snapshot posterior o el stock actual de insumos) y solo
+    reaplica los movimientos entre el ancla y la fecha, así el costo no crece con el historial del ledger.
+    El valor se calcula con el costo promedio del ancla.
+    """
+    fecha = como_fecha(fecha); hoy = datetime.date.today(); dia_siguiente = fecha + datetime.timedelta(days=1)
+    anterior, posterior = consultar_db(conexion, "SELECT (SELECT MAX(fecha) FROM inventario_snapshots WHERE fecha <= %s), (SELECT MIN(fecha) FROM inventario_snapshots WHERE fecha > %s)", (fecha, fecha))[0]
+    anclas = [(abs((hoy - fecha).days), 1, None)]
+    if fecha < hoy:
+        if anterior: anclas.append(((fecha - como_fecha(anterior)).days, 0, como_fecha(anterior)))
+        if posterior: anclas.append(((como_fecha(posterior) - fecha).days, 0, como_fecha(posterior)))
+    ancla = min(anclas)[2]
+    if ancla is None:
+        query = f"""
+        SELECT i.id_insumo, i.stock_actual - COALESCE(m.delta, 0), i.costo_promedio
+        FROM insumos i LEFT JOIN (SELECT id_insumo, SUM({SIGNO_MOVIMIENTO}) AS delta FROM movimientos_inventario
+                                  WHERE fecha_movimiento >= %s GROUP BY id_insumo) m ON m.id_insumo = i.id_insumo
+        WHERE i.activo = TRUE
+        """
+        params = (dia_siguiente,)
+    else:
+        # Snapshot anterior: se suman los movimientos (ancla, fecha]; snapshot posterior: se restan los de (fecha, ancla].
+        signo, desde, hasta = ("+", ancla + datetime.timedelta(days=1), dia_siguiente) if ancla <= fecha else ("-", dia_siguiente, ancla + datetime.timedelta(days=1))
+        query = f"""
+        SELECT i.id_insumo, COALESCE(s.stock, 0) {signo} COALESCE(m.delta, 0), COALESCE(s.costo_promedio, i.costo_promedio)
+        FROM insumos i
+        LEFT JOIN inventario_snapshots s ON s.id_insumo = i.id_insumo AND s.fecha = %s
+        LEFT JOIN (SELECT id_insumo, SUM({SIGNO_MOVIMIENTO}) AS delta FROM movimientos_inventario
+                   WHERE fecha_movimiento >= %s AND fecha_movimiento < %s GROUP BY id_insumo) m ON m.id_insumo = i.id_insumo
+        WHERE i.activo = TRUE
+        """
+        params = (ancla, desde, hasta)
+    return {id_insumo: (float(stock), float(costo)) for id_insumo, stock, costo in consultar_db(conexion, query, params)}
+
+
+def valor_inventario(inventario): return sum(stock * costo for stock, costo in inventario.values())
+
+
+def inventario_promedio(conexion, fecha_inicio, fecha_fin, suma, dias, apertura, cierre):
+    """(valor promedio, valor final) del inventario en el rango: promedio de la apertura, los cierres diarios guardados y el cierre del rango.
+
+    Recibe los snapshots ya sumados por la consulta de calcular_resumen_financiero (suma y cantidad de días entre la
+    víspera del rango y su último día, y el valor de esos dos días o None si no tienen snapshot). Solo consulta,
+    con inventario_en_fecha, la apertura o el cierre que falte, como el cierre del período en curso.
+    """
+    suma, dias = float(suma), int(dias)
+    if apertura is None: suma += valor_inventario(inventario_en_fecha(conexion, como_fecha(fecha_inicio) - datetime.timedelta(days=1))); dias += 1
+    if cierre is None: cierre = valor_inventario(inventario_en_fecha(conexion, fecha_fin)); suma += cierre; dias += 1
+    return suma / dias, float(cierre)
+
+
+def tomar_snapshot_inventario(conexion, fecha=None):
+    """Guarda (o reemplaza) el cierre de inventario de un día ya cerrado (por defecto ayer)."""
+    fecha = como_fecha(fecha) if fecha else datetime.date.today() - datetime.timedelta(days=1)
+    if fecha >= datetime.date.today(): return False, "Solo se pueden guardar snapshots de días ya cerrados."
+    try:
+        inventario = inventario_en_fecha(conexion, fecha)
+        query = """
+        INSERT INTO inventario_snapshots (fecha, id_insumo, stock, costo_promedio, valor) VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE stock = VALUES(stock), costo_promedio = VALUES(costo_promedio), valor = VALUES(valor)
+        """
+        with conexion.cursor() as cursor:
+            cursor.executemany(query, [(fecha, id_insumo, stock, costo, stock * costo) for id_insumo, (stock, costo) in inventario.items()])
+        conexion.commit(); VERSIONES_TABLAS.tocar(conexion, "inventario_snapshots", desde=fecha)
+        return True, len(inventario)
+    except pymysql.MySQLError as e:
+        conexion.rollback()
+        return False, str(e)
+
+
+def completar_snapshots_inventario(conexion, dias_maximos=DIAS_MAXIMOS_SNAPSHOT):
+    """Guarda los cierres faltantes desde el último snapshot hasta ayer (como máximo `dias_maximos` días).
+
+    Se recorren del más reciente al más antiguo para que cada día se reconstruya desde el día siguiente.
+    """
+    ayer = datetime.date.today() - datetime.timedelta(days=1)
+    try: ultimo = consultar_db(conexion, "SELECT MAX(fecha) FROM inventario_snapshots")[0][0]
+    except pymysql.MySQLError as e: return False, str(e)
+    desde = max(como_fecha(ultimo) + datetime.timedelta(days=1), ayer - datetime.timedelta(days=dias_maximos - 1)) if ultimo else ayer
+    dias = 0
+    for dias_atras in range((ayer - desde).days + 1):
+        ok, resultado = tomar_snapshot_inventario(conexion, ayer - datetime.timedelta(days=dias_atras))
+        if not ok: return False, resultado
+        dias += 1
+    return True, dias
+
+
+class TareaSnapshotsInventario(QRunnable):
+    """Corre completar_snapshots_inventario al ingresar sin demorar la apertura del menú. Va en POOL_SINCRONIZACION
+    para no cruzarse con la réplica de la cola; si falla, los días faltantes se completan en el próximo ingreso."""
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+
+    def run(self):
+        try:
+            with self.pool.prestar() as conexion, origen_consultas("completar_snapshots_inventario"): completar_snapshots_inventario(conexion)
+        except Exception: pass
+
+
+@dataclass
+class ResumenFinanciero:
+    """Cifras del EERR y de los KPIs operacionales para un rango de fechas."""
+    fecha_inicio: str
+    fecha_fin: str
+    ingresos: float
+    cmv: float
+    gastos: float
+    criticos: int
+    total_insumos: int
+    inv_final: float
+    inv_promedio: float
+    perdidas: float
+    compras: float
+
+    @property
+    def margen_bruto(self): return self.ingresos - self.cmv
+    @property
+    def utilidad_neta(self): return self.margen_bruto - self.gastos
+    @property
+    def tasa_quiebre(self): return (self.criticos / self.total_insumos) * 100 if self.total_insumos > 0 else 0
+    @property
+    def rotacion(self): return self.cmv / self.inv_promedio if self.inv_promedio > 0 else 0
+    @property
+    def porc_perdida(self): return (self.perdidas / self.compras) * 100 if self.compras > 0 else 0
+
+
+TABLAS_RESUMEN_PERIODO = ("ventas_diarias", "gastos_operativos", "movimientos_inventario", "insumos", "inventario_snapshots")
+
+
+def calcular_resumen_financiero(conexion, fecha_inicio, fecha_fin):
+    """Calcula todas las cifras de EERR y KPIs en una sola sentencia por período (un recorrido por tabla base).
+
+    Antes: 3 consultas en generar_eerr + 6 en generar_kpis, dos de ellas sumando el mismo CMV sobre ventas.
+    Ingresos y CMV se leen de ventas_diarias (~365 x productos filas por año) en vez de cada línea de venta.
+    La misma sentencia suma los snapshots diarios del inventario y cuenta alertas abiertas e insumos activos; solo
+    el cierre de un período sin snapshot (el día en curso) agrega las dos consultas de inventario_en_fecha.
+    Las cifras del período pasan por CACHE_REPORTES; las alertas abiertas son estado actual, así que con un
+    resultado guardado se cuentan aparte en una consulta.
+    """
+    query = """
+    SELECT v.ingresos, v.cmv, g.gastos, m.perdidas, m.compras, s.suma, s.dias, s.apertura, s.cierre, a.criticos, i.total_insumos
+    FROM (SELECT COALESCE(SUM(ingreso), 0) AS ingresos, COALESCE(SUM(cmv), 0) AS cmv
+          FROM ventas_diarias WHERE fecha BETWEEN %s AND %s) v
+    CROSS JOIN (SELECT COALESCE(SUM(monto), 0) AS gastos
+                FROM gastos_operativos WHERE fecha_gasto BETWEEN %s AND %s) g
+    CROSS JOIN (SELECT COALESCE(SUM(CASE WHEN mi.tipo_movimiento = 'perdida' OR (mi.tipo_movimiento = 'ajuste' AND mi.cantidad < 0) THEN ABS(mi.cantidad) * ins.costo_promedio END), 0) AS perdidas,
+                       COALESCE(SUM(CASE WHEN mi.tipo_movimiento = 'entrada' THEN mi.cantidad * mi.costo_unitario END), 0) AS compras
+                FROM movimientos_inventario mi JOIN insumos ins ON mi.id_insumo = ins.id_insumo
+                WHERE mi.fecha_movimiento BETWEEN %s AND %s) m
+    CROSS JOIN (SELECT COALESCE(SUM(valor), 0) AS suma, COUNT(DISTINCT fecha) AS dias,
+                       SUM(CASE WHEN fecha = %s THEN valor END) AS apertura, SUM(CASE WHEN fecha = %s THEN valor END) AS cierre
+                FROM inventario_snapshots WHERE fecha BETWEEN %s AND %s) s
+    CROSS JOIN (SELECT COUNT(*) AS criticos FROM alertas_stock WHERE fecha_resolucion IS NULL) a
+    CROSS JOIN (SELECT COUNT(*) AS total_insumos FROM insumos WHERE activo = TRUE) i
+    """
+    vispera = como_fecha(fecha_inicio) - datetime.timedelta(days=1); estado_actual = []
+    def calcular_periodo():
+        ingresos, cmv, gastos, perdidas, compras, suma, dias, apertura, cierre, *alertas = consultar_db(conexion, query, (fecha_inicio, fecha_fin) * 3 + (vispera, fecha_fin) * 2)[0]
+        estado_actual.extend(alertas); inv_promedio, inv_final = inventario_promedio(conexion, fecha_inicio, fecha_fin, suma, dias, apertura, cierre)
+        return float(ingresos), float(cmv), float(gastos), inv_final, inv_promedio, float(perdidas), float(compras)
+    ingresos, cmv, gastos, inv_final, inv_promedio, perdidas, compras = CACHE_REPORTES.resolver(conexion, "resumen_financiero", fecha_inicio, fecha_fin, TABLAS_RESUMEN_PERIODO, calcular_periodo)
+    criticos, total_insumos = estado_actual or consultar_db(conexion, "SELECT (SELECT COUNT(*) FROM alertas_stock WHERE fecha_resolucion IS NULL), COUNT(*) FROM insumos WHERE activo = TRUE")[0]
+    return ResumenFinanciero(fecha_inicio, fecha_fin, ingresos, cmv, gastos, int(criticos), int(total_insumos), inv_final, inv_promedio, perdidas, compras)
+
+
+def calcular_margen(conexion, fecha_inicio, fecha_fin):
+    query = """
+    SELECT 
+        p.nombre AS Producto,
+        SUM(vd.unidades) AS Unidades_Vendidas,
+        SUM(vd.ingreso) AS Ingreso_Total,
+        SUM(vd.cmv) AS CMV_Total
+    FROM ventas_diarias vd
+    JOIN productos p ON vd.id_producto = p.id_producto
+    WHERE vd.fecha BETWEEN %s AND %s
+    GROUP BY p.nombre
+    ORDER BY Unidades_Vendidas DESC;
+    """
+    return CACHE_REPORTES.resolver(conexion, "margen", fecha_inicio, fecha_fin, ("ventas_diarias", "productos"), lambda: consultar_db(conexion, query, (fecha_inicio, fecha_fin)))
+
+
+# --- COMPARATIVOS ENTRE PERÍODOS (una consulta agrupada por vista) ---
+DIAS_SEMANA = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")  # Índice = WEEKDAY() de MySQL (0 = lunes).
+TOP_PRODUCTOS_COMPARATIVO = 15
+TABLAS_COMPARATIVO = ("ventas_diarias", "gastos_operativos", "productos")
+
+
+def variacion_pct(actual, anterior): return (actual - anterior) / anterior * 100 if actual is not None and anterior else None
+
+
+def meses_del_rango(fecha_inicio, fecha_fin):
+    """Claves 'AAAA-MM' (las de DATE_FORMAT(fecha, '%Y-%m')) de todos los meses del rango, tengan o no ventas."""
+    inicio, fin = como_fecha(fecha_inicio), como_fecha(fecha_fin); anio, mes = inicio.year, inicio.month; meses = []
+    while (anio, mes) <= (fin.year, fin.month):
+        meses.append(f"{anio:04d}-{mes:02d}"); anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return meses
+
+
+def semanas_del_rango(fecha_inicio, fecha_fin):
+    """{YEARWEEK(fecha, 3): lunes de esa semana ISO} para todas las semanas del rango, en orden."""
+    inicio, fin = como_fecha(fecha_inicio), como_fecha(fecha_fin)
+    lunes = inicio - datetime.timedelta(days=inicio.weekday()); semanas = {}
+    while lunes <= fin:
+        anio, semana, _ = lunes.isocalendar(); semanas[anio * 100 + semana] = lunes; lunes += datetime.timedelta(days=7)
+    return semanas
+
+
+def comparar_eerr_mensual(conexion, fecha_inicio, fecha_fin):
+    """EERR mes a mes: ventas_diarias y gastos_operativos se agrupan por mes en una sola consulta (un recorrido del rango).
+
+    Antes comparar 24 meses era generar el EERR 24 veces. Los meses se agrupan en SQL y se pivotean aquí.
+    Retorna {'columnas', 'filas': [(concepto, valores, formato, variacion)], 'variacion'}; formato es '$', 'u' o '%'.
+    """
+    query = """
+    SELECT periodo, SUM(ingresos), SUM(cmv), SUM(gastos) FROM (
+        SELECT DATE_FORMAT(fecha, '%%Y-%%m') AS periodo, ingreso AS ingresos, cmv, 0 AS gastos FROM ventas_diarias WHERE fecha BETWEEN %s AND %s
+        UNION ALL
+        SELECT DATE_FORMAT(fecha_gasto, '%%Y-%%m'), 0, 0, monto FROM gastos_operativos WHERE fecha_gasto BETWEEN %s AND %s
+    ) t
+    GROUP BY periodo
+    """
+    def calcular():
+        por_mes = {periodo: (float(ingresos), float(cmv), float(gastos)) for periodo, ingresos, cmv, gastos in consultar_db(conexion, query, (fecha_inicio, fecha_fin) * 2)}
+        meses = meses_del_rango(fecha_inicio, fecha_fin)
+        ingresos, cmv, gastos = ([por_mes.get(mes, (0.0, 0.0, 0.0))[k] for mes in meses] for k in range(3))
+        margen = [i - c for i, c in zip(ingresos, cmv)]; utilidad = [m - g for m, g in zip(margen, gastos)]
+        conceptos = [("Ingresos por Ventas", ingresos, '$'), ("(-) CMV", cmv, '$'), ("(=) Margen Bruto", margen, '$'), ("(-) Gastos Operacionales", gastos, '$'),
+                     ("(=) Utilidad Neta", utilidad, '$'), ("Margen Bruto (%)", [m / i * 100 if i else None for m, i in zip(margen, ingresos)], '%')]
+        filas = [(concepto, valores, formato, variacion_pct(valores[-1], valores[-2]) if len(valores) > 1 and formato != '%' else None) for concepto, valores, formato in conceptos]
+        return {'columnas': meses, 'filas': filas, 'variacion': "Var. % último mes"}
+    return CACHE_REPORTES.resolver(conexion, "comparativo_eerr_mensual", fecha_inicio, fecha_fin, TABLAS_COMPARATIVO, calcular)
+
+
+def comparar_top_productos_semanal(conexion, fecha_inicio, fecha_fin, top=TOP_PRODUCTOS_COMPARATIVO):
+    """Unidades por producto y semana ISO (YEARWEEK en SQL, una consulta): los `top` productos de la última semana
+    (desempate por el total del rango) con su variación contra la semana anterior. Mismo formato que comparar_eerr_mensual.
+    """
+    query = """
+    SELECT s.semana, p.nombre, s.unidades
+    FROM (SELECT YEARWEEK(fecha, 3) AS semana, id_producto, SUM(unidades) AS unidades
+          FROM ventas_diarias WHERE fecha BETWEEN %s AND %s
+          GROUP BY YEARWEEK(fecha, 3), id_producto) s
+    JOIN productos p ON p.id_producto = s.id_producto
+    """
+    def calcular():
+        semanas = semanas_del_rango(fecha_inicio, fecha_fin); indice = {semana: n for n, semana in enumerate(semanas)}; por_producto = {}
+        for semana, nombre, unidades in consultar_db(conexion, query, (fecha_inicio, fecha_fin)):
+            if int(semana) in indice: por_producto.setdefault(nombre, [0.0] * len(semanas))[indice[int(semana)]] += float(unidades)
+        ranking = sorted(por_producto.items(), key=lambda par: (-par[1][-1], -sum(par[1]), par[0]))[:top]
+        filas = [(nombre, valores, 'u', variacion_pct(valores[-1], valores[-2]) if len(valores) > 1 else None) for nombre, valores in ranking]
+        return {'columnas': [f"Sem. {lunes:%d-%m-%y}" for lunes in semanas.values()], 'filas': filas, 'variacion': "Var. % última semana"}
+    return CACHE_REPORTES.resolver(conexion, "comparativo_top_semanal", fecha_inicio, fecha_fin, TABLAS_COMPARATIVO, calcular)
+
+
+def comparar_mismo_dia_semana(conexion, fecha_inicio, fecha_fin):
+    """Ingresos por día de la semana y semana ISO (WEEKDAY y YEARWEEK en SQL, una consulta): cada fila es un día
+    (todos los viernes del rango, etc.) y la variación compara el último de ellos con el promedio de los anteriores.
+    Los días fuera del rango (semanas incompletas en los extremos) quedan en None para no bajar el promedio.
+    """
+    query = """
+    SELECT YEARWEEK(fecha, 3), WEEKDAY(fecha), SUM(ingreso)
+    FROM ventas_diarias WHERE fecha BETWEEN %s AND %s
+    GROUP BY YEARWEEK(fecha, 3), WEEKDAY(fecha)
+    """
+    def calcular():
+        inicio, fin = como_fecha(fecha_inicio), como_fecha(fecha_fin); semanas = semanas_del_rango(inicio, fin)
+        ingresos = {(int(semana), int(dia)): float(total) for semana, dia, total in consultar_db(conexion, query, (fecha_inicio, fecha_fin))}
+        filas = []
+        for dia, nombre_dia in enumerate(DIAS_SEMANA):
+            valores = [ingresos.get((semana, dia), 0.0) if inicio <= lunes + datetime.timedelta(days=dia) <= fin else None for semana, lunes in semanas.items()]
+            presentes = [valor for valor in valores if valor is not None]
+            filas.append((nombre_dia, valores, '$', variacion_pct(presentes[-1], sum(presentes[:-1]) / len(presentes[:-1])) if len(presentes) > 1 else None))
+        return {'columnas': [f"Sem. {lunes:%d-%m-%y}" for lunes in semanas.values()], 'filas': filas, 'variacion': "Var. % vs promedio"}
+    return CACHE_REPORTES.resolver(conexion, "comparativo_dia_semana", fecha_inicio, fecha_fin, TABLAS_COMPARATIVO, calcular)
+
+
+# --- TABLAS VIRTUALIZADAS (Modelo/Vista) ---
+class ModeloTabla(QAbstractTableModel):
+    """Modelo de solo lectura sobre las filas crudas de una consulta.
+    No se crea ningún objeto por celda: el texto, el color y el tooltip se calculan en data() solo para las
+    celdas que la vista pinta, y las filas se entregan a la vista por lotes (canFetchMore/fetchMore)."""
+    TAMANO_LOTE = 500
+
+    def __init__(self, columnas, fondo=None, primer_plano=None, tooltip=None, parent=None):
+        super().__init__(parent)
+        self.columnas = columnas  # [(titulo, funcion(fila, n_fila) -> texto)]
+        self.fondo = fondo; self.primer_plano = primer_plano; self.tooltip = tooltip  # funcion(fila, n_fila, col) -> QColor / str / None
+        self.filas = []; self.filas_visibles = 0
+
+    def cargar(self, filas):
+        self.beginResetModel(); self.filas = list(filas); self.filas_visibles = min(len(self.filas), self.TAMANO_LOTE); self.endResetModel()
+
+    def fila(self, n_fila): return self.filas[n_fila]
+    def actualizar_fila(self, n_fila, fila):
+        self.filas[n_fila] = fila
+        if n_fila < self.filas_visibles: self.dataChanged.emit(self.index(n_fila, 0), self.index(n_fila, len(self.columnas) - 1))
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else self.filas_visibles
+    def columnCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.columnas)
+    def canFetchMore(self, parent=QModelIndex()): return not parent.isValid() and self.filas_visibles < len(self.filas)
+
+    def fetchMore(self, parent=QModelIndex()):
+        nuevas = min(len(self.filas) - self.filas_visibles, self.TAMANO_LOTE)
+        if parent.isValid() or nuevas <= 0: return
+        self.beginInsertRows(QModelIndex(), self.filas_visibles, self.filas_visibles + nuevas - 1); self.filas_visibles += nuevas; self.endInsertRows()
+
+    def headerData(self, seccion, orientacion, rol=Qt.DisplayRole):
+        if rol == Qt.DisplayRole and orientacion == Qt.Horizontal: return self.columnas[seccion][0]
+        return super().headerData(seccion, orientacion, rol)
+
+    def data(self, indice, rol=Qt.DisplayRole):
+        if not indice.isValid(): return None
+        n_fila, col = indice.row(), indice.column(); fila = self.filas[n_fila]
+        if rol == Qt.DisplayRole: return self.columnas[col][1](fila, n_fila)
+        if rol == Qt.BackgroundRole and self.fondo: return self.fondo(fila, n_fila, col)
+        if rol == Qt.ForegroundRole and self.primer_plano: return self.primer_plano(fila, n_fila, col)
+        if rol == Qt.ToolTipRole and self.tooltip: return self.tooltip(fila, n_fila, col)
+        return None
+
+
+class FiltroTabla(QSortFilterProxyModel):
+    """Filtro en memoria sobre un ModeloTabla: un predicado sobre la fila cruda decide qué se muestra, sin volver a consultar la BD."""
+    def __init__(self, modelo, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(modelo); self.predicado = None
+
+    def filtrar(self, predicado): self.predicado = predicado; self.invalidateFilter()
+    def filterAcceptsRow(self, fila_origen, parent): return self.predicado is None or self.predicado(self.sourceModel().fila(fila_origen))
+
+
+# --- REGISTRO DE VENTANAS ---
+VIGENCIA_VENTANA_SEGUNDOS = 300
+TABLAS_RESUMEN = ("ventas", "ventas_diarias", "gastos_operativos", "inventario_snapshots") + TABLAS_STOCK
+
+
+class RegistroVentanas:
+    """Crea cada pantalla una sola vez y la vuelve a mostrar al regresar a ella.
+
+    Al reabrirla llama a su `refrescar()` solo si cambió alguna de sus `TABLAS` (según VERSIONES_TABLAS) desde
+    la última vez que se mostró, o si pasaron VIGENCIA_VENTANA_SEGUNDOS (cambios hechos fuera de la aplicación).
+    Una pantalla con `refrescar` pero sin `TABLAS` se refresca siempre; sin `refrescar` nunca.
+    Hay una instancia por clase, así la memoria no crece con la navegación durante el turno.
+    """
+    def __init__(self): self.ventanas = {}; self.mostradas = {}
+
+    def abrir(self, ClaseVentana, padre):
+        ventana = self.ventanas.get(ClaseVentana); tablas = getattr(ClaseVentana, "TABLAS", None)
+        with origen_consultas(f"{ClaseVentana.__name__}.abrir"):
+            firma = VERSIONES_TABLAS.firma(padre.conexion, tablas) if tablas else None
+            if ventana is None or ventana.parent_window is not padre:  # Tras reconectar, el menú (y con él toda la jerarquía) es nuevo.
+                if ventana is not None: ventana.deleteLater()
+                self.mostradas[ClaseVentana] = (firma, time.monotonic())
+                ventana = self.ventanas[ClaseVentana] = ClaseVentana(padre, padre.conexion)
+            else:
+                firma_anterior, mostrada = self.mostradas[ClaseVentana]
+                self.mostradas[ClaseVentana] = (firma, time.monotonic())
+                if hasattr(ventana, "refrescar") and (tablas is None or firma != firma_anterior or time.monotonic() - mostrada > VIGENCIA_VENTANA_SEGUNDOS): ventana.refrescar()
+                ventana.show()
+        padre.hide()
+        return ventana
+
+
+VENTANAS = RegistroVentanas()
+
 
 class EERRWindow(QMainWindow):
     """Módulo 4.1: Reporte de Estado de Resultados (EERR)."""
+    TABLAS = TABLAS_RESUMEN
+
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Reporte_EERR.ui", self)
+        cargar_ui("Reporte_EERR.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("4.1 Estado de Resultados (EERR)")
         self.showMaximized()
+        self.ejecutor = EjecutorReportes(self, self.mostrar_eerr)
         
         self.boton_volver_submenu.clicked.connect(self.volver_menu)
         self.boton_generar_reporte.clicked.connect(self.generar_eerr)
@@ -49,6 +2015,7 @@ class EERRWindow(QMainWindow):
         hoy = QDate.currentDate()
         self.dateEdit_inicio.setDate(QDate(hoy.year(), hoy.month(), 1))
         self.dateEdit_fin.setDate(hoy)
+        self.dateEdit_inicio.dateChanged.connect(self.generar_eerr); self.dateEdit_fin.dateChanged.connect(self.generar_eerr)
         
         self.tabla_eerr.setRowCount(5)
         conceptos = ["Ingresos por Ventas", "(-) Costo de Mercadería Vendida (CMV)", "(=) Margen Bruto", "(-) Gastos Operacionales Fijos", "(=) Utilidad Neta"]
@@ -64,25 +2031,18 @@ class EERRWindow(QMainWindow):
     def volver_menu(self):
         self.parent_window.show()
         self.hide()
+
+    def refrescar(self): self.generar_eerr()
         
     def generar_eerr(self):
         fecha_inicio = self.dateEdit_inicio.date().toString("yyyy-MM-dd")
         fecha_fin = self.dateEdit_fin.date().toString("yyyy-MM-dd")
-        
-        query_ingresos = "SELECT COALESCE(SUM(total_venta), 0) FROM ventas WHERE fecha_venta BETWEEN %s AND %s"
-        ok_i, ingresos_data = ejecutar_consulta_db(self.conexion, query_ingresos, (fecha_inicio, fecha_fin), fetch=True)
-        ingresos_totales = float(ingresos_data[0][0]) if ok_i and ingresos_data else 0
-
-        query_cmv = "SELECT COALESCE(SUM(cantidad * costo_unitario_calculado), 0) FROM ventas WHERE fecha_venta BETWEEN %s AND %s"
-        ok_cmv, cmv_data = ejecutar_consulta_db(self.conexion, query_cmv, (fecha_inicio, fecha_fin), fetch=True)
-        cmv_total = float(cmv_data[0][0]) if ok_cmv and cmv_data else 0
-        
-        query_gastos = "SELECT COALESCE(SUM(monto), 0) FROM gastos_operativos WHERE fecha_gasto BETWEEN %s AND %s"
-        ok_g, gastos_data = ejecutar_consulta_db(self.conexion, query_gastos, (fecha_inicio, fecha_fin), fetch=True)
-        gastos_fijos = float(gastos_data[0][0]) if ok_g and gastos_data else 0
+        self.ejecutor.lanzar(calcular_resumen_financiero, fecha_inicio, fecha_fin)
 
-        margen_bruto = ingresos_totales - cmv_total
-        utilidad_neta = margen_bruto - gastos_fijos
+    def mostrar_eerr(self, resumen):
+        ingresos_totales = resumen.ingresos; cmv_total = resumen.cmv; gastos_fijos = resumen.gastos
+        margen_bruto = resumen.margen_bruto
+        utilidad_neta = resumen.utilidad_neta
 
         self.tabla_eerr.item(0, 1).setText(f"${ingresos_totales:,.2f}"); self.tabla_eerr.item(0, 1).setForeground(QBrush(QColor(46, 204, 113)))
         self.tabla_eerr.item(1, 1).setText(f"${cmv_total:,.2f}"); self.tabla_eerr.item(1, 1).setForeground(QBrush(QColor(231, 76, 60)))
@@ -98,13 +2058,16 @@ class EERRWindow(QMainWindow):
 
 class MargenWindow(QMainWindow):
     """Módulo 4.2: Análisis de Margen y Top Ventas."""
+    TABLAS = ("ventas", "ventas_diarias", "productos", "recetas", "insumos")
+
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Reporte_Margen_Ventas.ui", self)
+        cargar_ui("Reporte_Margen_Ventas.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("4.2 Análisis de Margen y Top Ventas")
         self.showMaximized()
+        self.ejecutor = EjecutorReportes(self, self.mostrar_reporte_margen)
 
         self.boton_volver_submenu.clicked.connect(self.volver_menu)
         self.boton_generar_reporte.clicked.connect(self.generar_reporte_margen)
@@ -112,8 +2075,17 @@ class MargenWindow(QMainWindow):
         hoy = QDate.currentDate()
         self.dateEdit_inicio.setDate(QDate(hoy.year(), hoy.month(), 1))
         self.dateEdit_fin.setDate(hoy)
+        self.dateEdit_inicio.dateChanged.connect(self.generar_reporte_margen); self.dateEdit_fin.dateChanged.connect(self.generar_reporte_margen)
         
-        self.tabla_margen_ventas.setEditTriggers(self.tabla_margen_ventas.NoEditTriggers)
+        margen_pct = lambda f: (float(f[2]) - float(f[3])) / float(f[2]) * 100 if float(f[2]) > 0 else 0
+        bajo_margen = lambda f, n, col: col == 6 and margen_pct(f) < MARGEN_MINIMO_PCT
+        self.modelo_margen = ModeloTabla([
+            ("Ranking", lambda f, n: f"#{n + 1}"), ("Producto (Roll)", lambda f, n: f[0]), ("Total Vendido (Unidades)", lambda f, n: f"{f[1]:,.0f}"),
+            ("Ingreso Total", lambda f, n: f"${float(f[2]):,.0f}"), ("CMV Total", lambda f, n: f"${float(f[3]):,.2f}"),
+            ("Margen Bruto Total (CLP)", lambda f, n: f"${float(f[2]) - float(f[3]):,.2f}"), ("Margen Contribución (%)", lambda f, n: f"{margen_pct(f):,.1f}%")],
+            fondo=lambda f, n, col: QColor(255, 230, 230) if bajo_margen(f, n, col) else None,
+            primer_plano=lambda f, n, col: QBrush(QColor(231, 76, 60)) if bajo_margen(f, n, col) else None, parent=self)
+        self.tabla_margen_ventas.setModel(self.modelo_margen)
         self.tabla_margen_ventas.setSelectionBehavior(self.tabla_margen_ventas.SelectRows)
         
         self.generar_reporte_margen()
@@ -122,64 +2094,30 @@ class MargenWindow(QMainWindow):
         self.parent_window.show()
         self.hide()
 
+    def refrescar(self): self.generar_reporte_margen()
+
     def generar_reporte_margen(self):
         fecha_inicio = self.dateEdit_inicio.date().toString("yyyy-MM-dd")
         fecha_fin = self.dateEdit_fin.date().toString("yyyy-MM-dd")
+        self.ejecutor.lanzar(calcular_margen, fecha_inicio, fecha_fin)
 
-        query = """
-        SELECT 
-            p.nombre AS Producto,
-            SUM(v.cantidad) AS Unidades_Vendidas,
-            SUM(v.total_venta) AS Ingreso_Total,
-            SUM(v.cantidad * v.costo_unitario_calculado) AS CMV_Total
-        FROM ventas v
-        JOIN productos p ON v.id_producto = p.id_producto
-        WHERE v.fecha_venta BETWEEN %s AND %s
-        GROUP BY p.nombre
-        ORDER BY Unidades_Vendidas DESC;
-        """
-        ok, resultados = ejecutar_consulta_db(self.conexion, query, (fecha_inicio, fecha_fin), fetch=True)
-        if not ok: self.tabla_margen_ventas.setRowCount(0); return
-
-        self.tabla_margen_ventas.setRowCount(len(resultados))
-        
-        for fila, datos in enumerate(resultados):
-            producto, unidades, ingreso, cmv = datos
-            ranking = fila + 1
-            ingreso, cmv = float(ingreso), float(cmv)
-            
-            margen_bruto = ingreso - cmv
-            margen_porcentual = (margen_bruto / ingreso) * 100 if ingreso > 0 else 0
-            
-            self.tabla_margen_ventas.setItem(fila, 0, QTableWidgetItem(f"#{ranking}"))
-            self.tabla_margen_ventas.setItem(fila, 1, QTableWidgetItem(producto))
-            self.tabla_margen_ventas.setItem(fila, 2, QTableWidgetItem(f"{unidades:,.0f}"))
-            self.tabla_margen_ventas.setItem(fila, 3, QTableWidgetItem(f"${ingreso:,.0f}"))
-            self.tabla_margen_ventas.setItem(fila, 4, QTableWidgetItem(f"${cmv:,.2f}"))
-            
-            item_margen_clp = QTableWidgetItem(f"${margen_bruto:,.2f}")
-            self.tabla_margen_ventas.setItem(fila, 5, item_margen_clp)
-            
-            item_margen_pct = QTableWidgetItem(f"{margen_porcentual:,.1f}%")
-            
-            if margen_porcentual < 40:
-                item_margen_pct.setBackground(QColor(255, 230, 230))
-                item_margen_pct.setForeground(QBrush(QColor(231, 76, 60)))
-            
-            self.tabla_margen_ventas.setItem(fila, 6, item_margen_pct)
-
-        QMessageBox.information(self, "Reporte Generado", f"Reporte de Margen y Top Ventas generado para {len(resultados)} productos.")
+    def mostrar_reporte_margen(self, resultados):
+        self.modelo_margen.cargar(resultados)
+        self.statusbar.showMessage(f"Reporte de Margen y Top Ventas generado para {len(resultados)} productos.")
 
 
 class KPIsWindow(QMainWindow):
     """Módulo 4.3: KPIs Operacionales (Quiebre, Rotación, Pérdida)."""
+    TABLAS = TABLAS_RESUMEN
+
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Reporte_KPIs.ui", self)
+        cargar_ui("Reporte_KPIs.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("4.3 KPIs Operacionales de Inventario")
         self.showMaximized()
+        self.ejecutor = EjecutorReportes(self, self.mostrar_kpis)
 
         self.boton_volver_submenu.clicked.connect(self.volver_menu)
         self.boton_generar_reporte.clicked.connect(self.generar_kpis)
@@ -187,6 +2125,7 @@ class KPIsWindow(QMainWindow):
         hoy = QDate.currentDate()
         self.dateEdit_inicio.setDate(QDate(hoy.year(), hoy.month(), 1))
         self.dateEdit_fin.setDate(hoy)
+        self.dateEdit_inicio.dateChanged.connect(self.generar_kpis); self.dateEdit_fin.dateChanged.connect(self.generar_kpis)
         
         self.generar_kpis()
 
@@ -194,98 +2133,376 @@ class KPIsWindow(QMainWindow):
         self.parent_window.show()
         self.hide()
 
+    def refrescar(self): self.generar_kpis()
+
     def generar_kpis(self):
         fecha_inicio = self.dateEdit_inicio.date().toString("yyyy-MM-dd")
         fecha_fin = self.dateEdit_fin.date().toString("yyyy-MM-dd")
+        self.ejecutor.lanzar(calcular_resumen_financiero, fecha_inicio, fecha_fin)
 
+    def mostrar_kpis(self, resumen):
         # TASA DE QUIEBRE DE STOCK 
-        query_criticos = "SELECT COUNT(id_insumo) FROM insumos WHERE activo = TRUE AND stock_actual <= stock_minimo"
-        ok_crit, criticos_data = ejecutar_consulta_db(self.conexion, query_criticos, fetch=True)
-        criticos = float(criticos_data[0][0]) if ok_crit and criticos_data else 0
-
-        query_total = "SELECT COUNT(id_insumo) FROM insumos WHERE activo = TRUE"
-        ok_total, total_data = ejecutar_consulta_db(self.conexion, query_total, fetch=True)
-        total_insumos = float(total_data[0][0]) if ok_total and total_data else 1
-
-        tasa_quiebre = (criticos / total_insumos) * 100 if total_insumos > 0 else 0
+        criticos = resumen.criticos; total_insumos = resumen.total_insumos
+        tasa_quiebre = resumen.tasa_quiebre
         
         self.label_kpi_quiebre_valor.setText(f"{tasa_quiebre:,.1f}%")
         self.label_kpi_quiebre_descripcion.setText(f"Basado en {criticos:,.0f} de {total_insumos:,.0f} insumos críticos actualmente.")
 
 
         #  ROTACIÓN DE INVENTARIO 
-        query_cmv = "SELECT COALESCE(SUM(cantidad * costo_unitario_calculado), 0) FROM ventas WHERE fecha_venta BETWEEN %s AND %s"
-        ok_cmv, cmv_data = ejecutar_consulta_db(self.conexion, query_cmv, (fecha_inicio, fecha_fin), fetch=True)
-        cmv_periodo = float(cmv_data[0][0]) if ok_cmv and cmv_data else 0
-
-        query_inv_final = "SELECT COALESCE(SUM(stock_actual * costo_promedio), 0) FROM insumos WHERE activo = TRUE"
-        ok_f, inv_final_data = ejecutar_consulta_db(self.conexion, query_inv_final, fetch=True)
-        inv_final = float(inv_final_data[0][0]) if ok_f and inv_final_data else 0
-        
-        inv_promedio = inv_final 
-        
-        rotacion = cmv_periodo / inv_promedio if inv_promedio > 0 else 0
+        cmv_periodo = resumen.cmv; inv_promedio = resumen.inv_promedio
+        rotacion = resumen.rotacion
         
         self.label_kpi_rotacion_valor.setText(f"{rotacion:,.2f} veces")
-        self.label_kpi_rotacion_descripcion.setText(f"Rotación calculada sobre CMV total (${cmv_periodo:,.0f}) e Inventario Final estimado (${inv_final:,.0f}).")
+        self.label_kpi_rotacion_descripcion.setText(f"Rotación calculada sobre CMV total (${cmv_periodo:,.0f}) e Inventario Promedio del período (${inv_promedio:,.0f}).")
 
 
         #  3. PORCENTAJE DE PÉRDIDA 
-        query_perdidas = """
-        SELECT COALESCE(SUM(m.cantidad * i.costo_promedio), 0)
-        FROM movimientos_inventario m
-        JOIN insumos i ON m.id_insumo = i.id_insumo
-        WHERE m.tipo_movimiento IN ('perdida', 'ajuste')
-        AND m.fecha_movimiento BETWEEN %s AND %s
-        """
-        ok_p, perdidas_data = ejecutar_consulta_db(self.conexion, query_perdidas, (fecha_inicio, fecha_fin), fetch=True)
-        valor_perdidas = float(perdidas_data[0][0]) if ok_p and perdidas_data else 0
-
-        query_compras = """
-        SELECT COALESCE(SUM(cantidad * costo_unitario), 0)
-        FROM movimientos_inventario
-        WHERE tipo_movimiento = 'entrada'
-        AND fecha_movimiento BETWEEN %s AND %s
-        """
-        ok_c, compras_data = ejecutar_consulta_db(self.conexion, query_compras, (fecha_inicio, fecha_fin), fetch=True)
-        valor_compras = float(compras_data[0][0]) if ok_c and compras_data else 1
-
-        porc_perdida = (valor_perdidas / valor_compras) * 100 if valor_compras > 0 else 0
+        valor_perdidas = resumen.perdidas; valor_compras = resumen.compras
+        porc_perdida = resumen.porc_perdida
         
         self.label_kpi_perdida_valor.setText(f"{porc_perdida:,.1f}%")
         self.label_kpi_perdida_descripcion.setText(f"Pérdidas valoradas en ${valor_perdidas:,.0f} respecto a las Compras totales (${valor_compras:,.0f}).")
 
-        QMessageBox.information(self, "Reporte Generado", "Reporte de KPIs Operacionales generado.")
+
+class CanastaWindow(QMainWindow):
+    """Módulo 4.4: Análisis de Canasta (productos que se venden juntos) y Ticket Promedio por Canal."""
+    TABLAS = ("pedidos", "ventas", "productos")
+
+    def __init__(self, parent_window, conexion):
+        super().__init__()
+        self.conexion = conexion; self.parent_window = parent_window
+        self.setWindowTitle("4.4 Análisis de Canasta y Ticket Promedio"); self.showMaximized()
+        self.statusbar = self.statusBar()
+        temp_widget = QWidget(); temp_layout = QVBoxLayout(temp_widget); filtros = QHBoxLayout()
+        hoy = QDate.currentDate()
+        self.dateEdit_inicio = QDateEdit(QDate(hoy.year(), 1, 1)); self.dateEdit_fin = QDateEdit(hoy)
+        self.dateEdit_inicio.setCalendarPopup(True); self.dateEdit_fin.setCalendarPopup(True)
+        self.boton_generar_reporte = QPushButton("GENERAR ANÁLISIS")
+        self.boton_generar_reporte.setStyleSheet("background-color: #6c5ce7; color: white; min-height: 35px; border-radius: 8px; font-weight: bold;")
+        self.boton_generar_reporte.clicked.connect(self.generar_analisis)
+        filtros.addWidget(QLabel("Desde:")); filtros.addWidget(self.dateEdit_inicio); filtros.addWidget(QLabel("Hasta:")); filtros.addWidget(self.dateEdit_fin); filtros.addWidget(self.boton_generar_reporte)
+        self.label_resumen = QLabel("Seleccione un rango de fechas y presione Generar.")
+        self.tabla_canales = QTableWidget(0, 5); self.tabla_canales.setHorizontalHeaderLabels(["Canal", "Pedidos", "Ticket Promedio", "Ventas Totales", "Líneas por Pedido"])
+        self.tabla_pares = QTableWidget(0, 6); self.tabla_pares.setHorizontalHeaderLabels(["Producto A", "Producto B", "Pedidos Juntos", "Soporte", "Confianza A→B", "Lift"])
+        for tabla in (self.tabla_canales, self.tabla_pares): tabla.setEditTriggers(tabla.NoEditTriggers); tabla.horizontalHeader().setStretchLastSection(True)
+        self.volver_button = QPushButton("⬅️ Volver al Submenú")
+        self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
+        self.volver_button.clicked.connect(self.volver_menu)
+        temp_layout.addLayout(filtros); temp_layout.addWidget(self.label_resumen)
+        temp_layout.addWidget(QLabel("Ticket promedio por canal de venta:")); temp_layout.addWidget(self.tabla_canales, 1)
+        temp_layout.addWidget(QLabel("Pares de productos que se venden juntos (ordenados por frecuencia y lift):")); temp_layout.addWidget(self.tabla_pares, 3)
+        temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget)
+        self.ejecutor = EjecutorReportes(self, self.mostrar_analisis)
+
+    def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.generar_analisis()
+
+    @staticmethod
+    def calcular_analisis(conexion, fecha_inicio, fecha_fin):
+        """Corre en POOL_REPORTES: el análisis y los nombres de productos, con la conexión prestada a la tarea."""
+        ok, resultado = analizar_canasta(conexion, fecha_inicio, fecha_fin)
+        return ok, resultado, dict(consultar_db(conexion, "SELECT id_producto, nombre FROM productos")) if ok else {}
+
+    def generar_analisis(self):
+        fecha_inicio = self.dateEdit_inicio.date().toString("yyyy-MM-dd")
+        fecha_fin = self.dateEdit_fin.date().toString("yyyy-MM-dd")
+        self.ejecutor.lanzar(self.calcular_analisis, fecha_inicio, fecha_fin)
+
+    def mostrar_analisis(self, analisis):
+        ok, resultado, nombres = analisis
+        if not ok: QMessageBox.critical(self, "Error de Análisis", resultado); return
+
+        self.tabla_canales.setRowCount(len(resultado['canales']))
+        for fila, (canal, n_pedidos, ticket, total, lineas) in enumerate(resultado['canales']):
+            for col, texto in enumerate([canal, f"{n_pedidos:,}", f"${ticket:,.0f}", f"${total:,.0f}", f"{lineas:,.2f}"]): self.tabla_canales.setItem(fila, col, QTableWidgetItem(texto))
+
+        pares = resultado['pares'][:500]
+        self.tabla_pares.setRowCount(len(pares))
+        for fila, (id_a, id_b, conteo, soporte, confianza, lift) in enumerate(pares):
+            valores = [nombres.get(id_a, str(id_a)), nombres.get(id_b, str(id_b)), f"{conteo:,}", f"{soporte * 100:,.2f}%", f"{confianza * 100:,.1f}%", f"{lift:,.2f}"]
+            for col, texto in enumerate(valores):
+                item = QTableWidgetItem(texto)
+                if col == 5 and lift > 1: item.setForeground(QBrush(QColor(46, 204, 113)))
+                self.tabla_pares.setItem(fila, col, item)
+        self.label_resumen.setText(f"{resultado['n_pedidos']:,} pedidos analizados, {len(resultado['pares']):,} pares con 2 o más pedidos en común.")
+
+
+class PronosticoWindow(QMainWindow):
+    """Módulo 4.5: Pronóstico de Consumo por Insumo y Sugerencia de Compra por Proveedor."""
+    def __init__(self, parent_window, conexion):
+        super().__init__()
+        self.conexion = conexion; self.parent_window = parent_window
+        self.setWindowTitle("4.5 Pronóstico de Consumo y Reposición"); self.showMaximized()
+        self.statusbar = self.statusBar()
+        temp_widget = QWidget(); temp_layout = QVBoxLayout(temp_widget); filtros = QHBoxLayout()
+        hoy = QDate.currentDate()
+        self.dateEdit_inicio = QDateEdit(hoy.addDays(-364)); self.dateEdit_fin = QDateEdit(hoy)
+        self.dateEdit_inicio.setCalendarPopup(True); self.dateEdit_fin.setCalendarPopup(True)
+        self.spin_dias_entrega = QSpinBox(); self.spin_dias_entrega.setRange(1, 60); self.spin_dias_entrega.setValue(2)
+        self.spin_dias_cobertura = QSpinBox(); self.spin_dias_cobertura.setRange(1, 90); self.spin_dias_cobertura.setValue(7)
+        self.checkbox_solo_pedir = QCheckBox("Solo insumos a pedir"); self.checkbox_solo_pedir.setChecked(True)
+        self.boton_generar_reporte = QPushButton("GENERAR PRONÓSTICO")
+        self.boton_generar_reporte.setStyleSheet("background-color: #00b894; color: white; min-height: 35px; border-radius: 8px; font-weight: bold;")
+        self.boton_generar_reporte.clicked.connect(self.generar_pronostico)
+        for widget in (QLabel("Historial desde:"), self.dateEdit_inicio, QLabel("Hasta:"), self.dateEdit_fin, QLabel("Días de entrega:"), self.spin_dias_entrega,
+                       QLabel("Días de cobertura:"), self.spin_dias_cobertura, self.checkbox_solo_pedir, self.boton_generar_reporte): filtros.addWidget(widget)
+        a_pedir = lambda f, n, col: QColor(255, 243, 205) if f[9] > 0 else None
+        self.modelo_lineas = ModeloTabla([
+            ("Proveedor", lambda f, n: f[0]), ("ID", lambda f, n: str(f[1])), ("Insumo", lambda f, n: f"{f[2]} ({f[3]})"), ("Stock Actual", lambda f, n: f"{f[4]:,.2f}"),
+            (f"Consumo Diario (Media {VENTANA_MEDIA_MOVIL}d)", lambda f, n: f"{f[5]:,.2f}"), ("Consumo Diario (Suavizado)", lambda f, n: f"{f[6]:,.2f}"),
+            ("Stock de Seguridad", lambda f, n: f"{f[7]:,.2f}"), ("Punto de Reorden", lambda f, n: f"{f[8]:,.2f}"),
+            ("Cantidad Sugerida", lambda f, n: f"{f[9]:,.2f}"), ("Costo Estimado", lambda f, n: f"${f[10]:,.0f}")], fondo=a_pedir, parent=self)
+        self.filtro_lineas = FiltroTabla(self.modelo_lineas, self)
+        self.modelo_proveedores = ModeloTabla([("ID", lambda f, n: "—" if f[0] is None else str(f[0])), ("Proveedor", lambda f, n: f[1]), ("Insumos a Pedir", lambda f, n: f"{f[2]:,}"),
+                                               ("Costo Estimado", lambda f, n: f"${f[3]:,.0f}")], parent=self)
+        self.tabla_lineas = QTableView(); self.tabla_lineas.setModel(self.filtro_lineas)
+        self.tabla_proveedores = QTableView(); self.tabla_proveedores.setModel(self.modelo_proveedores)
+        for tabla in (self.tabla_lineas, self.tabla_proveedores): tabla.setSelectionBehavior(tabla.SelectRows); tabla.horizontalHeader().setStretchLastSection(True)
+        self.checkbox_solo_pedir.toggled.connect(self.aplicar_filtro)
+        self.label_resumen = QLabel("Seleccione el historial y presione Generar.")
+        self.volver_button = QPushButton("⬅️ Volver al Submenú")
+        self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
+        self.volver_button.clicked.connect(self.volver_menu)
+        temp_layout.addLayout(filtros); temp_layout.addWidget(self.label_resumen)
+        temp_layout.addWidget(QLabel("Sugerencia de compra por insumo (agrupada por proveedor principal):")); temp_layout.addWidget(self.tabla_lineas, 3)
+        temp_layout.addWidget(QLabel("Total a pedir por proveedor:")); temp_layout.addWidget(self.tabla_proveedores, 1)
+        temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget)
+        self.ejecutor = EjecutorReportes(self, self.mostrar_pronostico); self.aplicar_filtro()
+
+    def volver_menu(self): self.parent_window.show(); self.hide()
+    def aplicar_filtro(self): self.filtro_lineas.filtrar((lambda f: f[9] > 0) if self.checkbox_solo_pedir.isChecked() else None)
+
+    def generar_pronostico(self):
+        fecha_inicio = self.dateEdit_inicio.date().toString("yyyy-MM-dd")
+        fecha_fin = self.dateEdit_fin.date().toString("yyyy-MM-dd")
+        self.ejecutor.lanzar(pronosticar_reposicion, fecha_inicio, fecha_fin, self.spin_dias_entrega.value(), self.spin_dias_cobertura.value())
+
+    def mostrar_pronostico(self, resultado):
+        self.modelo_lineas.cargar(resultado['lineas']); self.modelo_proveedores.cargar(resultado['proveedores'])
+        a_pedir = sum(1 for linea in resultado['lineas'] if linea[9] > 0); total = sum(costo for *_, costo in resultado['proveedores'])
+        self.label_resumen.setText(f"{resultado['dias']:,} días de historial: {a_pedir} de {len(resultado['lineas'])} insumos bajo su punto de reorden; compra sugerida ${total:,.0f}.")
+
+
+class CosteoMenuWindow(QMainWindow):
+    """Módulo 4.6: Costeo de todo el menú y simulación de variaciones en el costo de insumos."""
+    TABLAS = ("productos", "recetas", "insumos")
+
+    def __init__(self, parent_window, conexion):
+        super().__init__()
+        self.conexion = conexion; self.parent_window = parent_window
+        self.setWindowTitle("4.6 Costeo de Menú y Simulación de Costos"); self.showMaximized()
+        self.matriz = None; self.variaciones = {}
+        temp_widget = QWidget(); temp_layout = QVBoxLayout(temp_widget); controles = QHBoxLayout()
+        self.combo_insumo = QComboBox(); self.spin_variacion = QDoubleSpinBox(); self.spin_variacion.setRange(-90, 500); self.spin_variacion.setSuffix(" %"); self.spin_variacion.setValue(15)
+        self.checkbox_bajo_umbral = QCheckBox(f"Solo productos bajo {MARGEN_MINIMO_PCT}%")
+        botones = [("➕ Aplicar Variación", "#fd79a8", self.agregar_variacion), ("🧹 Limpiar Escenario", "#95a5a6", self.limpiar_escenario), ("🔄 Recargar Costos", "#3498db", self.cargar_matriz)]
+        controles.addWidget(QLabel("Insumo:")); controles.addWidget(self.combo_insumo, 2); controles.addWidget(QLabel("Variación del costo:")); controles.addWidget(self.spin_variacion)
+        for texto, color, accion in botones:
+            boton = QPushButton(texto); boton.setStyleSheet(f"background-color: {color}; color: white; min-height: 35px; border-radius: 8px; font-weight: bold;")
+            boton.clicked.connect(accion); controles.addWidget(boton)
+        controles.addWidget(self.checkbox_bajo_umbral)
+        bajo_umbral = lambda f, n, col: col in (6, 7) and f[6] < MARGEN_MINIMO_PCT
+        self.modelo_costeo = ModeloTabla([
+            ("ID", lambda f, n: str(f[0])), ("Producto", lambda f, n: f[1]), ("Precio Venta", lambda f, n: f"${f[2]:,.0f}"),
+            ("CMV Actual", lambda f, n: f"${f[3]:,.2f}"), ("Margen Actual (%)", lambda f, n: f"{f[4]:,.1f}%"), ("CMV Simulado", lambda f, n: f"${f[5]:,.2f}"),
+            ("Margen Simulado (%)", lambda f, n: f"{f[6]:,.1f}%"), ("Variación (pts)", lambda f, n: f"{f[6] - f[4]:+,.1f}")],
+            fondo=lambda f, n, col: QColor(255, 230, 230) if bajo_umbral(f, n, col) else None,
+            primer_plano=lambda f, n, col: QBrush(QColor(231, 76, 60)) if bajo_umbral(f, n, col) else None, parent=self)
+        self.filtro_costeo = FiltroTabla(self.modelo_costeo, self)
+        self.tabla_costeo = QTableView(); self.tabla_costeo.setModel(self.filtro_costeo); self.tabla_costeo.setSelectionBehavior(self.tabla_costeo.SelectRows)
+        self.tabla_costeo.horizontalHeader().setStretchLastSection(True)
+        self.checkbox_bajo_umbral.toggled.connect(self.aplicar_filtro)
+        self.label_escenario = QLabel("Escenario: costos actuales."); self.label_resumen = QLabel("")
+        self.volver_button = QPushButton("⬅️ Volver al Submenú")
+        self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
+        self.volver_button.clicked.connect(self.volver_menu)
+        temp_layout.addLayout(controles); temp_layout.addWidget(self.label_escenario); temp_layout.addWidget(self.label_resumen)
+        temp_layout.addWidget(self.tabla_costeo, 1); temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget)
+        self.cargar_matriz()
+
+    def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.cargar_matriz()
+
+    def cargar_matriz(self):
+        ok, resultado = cargar_matriz_costos(self.conexion)
+        if not ok: QMessageBox.critical(self, "Error de Costeo", resultado); return
+        self.matriz = resultado; self.combo_insumo.clear()
+        for id_insumo, nombre in sorted(self.matriz.nombres_insumos.items(), key=lambda par: par[1]): self.combo_insumo.addItem(f"{id_insumo} - {nombre}")
+        self.recalcular()
+
+    def agregar_variacion(self):
+        if not self.combo_insumo.currentText(): QMessageBox.warning(self, "Advertencia", "Debe seleccionar un insumo."); return
+        id_insumo = int(self.combo_insumo.currentText().split(' - ')[0]); variacion = self.spin_variacion.value()
+        if variacion == 0: self.variaciones.pop(id_insumo, None)
+        else: self.variaciones[id_insumo] = variacion
+        self.recalcular()
+
+    def limpiar_escenario(self): self.variaciones = {}; self.recalcular()
+    def aplicar_filtro(self): self.filtro_costeo.filtrar((lambda f: f[6] < MARGEN_MINIMO_PCT) if self.checkbox_bajo_umbral.isChecked() else None)
+
+    def recalcular(self):
+        if self.matriz is None: return
+        filas = self.matriz.escenario(self.variaciones)
+        self.modelo_costeo.cargar(filas); self.aplicar_filtro()
+        if self.variaciones: self.label_escenario.setText("Escenario: " + ", ".join(f"{self.matriz.nombres_insumos.get(id_i, id_i)} {pct:+.1f}%" for id_i, pct in self.variaciones.items()))
+        else: self.label_escenario.setText("Escenario: costos actuales.")
+        bajo_actual = sum(1 for f in filas if f[4] < MARGEN_MINIMO_PCT); bajo_simulado = sum(1 for f in filas if f[6] < MARGEN_MINIMO_PCT)
+        self.label_resumen.setText(f"{len(filas)} productos activos: {bajo_simulado} bajo el {MARGEN_MINIMO_PCT}% de margen en el escenario ({bajo_actual} con los costos actuales).")
+
+
+class DiagnosticoConsultasWindow(QMainWindow):
+    """Módulo 4.7: Diagnóstico de consultas (latencia por plantilla y round trips por ventana)."""
+    def __init__(self, parent_window, conexion):
+        super().__init__()
+        self.conexion = conexion; self.parent_window = parent_window
+        self.setWindowTitle("4.7 Diagnóstico de Consultas"); self.showMaximized()
+        temp_widget = QWidget(); temp_layout = QVBoxLayout(temp_widget); controles = QHBoxLayout()
+        botones = [("🔄 Actualizar", "#3498db", self.actualizar), ("💾 Exportar JSON", "#00b894", lambda: self.exportar("json")),
+                   ("💾 Exportar CSV", "#00b894", lambda: self.exportar("csv")), ("🧹 Reiniciar Mediciones", "#95a5a6", self.reiniciar)]
+        for texto, color, accion in botones:
+            boton = QPushButton(texto); boton.setStyleSheet(f"background-color: {color}; color: white; min-height: 35px; border-radius: 8px; font-weight: bold;")
+            boton.clicked.connect(accion); controles.addWidget(boton)
+        lenta = lambda f, n, col: col in (4, 5, 6) and f[col_ms[col]] >= METRICAS_CONSULTAS.umbral_lenta_ms
+        col_ms = {4: 'p50_ms', 5: 'p95_ms', 6: 'p99_ms'}
+        self.modelo_plantillas = ModeloTabla([
+            ("Plantilla", lambda f, n: f['plantilla']), ("Llamadas", lambda f, n: f"{f['llamadas']:,}"), ("Filas Prom.", lambda f, n: f"{f['filas_promedio']:,.1f}"),
+            ("Total (ms)", lambda f, n: f"{f['total_ms']:,.0f}"), ("p50 (ms)", lambda f, n: f"{f['p50_ms']:,.1f}"), ("p95 (ms)", lambda f, n: f"{f['p95_ms']:,.1f}"),
+            ("p99 (ms)", lambda f, n: f"{f['p99_ms']:,.1f}"), ("Máx (ms)", lambda f, n: f"{f['max_ms']:,.1f}"), ("Origen", lambda f, n: f['origenes'])],
+            primer_plano=lambda f, n, col: QBrush(QColor(231, 76, 60)) if lenta(f, n, col) else None,
+            tooltip=lambda f, n, col: f['plantilla'] if col == 0 else None, parent=self)
+        self.modelo_origenes = ModeloTabla([
+            ("Ventana / Método", lambda f, n: f[0]), ("Round Trips", lambda f, n: f"{f[1]:,}"), ("Total (ms)", lambda f, n: f"{f[2]:,.0f}"),
+            ("Prom. (ms)", lambda f, n: f"{f[2] / f[1]:,.1f}"), ("Lentas", lambda f, n: str(f[3]))],
+            fondo=lambda f, n, col: QColor(255, 230, 230) if f[3] else None, parent=self)
+        self.tabla_plantillas = QTableView(); self.tabla_plantillas.setModel(self.modelo_plantillas); self.tabla_plantillas.horizontalHeader().setStretchLastSection(True)
+        self.tabla_origenes = QTableView(); self.tabla_origenes.setModel(self.modelo_origenes); self.tabla_origenes.horizontalHeader().setStretchLastSection(True)
+        self.label_resumen = QLabel("")
+        self.volver_button = QPushButton("⬅️ Volver al Submenú")
+        self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
+        self.volver_button.clicked.connect(self.volver_menu)
+        temp_layout.addLayout(controles); temp_layout.addWidget(self.label_resumen)
+        temp_layout.addWidget(QLabel("Latencia por plantilla de consulta:")); temp_layout.addWidget(self.tabla_plantillas, 2)
+        temp_layout.addWidget(QLabel("Round trips por ventana / método:")); temp_layout.addWidget(self.tabla_origenes, 1); temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget)
+        self.actualizar()
+
+    def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.actualizar()
+
+    def actualizar(self):
+        resumen = METRICAS_CONSULTAS.resumen(); origenes = METRICAS_CONSULTAS.por_origen()
+        self.modelo_plantillas.cargar(resumen); self.modelo_origenes.cargar(origenes)
+        self.label_resumen.setText(f"Desde {METRICAS_CONSULTAS.desde.strftime('%d-%m-%Y %H:%M:%S')}: {sum(f['llamadas'] for f in resumen):,} sentencias en {len(resumen)} plantillas. "
+                                   f"Las que superan {METRICAS_CONSULTAS.umbral_lenta_ms:,.0f} ms se registran en {METRICAS_CONSULTAS.ruta_log}.")
+
+    def exportar(self, formato):
+        ruta, _ = QFileDialog.getSaveFileName(self, "Exportar Mediciones", os.path.join(os.getcwd(), f"latencias_consultas_{QDateTime.currentDateTime().toString('yyyyMMdd_HHmmss')}.{formato}"), f"{formato.upper()} (*.{formato})")
+        if not ruta: return
+        try: METRICAS_CONSULTAS.exportar(ruta)
+        except OSError as e: QMessageBox.critical(self, "Error de Exportación", f"No se pudo escribir el archivo:\n{str(e)}"); return
+        QMessageBox.information(self, "Éxito", f"Mediciones exportadas en:\n{ruta}")
+
+    def reiniciar(self): METRICAS_CONSULTAS.reiniciar(); self.actualizar()
+
+
+class ComparativoPeriodosWindow(QMainWindow):
+    """Módulo 4.8: Comparativos entre períodos (EERR mes a mes, top productos semana a semana y mismo día de la semana)."""
+    TABLAS = TABLAS_COMPARATIVO
+    VISTAS = [("Estado de resultados mes a mes", comparar_eerr_mensual), ("Top productos semana a semana (unidades)", comparar_top_productos_semanal),
+              ("Mismo día de la semana (ingresos)", comparar_mismo_dia_semana)]
+
+    def __init__(self, parent_window, conexion):
+        super().__init__()
+        self.conexion = conexion; self.parent_window = parent_window
+        self.setWindowTitle("4.8 Comparativo entre Períodos"); self.showMaximized()
+        self.statusbar = self.statusBar()
+        temp_widget = QWidget(); temp_layout = QVBoxLayout(temp_widget); filtros = QHBoxLayout()
+        hoy = QDate.currentDate()
+        self.combo_vista = QComboBox(); self.combo_vista.addItems([nombre for nombre, _ in self.VISTAS])
+        self.dateEdit_inicio = QDateEdit(QDate(hoy.year(), hoy.month(), 1).addMonths(-11)); self.dateEdit_fin = QDateEdit(hoy)
+        self.dateEdit_inicio.setCalendarPopup(True); self.dateEdit_fin.setCalendarPopup(True)
+        self.boton_generar_reporte = QPushButton("GENERAR COMPARATIVO")
+        self.boton_generar_reporte.setStyleSheet("background-color: #0984e3; color: white; min-height: 35px; border-radius: 8px; font-weight: bold;")
+        self.boton_generar_reporte.clicked.connect(self.generar_comparativo); self.combo_vista.currentIndexChanged.connect(self.generar_comparativo)
+        for widget in (QLabel("Vista:"), self.combo_vista, QLabel("Desde:"), self.dateEdit_inicio, QLabel("Hasta:"), self.dateEdit_fin, self.boton_generar_reporte): filtros.addWidget(widget)
+        self.label_resumen = QLabel("Seleccione la vista y el rango, y presione Generar.")
+        self.tabla_comparativo = QTableWidget(0, 0); self.tabla_comparativo.setEditTriggers(self.tabla_comparativo.NoEditTriggers)
+        self.volver_button = QPushButton("⬅️ Volver al Submenú")
+        self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
+        self.volver_button.clicked.connect(self.volver_menu)
+        temp_layout.addLayout(filtros); temp_layout.addWidget(self.label_resumen); temp_layout.addWidget(self.tabla_comparativo, 1); temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget)
+        self.ejecutor = EjecutorReportes(self, self.mostrar_comparativo)
+        self.generar_comparativo()
+
+    def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.generar_comparativo()
+
+    def generar_comparativo(self):
+        fecha_inicio = self.dateEdit_inicio.date().toString("yyyy-MM-dd")
+        fecha_fin = self.dateEdit_fin.date().toString("yyyy-MM-dd")
+        if fecha_inicio > fecha_fin: QMessageBox.warning(self, "Advertencia", "La fecha inicial debe ser anterior a la final."); return
+        self.ejecutor.lanzar(self.VISTAS[self.combo_vista.currentIndex()][1], fecha_inicio, fecha_fin)
+
+    def mostrar_comparativo(self, resultado):
+        formatear = lambda valor, formato: "—" if valor is None else f"{valor:,.1f}%" if formato == '%' else f"${valor:,.0f}" if formato == '$' else f"{valor:,.0f}"
+        columnas = resultado['columnas']
+        self.tabla_comparativo.clear(); self.tabla_comparativo.setColumnCount(len(columnas) + 2); self.tabla_comparativo.setRowCount(len(resultado['filas']))
+        self.tabla_comparativo.setHorizontalHeaderLabels([""] + columnas + [resultado['variacion']])
+        for fila, (etiqueta, valores, formato, variacion) in enumerate(resultado['filas']):
+            self.tabla_comparativo.setItem(fila, 0, QTableWidgetItem(etiqueta))
+            for col, valor in enumerate(valores): self.tabla_comparativo.setItem(fila, col + 1, QTableWidgetItem(formatear(valor, formato)))
+            item = QTableWidgetItem(formatear(variacion, '%'))
+            if variacion is not None: item.setForeground(QBrush(QColor(46, 204, 113) if variacion >= 0 else QColor(231, 76, 60)))
+            self.tabla_comparativo.setItem(fila, len(columnas) + 1, item)
+        self.tabla_comparativo.resizeColumnsToContents()
+        self.label_resumen.setText(f"{self.combo_vista.currentText()}: {len(columnas)} períodos, {len(resultado['filas'])} filas (una sola consulta agrupada sobre todo el rango).")
 
 
 class ReportesWindow(QMainWindow):
     """Módulo 4 (Submenú): Carga el Submenú de Reportes."""
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Submenu_Reportes.ui", self)
+        cargar_ui("Submenu_Reportes.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("Módulo 4: Reportes Administrativos y Financieros")
         self.boton_estado_resultados.clicked.connect(self.ir_a_eerr)
         self.boton_analisis_margen.clicked.connect(self.ir_a_margen)
         self.boton_kpis_operacionales.clicked.connect(self.ir_a_kpis)
+        self.boton_analisis_canasta.clicked.connect(self.ir_a_canasta)
+        self.boton_pronostico_reposicion.clicked.connect(self.ir_a_pronostico)
+        self.boton_costeo_menu.clicked.connect(self.ir_a_costeo_menu)
+        self.boton_diagnostico_consultas.clicked.connect(self.ir_a_diagnostico)
+        self.boton_comparativo_periodos.clicked.connect(self.ir_a_comparativo)
         self.boton_volver_menu.clicked.connect(self.volver_menu)
         self.show()
 
     def volver_menu(self): self.parent_window.show(); self.hide()
-    def navegar_a_submodulo(self, SubmoduloClase): self.modulo_actual = SubmoduloClase(self, self.conexion); self.hide()
+    def navegar_a_submodulo(self, SubmoduloClase): VENTANAS.abrir(SubmoduloClase, self)
     def ir_a_eerr(self): self.navegar_a_submodulo(EERRWindow)
     def ir_a_margen(self): self.navegar_a_submodulo(MargenWindow)
     def ir_a_kpis(self): self.navegar_a_submodulo(KPIsWindow)
+    def ir_a_canasta(self): self.navegar_a_submodulo(CanastaWindow)
+    def ir_a_pronostico(self): self.navegar_a_submodulo(PronosticoWindow)
+    def ir_a_costeo_menu(self): self.navegar_a_submodulo(CosteoMenuWindow)
+    def ir_a_diagnostico(self): self.navegar_a_submodulo(DiagnosticoConsultasWindow)
+    def ir_a_comparativo(self): self.navegar_a_submodulo(ComparativoPeriodosWindow)
 
 
 
 
 class ProveedoresWindow(QMainWindow):
     """Módulo 1.3: Gestión CRUD de la tabla Proveedores."""
+    TABLAS = ("proveedores",)
+
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Proveedores.ui", self)
+        cargar_ui("Proveedores.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("1.3 Gestión de Proveedores")
@@ -295,10 +2512,15 @@ class ProveedoresWindow(QMainWindow):
         self.boton_agregar.clicked.connect(self.agregar_proveedor)
         self.boton_modificar.clicked.connect(self.modificar_proveedor)
         self.boton_eliminar.clicked.connect(self.inactivar_proveedor)
-        self.tabla_proveedores.cellClicked.connect(self.seleccionar_proveedor)
+        self.modelo_proveedores = ModeloTabla([("ID", lambda f, n: str(f[0])), ("Nombre", lambda f, n: f[1]), ("Contacto", lambda f, n: f[2] or ""),
+                                               ("Teléfono", lambda f, n: f[3] or ""), ("Activo", lambda f, n: "🟢 Sí" if f[4] else "🔴 No")],
+                                              fondo=lambda f, n, col: QColor(255, 200, 200) if col == 4 and not f[4] else None, parent=self)
+        self.tabla_proveedores.setModel(self.modelo_proveedores); self.tabla_proveedores.setSelectionBehavior(self.tabla_proveedores.SelectRows)
+        self.tabla_proveedores.clicked.connect(self.seleccionar_proveedor)
         self.cargar_datos_proveedores()
 
     def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.cargar_datos_proveedores()
     def limpiar_campos(self):
         self.entrada_nombre.clear(); self.entrada_contacto.clear(); self.entrada_telefono.clear()
         self.checkbox_activo.setChecked(True); self.proveedor_seleccionado_id = None
@@ -307,22 +2529,14 @@ class ProveedoresWindow(QMainWindow):
         query = "SELECT id_proveedor, nombre, contacto, telefono, activo FROM proveedores ORDER BY activo DESC, nombre ASC"
         ok, resultados = ejecutar_consulta_db(self.conexion, query, fetch=True)
         if not ok: return
-        self.tabla_proveedores.setRowCount(len(resultados)); self.tabla_proveedores.setColumnCount(5)
-        self.tabla_proveedores.setHorizontalHeaderLabels(["ID", "Nombre", "Contacto", "Teléfono", "Activo"])
-        for fila, datos in enumerate(resultados):
-            for col, valor in enumerate(datos):
-                item = QTableWidgetItem(str(valor)); item.setFlags(item.flags() & ~Qt.ItemIsEditable) 
-                if col == 4:
-                    estado_texto = "🟢 Sí" if valor == 1 else "🔴 No"; item.setText(estado_texto)
-                    if valor == 0: item.setBackground(QColor(255, 200, 200))
-                self.tabla_proveedores.setItem(fila, col, item)
+        self.modelo_proveedores.cargar(resultados)
         self.limpiar_campos()
-    def seleccionar_proveedor(self, fila, columna):
+    def seleccionar_proveedor(self, indice):
         try:
-            self.proveedor_seleccionado_id = int(self.tabla_proveedores.item(fila, 0).text())
-            self.entrada_nombre.setText(self.tabla_proveedores.item(fila, 1).text()); self.entrada_contacto.setText(self.tabla_proveedores.item(fila, 2).text())
-            self.entrada_telefono.setText(self.tabla_proveedores.item(fila, 3).text())
-            activo_str = self.tabla_proveedores.item(fila, 4).text(); is_activo = "Sí" in activo_str; self.checkbox_activo.setChecked(is_activo)
+            id_proveedor, nombre, contacto, telefono, activo = self.modelo_proveedores.fila(indice.row())
+            self.proveedor_seleccionado_id = int(id_proveedor)
+            self.entrada_nombre.setText(nombre); self.entrada_contacto.setText(contacto or ""); self.entrada_telefono.setText(telefono or "")
+            is_activo = bool(activo); self.checkbox_activo.setChecked(is_activo)
             self.boton_modificar.setEnabled(True); self.boton_eliminar.setEnabled(True); self.boton_eliminar.setText("🗑️ INACTIVAR" if is_activo else "🟢 ACTIVAR")
         except Exception as e: QMessageBox.critical(self, "Error de Selección", f"Error al seleccionar fila: {e}"); self.limpiar_campos()
     def agregar_proveedor(self):
@@ -349,16 +2563,17 @@ class ProveedoresWindow(QMainWindow):
 
 class RecetasWindow(QMainWindow):
     """Módulo 1.2: Definición de Recetas y Cálculo de CMV Base."""
+    TABLAS = ("productos", "recetas", "insumos")
+
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Recetas.ui", self)
+        cargar_ui("Recetas.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("1.2 Definición de Recetas y CMV")
         self.showMaximized()
         self.producto_seleccionado_id = None
-        self.productos_map = {}
-        self.insumos_map = {}
+        self.productos_map = {}; self.insumos_map = {}
         self.boton_volver_submenu.clicked.connect(self.volver_menu)
         self.combo_productos.currentIndexChanged.connect(self.cargar_receta_y_cmv)
         self.boton_agregar_insumo.clicked.connect(self.agregar_o_modificar_insumo_receta)
@@ -366,6 +2581,7 @@ class RecetasWindow(QMainWindow):
         self.cargar_comboboxes(); self.tabla_receta.setEditTriggers(self.tabla_receta.NoEditTriggers)
 
     def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.cargar_comboboxes()
 
     def cargar_comboboxes(self):
         query_productos = "SELECT id_producto, nombre, precio_venta FROM productos WHERE activo = TRUE ORDER BY nombre"
@@ -386,7 +2602,7 @@ class RecetasWindow(QMainWindow):
         id_p = self.producto_seleccionado_id; precio_venta = self.productos_map[id_p]['precio']; margen = precio_venta - cmv_total
         self.label_precio_venta_valor.setText(f"Precio Venta: $ {precio_venta:,.0f}"); self.label_cmv_actual.setText(f"CMV Estimado: $ {cmv_total:,.2f}")
         self.label_margen_contribucion.setText(f"Margen Contribución: $ {margen:,.2f}")
-        if margen < precio_venta * 0.40: self.label_margen_contribucion.setStyleSheet("color: #e74c3c; font-weight: bold;")
+        if margen < precio_venta * MARGEN_MINIMO_PCT / 100: self.label_margen_contribucion.setStyleSheet("color: #e74c3c; font-weight: bold;")
         else: self.label_margen_contribucion.setStyleSheet("color: #2ecc71; font-weight: bold;")
 
     def cargar_receta_y_cmv(self):
@@ -419,7 +2635,7 @@ class RecetasWindow(QMainWindow):
         if resultado_check: query = "UPDATE recetas SET cantidad_requerida = %s WHERE id_receta = %s"; params = (cantidad_requerida, resultado_check[0][0]); mensaje = f"Receta actualizada: Cantidad de {self.insumos_map[insumo_id]['nombre']} modificada."
         else: query = "INSERT INTO recetas (id_producto, id_insumo, cantidad_requerida) VALUES (%s, %s, %s)"; params = (self.producto_seleccionado_id, insumo_id, cantidad_requerida); mensaje = f"Receta actualizada: {self.insumos_map[insumo_id]['nombre']} agregado."
         ok_op, _ = ejecutar_consulta_db(self.conexion, query, params)
-        if ok_op: QMessageBox.information(self, "Éxito", mensaje); self.entrada_cantidad_requerida.clear(); self.cargar_receta_y_cmv()
+        if ok_op: CACHE_RECETAS.invalidar_producto(self.producto_seleccionado_id); QMessageBox.information(self, "Éxito", mensaje); self.entrada_cantidad_requerida.clear(); self.cargar_receta_y_cmv()
         else: QMessageBox.critical(self, "Error de DB", "No se pudo actualizar la receta.")
     def eliminar_insumo_receta(self):
         selected_rows = self.tabla_receta.selectionModel().selectedRows()
@@ -429,14 +2645,16 @@ class RecetasWindow(QMainWindow):
         confirmacion = QMessageBox.question(self, "Confirmar Eliminación", f"¿Desea eliminar '{nombre_insumo}' de la receta actual?", QMessageBox.Yes | QMessageBox.No)
         if confirmacion == QMessageBox.Yes:
             query = "DELETE FROM recetas WHERE id_receta = %s"; ok, _ = ejecutar_consulta_db(self.conexion, query, (id_receta,))
-            if ok: QMessageBox.information(self, "Éxito", f"'{nombre_insumo}' eliminado de la receta."); self.cargar_receta_y_cmv()
+            if ok: CACHE_RECETAS.invalidar_producto(self.producto_seleccionado_id); QMessageBox.information(self, "Éxito", f"'{nombre_insumo}' eliminado de la receta."); self.cargar_receta_y_cmv()
 
 
 class ControlStockWindow(QMainWindow):
     """Módulo 1.1: Visualización y Gestión de Entradas/Salidas/Pérdidas de Stock."""
+    TABLAS = ("proveedores",) + TABLAS_STOCK
+
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Control_Stock.ui", self)
+        cargar_ui("Control_Stock.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("1.1 Control de Stock y Alertas")
@@ -445,46 +2663,59 @@ class ControlStockWindow(QMainWindow):
         self.boton_recargar_tabla.clicked.connect(self.cargar_datos_stock)
         self.boton_registrar_compra.clicked.connect(self.registrar_compra)
         self.boton_registrar_perdida.clicked.connect(self.registrar_perdida)
-        self.combo_filtro_alertas.currentIndexChanged.connect(self.cargar_datos_stock)
-        self.cargar_datos_stock()
+        self.boton_recepcion_factura.clicked.connect(self.ir_a_recepcion)
+        self.combo_filtro_alertas.currentIndexChanged.connect(self.aplicar_filtro)
+        self.modelo_stock = ModeloTabla([
+            ("ID", lambda f, n: str(f[0])), ("Insumo", lambda f, n: f[1]), ("Unidad", lambda f, n: f[2]), ("Stock Actual", lambda f, n: f"{float(f[3]):.2f}"),
+            ("Stock Mínimo", lambda f, n: f"{float(f[4]):.2f}"), ("Costo Promedio (CLP)", lambda f, n: f"${float(f[5]):,.2f}"), ("Proveedor Principal", lambda f, n: f[6] or ""),
+            ("Estado", lambda f, n: ("🚨 SIN STOCK" if float(f[3]) <= 0 else "⚠️ CRÍTICO") if f[7] else "🟢 OK")],
+            fondo=lambda f, n, col: QColor(255, 230, 230) if f[7] else None, parent=self)
+        self.filtro_stock = FiltroTabla(self.modelo_stock, self); self.posicion_insumo = {}
+        self.tabla_stock_insumos.setModel(self.filtro_stock); self.tabla_stock_insumos.setSelectionBehavior(self.tabla_stock_insumos.SelectRows)
+        self.cargar_datos_stock(); self.aplicar_filtro()
 
     def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.cargar_datos_stock()
     
-    def cargar_datos_stock(self):
-        query = """
+    CONSULTA_STOCK = """
         SELECT i.id_insumo, i.nombre, i.unidad_medida, i.stock_actual, i.stock_minimo, 
                i.costo_promedio, p.nombre AS proveedor_principal, i.stock_actual <= i.stock_minimo AS es_critico
         FROM insumos i LEFT JOIN proveedores p ON i.id_proveedor_principal = p.id_proveedor
         WHERE i.activo = TRUE
         """
-        filtro = self.combo_filtro_alertas.currentText()
-        if 'Críticos' in filtro or 'Bajo Stock' in filtro: query += " AND i.stock_actual <= i.stock_minimo"
-        elif 'Suficiente' in filtro: query += " AND i.stock_actual > i.stock_minimo"
-        ok, resultados = ejecutar_consulta_db(self.conexion, query, fetch=True)
-        if not ok: self.tabla_stock_insumos.setRowCount(0); return
-        columnas = ["ID", "Insumo", "Unidad", "Stock Actual", "Stock Mínimo", "Costo Promedio (CLP)", "Proveedor Principal", "Estado"]
-        self.tabla_stock_insumos.setRowCount(len(resultados)); self.tabla_stock_insumos.setColumnCount(len(columnas)); self.tabla_stock_insumos.setHorizontalHeaderLabels(columnas)
-        self.lista_alertas.clear(); insumos_en_alerta = []; insumo_nombres = {}
-        for fila, datos in enumerate(resultados):
-            insumo_id, insumo_nombre, unidad, stock_actual, stock_minimo, costo_promedio, proveedor, es_critico = datos
-            stock_actual, stock_minimo = float(stock_actual), float(stock_minimo)
-            insumo_nombres[insumo_id] = insumo_nombre
-            for col, valor in enumerate(datos):
-                item = QTableWidgetItem(str(valor)); item.setFlags(item.flags() & ~Qt.ItemIsEditable) 
-                if es_critico:
-                    item.setBackground(QColor(255, 230, 230))
-                    if col == 7:
-                        estado_texto = "🚨 SIN STOCK" if stock_actual <= 0 else "⚠️ CRÍTICO"; item.setText(estado_texto)
-                        if stock_actual <= stock_minimo:
-                            tipo = "SIN STOCK" if stock_actual <= 0 else "CRÍTICO"; alerta_msg = f"⚠️ {insumo_nombre} (ID {insumo_id}): {stock_actual:.2f} {unidad}. ¡{tipo}!"; insumos_en_alerta.append(alerta_msg)
-                elif col == 7: item.setText("🟢 OK")
-                if col == 5: item.setText(f"${float(valor):,.2f}")
-                if col == 3 or col == 4: item.setText(f"{float(valor):.2f}")
-                self.tabla_stock_insumos.setItem(fila, col, item)
-        self.lista_alertas.addItems(insumos_en_alerta); self.combo_insumo_compra.clear(); self.combo_insumo_perdida.clear()
-        insumo_lista_formato = [f"{id} - {nombre}" for id, nombre in insumo_nombres.items()]
+
+    def cargar_datos_stock(self):
+        ok, resultados = ejecutar_consulta_db(self.conexion, self.CONSULTA_STOCK, fetch=True)
+        if not ok: self.modelo_stock.cargar([]); self.posicion_insumo = {}; return
+        self.modelo_stock.cargar(resultados); self.posicion_insumo = {datos[0]: n_fila for n_fila, datos in enumerate(resultados)}
+        self.combo_insumo_compra.clear(); self.combo_insumo_perdida.clear()
+        insumo_lista_formato = [f"{datos[0]} - {datos[1]}" for datos in resultados]
         self.combo_insumo_compra.addItems(insumo_lista_formato); self.combo_insumo_perdida.addItems(insumo_lista_formato)
-        QMessageBox.information(self, "Información", f"Se cargaron {len(resultados)} insumos y {len(insumos_en_alerta)} alertas activas.")
+        ALERTAS_STOCK.cargar(self.conexion); self.actualizar_alertas()
+        self.statusbar.showMessage(f"Se cargaron {len(resultados)} insumos y {ALERTAS_STOCK.criticos} alertas activas.")
+
+    def ir_a_recepcion(self): VENTANAS.abrir(RecepcionComprasWindow, self)
+
+    def refrescar_insumos(self, ids_insumos):
+        """Vuelve a leer solo las filas de los insumos modificados y las parcha en el modelo (sin recargar la tabla ni los combos)."""
+        ids_insumos = sorted(set(ids_insumos)); marcadores = ", ".join(["%s"] * len(ids_insumos))
+        ok, resultados = ejecutar_consulta_db(self.conexion, self.CONSULTA_STOCK + f" AND i.id_insumo IN ({marcadores})", ids_insumos, fetch=True)
+        if not ok or len(resultados) != len(ids_insumos) or any(datos[0] not in self.posicion_insumo for datos in resultados): self.cargar_datos_stock(); return
+        for datos in resultados: self.modelo_stock.actualizar_fila(self.posicion_insumo[datos[0]], datos)
+        ALERTAS_STOCK.refrescar(self.conexion, ids_insumos); self.actualizar_alertas()
+
+    def actualizar_alertas(self):
+        gravedad = list(ETIQUETAS_ALERTA)
+        alertas = sorted(ALERTAS_STOCK.activas.items(), key=lambda par: (gravedad.index(par[1][0]), par[1][3]))
+        self.lista_alertas.clear()
+        self.lista_alertas.addItems([f"⚠️ {nombre} (ID {insumo_id}): {float(nivel):.2f} {unidad} (mín. {float(minimo):.2f}). ¡{ETIQUETAS_ALERTA[tipo]}!"
+                                     for insumo_id, (tipo, nivel, minimo, nombre, unidad) in alertas])
+
+    def aplicar_filtro(self):
+        filtro = self.combo_filtro_alertas.currentText()
+        if 'Críticos' in filtro or 'Bajo Stock' in filtro: self.filtro_stock.filtrar(lambda datos: bool(datos[7]))
+        elif 'Suficiente' in filtro: self.filtro_stock.filtrar(lambda datos: not datos[7])
+        else: self.filtro_stock.filtrar(None)
 
     def registrar_compra(self):
         insumo_seleccionado = self.combo_insumo_compra.currentText()
@@ -492,23 +2723,13 @@ class ControlStockWindow(QMainWindow):
         try: insumo_id = int(insumo_seleccionado.split(' - ')[0]); cantidad = float(self.entrada_cantidad_compra.text()); costo_unitario = float(self.entrada_costo_unitario.text())
         except ValueError: QMessageBox.critical(self, "Error de Entrada", "Cantidad y Costo deben ser números válidos."); return
         if cantidad <= 0 or costo_unitario <= 0: QMessageBox.warning(self, "Advertencia", "Cantidad y Costo Unitario deben ser mayores a cero."); return
-        query_actual = "SELECT stock_actual, costo_promedio FROM insumos WHERE id_insumo = %s"
-        ok, datos_actuales = ejecutar_consulta_db(self.conexion, query_actual, (insumo_id,), fetch=True)
-        if not ok or not datos_actuales: return
-        stock_actual, costo_promedio_actual = float(datos_actuales[0][0]), float(datos_actuales[0][1])
-        costo_total_antiguo = stock_actual * costo_promedio_actual; costo_total_nuevo = cantidad * costo_unitario
-        stock_total_nuevo = stock_actual + cantidad
-        nuevo_costo_promedio = (costo_total_antiguo + costo_total_nuevo) / stock_total_nuevo if stock_total_nuevo > 0 else costo_unitario 
         try:
-            cursor = self.conexion.cursor()
-            query_movimiento = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, costo_unitario, motivo) VALUES (%s, 'entrada', %s, %s, 'Compra registrada')"
-            cursor.execute(query_movimiento, (insumo_id, cantidad, costo_unitario))
-            query_insumo_update = "UPDATE insumos SET stock_actual = %s, costo_promedio = %s WHERE id_insumo = %s"
-            cursor.execute(query_insumo_update, (stock_total_nuevo, nuevo_costo_promedio, insumo_id))
-            self.conexion.commit()
+            ok, resultado = en_transaccion(self.conexion, lambda cursor: registrar_recepcion_db(cursor, None, [(insumo_id, cantidad, costo_unitario)]))
+            if not ok: QMessageBox.critical(self, "Error de Compra", resultado); return
+            CACHE_RECETAS.invalidar_insumo(insumo_id); VERSIONES_TABLAS.tocar(self.conexion, *TABLAS_STOCK, desde=datetime.date.today())
             QMessageBox.information(self, "Éxito", "Compra registrada y costo promedio actualizado.")
-            self.cargar_datos_stock(); self.entrada_cantidad_compra.clear(); self.entrada_costo_unitario.clear()
-        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al registrar la compra:\n{str(e)}"); self.conexion.rollback()
+            self.refrescar_insumos([insumo_id]); self.entrada_cantidad_compra.clear(); self.entrada_costo_unitario.clear()
+        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al registrar la compra:\n{str(e)}")
 
     def registrar_perdida(self):
         insumo_seleccionado = self.combo_insumo_perdida.currentText()
@@ -517,236 +2738,123 @@ class ControlStockWindow(QMainWindow):
         except ValueError: QMessageBox.critical(self, "Error de Entrada", "La cantidad debe ser un número válido."); return
         if cantidad_perdida <= 0: QMessageBox.warning(self, "Advertencia", "La cantidad de pérdida debe ser mayor a cero."); return
         if not motivo: QMessageBox.warning(self, "Advertencia", "Debe especificar un motivo para la pérdida."); return
-        query_actual = "SELECT stock_actual FROM insumos WHERE id_insumo = %s"
-        ok, datos_actuales = ejecutar_consulta_db(self.conexion, query_actual, (insumo_id,), fetch=True)
-        if not ok or not datos_actuales: return
-        stock_actual = float(datos_actuales[0][0])
-        if cantidad_perdida > stock_actual: QMessageBox.critical(self, "Error de Stock", f"La pérdida ({cantidad_perdida}) es mayor al stock actual ({stock_actual})."); return
-        stock_final = stock_actual - cantidad_perdida
         try:
-            cursor = self.conexion.cursor()
-            query_movimiento = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, motivo) VALUES (%s, 'perdida', %s, %s)"
-            cursor.execute(query_movimiento, (insumo_id, cantidad_perdida, motivo))
-            query_insumo_update = "UPDATE insumos SET stock_actual = %s WHERE id_insumo = %s"
-            cursor.execute(query_insumo_update, (stock_final, insumo_id))
-            self.conexion.commit()
+            ok, resultado = en_transaccion(self.conexion, lambda cursor: registrar_perdida_db(cursor, insumo_id, cantidad_perdida, motivo))
+            if not ok: QMessageBox.critical(self, "Error de Stock", resultado); return
+            CACHE_RECETAS.invalidar_insumo(insumo_id); VERSIONES_TABLAS.tocar(self.conexion, *TABLAS_STOCK, desde=datetime.date.today())
             QMessageBox.information(self, "Éxito", f"Pérdida de {cantidad_perdida} registrada. Stock actualizado.")
-            self.cargar_datos_stock(); self.entrada_cantidad_perdida.clear(); self.entrada_motivo_perdida.clear()
-        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al registrar la pérdida:\n{str(e)}"); self.conexion.rollback()
-
+            self.refrescar_insumos([insumo_id]); self.entrada_cantidad_perdida.clear(); self.entrada_motivo_perdida.clear()
+        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al registrar la pérdida:\n{str(e)}")
 
-class InventarioWindow(QMainWindow):
-    """Módulo 1: Gestión de Inventario (Submenú)."""
-    def __init__(self, parent_window, conexion):
-        super().__init__()
-        loadUi("Submenu_Inventario.ui", self)
-        self.conexion = conexion
-        self.parent_window = parent_window
-        self.setWindowTitle("Módulo 1: Gestión de Inventario")
-        self.boton_control_stock.clicked.connect(self.ir_a_control_stock)
-        self.boton_config_recetas.clicked.connect(self.ir_a_recetas)
-        self.boton_gestion_proveedores.clicked.connect(self.ir_a_proveedores)
-        self.boton_volver_menu.clicked.connect(self.volver_menu)
-        self.show()
-    def volver_menu(self): self.parent_window.show(); self.hide()
-    def navegar_a_submodulo(self, SubmoduloClase): self.modulo_actual = SubmoduloClase(self, self.conexion); self.hide()
-    def ir_a_control_stock(self): self.navegar_a_submodulo(ControlStockWindow)
-    def ir_a_recetas(self): self.navegar_a_submodulo(RecetasWindow)
-    def ir_a_proveedores(self): self.navegar_a_submodulo(ProveedoresWindow)
 
+class RecepcionComprasWindow(QMainWindow):
+    """Módulo 1.1.1: Recepción de una factura de proveedor completa (grilla o CSV) en una sola transacción."""
+    TABLAS = ("proveedores", "insumos")
+    COLUMNAS_CSV = {'insumo': ('id_insumo', 'insumo', 'nombre'), 'cantidad': ('cantidad',), 'costo': ('costo_unitario', 'costo')}
 
-class RecetasWindow(QMainWindow):
-    """Módulo 1.2: Definición de Recetas y Cálculo de CMV Base."""
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Recetas.ui", self)
-        self.conexion = conexion
-        self.parent_window = parent_window
-        self.setWindowTitle("1.2 Definición de Recetas y CMV")
-        self.showMaximized()
-        self.producto_seleccionado_id = None
-        self.productos_map = {}; self.insumos_map = {}
-        self.boton_volver_submenu.clicked.connect(self.volver_menu)
-        self.combo_productos.currentIndexChanged.connect(self.cargar_receta_y_cmv)
-        self.boton_agregar_insumo.clicked.connect(self.agregar_o_modificar_insumo_receta)
-        self.boton_eliminar_insumo.clicked.connect(self.eliminar_insumo_receta)
-        self.cargar_comboboxes(); self.tabla_receta.setEditTriggers(self.tabla_receta.NoEditTriggers)
-
-    def volver_menu(self): self.parent_window.show(); self.hide()
-
-    def cargar_comboboxes(self):
-        query_productos = "SELECT id_producto, nombre, precio_venta FROM productos WHERE activo = TRUE ORDER BY nombre"
-        ok_p, productos = ejecutar_consulta_db(self.conexion, query_productos, fetch=True)
-        if ok_p:
-            self.combo_productos.clear(); self.productos_map = {}
-            for id_p, nombre, precio in productos: self.productos_map[id_p] = {'nombre': nombre, 'precio': float(precio)}; self.combo_productos.addItem(f"{id_p} - {nombre}")
-            if self.combo_productos.count() > 0: self.cargar_receta_y_cmv()
-        query_insumos = "SELECT id_insumo, nombre, unidad_medida, costo_promedio FROM insumos WHERE activo = TRUE ORDER BY nombre"
-        ok_i, insumos = ejecutar_consulta_db(self.conexion, query_insumos, fetch=True)
-        if ok_i:
-            self.combo_insumo_nuevo.clear(); self.insumos_map = {}
-            for id_i, nombre, unidad, costo in insumos: self.insumos_map[id_i] = {'nombre': nombre, 'unidad': unidad, 'costo_promedio': float(costo)}; self.combo_insumo_nuevo.addItem(f"{id_i} - {nombre} ({unidad})")
-
-    def calcular_cmv_y_margen(self, receta_actual):
-        cmv_total = sum(float(insumo[4]) for insumo in receta_actual)
-        if self.producto_seleccionado_id not in self.productos_map: return
-        id_p = self.producto_seleccionado_id; precio_venta = self.productos_map[id_p]['precio']; margen = precio_venta - cmv_total
-        self.label_precio_venta_valor.setText(f"Precio Venta: $ {precio_venta:,.0f}"); self.label_cmv_actual.setText(f"CMV Estimado: $ {cmv_total:,.2f}")
-        self.label_margen_contribucion.setText(f"Margen Contribución: $ {margen:,.2f}")
-        if margen < precio_venta * 0.40: self.label_margen_contribucion.setStyleSheet("color: #e74c3c; font-weight: bold;")
-        else: self.label_margen_contribucion.setStyleSheet("color: #2ecc71; font-weight: bold;")
-
-    def cargar_receta_y_cmv(self):
-        item_texto = self.combo_productos.currentText()
-        if not item_texto: self.tabla_receta.setRowCount(0); return
-        try: self.producto_seleccionado_id = int(item_texto.split(' - ')[0])
-        except ValueError: self.tabla_receta.setRowCount(0); return
-        query = "SELECT r.id_receta, r.id_insumo, i.nombre, r.cantidad_requerida, i.unidad_medida, i.costo_promedio FROM recetas r JOIN insumos i ON r.id_insumo = i.id_insumo WHERE r.id_producto = %s ORDER BY i.nombre"
-        ok, resultados = ejecutar_consulta_db(self.conexion, query, (self.producto_seleccionado_id,), fetch=True)
-        if not ok: self.tabla_receta.setRowCount(0); return
-        self.tabla_receta.setRowCount(len(resultados)); receta_actual_data = [] 
-        for fila, datos in enumerate(resultados):
-            id_receta, id_insumo, nombre, cantidad, unidad, costo_promedio = datos
-            costo_cmv = float(cantidad) * float(costo_promedio)
-            self.tabla_receta.setItem(fila, 0, QTableWidgetItem(str(id_receta))); self.tabla_receta.setItem(fila, 1, QTableWidgetItem(str(id_insumo)))
-            self.tabla_receta.setItem(fila, 2, QTableWidgetItem(nombre)); self.tabla_receta.setItem(fila, 3, QTableWidgetItem(f"{float(cantidad):.3f}"))
-            self.tabla_receta.setItem(fila, 4, QTableWidgetItem(unidad)); self.tabla_receta.setItem(fila, 5, QTableWidgetItem(f"$ {costo_cmv:,.2f}"))
-            receta_actual_data.append((id_insumo, nombre, cantidad, unidad, costo_cmv))
-        self.calcular_cmv_y_margen(receta_actual_data)
-    def agregar_o_modificar_insumo_receta(self):
-        if self.producto_seleccionado_id is None: QMessageBox.warning(self, "Advertencia", "Debe seleccionar un producto (Roll) primero."); return
-        insumo_texto = self.combo_insumo_nuevo.currentText()
-        if not insumo_texto: QMessageBox.warning(self, "Advertencia", "Debe seleccionar un insumo."); return
-        try: insumo_id = int(insumo_texto.split(' - ')[0]); cantidad_requerida = float(self.entrada_cantidad_requerida.text())
-        except ValueError: QMessageBox.critical(self, "Error de Entrada", "Cantidad debe ser un número decimal válido."); return
-        if cantidad_requerida <= 0: QMessageBox.warning(self, "Advertencia", "La cantidad requerida debe ser mayor a cero."); return
-        query_check = "SELECT id_receta FROM recetas WHERE id_producto = %s AND id_insumo = %s"
-        ok, resultado_check = ejecutar_consulta_db(self.conexion, query_check, (self.producto_seleccionado_id, insumo_id), fetch=True)
-        if not ok: return
-        if resultado_check: query = "UPDATE recetas SET cantidad_requerida = %s WHERE id_receta = %s"; params = (cantidad_requerida, resultado_check[0][0]); mensaje = f"Receta actualizada: Cantidad de {self.insumos_map[insumo_id]['nombre']} modificada."
-        else: query = "INSERT INTO recetas (id_producto, id_insumo, cantidad_requerida) VALUES (%s, %s, %s)"; params = (self.producto_seleccionado_id, insumo_id, cantidad_requerida); mensaje = f"Receta actualizada: {self.insumos_map[insumo_id]['nombre']} agregado."
-        ok_op, _ = ejecutar_consulta_db(self.conexion, query, params)
-        if ok_op: QMessageBox.information(self, "Éxito", mensaje); self.entrada_cantidad_requerida.clear(); self.cargar_receta_y_cmv()
-        else: QMessageBox.critical(self, "Error de DB", "No se pudo actualizar la receta.")
-    def eliminar_insumo_receta(self):
-        selected_rows = self.tabla_receta.selectionModel().selectedRows()
-        if not selected_rows: QMessageBox.warning(self, "Advertencia", "Seleccione un insumo de la receta para eliminar."); return
-        fila_seleccionada = selected_rows[0].row(); id_receta = self.tabla_receta.item(fila_seleccionada, 0).text()
-        nombre_insumo = self.tabla_receta.item(fila_seleccionada, 2).text()
-        confirmacion = QMessageBox.question(self, "Confirmar Eliminación", f"¿Desea eliminar '{nombre_insumo}' de la receta actual?", QMessageBox.Yes | QMessageBox.No)
-        if confirmacion == QMessageBox.Yes:
-            query = "DELETE FROM recetas WHERE id_receta = %s"; ok, _ = ejecutar_consulta_db(self.conexion, query, (id_receta,))
-            if ok: QMessageBox.information(self, "Éxito", f"'{nombre_insumo}' eliminado de la receta."); self.cargar_receta_y_cmv()
-
-
-class ControlStockWindow(QMainWindow):
-    """Módulo 1.1: Visualización y Gestión de Entradas/Salidas/Pérdidas de Stock."""
-    def __init__(self, parent_window, conexion):
-        super().__init__()
-        loadUi("Control_Stock.ui", self)
-        self.conexion = conexion
-        self.parent_window = parent_window
-        self.setWindowTitle("1.1 Control de Stock y Alertas")
-        self.showMaximized()
-        self.boton_volver_submenu.clicked.connect(self.volver_menu)
-        self.boton_recargar_tabla.clicked.connect(self.cargar_datos_stock)
-        self.boton_registrar_compra.clicked.connect(self.registrar_compra)
-        self.boton_registrar_perdida.clicked.connect(self.registrar_perdida)
-        self.combo_filtro_alertas.currentIndexChanged.connect(self.cargar_datos_stock)
-        self.cargar_datos_stock()
+        self.conexion = conexion; self.parent_window = parent_window
+        self.setWindowTitle("1.1.1 Recepción de Factura de Proveedor"); self.showMaximized()
+        self.insumos_por_id = {}; self.insumos_por_nombre = {}
+        temp_widget = QWidget(); temp_layout = QVBoxLayout(temp_widget); cabecera = QHBoxLayout(); acciones = QHBoxLayout()
+        self.combo_proveedor = QComboBox(); self.entrada_documento = QLineEdit(); self.entrada_documento.setPlaceholderText("N° de factura / guía")
+        cabecera.addWidget(QLabel("Proveedor:")); cabecera.addWidget(self.combo_proveedor, 2); cabecera.addWidget(QLabel("Documento:")); cabecera.addWidget(self.entrada_documento, 1)
+        self.tabla_lineas = QTableWidget(0, 3); self.tabla_lineas.setHorizontalHeaderLabels(["Insumo (ID o nombre)", "Cantidad", "Costo Unitario (CLP)"])
+        self.tabla_lineas.horizontalHeader().setStretchLastSection(True); self.tabla_lineas.itemChanged.connect(self.actualizar_total)
+        self.label_total = QLabel("Total factura: $ 0")
+        botones = [("➕ Agregar Línea", "#3498db", lambda: self.agregar_linea()), ("➖ Eliminar Línea", "#e67e22", self.eliminar_linea),
+                   ("📄 Cargar CSV", "#8e44ad", self.cargar_csv), ("✅ REGISTRAR RECEPCIÓN", "#2ecc71", self.registrar_recepcion)]
+        for texto, color, accion in botones:
+            boton = QPushButton(texto); boton.setStyleSheet(f"background-color: {color}; color: white; min-height: 35px; border-radius: 8px; font-weight: bold;")
+            boton.clicked.connect(accion); acciones.addWidget(boton)
+        self.volver_button = QPushButton("⬅️ Volver a Control de Stock")
+        self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
+        self.volver_button.clicked.connect(self.volver_menu)
+        temp_layout.addLayout(cabecera); temp_layout.addWidget(self.tabla_lineas, 1); temp_layout.addWidget(self.label_total); temp_layout.addLayout(acciones); temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget)
+        self.cargar_catalogos(); self.agregar_linea()
 
     def volver_menu(self): self.parent_window.show(); self.hide()
-    
-    def cargar_datos_stock(self):
-        query = """
-        SELECT i.id_insumo, i.nombre, i.unidad_medida, i.stock_actual, i.stock_minimo, 
-               i.costo_promedio, p.nombre AS proveedor_principal, i.stock_actual <= i.stock_minimo AS es_critico
-        FROM insumos i LEFT JOIN proveedores p ON i.id_proveedor_principal = p.id_proveedor
-        WHERE i.activo = TRUE
-        """
-        filtro = self.combo_filtro_alertas.currentText()
-        if 'Críticos' in filtro or 'Bajo Stock' in filtro: query += " AND i.stock_actual <= i.stock_minimo"
-        elif 'Suficiente' in filtro: query += " AND i.stock_actual > i.stock_minimo"
-        ok, resultados = ejecutar_consulta_db(self.conexion, query, fetch=True)
-        if not ok: self.tabla_stock_insumos.setRowCount(0); return
-        columnas = ["ID", "Insumo", "Unidad", "Stock Actual", "Stock Mínimo", "Costo Promedio (CLP)", "Proveedor Principal", "Estado"]
-        self.tabla_stock_insumos.setRowCount(len(resultados)); self.tabla_stock_insumos.setColumnCount(len(columnas)); self.tabla_stock_insumos.setHorizontalHeaderLabels(columnas)
-        self.lista_alertas.clear(); insumos_en_alerta = []; insumo_nombres = {}
-        for fila, datos in enumerate(resultados):
-            insumo_id, insumo_nombre, unidad, stock_actual, stock_minimo, costo_promedio, proveedor, es_critico = datos
-            stock_actual, stock_minimo = float(stock_actual), float(stock_minimo)
-            insumo_nombres[insumo_id] = insumo_nombre
-            for col, valor in enumerate(datos):
-                item = QTableWidgetItem(str(valor)); item.setFlags(item.flags() & ~Qt.ItemIsEditable) 
-                if es_critico:
-                    item.setBackground(QColor(255, 230, 230))
-                    if col == 7:
-                        estado_texto = "🚨 SIN STOCK" if stock_actual <= 0 else "⚠️ CRÍTICO"; item.setText(estado_texto)
-                        if stock_actual <= stock_minimo:
-                            tipo = "SIN STOCK" if stock_actual <= 0 else "CRÍTICO"; alerta_msg = f"⚠️ {insumo_nombre} (ID {insumo_id}): {stock_actual:.2f} {unidad}. ¡{tipo}!"; insumos_en_alerta.append(alerta_msg)
-                elif col == 7: item.setText("🟢 OK")
-                if col == 5: item.setText(f"${float(valor):,.2f}")
-                if col == 3 or col == 4: item.setText(f"{float(valor):.2f}")
-                self.tabla_stock_insumos.setItem(fila, col, item)
-        self.lista_alertas.addItems(insumos_en_alerta); self.combo_insumo_compra.clear(); self.combo_insumo_perdida.clear()
-        insumo_lista_formato = [f"{id} - {nombre}" for id, nombre in insumo_nombres.items()]
-        self.combo_insumo_compra.addItems(insumo_lista_formato); self.combo_insumo_perdida.addItems(insumo_lista_formato)
-        QMessageBox.information(self, "Información", f"Se cargaron {len(resultados)} insumos y {len(insumos_en_alerta)} alertas activas.")
-
-    def registrar_compra(self):
-        insumo_seleccionado = self.combo_insumo_compra.currentText()
-        if not insumo_seleccionado: QMessageBox.warning(self, "Advertencia", "Debe seleccionar un insumo."); return
-        try: insumo_id = int(insumo_seleccionado.split(' - ')[0]); cantidad = float(self.entrada_cantidad_compra.text()); costo_unitario = float(self.entrada_costo_unitario.text())
-        except ValueError: QMessageBox.critical(self, "Error de Entrada", "Cantidad y Costo deben ser números válidos."); return
-        if cantidad <= 0 or costo_unitario <= 0: QMessageBox.warning(self, "Advertencia", "Cantidad y Costo Unitario deben ser mayores a cero."); return
-        query_actual = "SELECT stock_actual, costo_promedio FROM insumos WHERE id_insumo = %s"
-        ok, datos_actuales = ejecutar_consulta_db(self.conexion, query_actual, (insumo_id,), fetch=True)
-        if not ok or not datos_actuales: return
-        stock_actual, costo_promedio_actual = float(datos_actuales[0][0]), float(datos_actuales[0][1])
-        costo_total_antiguo = stock_actual * costo_promedio_actual; costo_total_nuevo = cantidad * costo_unitario
-        stock_total_nuevo = stock_actual + cantidad
-        nuevo_costo_promedio = (costo_total_antiguo + costo_total_nuevo) / stock_total_nuevo if stock_total_nuevo > 0 else costo_unitario 
+    def refrescar(self): self.cargar_catalogos()
+
+    def cargar_catalogos(self):
+        ok_p, proveedores = ejecutar_consulta_db(self.conexion, "SELECT id_proveedor, nombre FROM proveedores WHERE activo = TRUE ORDER BY nombre", fetch=True)
+        if ok_p: self.combo_proveedor.clear(); self.combo_proveedor.addItems([f"{id_p} - {nombre}" for id_p, nombre in proveedores])
+        ok_i, insumos = ejecutar_consulta_db(self.conexion, "SELECT id_insumo, nombre FROM insumos WHERE activo = TRUE", fetch=True)
+        if ok_i: self.insumos_por_id = dict(insumos); self.insumos_por_nombre = {nombre.strip().lower(): id_i for id_i, nombre in insumos}
+
+    def agregar_linea(self, valores=("", "", "")):
+        fila = self.tabla_lineas.rowCount(); self.tabla_lineas.insertRow(fila)
+        for col, valor in enumerate(valores): self.tabla_lineas.setItem(fila, col, QTableWidgetItem(str(valor)))
+
+    def eliminar_linea(self):
+        selected_rows = self.tabla_lineas.selectionModel().selectedRows() or self.tabla_lineas.selectedIndexes()
+        if not selected_rows: QMessageBox.warning(self, "Advertencia", "Seleccione una línea de la factura para eliminar."); return
+        self.tabla_lineas.removeRow(selected_rows[0].row()); self.actualizar_total()
+
+    def cargar_csv(self):
+        import csv
+        ruta, _ = QFileDialog.getOpenFileName(self, "Cargar Factura de Proveedor", "", "Archivos CSV (*.csv)")
+        if not ruta: return
         try:
-            cursor = self.conexion.cursor()
-            query_movimiento = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, costo_unitario, motivo) VALUES (%s, 'entrada', %s, %s, 'Compra registrada')"
-            cursor.execute(query_movimiento, (insumo_id, cantidad, costo_unitario))
-            query_insumo_update = "UPDATE insumos SET stock_actual = %s, costo_promedio = %s WHERE id_insumo = %s"
-            cursor.execute(query_insumo_update, (stock_total_nuevo, nuevo_costo_promedio, insumo_id))
-            self.conexion.commit()
-            QMessageBox.information(self, "Éxito", "Compra registrada y costo promedio actualizado.")
-            self.cargar_datos_stock(); self.entrada_cantidad_compra.clear(); self.entrada_costo_unitario.clear()
-        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al registrar la compra:\n{str(e)}"); self.conexion.rollback()
-
-    def registrar_perdida(self):
-        insumo_seleccionado = self.combo_insumo_perdida.currentText()
-        if not insumo_seleccionado: QMessageBox.warning(self, "Advertencia", "Debe seleccionar un insumo."); return
-        try: insumo_id = int(insumo_seleccionado.split(' - ')[0]); cantidad_perdida = float(self.entrada_cantidad_perdida.text()); motivo = self.entrada_motivo_perdida.text()
-        except ValueError: QMessageBox.critical(self, "Error de Entrada", "La cantidad debe ser un número válido."); return
-        if cantidad_perdida <= 0: QMessageBox.warning(self, "Advertencia", "La cantidad de pérdida debe ser mayor a cero."); return
-        if not motivo: QMessageBox.warning(self, "Advertencia", "Debe especificar un motivo para la pérdida."); return
-        query_actual = "SELECT stock_actual FROM insumos WHERE id_insumo = %s"
-        ok, datos_actuales = ejecutar_consulta_db(self.conexion, query_actual, (insumo_id,), fetch=True)
-        if not ok or not datos_actuales: return
-        stock_actual = float(datos_actuales[0][0])
-        if cantidad_perdida > stock_actual: QMessageBox.critical(self, "Error de Stock", f"La pérdida ({cantidad_perdida}) es mayor al stock actual ({stock_actual})."); return
-        stock_final = stock_actual - cantidad_perdida
+            with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+                muestra = archivo.read(4096); archivo.seek(0)
+                separador = ';' if muestra.count(';') > muestra.count(',') else ','
+                lector = csv.DictReader(archivo, delimiter=separador)
+                encabezados = {campo.strip().lower(): campo for campo in lector.fieldnames or []}
+                columnas = {clave: next((encabezados[alias] for alias in alias_validos if alias in encabezados), None) for clave, alias_validos in self.COLUMNAS_CSV.items()}
+                if None in columnas.values(): QMessageBox.critical(self, "Error de CSV", "El archivo debe tener columnas insumo (o id_insumo), cantidad y costo_unitario."); return
+                numero = (lambda texto: texto.strip().replace(',', '.')) if separador == ';' else (lambda texto: texto.strip())
+                lineas = [(fila[columnas['insumo']].strip(), numero(fila[columnas['cantidad']]), numero(fila[columnas['costo']])) for fila in lector]
+        except (OSError, UnicodeDecodeError, csv.Error) as e: QMessageBox.critical(self, "Error de CSV", f"No se pudo leer el archivo:\n{e}"); return
+        self.tabla_lineas.blockSignals(True); self.tabla_lineas.setRowCount(0)
+        for linea in lineas: self.agregar_linea(linea)
+        self.tabla_lineas.blockSignals(False); self.actualizar_total()
+
+    def leer_lineas(self):
+        """Valida la grilla y retorna (lineas, errores) con lineas = [(id_insumo, cantidad, costo_unitario)]."""
+        lineas = []; errores = []
+        for fila in range(self.tabla_lineas.rowCount()):
+            textos = [(self.tabla_lineas.item(fila, col).text().strip() if self.tabla_lineas.item(fila, col) else "") for col in range(3)]
+            if not any(textos): continue
+            insumo_texto, cantidad_texto, costo_texto = textos
+            id_insumo = int(insumo_texto) if insumo_texto.isdigit() else self.insumos_por_nombre.get(insumo_texto.lower())
+            if id_insumo not in self.insumos_por_id: errores.append(f"Línea {fila + 1}: insumo '{insumo_texto}' no existe o está inactivo."); continue
+            try: cantidad = float(cantidad_texto); costo_unitario = float(costo_texto)
+            except ValueError: errores.append(f"Línea {fila + 1}: cantidad y costo deben ser números válidos."); continue
+            if cantidad <= 0 or costo_unitario <= 0: errores.append(f"Línea {fila + 1}: cantidad y costo deben ser mayores a cero."); continue
+            lineas.append((id_insumo, cantidad, costo_unitario))
+        return lineas, errores
+
+    def actualizar_total(self, *args):
+        lineas, errores = self.leer_lineas()
+        self.label_total.setText(f"Total factura: $ {sum(cantidad * costo for _, cantidad, costo in lineas):,.0f} ({len(lineas)} líneas válidas" + (f", {len(errores)} con errores)" if errores else ")"))
+
+    def registrar_recepcion(self):
+        if not self.combo_proveedor.currentText(): QMessageBox.warning(self, "Advertencia", "Debe seleccionar un proveedor."); return
+        lineas, errores = self.leer_lineas()
+        if errores: QMessageBox.critical(self, "Error de Entrada", "\n".join(errores[:20])); return
+        if not lineas: QMessageBox.warning(self, "Advertencia", "La factura no tiene líneas."); return
+        id_proveedor = int(self.combo_proveedor.currentText().split(' - ')[0]); documento = self.entrada_documento.text().strip()
+        total = sum(cantidad * costo for _, cantidad, costo in lineas)
+        confirmacion = QMessageBox.question(self, "Confirmar Recepción", f"{len(lineas)} líneas por ${total:,.0f}\nProveedor: {self.combo_proveedor.currentText()}\n¿Desea registrar la recepción?", QMessageBox.Yes | QMessageBox.No)
+        if confirmacion != QMessageBox.Yes: return
         try:
-            cursor = self.conexion.cursor()
-            query_movimiento = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, motivo) VALUES (%s, 'perdida', %s, %s)"
-            cursor.execute(query_movimiento, (insumo_id, cantidad_perdida, motivo))
-            query_insumo_update = "UPDATE insumos SET stock_actual = %s WHERE id_insumo = %s"
-            cursor.execute(query_insumo_update, (stock_final, insumo_id))
-            self.conexion.commit()
-            QMessageBox.information(self, "Éxito", f"Pérdida de {cantidad_perdida} registrada. Stock actualizado.")
-            self.cargar_datos_stock(); self.entrada_cantidad_perdida.clear(); self.entrada_motivo_perdida.clear()
-        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al registrar la pérdida:\n{str(e)}"); self.conexion.rollback()
+            ok, resultado = en_transaccion(self.conexion, lambda cursor: registrar_recepcion_db(cursor, id_proveedor, lineas, f"Recepción factura {documento}" if documento else "Recepción factura proveedor"))
+            if not ok: QMessageBox.critical(self, "Error de Recepción", resultado); return
+            VERSIONES_TABLAS.tocar(self.conexion, *TABLAS_STOCK, desde=datetime.date.today())
+            for id_insumo in resultado: CACHE_RECETAS.invalidar_insumo(id_insumo)
+            QMessageBox.information(self, "Éxito", f"Recepción registrada: {len(lineas)} líneas, {len(resultado)} insumos actualizados.")
+            self.parent_window.refrescar_insumos(list(resultado)); self.tabla_lineas.setRowCount(0); self.entrada_documento.clear(); self.agregar_linea(); self.actualizar_total()
+        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al registrar la recepción. Transacción revertida:\n{str(e)}")
 
 
 class InventarioWindow(QMainWindow):
     """Módulo 1: Gestión de Inventario (Submenú)."""
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Submenu_Inventario.ui", self)
+        cargar_ui("Submenu_Inventario.ui", self)
         self.conexion = conexion
         self.parent_window = parent_window
         self.setWindowTitle("Módulo 1: Gestión de Inventario")
@@ -756,7 +2864,7 @@ class InventarioWindow(QMainWindow):
         self.boton_volver_menu.clicked.connect(self.volver_menu)
         self.show()
     def volver_menu(self): self.parent_window.show(); self.hide()
-    def navegar_a_submodulo(self, SubmoduloClase): self.modulo_actual = SubmoduloClase(self, self.conexion); self.hide()
+    def navegar_a_submodulo(self, SubmoduloClase): VENTANAS.abrir(SubmoduloClase, self)
     def ir_a_control_stock(self): self.navegar_a_submodulo(ControlStockWindow)
     def ir_a_recetas(self): self.navegar_a_submodulo(RecetasWindow)
     def ir_a_proveedores(self): self.navegar_a_submodulo(ProveedoresWindow)
@@ -764,9 +2872,11 @@ class InventarioWindow(QMainWindow):
 
 class PedidosWindow(QMainWindow):
     """Módulo 2: Registro de Pedidos (TPV) - Lógica de Venta y Consumo de Stock."""
+    TABLAS = ("categorias_productos", "productos", "recetas", "insumos")
+
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Pedidos.ui", self); self.conexion = conexion; self.parent_window = parent_window
+        cargar_ui("Pedidos.ui", self); self.conexion = conexion; self.parent_window = parent_window
         self.setWindowTitle("2. Registro de Pedidos (TPV)"); self.showMaximized()
         self.current_pedido = []; self.productos_data = {} 
         self.boton_volver_menu.clicked.connect(self.volver_menu)
@@ -774,21 +2884,51 @@ class PedidosWindow(QMainWindow):
         self.boton_agregar_a_pedido.clicked.connect(self.agregar_a_pedido)
         self.boton_eliminar_item.clicked.connect(self.eliminar_item); self.boton_cancelar_pedido.clicked.connect(self.cancelar_pedido)
         self.boton_finalizar_venta.clicked.connect(self.finalizar_venta)
-        self.tabla_pedido_actual.setSelectionBehavior(self.tabla_pedido_actual.SelectRows); self.tabla_pedido_actual.setEditTriggers(self.tabla_pedido_actual.NoEditTriggers)
+        self.boton_importar_pedidos.clicked.connect(self.ir_a_importacion)
+        self.faltantes = {}
+        self.modelo_pedido = ModeloTabla([("ID Prod.", lambda item, n: str(item['id_producto'])), ("Producto", lambda item, n: item['nombre']), ("Cant.", lambda item, n: str(item['cantidad'])),
+                                          ("Precio Unit.", lambda item, n: f"${item['precio_unitario']:,.0f}"), ("Total", lambda item, n: f"${item['total_item']:,.0f}"), ("CMV Línea", lambda item, n: f"${item['cmv_item']:,.0f}")],
+                                         fondo=lambda item, n, col: QColor(255, 230, 230) if self.insumos_faltantes(item) else None, tooltip=self.tooltip_linea, parent=self)
+        self.tabla_pedido_actual.setModel(self.modelo_pedido); self.tabla_pedido_actual.setSelectionBehavior(self.tabla_pedido_actual.SelectRows)
+        self.sincronizador = parent_window.sincronizador; self.sincronizador.actualizado.connect(self.actualizar_estado_sincronizacion)
+        self.sincronizador.rechazadas.connect(self.avisar_ventas_rechazadas); self.sincronizador.sin_stock.connect(self.avisar_ventas_sin_stock)
+        self.label_sincronizacion = QLabel(); self.statusbar.addPermanentWidget(self.label_sincronizacion); self.actualizar_estado_sincronizacion()
         self.cargar_inicial()
     def volver_menu(self): self.parent_window.show(); self.hide()
+    def refrescar(self): self.cargar_inicial()
+    def ir_a_importacion(self): VENTANAS.abrir(ImportarPedidosWindow, self)
     def cargar_inicial(self):
+        import sqlite3
         query_cat = "SELECT id_categoria, nombre FROM categorias_productos ORDER BY nombre"
-        ok_c, categorias = ejecutar_consulta_db(self.conexion, query_cat, fetch=True)
-        if ok_c:
-            self.combo_categoria.clear(); self.combo_categoria.addItem("Todas las Categorías")
-            for id_c, nombre in categorias: self.combo_categoria.addItem(f"{id_c} - {nombre}")
         query_prod = "SELECT id_producto, nombre, precio_venta, id_categoria FROM productos WHERE activo = TRUE"
-        ok_p, productos = ejecutar_consulta_db(self.conexion, query_prod, fetch=True)
-        if ok_p:
-            self.productos_data = {}
-            for id_p, nombre, precio, id_cat in productos: self.productos_data[id_p] = {'nombre': nombre, 'precio_venta': float(precio), 'id_categoria': id_cat}
+        sin_conexion = False
+        try:
+            categorias = consultar_db(self.conexion, query_cat); productos = consultar_db(self.conexion, query_prod)
+        except pymysql.MySQLError:
+            # Servidor caído: se vende con la última copia local del catálogo y las ventas quedan en la cola.
+            catalogo = COLA_VENTAS.cargar_catalogo()
+            if catalogo is None: QMessageBox.critical(self, "Sin Conexión", "No se pudo contactar la base de datos y no hay una copia local del catálogo."); return
+            categorias, productos, recetas, insumos = catalogo; CACHE_RECETAS.cargar_filas(recetas, insumos); sin_conexion = True
+        else:
+            if CACHE_RECETAS.refrescar(self.conexion):
+                ALERTAS_STOCK.cargar(self.conexion)
+                try: COLA_VENTAS.guardar_catalogo(categorias, productos, *CACHE_RECETAS.filas())
+                except sqlite3.Error as e: self.statusbar.showMessage(f"No se pudo guardar la copia local del catálogo: {e}")
+        self.combo_categoria.clear(); self.combo_categoria.addItem("Todas las Categorías")
+        for id_c, nombre in categorias: self.combo_categoria.addItem(f"{id_c} - {nombre}")
+        self.productos_data = {}
+        for id_p, nombre, precio, id_cat in productos: self.productos_data[id_p] = {'nombre': nombre, 'precio_venta': float(precio), 'id_categoria': id_cat}
         self.cargar_productos_por_categoria(); self.actualizar_resumen()
+        if sin_conexion: self.statusbar.showMessage("⚠️ Sin conexión con el servidor: se vende con el catálogo local y las ventas quedan en cola.")
+    def actualizar_estado_sincronizacion(self): self.label_sincronizacion.setText(self.sincronizador.estado())
+    def avisar_ventas_rechazadas(self, ventas):
+        lineas = lambda pedido: ", ".join(f"{item['cantidad']} x {item['nombre']}" for item in pedido)
+        detalle = "\n".join(f"• {fecha_venta} ({canal_venta}): {lineas(pedido)} — {error}" for _, fecha_venta, canal_venta, pedido, error, _ in ventas)
+        QMessageBox.warning(self, "VENTAS RECHAZADAS", f"La base de datos rechazó {len(ventas)} venta(s) de la cola (no se registraron ni descontaron stock):\n{detalle}\n\nRevíselas con `python mantenimiento.py ventas-rechazadas`.")
+    def avisar_ventas_sin_stock(self, ventas):
+        insumos = lambda faltantes: ", ".join(f"Insumo ID {id_i} (requería {requerido:.2f}, había {disponible:.2f})" for id_i, (requerido, disponible) in sorted(faltantes.items()))
+        detalle = "\n".join(f"• {fecha_venta} ({canal_venta}): {insumos(faltantes)}" for _, fecha_venta, canal_venta, _, faltantes, _ in ventas)
+        QMessageBox.warning(self, "VENTAS SIN STOCK SUFICIENTE", f"{len(ventas)} venta(s) ya cobrada(s) se registraron aunque otra caja había consumido el stock; esos insumos quedaron con stock negativo:\n{detalle}\n\nRevise el inventario (conteo o recepción pendiente).")
     def cargar_productos_por_categoria(self):
         self.lista_productos.clear(); filtro = self.combo_categoria.currentText(); selected_category_id = None
         if filtro != "Todas las Categorías" and filtro:
@@ -805,62 +2945,101 @@ class PedidosWindow(QMainWindow):
         except ValueError: QMessageBox.critical(self, "Error de Entrada", "Cantidad debe ser un número entero positivo."); return
         if cantidad <= 0: QMessageBox.critical(self, "Error de Entrada", "Cantidad debe ser un número entero positivo."); return
         data = self.productos_data.get(prod_id)
-        precio_unitario = data['precio_venta']; total_item = cantidad * precio_unitario
-        self.current_pedido.append({'id_producto': prod_id, 'nombre': data['nombre'], 'cantidad': cantidad, 'precio_unitario': precio_unitario, 'total_item': total_item})
+        precio_unitario = data['precio_venta']; total_item = cantidad * precio_unitario; cmv_item = cantidad * CACHE_RECETAS.cmv_unitario(prod_id)
+        self.current_pedido.append({'id_producto': prod_id, 'nombre': data['nombre'], 'cantidad': cantidad, 'precio_unitario': precio_unitario, 'total_item': total_item, 'cmv_item': cmv_item})
         self.actualizar_resumen(); self.entrada_cantidad.setText("1")
     def eliminar_item(self):
         selected_rows = self.tabla_pedido_actual.selectionModel().selectedRows()
         if not selected_rows: QMessageBox.warning(self, "Advertencia", "Seleccione un ítem del pedido para eliminar."); return
-        fila = selected_rows[0].row(); del self.current_pedido[fila]; self.tabla_pedido_actual.removeRow(fila)
+        fila = selected_rows[0].row(); del self.current_pedido[fila]
         self.actualizar_resumen()
     def cancelar_pedido(self):
         confirmacion = QMessageBox.question(self, "Confirmar Cancelación", "¿Desea CANCELAR y limpiar el pedido actual?", QMessageBox.Yes | QMessageBox.No)
         if confirmacion == QMessageBox.Yes: self.current_pedido = []; self.actualizar_resumen(); QMessageBox.information(self, "Cancelado", "Pedido cancelado. El carrito está vacío.")
     def actualizar_resumen(self):
         subtotal = sum(item['total_item'] for item in self.current_pedido); total_final = subtotal
-        self.tabla_pedido_actual.setRowCount(len(self.current_pedido))
-        for fila, item in enumerate(self.current_pedido):
-            self.tabla_pedido_actual.setItem(fila, 0, QTableWidgetItem(str(item['id_producto']))); self.tabla_pedido_actual.setItem(fila, 1, QTableWidgetItem(item['nombre']))
-            self.tabla_pedido_actual.setItem(fila, 2, QTableWidgetItem(str(item['cantidad']))); self.tabla_pedido_actual.setItem(fila, 3, QTableWidgetItem(f"${item['precio_unitario']:,.0f}"))
-            self.tabla_pedido_actual.setItem(fila, 4, QTableWidgetItem(f"${item['total_item']:,.0f}"))
+        self.faltantes = faltantes = CACHE_RECETAS.faltantes(self.current_pedido)
+        self.modelo_pedido.cargar(self.current_pedido)
         self.label_subtotal.setText(f"SUBTOTAL: $ {subtotal:,.0f}"); self.label_total.setText(f"TOTAL FINAL: $ {total_final:,.0f}")
+        if faltantes: self.statusbar.showMessage(f"⚠️ {len(faltantes)} insumo(s) sin stock suficiente para este pedido.")
+        else: self.statusbar.clearMessage()
+    def insumos_faltantes(self, item): return [id_i for id_i, _ in CACHE_RECETAS.recetas.get(item['id_producto'], []) if id_i in self.faltantes]
+    def tooltip_linea(self, item, n_fila, col):
+        insumos_faltantes = self.insumos_faltantes(item)
+        if insumos_faltantes: return "⚠️ Stock insuficiente: " + ", ".join(f"Insumo ID {id_i} ({self.faltantes[id_i][1]:.2f} de {self.faltantes[id_i][0]:.2f})" for id_i in insumos_faltantes)
+        return None
     def finalizar_venta(self):
+        import sqlite3
         if not self.current_pedido: QMessageBox.warning(self, "Advertencia", "El pedido está vacío."); return
         canal_venta = self.combo_canal_venta.currentText(); total_pedido = sum(item['total_item'] for item in self.current_pedido)
         confirmacion = QMessageBox.question(self, "CONFIRMAR VENTA", f"Total a registrar: ${total_pedido:,.0f}\nCanal: {canal_venta}\n¿Desea confirmar y consumir stock?", QMessageBox.Yes | QMessageBox.No)
         if confirmacion != QMessageBox.Yes: return
-        consumo_total_insumos = {}; venta_registros = []
-        try:
-            cursor = self.conexion.cursor()
-            for item in self.current_pedido:
-                prod_id = item['id_producto']; cantidad_vendida = item['cantidad']
-                query_receta = "SELECT r.id_insumo, r.cantidad_requerida, i.costo_promedio, i.stock_actual FROM recetas r JOIN insumos i ON r.id_insumo = i.id_insumo WHERE r.id_producto = %s"
-                cursor.execute(query_receta, (prod_id,)); receta = cursor.fetchall()
-                item_cmv = 0.0
-                for id_insumo, req_por_unidad, costo_unitario, stock_actual in receta:
-                    req_total = float(req_por_unidad) * cantidad_vendida; item_cmv += float(req_por_unidad) * float(costo_unitario)
-                    if float(stock_actual) < req_total:
-                        QMessageBox.critical(self, "ERROR CRÍTICO", f"STOCK INSUFICIENTE para Insumo ID {id_insumo} ({float(stock_actual):.2f}). Venta abortada."); return 
-                    consumo_total_insumos[id_insumo] = consumo_total_insumos.get(id_insumo, 0) + req_total
-                venta_registros.append({
-                    'fecha_venta': QDate.currentDate().toString("yyyy-MM-dd"), 'id_producto': prod_id, 'cantidad': cantidad_vendida,
-                    'precio_unitario': item['precio_unitario'], 'costo_unitario_calculado': item_cmv,
-                    'total_venta': item['total_item'], 'canal_venta': canal_venta
-                })
-            query_insert_venta = "INSERT INTO ventas (fecha_venta, id_producto, cantidad, precio_unitario, costo_unitario_calculado, total_venta, canal_venta) VALUES (%s, %s, %s, %s, %s, %s, %s)"
-            for registro in venta_registros: cursor.execute(query_insert_venta, tuple(registro.values()))
-            for id_insumo, consumo in consumo_total_insumos.items():
-                query_stock_actual = "SELECT stock_actual FROM insumos WHERE id_insumo = %s"; cursor.execute(query_stock_actual, (id_insumo,))
-                stock_actual = float(cursor.fetchone()[0]); nuevo_stock = stock_actual - consumo
-                query_insert_mov = "INSERT INTO movimientos_inventario (id_insumo, tipo_movimiento, cantidad, motivo) VALUES (%s, 'salida', %s, 'Consumo por Venta TPV')"
-                cursor.execute(query_insert_mov, (id_insumo, consumo))
-                query_update_stock = "UPDATE insumos SET stock_actual = %s WHERE id_insumo = %s"
-                cursor.execute(query_update_stock, (nuevo_stock, id_insumo))
-            self.conexion.commit()
-            QMessageBox.information(self, "Éxito de Venta", f"Venta Total (${total_pedido:,.0f}) registrada y stock consumido.")
-            self.cancelar_pedido()
-        except pymysql.MySQLError as e: QMessageBox.critical(self, "ERROR DE TRANSACCIÓN", f"Fallo en MySQL. Transacción revertida. Error: {str(e)}"); self.conexion.rollback()
-        except Exception as e: QMessageBox.critical(self, "ERROR GENERAL", f"Fallo inesperado al procesar la venta. Transacción revertida. Error: {str(e)}"); self.conexion.rollback()
+        # La venta se confirma contra la caché y la cola local; MySQL la recibe después desde SincronizadorVentas.
+        faltantes = CACHE_RECETAS.faltantes(self.current_pedido)
+        if faltantes:
+            id_insumo = min(faltantes); QMessageBox.critical(self, "ERROR CRÍTICO", f"STOCK INSUFICIENTE para Insumo ID {id_insumo} ({faltantes[id_insumo][1]:.2f}). Venta abortada.")
+            self.actualizar_resumen(); return
+        consumo = CACHE_RECETAS.consumo(self.current_pedido)
+        try: COLA_VENTAS.encolar(self.current_pedido, canal_venta, QDate.currentDate().toString("yyyy-MM-dd"), consumo)
+        except sqlite3.Error as e: QMessageBox.critical(self, "ERROR DE TRANSACCIÓN", f"No se pudo guardar la venta en la cola local. Venta no registrada. Error: {str(e)}"); return
+        CACHE_RECETAS.registrar_pendiente(consumo); self.sincronizador.sincronizar(); self.actualizar_estado_sincronizacion()
+        QMessageBox.information(self, "Éxito de Venta", f"Venta Total (${total_pedido:,.0f}) registrada y stock consumido.\nSe sincronizará con la base de datos en segundo plano (en cola: {COLA_VENTAS.profundidad()}).")
+        self.cancelar_pedido()
+
+
+class ImportarPedidosWindow(QMainWindow):
+    """Módulo 2.1: Importación de un archivo de pedidos de delivery_app / whatsapp (CSV o JSON) con simulación previa."""
+    def __init__(self, parent_window, conexion):
+        super().__init__()
+        self.conexion = conexion; self.parent_window = parent_window
+        self.setWindowTitle("2.1 Importación de Pedidos Externos"); self.showMaximized()
+        temp_widget = QWidget(); temp_layout = QVBoxLayout(temp_widget); cabecera = QHBoxLayout(); acciones = QHBoxLayout()
+        self.combo_canal = QComboBox(); self.combo_canal.addItems(CANALES_IMPORTACION)
+        self.entrada_archivo = QLineEdit(); self.entrada_archivo.setReadOnly(True); self.entrada_archivo.setPlaceholderText("Archivo CSV / JSON / JSON Lines de pedidos")
+        boton_archivo = QPushButton("📂 Seleccionar Archivo"); boton_archivo.clicked.connect(self.seleccionar_archivo)
+        cabecera.addWidget(QLabel("Canal (si el archivo no lo indica):")); cabecera.addWidget(self.combo_canal); cabecera.addWidget(self.entrada_archivo, 2); cabecera.addWidget(boton_archivo)
+        self.check_faltantes = QCheckBox("Importar aunque falte stock (el stock de esos insumos queda negativo)")
+        self.label_resumen = QLabel("Seleccione un archivo y simule la importación antes de registrarla."); self.label_resumen.setWordWrap(True)
+        self.tabla_informe = QTableWidget(0, 3); self.tabla_informe.setHorizontalHeaderLabels(["Observación", "Detalle", "Cantidad"])
+        self.tabla_informe.horizontalHeader().setStretchLastSection(True)
+        for texto, color, accion in [("🔍 SIMULAR (SIN ESCRIBIR)", "#3498db", lambda: self.importar(simular=True)), ("✅ IMPORTAR PEDIDOS", "#2ecc71", lambda: self.importar(simular=False))]:
+            boton = QPushButton(texto); boton.setStyleSheet(f"background-color: {color}; color: white; min-height: 35px; border-radius: 8px; font-weight: bold;")
+            boton.clicked.connect(accion); acciones.addWidget(boton)
+        self.volver_button = QPushButton("⬅️ Volver al Registro de Pedidos")
+        self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
+        self.volver_button.clicked.connect(self.volver_menu)
+        temp_layout.addLayout(cabecera); temp_layout.addWidget(self.check_faltantes); temp_layout.addWidget(self.label_resumen); temp_layout.addWidget(self.tabla_informe, 1)
+        temp_layout.addLayout(acciones); temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget)
+
+    def volver_menu(self): self.parent_window.show(); self.hide()
+
+    def seleccionar_archivo(self):
+        ruta, _ = QFileDialog.getOpenFileName(self, "Seleccionar Archivo de Pedidos", "", "Pedidos (*.csv *.json *.jsonl *.ndjson)")
+        if ruta: self.entrada_archivo.setText(ruta)
+
+    def importar(self, simular):
+        import csv
+        ruta = self.entrada_archivo.text()
+        if not ruta: QMessageBox.warning(self, "Advertencia", "Seleccione un archivo de pedidos."); return
+        if not simular and QMessageBox.question(self, "Confirmar Importación", f"¿Desea importar los pedidos de {os.path.basename(ruta)} y descontar su consumo de stock?", QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes: return
+        try: ok, informe = importar_pedidos_externos(self.conexion, leer_pedidos_externos(ruta), self.combo_canal.currentText(), simular=simular, permitir_faltantes=self.check_faltantes.isChecked())
+        except (OSError, ValueError, csv.Error) as e: QMessageBox.critical(self, "Error de Archivo", f"No se pudo leer el archivo:\n{e}"); return
+        except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de DB", f"Fallo al importar los pedidos. Transacción revertida:\n{str(e)}"); return
+        self.mostrar_informe(informe)
+        if simular: self.label_resumen.setText(("✅ Se puede importar. " if ok else "⚠️ No se puede importar todavía. ") + self.label_resumen.text()); return
+        if not ok: QMessageBox.critical(self, "Importación Rechazada", "No se importó ningún pedido:\n" + informe.resumen()); return
+        QMessageBox.information(self, "Éxito", f"Importados {informe.pedidos} pedidos ({informe.lineas} líneas, $ {informe.total:,.0f})." + (f"\n{informe.ya_importados} pedidos ya estaban importados y se omitieron." if informe.ya_importados else ""))
+        self.parent_window.refrescar()
+
+    def mostrar_informe(self, informe):
+        self.label_resumen.setText(informe.resumen().split("\n")[0])
+        filas = ([("Producto sin mapear", texto, f"{lineas} línea(s)") for texto, lineas in sorted(informe.sin_mapear.items(), key=lambda par: -par[1])]
+                 + [("Stock insuficiente", f"{nombre} (ID {id_insumo})", f"requiere {requerido:,.2f}, hay {disponible:,.2f}") for id_insumo, (nombre, requerido, disponible) in sorted(informe.faltantes.items())]
+                 + [("Línea con error", error, "") for error in informe.errores])
+        self.tabla_informe.setRowCount(len(filas))
+        for fila, valores in enumerate(filas):
+            for col, valor in enumerate(valores): self.tabla_informe.setItem(fila, col, QTableWidgetItem(valor))
 
 
 class InsumosSecundariosWindow(QMainWindow): 
@@ -883,6 +3062,166 @@ class GastosFijosWindow(QMainWindow):
     def volver_menu(self): self.parent_window.show(); self.hide()
 
 
+# --- EXPORTACIÓN EN STREAMING ---
+TABLAS_EXPORTABLES = {
+    "ventas": "id_venta", "pedidos": "id_pedido", "movimientos_inventario": "id_movimiento", "gastos_operativos": "id_gasto",
+    "insumos": "id_insumo", "productos": "id_producto", "proveedores": "id_proveedor",
+}
+TABLAS_INCREMENTALES = {"ventas": "fecha_importacion", "pedidos": "fecha_registro", "movimientos_inventario": "fecha_movimiento"}  # Hora de inserción (DEFAULT CURRENT_TIMESTAMP).
+SOLAPAMIENTO_EXPORTACION_SEGUNDOS = 900  # Mayor que la transacción más larga y que el desfase de reloj entre terminales.
+ARCHIVO_MARCAS_EXPORTACION = ".marcas_exportacion.json"
+TAMANO_BLOQUE_EXPORTACION = 5000
+
+
+def leer_marcas_exportacion(directorio):
+    ruta = os.path.join(directorio, ARCHIVO_MARCAS_EXPORTACION)
+    if not os.path.exists(ruta): return {}
+    with open(ruta, encoding='utf-8') as f: marcas = json.load(f)
+    return {tabla: marca for tabla, marca in marcas.items() if isinstance(marca, dict)}  # Las marcas por id de versiones anteriores se descartan: exportación completa.
+
+
+def guardar_marcas_exportacion(directorio, marcas):
+    ruta = os.path.join(directorio, ARCHIVO_MARCAS_EXPORTACION)
+    with open(ruta + ".tmp", 'w', encoding='utf-8') as f: json.dump(marcas, f, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def exportar_tabla_csv(conexion, tabla, ruta, marca=None, comprimir=False, tamano_bloque=TAMANO_BLOQUE_EXPORTACION):
+    """Escribe una tabla a CSV leyendo de un cursor sin buffer (SSCursor) en bloques de tamaño fijo.
+
+    Con `marca` (la que retornó la exportación anterior: {'hasta': hora de inserción, 'ids': [...]}) solo exporta
+    las filas insertadas después. El id autoincremental no sirve de marca: se asigna al insertar, no al confirmar,
+    y una transacción larga puede hacer visible un id menor después de exportado uno mayor. La hora de inserción
+    tiene el mismo problema, así que se releen los SOLAPAMIENTO_EXPORTACION_SEGUNDOS anteriores a la marca y se
+    descartan los ids que ya salieron. Retorna (filas_escritas, marca_nueva); marca_nueva es None si la tabla no
+    está en TABLAS_INCREMENTALES.
+    """
+    import csv
+    import gzip
+    columna_id = TABLAS_EXPORTABLES[tabla]; columna_hora = TABLAS_INCREMENTALES.get(tabla)
+    solapamiento = datetime.timedelta(seconds=SOLAPAMIENTO_EXPORTACION_SEGUNDOS)
+    hasta = datetime.datetime.fromisoformat(marca['hasta']) if marca else None; exportados = set(marca['ids']) if marca else set()
+    query = f"SELECT * FROM {tabla}" + (f" WHERE {columna_hora} > %s" if marca else ""); params = (hasta - solapamiento,) if marca else None
+    filas_escritas = 0; recientes = {}  # id -> hora de inserción, solo de la ventana de solapamiento de la marca nueva.
+    cursor = conexion.cursor(CursorInstrumentadoSS)
+    try:
+        cursor.execute(query, params)
+        columnas = [desc[0] for desc in cursor.description]; posicion_id = columnas.index(columna_id)
+        posicion_hora = columnas.index(columna_hora) if columna_hora else None
+        abrir = gzip.open if comprimir else open
+        with abrir(ruta, 'wt', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f); writer.writerow(columnas)
+            while True:
+                bloque = cursor.fetchmany(tamano_bloque)
+                if not bloque: break
+                nuevas = [fila for fila in bloque if fila[posicion_id] not in exportados] if exportados else bloque
+                writer.writerows(nuevas); filas_escritas += len(nuevas)
+                if posicion_hora is None: continue
+                for fila in bloque:
+                    hora = fila[posicion_hora]
+                    if hora is None: continue
+                    recientes[fila[posicion_id]] = hora
+                    if hasta is None or hora > hasta: hasta = hora
+                if hasta is not None: recientes = {id_fila: hora for id_fila, hora in recientes.items() if hora > hasta - solapamiento}
+    finally:
+        cursor.close()
+    if hasta is None: return filas_escritas, None
+    return filas_escritas, {'hasta': str(hasta), 'ids': sorted(recientes)}
+
+
+def exportar_tablas_csv(conexion, directorio, comprimir=False, incremental=False):
+    """Exporta TABLAS_EXPORTABLES a CSV en `directorio` (pensada para un hilo de EjecutorReportes, sin GUI).
+
+    Un fallo en una tabla no detiene las demás. Retorna (resumen, fallos): una línea de texto por tabla.
+    """
+    marcas = leer_marcas_exportacion(directorio); sello = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    extension = ".csv.gz" if comprimir else ".csv"; resumen = []; fallos = []
+    for tabla in TABLAS_EXPORTABLES:
+        marca = marcas.get(tabla) if incremental else None
+        nombre = f"{tabla}_data_nuevos_{sello}{extension}" if marca else f"{tabla}_data{extension}"
+        try: filas, marca_nueva = exportar_tabla_csv(conexion, tabla, os.path.join(directorio, nombre), marca, comprimir)
+        except Exception as e: fallos.append(f"{tabla}: {e}"); continue
+        if marca_nueva is not None: marcas[tabla] = marca_nueva; guardar_marcas_exportacion(directorio, marcas)
+        resumen.append(f"{tabla}: {filas:,} filas -> {nombre}")
+    return resumen, fallos
+
+
+# --- EXPORTACIÓN COLUMNAR (Parquet / Arrow IPC) ---
+COLUMNAS_COLUMNARES = {
+    # tabla: (columna de fecha para particionar por mes, [(columna, tipo)]); 'dinero' = DECIMAL(10,2)
+    "ventas": ("fecha_venta", [("id_venta", "int32"), ("id_pedido", "int32"), ("fecha_venta", "date32"), ("id_producto", "int32"), ("cantidad", "int32"),
+                               ("precio_unitario", "dinero"), ("costo_unitario_calculado", "dinero"), ("total_venta", "dinero"),
+                               ("canal_venta", "string"), ("fecha_importacion", "timestamp")]),
+    "movimientos_inventario": ("fecha_movimiento", [("id_movimiento", "int32"), ("id_insumo", "int32"), ("tipo_movimiento", "string"), ("cantidad", "dinero"),
+                                                    ("costo_unitario", "dinero"), ("fecha_movimiento", "timestamp"), ("motivo", "string"), ("id_proveedor", "int32")]),
+}
+TAMANO_BLOQUE_COLUMNAR = 50000
+MES_SIN_FECHA = "sin_fecha"  # Partición de las filas cuya columna de fecha es NULL.
+
+
+def exportar_tabla_columnar(conexion, tabla, directorio, formato="parquet", tamano_bloque=TAMANO_BLOQUE_COLUMNAR):
+    """Exporta una tabla a archivos Parquet o Arrow IPC tipados, particionados por mes (`tabla/mes=AAAA-MM/`).
+
+    Lee de un SSCursor en bloques y escribe cada bloque directo a los archivos de su mes, sin pasar por texto.
+    Los DECIMAL(10,2) se guardan como float64 para que pandas los cargue sin conversión. Cada exportación es una
+    foto completa: cada mes queda en un único archivo `tabla.parquet` que reemplaza al anterior (recién al terminar
+    sin errores) y se borran los de meses que ya no tienen filas, así leer la carpeta no cuenta un mes dos veces.
+    Las filas sin fecha van a `mes=sin_fecha`. Retorna (filas, meses).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    columna_fecha, columnas = COLUMNAS_COLUMNARES[tabla]
+    tipos = {"int32": pa.int32(), "date32": pa.date32(), "timestamp": pa.timestamp("s"), "string": pa.string(), "dinero": pa.decimal128(10, 2)}
+    esquema = pa.schema([(nombre, pa.float64() if tipo == "dinero" else tipos[tipo]) for nombre, tipo in columnas])
+    posicion_fecha = [nombre for nombre, _ in columnas].index(columna_fecha)
+    extension = ".parquet" if formato == "parquet" else ".arrow"; archivo = f"{tabla}{extension}"; temporal = f".{archivo}.tmp"
+    raiz = os.path.join(directorio, tabla); escritores = {}; filas_escritas = 0; completa = False
+    cursor = conexion.cursor(CursorInstrumentadoSS)
+    try:
+        cursor.execute(f"SELECT {', '.join(nombre for nombre, _ in columnas)} FROM {tabla}")
+        while True:
+            bloque = cursor.fetchmany(tamano_bloque)
+            if not bloque: break
+            arreglos = []
+            for (nombre, tipo), valores in zip(columnas, zip(*bloque)):
+                arreglo = pa.array(valores, type=tipos[tipo])
+                arreglos.append(arreglo.cast(pa.float64()) if tipo == "dinero" else arreglo)
+            lote = pa.Table.from_arrays(arreglos, schema=esquema)
+            meses = pc.fill_null(pc.strftime(pc.cast(lote.column(posicion_fecha), pa.timestamp("s")), format="%Y-%m"), MES_SIN_FECHA)
+            for mes in pc.unique(meses).to_pylist():
+                if mes not in escritores:
+                    carpeta = os.path.join(raiz, f"mes={mes}"); os.makedirs(carpeta, exist_ok=True)
+                    ruta = os.path.join(carpeta, temporal)
+                    escritores[mes] = pq.ParquetWriter(ruta, esquema, compression="snappy") if formato == "parquet" else pa.ipc.new_file(ruta, esquema)
+                escritores[mes].write_table(lote.filter(pc.equal(meses, mes)))
+            filas_escritas += len(bloque)
+        completa = True
+    finally:
+        cursor.close()
+        for escritor in escritores.values(): escritor.close()
+        if not completa:  # La exportación anterior queda intacta.
+            for mes in escritores: os.remove(os.path.join(raiz, f"mes={mes}", temporal))
+    for carpeta in os.listdir(raiz) if os.path.isdir(raiz) else []:
+        if not carpeta.startswith("mes="): continue
+        ruta_carpeta = os.path.join(raiz, carpeta)
+        if carpeta[4:] in escritores: os.replace(os.path.join(ruta_carpeta, temporal), os.path.join(ruta_carpeta, archivo))
+        for nombre in os.listdir(ruta_carpeta):  # Archivos de exportaciones previas (incluidos los de nombre con fecha y hora).
+            if nombre.startswith(tabla) and nombre.endswith(extension) and (nombre != archivo or carpeta[4:] not in escritores): os.remove(os.path.join(ruta_carpeta, nombre))
+        if not os.listdir(ruta_carpeta): os.rmdir(ruta_carpeta)
+    return filas_escritas, sorted(escritores)
+
+
+def exportar_tablas_columnar(conexion, directorio, formato="parquet"):
+    """Exporta las tablas de COLUMNAS_COLUMNARES (pensada para un hilo de EjecutorReportes). Retorna (resumen, fallos) como exportar_tablas_csv."""
+    resumen = []; fallos = []
+    for tabla in COLUMNAS_COLUMNARES:
+        try: filas, meses = exportar_tabla_columnar(conexion, tabla, directorio, formato)
+        except Exception as e: fallos.append(f"{tabla}: {e}"); continue
+        resumen.append(f"{tabla}: {filas:,} filas en {len(meses)} particiones mensuales")
+    return resumen, fallos
+
+
 class ExportarDatosWindow(QMainWindow): 
     """Módulo 3.3: Exportación de datos a CSV/Excel (Implementación base)."""
     def __init__(self, parent_window, conexion):
@@ -893,47 +3232,61 @@ class ExportarDatosWindow(QMainWindow):
         self.export_button = QPushButton("EXPORTAR TODAS LAS TABLAS A CSV")
         self.export_button.setStyleSheet("background-color: #e67e22; color: white; min-height: 50px; border-radius: 8px; font-size: 14pt;")
         self.export_button.clicked.connect(self.exportar_tablas)
+        self.export_columnar_button = QPushButton("EXPORTAR VENTAS Y MOVIMIENTOS PARA ANÁLISIS (columnar)")
+        self.export_columnar_button.setStyleSheet("background-color: #2980b9; color: white; min-height: 50px; border-radius: 8px; font-size: 14pt;")
+        self.export_columnar_button.clicked.connect(self.exportar_columnar)
+        self.combo_formato_columnar = QComboBox(); self.combo_formato_columnar.addItems(["Parquet (.parquet)", "Arrow IPC (.arrow)"])
+        self.checkbox_comprimir = QCheckBox("Comprimir archivos (.csv.gz)")
+        self.checkbox_incremental = QCheckBox("Solo registros nuevos desde la última exportación (ventas, pedidos y movimientos)")
         self.volver_button = QPushButton("⬅️ Volver al Submenú")
         self.volver_button.setStyleSheet("background-color: #95a5a6; color: white; min-height: 40px; border-radius: 8px; font-size: 12pt;")
         self.volver_button.clicked.connect(self.volver_menu)
         temp_layout.addWidget(QLabel("Seleccione la opción para generar archivos de auditoría."))
-        temp_layout.addWidget(self.export_button); temp_layout.addStretch(); temp_layout.addWidget(self.volver_button)
-        self.setCentralWidget(temp_widget)
+        temp_layout.addWidget(self.checkbox_comprimir); temp_layout.addWidget(self.checkbox_incremental)
+        temp_layout.addWidget(self.export_button)
+        temp_layout.addWidget(QLabel("Exportación tipada y particionada por mes para análisis (pandas / pyarrow):"))
+        temp_layout.addWidget(self.combo_formato_columnar); temp_layout.addWidget(self.export_columnar_button)
+        temp_layout.addStretch(); temp_layout.addWidget(self.volver_button)
+        self.setCentralWidget(temp_widget); self.statusbar = self.statusBar()
+        # Las exportaciones corren en POOL_REPORTES con su propia conexión: la ventana sigue respondiendo mientras tanto.
+        self.ejecutor_csv = EjecutorReportes(self, lambda resultado: self.mostrar_exportacion("Exportación", resultado), self.export_button)
+        self.ejecutor_columnar = EjecutorReportes(self, lambda resultado: self.mostrar_exportacion("Exportación columnar", resultado), self.export_columnar_button)
+        self.directorio_exportacion = {}
 
     def volver_menu(self): self.parent_window.show(); self.hide()
 
     def exportar_tablas(self):
-        tablas_a_exportar = ["ventas", "movimientos_inventario", "gastos_operativos", "insumos", "productos", "proveedores"]
         directorio = QFileDialog.getExistingDirectory(self, "Seleccionar Carpeta para Exportar", os.getcwd())
         if not directorio: QMessageBox.warning(self, "Advertencia", "Exportación cancelada."); return
-        for tabla in tablas_a_exportar:
-            query = f"SELECT * FROM {tabla}"
-            ok, resultados = ejecutar_consulta_db(self.conexion, query, fetch=True)
-            if ok:
-                try:
-                    cursor = self.conexion.cursor(); cursor.execute(query)
-                    columnas = [desc[0] for desc in cursor.description]
-                    filepath = os.path.join(directorio, f"{tabla}_data.csv")
-                    with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.writer(f); writer.writerow(columnas)
-                        writer.writerows([[str(col) for col in row] for row in resultados])
-                    QMessageBox.information(self, "Éxito", f"Datos de la tabla '{tabla}' exportados correctamente a:\n{filepath}")
-                except Exception as e: QMessageBox.critical(self, "Error de Exportación", f"Fallo al exportar la tabla {tabla}:\n{str(e)}")
-            else: QMessageBox.critical(self, "Error de Consulta", f"No se pudo obtener datos para la tabla {tabla}.")
+        self.directorio_exportacion["Exportación"] = directorio
+        self.ejecutor_csv.lanzar(exportar_tablas_csv, directorio, self.checkbox_comprimir.isChecked(), self.checkbox_incremental.isChecked())
+
+    def exportar_columnar(self):
+        try: import pyarrow  # noqa: F401
+        except ImportError: QMessageBox.critical(self, "Dependencia Faltante", "La exportación columnar requiere pyarrow (pip install pyarrow)."); return
+        directorio = QFileDialog.getExistingDirectory(self, "Seleccionar Carpeta para Exportar", os.getcwd())
+        if not directorio: QMessageBox.warning(self, "Advertencia", "Exportación cancelada."); return
+        self.directorio_exportacion["Exportación columnar"] = directorio
+        self.ejecutor_columnar.lanzar(exportar_tablas_columnar, directorio, "parquet" if self.combo_formato_columnar.currentIndex() == 0 else "arrow")
+
+    def mostrar_exportacion(self, titulo, resultado):
+        resumen, fallos = resultado; texto = f"{titulo} finalizada en:\n{self.directorio_exportacion[titulo]}\n\n" + "\n".join(resumen)
+        if fallos: QMessageBox.warning(self, "Error de Exportación", texto + "\n\nTablas que no se pudieron exportar:\n" + "\n".join(fallos))
+        else: QMessageBox.information(self, "Éxito", texto)
 
 
 class VentasGastosWindow(QMainWindow):
     """Carga el Submenú de Carga de Ventas, Gastos y Exportación (Módulo 3)."""
     def __init__(self, parent_window, conexion):
         super().__init__()
-        loadUi("Submenu_Ventas_Gastos.ui", self); self.conexion = conexion; self.parent_window = parent_window
+        cargar_ui("Submenu_Ventas_Gastos.ui", self); self.conexion = conexion; self.parent_window = parent_window
         self.setWindowTitle("Módulo 3: Carga de Datos, Gastos y Exportación")
         self.boton_insumos_secundarios.clicked.connect(self.ir_a_insumos_secundarios)
         self.boton_gestion_gastos.clicked.connect(self.ir_a_gastos_fijos)
         self.boton_exportar_datos.clicked.connect(self.ir_a_exportar_datos)
         self.boton_volver_menu.clicked.connect(self.volver_menu); self.show()
     def volver_menu(self): self.parent_window.show(); self.hide()
-    def navegar_a_submodulo(self, SubmoduloClase): self.modulo_actual = SubmoduloClase(self, self.conexion); self.hide()
+    def navegar_a_submodulo(self, SubmoduloClase): VENTANAS.abrir(SubmoduloClase, self)
     def ir_a_insumos_secundarios(self): self.navegar_a_submodulo(InsumosSecundariosWindow)
     def ir_a_gastos_fijos(self): self.navegar_a_submodulo(GastosFijosWindow)
     def ir_a_exportar_datos(self): self.navegar_a_submodulo(ExportarDatosWindow)
@@ -945,12 +3298,12 @@ class MenuPrincipalWindow(QMainWindow):
     """Ventana principal de navegación."""
     def __init__(self, conexion):
         super().__init__()
-        loadUi("Menu_Principal.ui", self)
-        self.conexion = conexion
+        cargar_ui("Menu_Principal.ui", self)
+        self.conexion = conexion; self.sincronizador = SincronizadorVentas(conexion, COLA_VENTAS, self)
         self.setWindowTitle("Menú Principal - Atai Sushi SIG")
         self.boton_inventario.clicked.connect(self.ir_a_inventario); self.boton_pedidos.clicked.connect(self.ir_a_pedidos)
         self.boton_reportes.clicked.connect(self.ir_a_reportes)
-    def navegar_a_modulo(self, ModuloClase): self.modulo_actual = ModuloClase(self, self.conexion); self.hide()
+    def navegar_a_modulo(self, ModuloClase): VENTANAS.abrir(ModuloClase, self)
     def ir_a_inventario(self): self.navegar_a_modulo(InventarioWindow)
     def ir_a_pedidos(self): self.navegar_a_modulo(PedidosWindow)
     def ir_a_reportes(self): self.navegar_a_modulo(ReportesWindow)
@@ -961,13 +3314,16 @@ class MenuPrincipalWindow(QMainWindow):
 class IngresoDBWindow(QMainWindow):
     """Ventana inicial de la aplicación (Login)."""
     def __init__(self):
-        super().__init__(); loadUi("Ingreso_DB.ui", self); self.conexion = None
+        super().__init__(); cargar_ui("Ingreso_DB.ui", self); self.conexion = None
         self.boton_conectar.clicked.connect(self.connect_to_database); self.menu_window = None
     def connect_to_database(self):
         host = self.entrada_host.text(); user = self.entrada_usuario.text(); password = self.entrada_clave.text()
         database_name = "atai_sushi_sig"
         try:
-            self.conexion = pymysql.connect(host=host, user=user, password=password, database=database_name)
+            PARAMETROS_CONEXION.update(host=host, user=user, password=password, database=database_name)
+            if self.conexion is not None: self.conexion.cerrar()
+            self.conexion = PoolConexiones(TAMANO_POOL_CONEXIONES)
+            POOL_SINCRONIZACION.start(TareaSnapshotsInventario(self.conexion))  # Cierres de inventario de los días sin snapshot, en segundo plano.
             QMessageBox.information(self, "Éxito de Conexión", f"¡Conexión exitosa a la base de datos '{database_name}'!")
             self.menu_window = MenuPrincipalWindow(self.conexion); self.menu_window.show(); self.hide() 
         except pymysql.MySQLError as e: QMessageBox.critical(self, "Error de Conexión", f"Fallo al conectar. Verifique credenciales o el servidor. \nError: {str(e)}")
@@ -978,4 +3334,6 @@ if __name__ == "__main__":
     app = QCoreApplication.instance(); 
     if app is None: app = QApplication(sys.argv)
     main_window = IngresoDBWindow(); main_window.show()
+    if os.environ.get("ATAI_MEDIR_ARRANQUE"):  # `python benchmark.py arranque`: informa cuándo quedó lista la ventana de ingreso y termina.
+        QTimer.singleShot(0, lambda: (print(f"ARRANQUE {time.time():.6f}", flush=True), app.quit()))
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Tareas de mantenimiento de la base de datos atai_sushi_sig (sin interfaz gráfica).
+
+Uso:
+    python mantenimiento.py reconstruir-ventas-diarias [--desde AAAA-MM-DD --hasta AAAA-MM-DD]
+    python mantenimiento.py snapshot-inventario [--desde AAAA-MM-DD --hasta AAAA-MM-DD]
+    python mantenimiento.py reconstruir-alertas
+    python mantenimiento.py compilar-ui [--verificar]
+    python mantenimiento.py limpiar-cache-reportes
+    python mantenimiento.py importar-pedidos ARCHIVO [--canal delivery_app|whatsapp] [--simular] [--permitir-faltantes]
+    python mantenimiento.py ventas-rechazadas [--reencolar] [--sin-stock]
+"""
+import argparse
+import csv
+import datetime
+import getpass
+import sys
+
+import main
+
+
+def conectar(args):
+    main.PARAMETROS_CONEXION.update(host=args.host, user=args.usuario, password=args.clave if args.clave is not None else getpass.getpass("Clave MySQL: "), database=args.base_datos)
+    return main.abrir_conexion()
+
+
+def reconstruir_ventas_diarias(args):
+    if bool(args.desde) != bool(args.hasta): print("Debe indicar --desde y --hasta juntos."); return 1
+    conexion = conectar(args)
+    ok, resultado = main.reconstruir_ventas_diarias(conexion, args.desde, args.hasta)
+    if not ok: print(f"Fallo al reconstruir ventas_diarias: {resultado}"); return 1
+    alcance = f"entre {args.desde} y {args.hasta}" if args.desde else "para todo el historial"
+    print(f"ventas_diarias reconstruida {alcance}: {resultado} filas.")
+    return 0
+
+
+def snapshot_inventario(args):
+    if bool(args.desde) != bool(args.hasta): print("Debe indicar --desde y --hasta juntos."); return 1
+    conexion = conectar(args)
+    if not args.desde:
+        ok, resultado = main.completar_snapshots_inventario(conexion)
+        if not ok: print(f"Fallo al guardar snapshots: {resultado}"); return 1
+        print(f"Snapshots de inventario completados: {resultado} días."); return 0
+    desde, hasta = main.como_fecha(args.desde), main.como_fecha(args.hasta)
+    # Del más reciente al más antiguo: cada día se reconstruye desde el snapshot del día siguiente.
+    for dias_atras in range((hasta - desde).days + 1):
+        fecha = hasta - datetime.timedelta(days=dias_atras)
+        ok, resultado = main.tomar_snapshot_inventario(conexion, fecha)
+        if not ok: print(f"Fallo al guardar el snapshot del {fecha}: {resultado}"); return 1
+    print(f"Snapshots de inventario guardados entre {desde} y {hasta}.")
+    return 0
+
+
+def reconstruir_alertas(args):
+    ok, resultado = main.reconstruir_alertas_stock(conectar(args))
+    if not ok: print(f"Fallo al reconstruir alertas_stock: {resultado}"); return 1
+    print(f"alertas_stock reevaluada para todos los insumos activos (cambio neto de alertas abiertas: {resultado:+d}).")
+    return 0
+
+
+def compilar_ui(args):
+    estados = main.compilar_interfaces(verificar=args.verificar)
+    for nombre_ui, estado in estados: print(f"{nombre_ui}: {estado}")
+    pendientes = [nombre_ui for nombre_ui, estado in estados if estado in ("desactualizada", "faltante")]
+    if pendientes: print(f"{len(pendientes)} interfaz(es) sin compilar o desactualizadas: ejecute `python mantenimiento.py compilar-ui`."); return 1
+    return 0
+
+
+def limpiar_cache_reportes(args):
+    main.PARAMETROS_CONEXION.update(host=args.host, database=args.base_datos)
+    print(f"Resultados de reportes eliminados de la caché local: {main.CACHE_REPORTES.limpiar()}.")
+    return 0
+
+
+def importar_pedidos(args):
+    conexion = conectar(args)
+    try: ok, informe = main.importar_pedidos_externos(conexion, main.leer_pedidos_externos(args.archivo), args.canal, simular=args.simular, permitir_faltantes=args.permitir_faltantes)
+    except (OSError, ValueError, csv.Error) as e: print(f"No se pudo leer {args.archivo}: {e}"); return 1
+    except main.pymysql.MySQLError as e: print(f"Fallo al importar los pedidos (transacción revertida): {e}"); return 1
+    print(informe.resumen())
+    if args.simular: print("Simulación: no se escribió nada." + ("" if ok else " El archivo no se puede importar así.")); return 0 if ok else 1
+    if not ok: print("No se importó ningún pedido."); return 1
+    print(f"Importación registrada con fecha_importacion {informe.fecha_importacion}.")
+    return 0
+
+
+def ventas_rechazadas(args):
+    if args.reencolar: print(f"Ventas devueltas a la cola de sincronización: {main.COLA_VENTAS.reencolar_rechazadas()}."); return 0
+    rechazadas = main.COLA_VENTAS.rechazadas()
+    for clave, fecha_venta, canal_venta, pedido, error, rechazada in rechazadas:
+        detalle = ", ".join(f"{item['cantidad']} x {item['nombre']}" for item in pedido)
+        print(f"{rechazada} | venta {fecha_venta} ({canal_venta}) | {detalle} | {error} | {clave}")
+    print(f"{len(rechazadas)} venta(s) rechazada(s) en {main.COLA_VENTAS.ruta}.")
+    if args.sin_stock:
+        for clave, fecha_venta, canal_venta, _, faltantes, registrada in main.COLA_VENTAS.ventas_sin_stock():
+            detalle = ", ".join(f"insumo {id_insumo}: requería {requerido:.2f}, había {disponible:.2f}" for id_insumo, (requerido, disponible) in sorted(faltantes.items()))
+            print(f"{registrada} | venta {fecha_venta} ({canal_venta}) registrada sin stock suficiente | {detalle} | {clave}")
+    return 0
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Mantenimiento de la base de datos de Atai Sushi SIG.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--usuario", default="root")
+    parser.add_argument("--clave", default=None, help="Si se omite se solicita por consola.")
+    parser.add_argument("--base-datos", default="atai_sushi_sig")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_rollup = subparsers.add_parser("reconstruir-ventas-diarias", help="Recalcula el resumen diario de ventas desde la tabla ventas.")
+    p_rollup.add_argument("--desde", help="Fecha inicial (AAAA-MM-DD); por defecto todo el historial.")
+    p_rollup.add_argument("--hasta", help="Fecha final (AAAA-MM-DD).")
+    p_rollup.set_defaults(funcion=reconstruir_ventas_diarias)
+
+    p_snapshot = subparsers.add_parser("snapshot-inventario", help="Guarda cierres diarios de inventario (por defecto los días faltantes hasta ayer).")
+    p_snapshot.add_argument("--desde", help="Fecha inicial (AAAA-MM-DD) para rellenar historial.")
+    p_snapshot.add_argument("--hasta", help="Fecha final (AAAA-MM-DD); debe ser un día ya cerrado.")
+    p_snapshot.set_defaults(funcion=snapshot_inventario)
+
+    p_alertas = subparsers.add_parser("reconstruir-alertas", help="Reevalúa las alertas de stock de todos los insumos activos.")
+    p_alertas.set_defaults(funcion=reconstruir_alertas)
+
+    p_ui = subparsers.add_parser("compilar-ui", help="Compila los .ui a clases Python (ui_compilada/) para acelerar la apertura de ventanas.")
+    p_ui.add_argument("--verificar", action="store_true", help="No escribe nada; sale con código 1 si algún .ui cambió desde su compilación.")
+    p_ui.set_defaults(funcion=compilar_ui)
+
+    p_cache = subparsers.add_parser("limpiar-cache-reportes", help="Vacía la caché local de reportes (tras corregir datos desde otra terminal o directo en MySQL).")
+    p_cache.set_defaults(funcion=limpiar_cache_reportes)
+
+    p_importar = subparsers.add_parser("importar-pedidos", help="Importa un archivo CSV/JSON/JSON Lines de pedidos de delivery_app o whatsapp en una sola transacción.")
+    p_importar.add_argument("archivo", help="Columnas: pedido, fecha, canal, producto (id o nombre), cantidad y precio_unitario; solo producto y cantidad son obligatorias.")
+    p_importar.add_argument("--canal", choices=main.CANALES_IMPORTACION, default="delivery_app", help="Canal de las líneas que no lo indican.")
+    p_importar.add_argument("--simular", action="store_true", help="No escribe nada: informa productos sin mapear y faltantes de stock.")
+    p_importar.add_argument("--permitir-faltantes", action="store_true", help="Importa aunque falte stock (esos insumos quedan con stock negativo).")
+    p_importar.set_defaults(funcion=importar_pedidos)
+
+    p_rechazadas = subparsers.add_parser("ventas-rechazadas", help="Lista las ventas de la cola local que MySQL rechazó al sincronizar.")
+    p_rechazadas.add_argument("--reencolar", action="store_true", help="Las devuelve a la cola (tras corregir la causa) para que se vuelvan a enviar.")
+    p_rechazadas.add_argument("--sin-stock", action="store_true", help="Lista también las ventas registradas aunque faltaba stock (insumos que quedaron negativos).")
+    p_rechazadas.set_defaults(funcion=ventas_rechazadas)
+    return parser
+
+
+if __name__ == "__main__":
+    args = crear_parser().parse_args()
+    with main.origen_consultas(f"mantenimiento {args.comando}"): sys.exit(args.funcion(args))
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+# Pruebas de las funciones puras de main.py: sin MySQL ni ventanas (Qt en modo offscreen).
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip("PyQt5")
+pytest.importorskip("pymysql")
+
+
+@pytest.fixture
+def main(monkeypatch):
+    import main as modulo
+    monkeypatch.setattr(modulo, "PARAMETROS_CONEXION", {'host': "localhost", 'database': "atai_sushi_test"})
+    return modulo
+
+
+class ConexionFalsa:
+    """Conexión que responde a cualquier SELECT con las mismas filas (lo que necesita consultar_db)."""
+    def __init__(self, filas): self.filas = filas; self.consultas = []
+
+    def cursor(self): return self
+
+    def __enter__(self): return self
+
+    def __exit__(self, *args): return False
+
+    def execute(self, query, params=None): self.consultas.append((query, params))
+
+    def fetchall(self): return list(self.filas)
+
+    def commit(self): pass
+
+
+@pytest.fixture
+def conexion_falsa(): return ConexionFalsa
@@ -0,0 +1,49 @@
+import datetime
+import decimal
+
+
+class VersionesFalsas:
+    """Sustituye a VersionesTablas: la firma es un contador que la prueba incrementa a mano."""
+    def __init__(self): self.disponible = True; self.version = 1
+
+    def firma(self, conexion, tablas, hasta="9999-12-31"): return self.version
+
+
+def preparar(main, monkeypatch, tmp_path):
+    monkeypatch.delenv("ATAI_CACHE_REPORTES", raising=False)
+    versiones = VersionesFalsas(); calculos = []
+    def calcular():
+        calculos.append(versiones.version); return [(datetime.date(2024, 5, 1), decimal.Decimal("1500.50"), len(calculos))]
+    return main.CacheReportes(versiones, str(tmp_path / "cache.sqlite3")), versiones, calculos, calcular
+
+
+def test_resultado_vigente_hasta_que_cambia_la_firma(main, monkeypatch, tmp_path):
+    cache, versiones, calculos, calcular = preparar(main, monkeypatch, tmp_path)
+    resolver = lambda: cache.resolver(None, "eerr", "2024-05-01", datetime.date(2024, 5, 31), ("ventas",), calcular)
+
+    assert resolver() == [["2024-05-01", 1500.5, 1]]  # Siempre en forma JSON, calculado o no.
+    assert resolver() == [["2024-05-01", 1500.5, 1]] and calculos == [1] and (cache.aciertos, cache.fallos) == (1, 1)
+    versiones.version += 1
+    assert resolver() == [["2024-05-01", 1500.5, 2]] and calculos == [1, 2]
+
+
+def test_sin_versiones_o_por_base_no_reutiliza(main, monkeypatch, tmp_path):
+    cache, versiones, calculos, calcular = preparar(main, monkeypatch, tmp_path)
+    resolver = lambda: cache.resolver(None, "kpis", "2024-05-01", "2024-05-31", ("ventas",), calcular)
+    resolver()
+    main.PARAMETROS_CONEXION['database'] = "otra_base"
+    resolver(); assert calculos == [1, 1]
+    versiones.disponible = False
+    resolver(); resolver(); assert len(calculos) == 4
+    versiones.disponible = True; main.PARAMETROS_CONEXION['database'] = "atai_sushi_test"
+    resolver(); assert len(calculos) == 4
+
+
+def test_limpiar_descarta_solo_la_base_actual(main, monkeypatch, tmp_path):
+    cache, _, calculos, calcular = preparar(main, monkeypatch, tmp_path)
+    for base in ("atai_sushi_test", "otra_base"):
+        main.PARAMETROS_CONEXION['database'] = base; cache.resolver(None, "margen", "2024-05-01", "2024-05-31", ("ventas",), calcular)
+    assert cache.limpiar() == 1  # La de "otra_base", la actual.
+    cache.resolver(None, "margen", "2024-05-01", "2024-05-31", ("ventas",), calcular); assert len(calculos) == 3
+    main.PARAMETROS_CONEXION['database'] = "atai_sushi_test"
+    cache.resolver(None, "margen", "2024-05-01", "2024-05-31", ("ventas",), calcular); assert len(calculos) == 3
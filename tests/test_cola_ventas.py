@@ -0,0 +1,43 @@
+import sqlite3
+
+PEDIDO = [{'id_producto': 1, 'nombre': "Roll Palta", 'cantidad': 2, 'precio_unitario': 1000.0}]
+
+
+def test_encolar_rechazar_y_reencolar(main, tmp_path):
+    cola = main.ColaVentasLocal(str(tmp_path / "cola.sqlite3"))
+    clave = cola.encolar(PEDIDO, "local", "2024-05-01", {10: 1.5})
+    assert cola.pendientes(10) == [(clave, "2024-05-01", "local", PEDIDO, {10: 1.5})]
+    assert cola.profundidad() == 1 and cola.consumo_pendiente() == {10: 1.5}
+
+    assert cola.registrar_fallo([clave], "Lock wait timeout") == 1
+    cola.rechazar(clave, "producto eliminado")
+    assert cola.profundidad() == 0 and cola.cantidad_rechazadas() == 1
+    assert cola.rechazadas()[0][:5] == (clave, "2024-05-01", "local", PEDIDO, "producto eliminado")
+
+    assert cola.reencolar_rechazadas() == 1
+    assert cola.cantidad_rechazadas() == 0 and [venta[0] for venta in cola.pendientes(10)] == [clave]
+    cola.confirmar([clave])
+    assert cola.profundidad() == 0 and cola.pendientes(10) == []
+
+
+def test_solo_replica_las_ventas_de_la_base_actual(main, tmp_path):
+    cola = main.ColaVentasLocal(str(tmp_path / "cola.sqlite3"))
+    propia = cola.encolar(PEDIDO, "local", "2024-05-01", {10: 1})
+    main.PARAMETROS_CONEXION['database'] = "otra_base"
+    ajena = cola.encolar(PEDIDO, "local", "2024-05-01", {10: 4})
+    cola.rechazar(ajena, "x"); cola.reencolar_rechazadas()  # Conserva la base al pasar por ventas_rechazadas.
+    assert [venta[0] for venta in cola.pendientes(10)] == [ajena] and cola.consumo_pendiente() == {10: 4}
+    main.PARAMETROS_CONEXION['database'] = "atai_sushi_test"
+    assert [venta[0] for venta in cola.pendientes(10)] == [propia] and cola.profundidad() == 1
+
+
+def test_migra_una_cola_sin_base_conservando_sus_ventas(main, tmp_path):
+    ruta = str(tmp_path / "cola.sqlite3")
+    with sqlite3.connect(ruta) as anterior:
+        anterior.execute("CREATE TABLE ventas_pendientes (clave TEXT PRIMARY KEY, fecha_venta TEXT NOT NULL, canal_venta TEXT NOT NULL, pedido TEXT NOT NULL, "
+                         "consumo TEXT NOT NULL, creada TEXT DEFAULT CURRENT_TIMESTAMP, intentos INTEGER DEFAULT 0, ultimo_error TEXT)")
+        anterior.execute("""INSERT INTO ventas_pendientes (clave, fecha_venta, canal_venta, pedido, consumo) VALUES ('vieja', '2024-04-30', 'local', '[]', '{"10": 2}')""")
+    anterior.close()
+    cola = main.ColaVentasLocal(ruta)
+    assert cola.pendientes(10) == [("vieja", "2024-04-30", "local", [], {10: 2.0})]
+    assert cola.conexion().execute("PRAGMA user_version").fetchone()[0] == main.VERSION_ESQUEMA_COLA_VENTAS
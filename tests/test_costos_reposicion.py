@@ -0,0 +1,40 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def test_escenario_costea_el_menu_y_ordena_por_margen_simulado(main):
+    productos = [(1, "Roll Palta", 1000), (2, "Nigiri", 500)]
+    insumos = [(10, "Arroz", 100), (20, "Salmón", 1000)]
+    recetas = [(1, 10, 2), (1, 20, 0.5), (2, 10, 1), (2, 99, 3)]  # El insumo 99 no existe: se ignora.
+    matriz = main.MatrizCostos(productos, insumos, recetas)
+
+    assert matriz.escenario() == [(1, "Roll Palta", 1000.0, 700.0, 30.0, 700.0, 30.0), (2, "Nigiri", 500.0, 100.0, 80.0, 100.0, 80.0)]
+    filas = matriz.escenario({20: 20, 99: 50})
+    assert [fila[0] for fila in filas] == [1, 2]
+    assert filas[0][5:] == pytest.approx((800.0, 20.0))
+    assert filas[1][3:] == pytest.approx((100.0, 80.0, 100.0, 80.0))
+
+
+def test_escenario_sin_precio_no_divide_por_cero(main):
+    matriz = main.MatrizCostos([(1, "Cortesía", 0)], [(10, "Arroz", 100)], [(1, 10, 1)])
+    assert matriz.escenario({10: -50}) == [(1, "Cortesía", 0.0, 100.0, 0.0, 50.0, 0.0)]
+
+
+def test_calcular_reposicion_sugiere_hasta_el_nivel_objetivo(main):
+    ventas = [(dia, 1, 2) for dia in range(3)]  # 2 rolls por día -> 1 unidad diaria del insumo 10.
+    recetas = [(1, 10, 0.5), (1, 77, 1)]        # El insumo 77 no está activo: no entra al cálculo.
+    insumos = [(10, 1, 0), (20, 5, 3), (30, 2, 3)]
+    r = main.calcular_reposicion(3, ventas, recetas, insumos, dias_entrega=2, dias_cobertura=7)
+
+    assert r['consumo_total'] == pytest.approx([3, 0, 0])
+    assert r['media_movil'] == pytest.approx([1, 0, 0])
+    assert r['suavizado'] == pytest.approx([1, 0, 0])
+    assert r['stock_seguridad'] == pytest.approx([0, 0, 0])
+    assert r['punto_reorden'] == pytest.approx([2, 0, 0])
+    assert r['cantidad_sugerida'] == pytest.approx([8, 0, 1])  # 1 x (2 + 7) - 1; sin consumo, solo reponer hasta el mínimo.
+
+
+def test_calcular_reposicion_sin_ventas(main):
+    r = main.calcular_reposicion(7, [], [], [(10, 0, 4)])
+    assert r['consumo_total'] == pytest.approx([0]) and r['cantidad_sugerida'] == pytest.approx([4])
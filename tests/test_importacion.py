@@ -0,0 +1,46 @@
+import datetime
+import hashlib
+
+PRODUCTOS = [(1, "Roll Palta", 1000), (2, "Nigiri", 500)]
+
+
+def clave(canal, fecha, pedido): return hashlib.md5(f"{canal}:{fecha}:{pedido}".encode("utf-8")).hexdigest()
+
+
+def escribir(ruta, texto):
+    ruta.write_text(texto, encoding="utf-8"); return str(ruta)
+
+
+def test_agrupa_lineas_por_pedido_con_clave_de_idempotencia(main, conexion_falsa, tmp_path):
+    ruta = escribir(tmp_path / "pedidos.csv", "pedido;fecha;canal;producto;cantidad;precio\n"
+                    "A1;2024-05-01;whatsapp;1;2;950,5\nA1;2024-05-01;whatsapp;nigiri;1;\n;2024-05-01;;2;3;\n;2024-05-02;;Roll Palta;1;\n")
+    pedidos, informe = main.agrupar_pedidos_externos(conexion_falsa(PRODUCTOS), main.leer_pedidos_externos(ruta))
+
+    assert informe.lineas == 4 and informe.importable
+    assert pedidos[clave("whatsapp", "2024-05-01", "A1")] == {'fecha': datetime.date(2024, 5, 1), 'canal': "whatsapp", 'items': [(1, 2, 950.5), (2, 1, 500.0)]}
+    sin_numero = [pedido for c, pedido in pedidos.items() if c != clave("whatsapp", "2024-05-01", "A1")]
+    assert len(sin_numero) == 2 and all(pedido['canal'] == "delivery_app" for pedido in sin_numero)  # Un pedido por línea sin número.
+
+
+def test_reimportar_repite_las_claves_y_otra_fecha_no(main, conexion_falsa, tmp_path):
+    ruta = escribir(tmp_path / "pedidos.jsonl", '{"pedido": "B7", "fecha": "2024-05-01", "items": [{"producto": 1, "cantidad": 1}, {"producto": 2, "cantidad": 2}]}\n')
+    primera, _ = main.agrupar_pedidos_externos(conexion_falsa(PRODUCTOS), main.leer_pedidos_externos(ruta))
+    segunda, _ = main.agrupar_pedidos_externos(conexion_falsa(PRODUCTOS), main.leer_pedidos_externos(ruta))
+    assert list(primera) == list(segunda) == [clave("delivery_app", "2024-05-01", "B7")]
+
+    otro_dia = escribir(tmp_path / "otro_dia.json", '[{"pedido": "B7", "fecha": "2024-05-02", "producto": 1, "cantidad": 1}]')
+    pedidos, _ = main.agrupar_pedidos_externos(conexion_falsa(PRODUCTOS), main.leer_pedidos_externos(otro_dia))
+    assert list(pedidos) == [clave("delivery_app", "2024-05-02", "B7")]
+
+
+def test_informa_lineas_invalidas_sin_agruparlas(main, conexion_falsa):
+    lineas = [{'numero_linea': 1, 'pedido': "C1", 'fecha': "2024-05-01", 'canal': None, 'producto': "Tempura", 'cantidad': 1, 'precio': None},
+              {'numero_linea': 2, 'pedido': "C1", 'fecha': "2024-05-01", 'canal': "local", 'producto': 1, 'cantidad': 1, 'precio': None},
+              {'numero_linea': 3, 'pedido': "C2", 'fecha': "2024-05-01", 'canal': None, 'producto': 1, 'cantidad': 1.5, 'precio': None},
+              {'numero_linea': 4, 'pedido': "C3", 'fecha': "2024-05-01", 'canal': None, 'producto': 2, 'cantidad': 1, 'precio': None},
+              {'numero_linea': 5, 'pedido': "C3", 'fecha': "2024-05-03", 'canal': None, 'producto': 2, 'cantidad': 1, 'precio': None}]
+    pedidos, informe = main.agrupar_pedidos_externos(conexion_falsa(PRODUCTOS), lineas)
+
+    assert not informe.importable and informe.sin_mapear == {"Tempura": 1}
+    assert [error.split(":")[0] for error in informe.errores] == ["Línea 2", "Línea 3", "Línea 5"]
+    assert list(pedidos) == [clave("delivery_app", "2024-05-01", "C3")]
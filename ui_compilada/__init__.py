@@ -0,0 +1 @@
+"""Clases generadas desde los .ui con `python mantenimiento.py compilar-ui`. No editar a mano."""
@@ -0,0 +1,245 @@
+# Generado desde Control_Stock.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Control_Stock.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1200, 800)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 3)
+        self.groupBox_filtros = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_filtros.setFont(font)
+        self.groupBox_filtros.setObjectName("groupBox_filtros")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.groupBox_filtros)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label_filtrar = QtWidgets.QLabel(self.groupBox_filtros)
+        self.label_filtrar.setObjectName("label_filtrar")
+        self.horizontalLayout.addWidget(self.label_filtrar)
+        self.combo_filtro_alertas = QtWidgets.QComboBox(self.groupBox_filtros)
+        self.combo_filtro_alertas.setMinimumSize(QtCore.QSize(250, 35))
+        self.combo_filtro_alertas.setStyleSheet("border: 1px solid #bdc3c7; border-radius: 5px; padding: 5px;")
+        self.combo_filtro_alertas.setObjectName("combo_filtro_alertas")
+        self.combo_filtro_alertas.addItem("")
+        self.combo_filtro_alertas.addItem("")
+        self.combo_filtro_alertas.addItem("")
+        self.combo_filtro_alertas.addItem("")
+        self.horizontalLayout.addWidget(self.combo_filtro_alertas)
+        self.boton_recargar_tabla = QtWidgets.QPushButton(self.groupBox_filtros)
+        self.boton_recargar_tabla.setMinimumSize(QtCore.QSize(0, 35))
+        self.boton_recargar_tabla.setStyleSheet("background-color: #3498db; color: white; border-radius: 8px;")
+        self.boton_recargar_tabla.setObjectName("boton_recargar_tabla")
+        self.horizontalLayout.addWidget(self.boton_recargar_tabla)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.gridLayout_main.addWidget(self.groupBox_filtros, 1, 0, 1, 3)
+        self.tabla_stock_insumos = QtWidgets.QTableView(self.centralwidget)
+        self.tabla_stock_insumos.setStyleSheet("background-color: white; border: 1px solid #bdc3c7;")
+        self.tabla_stock_insumos.setLineWidth(1)
+        self.tabla_stock_insumos.setObjectName("tabla_stock_insumos")
+        self.tabla_stock_insumos.horizontalHeader().setVisible(True)
+        self.tabla_stock_insumos.horizontalHeader().setStretchLastSection(True)
+        self.gridLayout_main.addWidget(self.tabla_stock_insumos, 2, 0, 1, 3)
+        self.groupBox_compra = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_compra.setFont(font)
+        self.groupBox_compra.setStyleSheet("background-color: white; border: 1px solid #2ecc71; border-radius: 8px; padding: 10px;")
+        self.groupBox_compra.setObjectName("groupBox_compra")
+        self.formLayout_compra = QtWidgets.QFormLayout(self.groupBox_compra)
+        self.formLayout_compra.setSpacing(10)
+        self.formLayout_compra.setObjectName("formLayout_compra")
+        self.label_insumo_compra = QtWidgets.QLabel(self.groupBox_compra)
+        self.label_insumo_compra.setObjectName("label_insumo_compra")
+        self.formLayout_compra.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.label_insumo_compra)
+        self.combo_insumo_compra = QtWidgets.QComboBox(self.groupBox_compra)
+        self.combo_insumo_compra.setMinimumSize(QtCore.QSize(0, 30))
+        self.combo_insumo_compra.setObjectName("combo_insumo_compra")
+        self.formLayout_compra.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.combo_insumo_compra)
+        self.label_cantidad_compra = QtWidgets.QLabel(self.groupBox_compra)
+        self.label_cantidad_compra.setObjectName("label_cantidad_compra")
+        self.formLayout_compra.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.label_cantidad_compra)
+        self.entrada_cantidad_compra = QtWidgets.QLineEdit(self.groupBox_compra)
+        self.entrada_cantidad_compra.setMinimumSize(QtCore.QSize(0, 30))
+        self.entrada_cantidad_compra.setObjectName("entrada_cantidad_compra")
+        self.formLayout_compra.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.entrada_cantidad_compra)
+        self.label_costo_unitario = QtWidgets.QLabel(self.groupBox_compra)
+        self.label_costo_unitario.setObjectName("label_costo_unitario")
+        self.formLayout_compra.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.label_costo_unitario)
+        self.entrada_costo_unitario = QtWidgets.QLineEdit(self.groupBox_compra)
+        self.entrada_costo_unitario.setMinimumSize(QtCore.QSize(0, 30))
+        self.entrada_costo_unitario.setObjectName("entrada_costo_unitario")
+        self.formLayout_compra.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.entrada_costo_unitario)
+        self.boton_registrar_compra = QtWidgets.QPushButton(self.groupBox_compra)
+        self.boton_registrar_compra.setMinimumSize(QtCore.QSize(0, 40))
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_registrar_compra.setFont(font)
+        self.boton_registrar_compra.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_registrar_compra.setObjectName("boton_registrar_compra")
+        self.formLayout_compra.setWidget(3, QtWidgets.QFormLayout.SpanningRole, self.boton_registrar_compra)
+        self.boton_recepcion_factura = QtWidgets.QPushButton(self.groupBox_compra)
+        self.boton_recepcion_factura.setMinimumSize(QtCore.QSize(0, 35))
+        self.boton_recepcion_factura.setStyleSheet("background-color: #27ae60; color: white; border-radius: 8px;")
+        self.boton_recepcion_factura.setObjectName("boton_recepcion_factura")
+        self.formLayout_compra.setWidget(4, QtWidgets.QFormLayout.SpanningRole, self.boton_recepcion_factura)
+        self.gridLayout_main.addWidget(self.groupBox_compra, 3, 0, 1, 1)
+        self.groupBox_perdida = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_perdida.setFont(font)
+        self.groupBox_perdida.setStyleSheet("background-color: white; border: 1px solid #d63031; border-radius: 8px; padding: 10px;")
+        self.groupBox_perdida.setObjectName("groupBox_perdida")
+        self.formLayout_perdida = QtWidgets.QFormLayout(self.groupBox_perdida)
+        self.formLayout_perdida.setSpacing(10)
+        self.formLayout_perdida.setObjectName("formLayout_perdida")
+        self.label_insumo_perdida = QtWidgets.QLabel(self.groupBox_perdida)
+        self.label_insumo_perdida.setObjectName("label_insumo_perdida")
+        self.formLayout_perdida.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.label_insumo_perdida)
+        self.combo_insumo_perdida = QtWidgets.QComboBox(self.groupBox_perdida)
+        self.combo_insumo_perdida.setMinimumSize(QtCore.QSize(0, 30))
+        self.combo_insumo_perdida.setObjectName("combo_insumo_perdida")
+        self.formLayout_perdida.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.combo_insumo_perdida)
+        self.label_cantidad_perdida = QtWidgets.QLabel(self.groupBox_perdida)
+        self.label_cantidad_perdida.setObjectName("label_cantidad_perdida")
+        self.formLayout_perdida.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.label_cantidad_perdida)
+        self.entrada_cantidad_perdida = QtWidgets.QLineEdit(self.groupBox_perdida)
+        self.entrada_cantidad_perdida.setMinimumSize(QtCore.QSize(0, 30))
+        self.entrada_cantidad_perdida.setObjectName("entrada_cantidad_perdida")
+        self.formLayout_perdida.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.entrada_cantidad_perdida)
+        self.label_motivo_perdida = QtWidgets.QLabel(self.groupBox_perdida)
+        self.label_motivo_perdida.setObjectName("label_motivo_perdida")
+        self.formLayout_perdida.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.label_motivo_perdida)
+        self.entrada_motivo_perdida = QtWidgets.QLineEdit(self.groupBox_perdida)
+        self.entrada_motivo_perdida.setMinimumSize(QtCore.QSize(0, 30))
+        self.entrada_motivo_perdida.setObjectName("entrada_motivo_perdida")
+        self.formLayout_perdida.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.entrada_motivo_perdida)
+        self.boton_registrar_perdida = QtWidgets.QPushButton(self.groupBox_perdida)
+        self.boton_registrar_perdida.setMinimumSize(QtCore.QSize(0, 40))
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_registrar_perdida.setFont(font)
+        self.boton_registrar_perdida.setStyleSheet("background-color: #d63031; color: white; border-radius: 8px;")
+        self.boton_registrar_perdida.setObjectName("boton_registrar_perdida")
+        self.formLayout_perdida.setWidget(3, QtWidgets.QFormLayout.SpanningRole, self.boton_registrar_perdida)
+        self.gridLayout_main.addWidget(self.groupBox_perdida, 3, 1, 1, 1)
+        self.groupBox_alertas = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_alertas.setFont(font)
+        self.groupBox_alertas.setStyleSheet("background-color: white; border: 1px solid #f39c12; border-radius: 8px; padding: 10px;")
+        self.groupBox_alertas.setObjectName("groupBox_alertas")
+        self.verticalLayout_alertas = QtWidgets.QVBoxLayout(self.groupBox_alertas)
+        self.verticalLayout_alertas.setObjectName("verticalLayout_alertas")
+        self.lista_alertas = QtWidgets.QListWidget(self.groupBox_alertas)
+        self.lista_alertas.setStyleSheet("background-color: #fffde7; border: 1px solid #f39c12;")
+        self.lista_alertas.setObjectName("lista_alertas")
+        item = QtWidgets.QListWidgetItem()
+        self.lista_alertas.addItem(item)
+        item = QtWidgets.QListWidgetItem()
+        self.lista_alertas.addItem(item)
+        item = QtWidgets.QListWidgetItem()
+        self.lista_alertas.addItem(item)
+        self.verticalLayout_alertas.addWidget(self.lista_alertas)
+        self.boton_marcar_leida = QtWidgets.QPushButton(self.groupBox_alertas)
+        self.boton_marcar_leida.setMinimumSize(QtCore.QSize(0, 35))
+        self.boton_marcar_leida.setStyleSheet("background-color: #f39c12; color: white; border-radius: 8px;")
+        self.boton_marcar_leida.setObjectName("boton_marcar_leida")
+        self.verticalLayout_alertas.addWidget(self.boton_marcar_leida)
+        self.gridLayout_main.addWidget(self.groupBox_alertas, 3, 2, 1, 1)
+        self.boton_volver_submenu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_submenu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_submenu.setFont(font)
+        self.boton_volver_submenu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_submenu.setObjectName("boton_volver_submenu")
+        self.gridLayout_main.addWidget(self.boton_volver_submenu, 4, 0, 1, 3)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "1.1 Control de Stock y Alertas - Atai Sushi SIG"))
+        self.label_header.setText(_translate("MainWindow", "📦 CONTROL DE STOCK Y ALERTAS CRÍTICAS"))
+        self.groupBox_filtros.setTitle(_translate("MainWindow", "Filtros y Resumen"))
+        self.label_filtrar.setText(_translate("MainWindow", "Mostrar:"))
+        self.combo_filtro_alertas.setItemText(0, _translate("MainWindow", "Todos los Insumos"))
+        self.combo_filtro_alertas.setItemText(1, _translate("MainWindow", "🚨 Insumos Críticos (Bajo Stock)"))
+        self.combo_filtro_alertas.setItemText(2, _translate("MainWindow", "🟢 Stock Suficiente"))
+        self.combo_filtro_alertas.setItemText(3, _translate("MainWindow", "Proveedor Principal"))
+        self.boton_recargar_tabla.setText(_translate("MainWindow", "🔄 Recargar Datos"))
+        self.groupBox_compra.setTitle(_translate("MainWindow", "➕ Registrar Compra (Entrada de Stock)"))
+        self.label_insumo_compra.setText(_translate("MainWindow", "Insumo:"))
+        self.label_cantidad_compra.setText(_translate("MainWindow", "Cantidad:"))
+        self.entrada_cantidad_compra.setPlaceholderText(_translate("MainWindow", "Ej: 5.0 (kg)"))
+        self.label_costo_unitario.setText(_translate("MainWindow", "Costo Unitario:"))
+        self.entrada_costo_unitario.setPlaceholderText(_translate("MainWindow", "Ej: 13500 (CLP/kg)"))
+        self.boton_registrar_compra.setText(_translate("MainWindow", "✅ REGISTRAR ENTRADA / ACTUALIZAR COSTO"))
+        self.boton_recepcion_factura.setText(_translate("MainWindow", "📥 RECEPCIÓN DE FACTURA (VARIAS LÍNEAS / CSV)"))
+        self.groupBox_perdida.setTitle(_translate("MainWindow", "➖ Registrar Pérdida (Salida / Merma)"))
+        self.label_insumo_perdida.setText(_translate("MainWindow", "Insumo:"))
+        self.label_cantidad_perdida.setText(_translate("MainWindow", "Cantidad:"))
+        self.entrada_cantidad_perdida.setPlaceholderText(_translate("MainWindow", "Ej: 0.80 (kg)"))
+        self.label_motivo_perdida.setText(_translate("MainWindow", "Motivo:"))
+        self.entrada_motivo_perdida.setPlaceholderText(_translate("MainWindow", "Ej: Palta madura/Queso vencido"))
+        self.boton_registrar_perdida.setText(_translate("MainWindow", "❌ REGISTRAR PÉRDIDA"))
+        self.groupBox_alertas.setTitle(_translate("MainWindow", "🚨 Alertas de Quiebre de Stock"))
+        __sortingEnabled = self.lista_alertas.isSortingEnabled()
+        self.lista_alertas.setSortingEnabled(False)
+        item = self.lista_alertas.item(0)
+        item.setText(_translate("MainWindow", "⚠️ Salmón (ID 2): 0.00 kg. ¡SIN STOCK!"))
+        item = self.lista_alertas.item(1)
+        item.setText(_translate("MainWindow", "⚠️ Palta (ID 7): 0.80 kg. ¡CRÍTICO! (Mín: 4.0)"))
+        item = self.lista_alertas.item(2)
+        item.setText(_translate("MainWindow", "⚠️ Queso Crema (ID 19): 2.80 kg. ¡MÍNIMO! (Mín: 3.0)"))
+        self.lista_alertas.setSortingEnabled(__sortingEnabled)
+        self.boton_marcar_leida.setText(_translate("MainWindow", "✔️ Marcar Alerta Seleccionada como Leída"))
+        self.boton_volver_submenu.setText(_translate("MainWindow", "⬅️ Volver al Submenú de Inventario"))
+
+
+FIRMA_UI = "c5ae7e8c03f14b05933d23e569f700a3c941f06a"
+ClaseUi = Ui_MainWindow
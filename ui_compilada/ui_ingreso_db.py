@@ -0,0 +1,85 @@
+# Generado desde Ingreso_DB.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Ingreso_DB.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(664, 699)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setObjectName("verticalLayout")
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem)
+        self.label_titulo = QtWidgets.QLabel(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_titulo.setFont(font)
+        self.label_titulo.setStyleSheet("color: #A03333;")
+        self.label_titulo.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_titulo.setObjectName("label_titulo")
+        self.verticalLayout.addWidget(self.label_titulo)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem1)
+        self.gridLayout = QtWidgets.QGridLayout()
+        self.gridLayout.setContentsMargins(50, -1, 50, -1)
+        self.gridLayout.setSpacing(10)
+        self.gridLayout.setObjectName("gridLayout")
+        self.label_host = QtWidgets.QLabel(self.centralwidget)
+        self.label_host.setObjectName("label_host")
+        self.gridLayout.addWidget(self.label_host, 0, 0, 1, 1)
+        self.entrada_host = QtWidgets.QLineEdit(self.centralwidget)
+        self.entrada_host.setObjectName("entrada_host")
+        self.gridLayout.addWidget(self.entrada_host, 0, 1, 1, 1)
+        self.label_usuario = QtWidgets.QLabel(self.centralwidget)
+        self.label_usuario.setObjectName("label_usuario")
+        self.gridLayout.addWidget(self.label_usuario, 1, 0, 1, 1)
+        self.entrada_usuario = QtWidgets.QLineEdit(self.centralwidget)
+        self.entrada_usuario.setObjectName("entrada_usuario")
+        self.gridLayout.addWidget(self.entrada_usuario, 1, 1, 1, 1)
+        self.label_clave = QtWidgets.QLabel(self.centralwidget)
+        self.label_clave.setObjectName("label_clave")
+        self.gridLayout.addWidget(self.label_clave, 2, 0, 1, 1)
+        self.entrada_clave = QtWidgets.QLineEdit(self.centralwidget)
+        self.entrada_clave.setEchoMode(QtWidgets.QLineEdit.Password)
+        self.entrada_clave.setObjectName("entrada_clave")
+        self.gridLayout.addWidget(self.entrada_clave, 2, 1, 1, 1)
+        self.boton_conectar = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_conectar.setStyleSheet("background-color: #6CBE44; color: white; font-weight: bold;")
+        self.boton_conectar.setObjectName("boton_conectar")
+        self.gridLayout.addWidget(self.boton_conectar, 3, 0, 1, 2)
+        self.verticalLayout.addLayout(self.gridLayout)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem2)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Atai Sushi - Conexión SIG"))
+        self.label_titulo.setText(_translate("MainWindow", "ATAI SUSHI"))
+        self.label_host.setText(_translate("MainWindow", "Host:"))
+        self.entrada_host.setText(_translate("MainWindow", "localhost"))
+        self.label_usuario.setText(_translate("MainWindow", "Usuario:"))
+        self.entrada_usuario.setText(_translate("MainWindow", "root"))
+        self.label_clave.setText(_translate("MainWindow", "Clave (Password):"))
+        self.boton_conectar.setText(_translate("MainWindow", "CONECTAR"))
+
+
+FIRMA_UI = "61bd6eb86eb79631c13e1a89a15ad0e2222d6c79"
+ClaseUi = Ui_MainWindow
@@ -0,0 +1,137 @@
+# Generado desde Menu_Principal.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Menu_Principal.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1264, 796)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.widget_card_inventario = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_inventario.setStyleSheet("background-color: #ecf0f1; border: 2px solid #bdc3c7; border-radius: 10px;")
+        self.widget_card_inventario.setObjectName("widget_card_inventario")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.widget_card_inventario)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.label_icon_inventario = QtWidgets.QLabel(self.widget_card_inventario)
+        font = QtGui.QFont()
+        font.setPointSize(24)
+        self.label_icon_inventario.setFont(font)
+        self.label_icon_inventario.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_inventario.setObjectName("label_icon_inventario")
+        self.verticalLayout_2.addWidget(self.label_icon_inventario)
+        self.boton_inventario = QtWidgets.QPushButton(self.widget_card_inventario)
+        self.boton_inventario.setMinimumSize(QtCore.QSize(0, 60))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_inventario.setFont(font)
+        self.boton_inventario.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_inventario.setObjectName("boton_inventario")
+        self.verticalLayout_2.addWidget(self.boton_inventario)
+        self.gridLayout_2.addWidget(self.widget_card_inventario, 3, 0, 1, 1)
+        spacerItem = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout_2.addItem(spacerItem, 1, 0, 1, 3)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout_2.addItem(spacerItem1, 4, 0, 1, 3)
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 80))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(28)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #d63031; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_2.addWidget(self.label_header, 0, 0, 1, 3)
+        self.widget_card_reportes = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_reportes.setStyleSheet("background-color: #ecf0f1; border: 2px solid #bdc3c7; border-radius: 10px;")
+        self.widget_card_reportes.setObjectName("widget_card_reportes")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.widget_card_reportes)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.label_icon_reportes = QtWidgets.QLabel(self.widget_card_reportes)
+        font = QtGui.QFont()
+        font.setPointSize(24)
+        self.label_icon_reportes.setFont(font)
+        self.label_icon_reportes.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_reportes.setObjectName("label_icon_reportes")
+        self.verticalLayout_4.addWidget(self.label_icon_reportes)
+        self.boton_reportes = QtWidgets.QPushButton(self.widget_card_reportes)
+        self.boton_reportes.setMinimumSize(QtCore.QSize(0, 60))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_reportes.setFont(font)
+        self.boton_reportes.setStyleSheet("background-color: #6c5ce7; color: white; border-radius: 8px;")
+        self.boton_reportes.setObjectName("boton_reportes")
+        self.verticalLayout_4.addWidget(self.boton_reportes)
+        self.gridLayout_2.addWidget(self.widget_card_reportes, 3, 2, 1, 1)
+        self.label_instruccion = QtWidgets.QLabel(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.label_instruccion.setFont(font)
+        self.label_instruccion.setStyleSheet("color: #333333;")
+        self.label_instruccion.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_instruccion.setObjectName("label_instruccion")
+        self.gridLayout_2.addWidget(self.label_instruccion, 2, 0, 1, 3)
+        self.widget_card_pedidos = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_pedidos.setStyleSheet("background-color: #ecf0f1; border: 2px solid #bdc3c7; border-radius: 10px;")
+        self.widget_card_pedidos.setObjectName("widget_card_pedidos")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.widget_card_pedidos)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.label_icon_pedidos = QtWidgets.QLabel(self.widget_card_pedidos)
+        font = QtGui.QFont()
+        font.setPointSize(24)
+        self.label_icon_pedidos.setFont(font)
+        self.label_icon_pedidos.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_pedidos.setObjectName("label_icon_pedidos")
+        self.verticalLayout_5.addWidget(self.label_icon_pedidos)
+        self.boton_pedidos = QtWidgets.QPushButton(self.widget_card_pedidos)
+        self.boton_pedidos.setMinimumSize(QtCore.QSize(0, 60))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_pedidos.setFont(font)
+        self.boton_pedidos.setStyleSheet("background-color: #3498db; color: white; border-radius: 8px;")
+        self.boton_pedidos.setObjectName("boton_pedidos")
+        self.verticalLayout_5.addWidget(self.boton_pedidos)
+        self.gridLayout_2.addWidget(self.widget_card_pedidos, 3, 1, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Menú Principal - SIG Atai Sushi"))
+        self.label_icon_inventario.setText(_translate("MainWindow", "🍣"))
+        self.boton_inventario.setText(_translate("MainWindow", "1. Gestión de Inventario"))
+        self.label_header.setText(_translate("MainWindow", "                               ATAI SUSHI  (SIG)"))
+        self.label_icon_reportes.setText(_translate("MainWindow", "📈"))
+        self.boton_reportes.setText(_translate("MainWindow", "4. Reportes Administrativos"))
+        self.label_instruccion.setText(_translate("MainWindow", "Seleccione un módulo para comenzar la gestión operativa y administrativa."))
+        self.label_icon_pedidos.setText(_translate("MainWindow", "🛒"))
+        self.boton_pedidos.setText(_translate("MainWindow", "2. Registro de Pedidos"))
+
+
+FIRMA_UI = "c533bfddabceb28ca6de4fcecfa9f7d5db573093"
+ClaseUi = Ui_MainWindow
@@ -0,0 +1,207 @@
+# Generado desde Pedidos.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Pedidos.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1300, 850)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #3498db; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 3)
+        self.groupBox_productos = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_productos.setFont(font)
+        self.groupBox_productos.setObjectName("groupBox_productos")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.groupBox_productos)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.combo_categoria = QtWidgets.QComboBox(self.groupBox_productos)
+        self.combo_categoria.setMinimumSize(QtCore.QSize(0, 35))
+        self.combo_categoria.setStyleSheet("border: 1px solid #bdc3c7; border-radius: 5px; padding: 5px; background-color: white;")
+        self.combo_categoria.setObjectName("combo_categoria")
+        self.verticalLayout_2.addWidget(self.combo_categoria)
+        self.lista_productos = QtWidgets.QListWidget(self.groupBox_productos)
+        self.lista_productos.setMinimumSize(QtCore.QSize(0, 500))
+        self.lista_productos.setStyleSheet("background-color: white; border: 1px solid #bdc3c7; selection-background-color: #3498db; selection-color: white;")
+        self.lista_productos.setObjectName("lista_productos")
+        self.verticalLayout_2.addWidget(self.lista_productos)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.entrada_cantidad = QtWidgets.QLineEdit(self.groupBox_productos)
+        self.entrada_cantidad.setMinimumSize(QtCore.QSize(80, 40))
+        self.entrada_cantidad.setAlignment(QtCore.Qt.AlignCenter)
+        self.entrada_cantidad.setObjectName("entrada_cantidad")
+        self.horizontalLayout.addWidget(self.entrada_cantidad)
+        self.boton_agregar_a_pedido = QtWidgets.QPushButton(self.groupBox_productos)
+        self.boton_agregar_a_pedido.setMinimumSize(QtCore.QSize(0, 40))
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_agregar_a_pedido.setFont(font)
+        self.boton_agregar_a_pedido.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_agregar_a_pedido.setObjectName("boton_agregar_a_pedido")
+        self.horizontalLayout.addWidget(self.boton_agregar_a_pedido)
+        self.verticalLayout_2.addLayout(self.horizontalLayout)
+        self.gridLayout_main.addWidget(self.groupBox_productos, 1, 0, 1, 1)
+        self.groupBox_pedido = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_pedido.setFont(font)
+        self.groupBox_pedido.setObjectName("groupBox_pedido")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.groupBox_pedido)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.tabla_pedido_actual = QtWidgets.QTableView(self.groupBox_pedido)
+        self.tabla_pedido_actual.setMinimumSize(QtCore.QSize(0, 500))
+        self.tabla_pedido_actual.setStyleSheet("background-color: white; border: 1px solid #bdc3c7;")
+        self.tabla_pedido_actual.setObjectName("tabla_pedido_actual")
+        self.tabla_pedido_actual.horizontalHeader().setStretchLastSection(True)
+        self.verticalLayout_3.addWidget(self.tabla_pedido_actual)
+        self.boton_eliminar_item = QtWidgets.QPushButton(self.groupBox_pedido)
+        self.boton_eliminar_item.setMinimumSize(QtCore.QSize(0, 40))
+        self.boton_eliminar_item.setStyleSheet("background-color: #e74c3c; color: white; border-radius: 8px;")
+        self.boton_eliminar_item.setObjectName("boton_eliminar_item")
+        self.verticalLayout_3.addWidget(self.boton_eliminar_item)
+        self.boton_cancelar_pedido = QtWidgets.QPushButton(self.groupBox_pedido)
+        self.boton_cancelar_pedido.setMinimumSize(QtCore.QSize(0, 40))
+        self.boton_cancelar_pedido.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_cancelar_pedido.setObjectName("boton_cancelar_pedido")
+        self.verticalLayout_3.addWidget(self.boton_cancelar_pedido)
+        self.gridLayout_main.addWidget(self.groupBox_pedido, 1, 1, 1, 1)
+        self.groupBox_resumen = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_resumen.setFont(font)
+        self.groupBox_resumen.setObjectName("groupBox_resumen")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.groupBox_resumen)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.label_subtotal = QtWidgets.QLabel(self.groupBox_resumen)
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        self.label_subtotal.setFont(font)
+        self.label_subtotal.setObjectName("label_subtotal")
+        self.verticalLayout_4.addWidget(self.label_subtotal)
+        self.label_descuento = QtWidgets.QLabel(self.groupBox_resumen)
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        self.label_descuento.setFont(font)
+        self.label_descuento.setObjectName("label_descuento")
+        self.verticalLayout_4.addWidget(self.label_descuento)
+        self.label_total = QtWidgets.QLabel(self.groupBox_resumen)
+        font = QtGui.QFont()
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_total.setFont(font)
+        self.label_total.setStyleSheet("color: #d63031;")
+        self.label_total.setObjectName("label_total")
+        self.verticalLayout_4.addWidget(self.label_total)
+        self.line = QtWidgets.QFrame(self.groupBox_resumen)
+        self.line.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line.setObjectName("line")
+        self.verticalLayout_4.addWidget(self.line)
+        self.label_canal_venta = QtWidgets.QLabel(self.groupBox_resumen)
+        self.label_canal_venta.setObjectName("label_canal_venta")
+        self.verticalLayout_4.addWidget(self.label_canal_venta)
+        self.combo_canal_venta = QtWidgets.QComboBox(self.groupBox_resumen)
+        self.combo_canal_venta.setMinimumSize(QtCore.QSize(0, 35))
+        self.combo_canal_venta.setStyleSheet("border: 1px solid #bdc3c7; border-radius: 5px; padding: 5px; background-color: white;")
+        self.combo_canal_venta.setObjectName("combo_canal_venta")
+        self.combo_canal_venta.addItem("")
+        self.combo_canal_venta.addItem("")
+        self.combo_canal_venta.addItem("")
+        self.combo_canal_venta.addItem("")
+        self.verticalLayout_4.addWidget(self.combo_canal_venta)
+        self.boton_finalizar_venta = QtWidgets.QPushButton(self.groupBox_resumen)
+        self.boton_finalizar_venta.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_finalizar_venta.setFont(font)
+        self.boton_finalizar_venta.setStyleSheet("background-color: #f39c12; color: white; border-radius: 8px;")
+        self.boton_finalizar_venta.setObjectName("boton_finalizar_venta")
+        self.verticalLayout_4.addWidget(self.boton_finalizar_venta)
+        self.boton_importar_pedidos = QtWidgets.QPushButton(self.groupBox_resumen)
+        self.boton_importar_pedidos.setMinimumSize(QtCore.QSize(0, 35))
+        self.boton_importar_pedidos.setStyleSheet("background-color: #8e44ad; color: white; border-radius: 8px;")
+        self.boton_importar_pedidos.setObjectName("boton_importar_pedidos")
+        self.verticalLayout_4.addWidget(self.boton_importar_pedidos)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_4.addItem(spacerItem)
+        self.gridLayout_main.addWidget(self.groupBox_resumen, 1, 2, 1, 1)
+        self.boton_volver_menu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_menu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_menu.setFont(font)
+        self.boton_volver_menu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_menu.setObjectName("boton_volver_menu")
+        self.gridLayout_main.addWidget(self.boton_volver_menu, 2, 0, 1, 3)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "2. Registro de Pedidos (TPV) - Atai Sushi SIG"))
+        self.label_header.setText(_translate("MainWindow", "🛒 MÓDULO 2: REGISTRO DE PEDIDOS "))
+        self.groupBox_productos.setTitle(_translate("MainWindow", "Productos Disponibles (Rolls y Promos)"))
+        self.entrada_cantidad.setText(_translate("MainWindow", "1"))
+        self.entrada_cantidad.setPlaceholderText(_translate("MainWindow", "Cant."))
+        self.boton_agregar_a_pedido.setText(_translate("MainWindow", "➕ AGREGAR AL PEDIDO"))
+        self.groupBox_pedido.setTitle(_translate("MainWindow", "Pedido Actual"))
+        self.boton_eliminar_item.setText(_translate("MainWindow", "❌ ELIMINAR ITEM SELECCIONADO"))
+        self.boton_cancelar_pedido.setText(_translate("MainWindow", "🗑️ CANCELAR PEDIDO"))
+        self.groupBox_resumen.setTitle(_translate("MainWindow", "Finalizar Venta"))
+        self.label_subtotal.setText(_translate("MainWindow", "SUBTOTAL: $ 0"))
+        self.label_descuento.setText(_translate("MainWindow", "DESCUENTO: $ 0"))
+        self.label_total.setText(_translate("MainWindow", "TOTAL FINAL: $ 0"))
+        self.label_canal_venta.setText(_translate("MainWindow", "Canal de Venta:"))
+        self.combo_canal_venta.setItemText(0, _translate("MainWindow", "whatsapp"))
+        self.combo_canal_venta.setItemText(1, _translate("MainWindow", "local"))
+        self.combo_canal_venta.setItemText(2, _translate("MainWindow", "delivery_app"))
+        self.combo_canal_venta.setItemText(3, _translate("MainWindow", "telefono"))
+        self.boton_finalizar_venta.setText(_translate("MainWindow", "💵 REGISTRAR PAGO Y VENTA"))
+        self.boton_importar_pedidos.setText(_translate("MainWindow", "📦 IMPORTAR PEDIDOS (DELIVERY / WHATSAPP)"))
+        self.boton_volver_menu.setText(_translate("MainWindow", "⬅️ Volver al Menú Principal"))
+
+
+FIRMA_UI = "c1c0a3ae260c31565cb91371a3f350bbb3c4a9bb"
+ClaseUi = Ui_MainWindow
@@ -0,0 +1,144 @@
+# Generado desde Proveedores.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Proveedores.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1000, 700)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 3)
+        self.tabla_proveedores = QtWidgets.QTableView(self.centralwidget)
+        self.tabla_proveedores.setMinimumSize(QtCore.QSize(0, 350))
+        self.tabla_proveedores.setStyleSheet("background-color: white; border: 1px solid #bdc3c7;")
+        self.tabla_proveedores.setObjectName("tabla_proveedores")
+        self.tabla_proveedores.horizontalHeader().setStretchLastSection(True)
+        self.gridLayout_main.addWidget(self.tabla_proveedores, 1, 0, 1, 3)
+        self.groupBox_crud = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_crud.setFont(font)
+        self.groupBox_crud.setStyleSheet("background-color: white; border: 1px solid #3498db; border-radius: 8px; padding: 10px;")
+        self.groupBox_crud.setObjectName("groupBox_crud")
+        self.formLayout_crud = QtWidgets.QFormLayout(self.groupBox_crud)
+        self.formLayout_crud.setHorizontalSpacing(20)
+        self.formLayout_crud.setVerticalSpacing(15)
+        self.formLayout_crud.setObjectName("formLayout_crud")
+        self.label_nombre = QtWidgets.QLabel(self.groupBox_crud)
+        self.label_nombre.setObjectName("label_nombre")
+        self.formLayout_crud.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.label_nombre)
+        self.entrada_nombre = QtWidgets.QLineEdit(self.groupBox_crud)
+        self.entrada_nombre.setMinimumSize(QtCore.QSize(0, 35))
+        self.entrada_nombre.setObjectName("entrada_nombre")
+        self.formLayout_crud.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.entrada_nombre)
+        self.label_contacto = QtWidgets.QLabel(self.groupBox_crud)
+        self.label_contacto.setObjectName("label_contacto")
+        self.formLayout_crud.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.label_contacto)
+        self.entrada_contacto = QtWidgets.QLineEdit(self.groupBox_crud)
+        self.entrada_contacto.setMinimumSize(QtCore.QSize(0, 35))
+        self.entrada_contacto.setObjectName("entrada_contacto")
+        self.formLayout_crud.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.entrada_contacto)
+        self.label_telefono = QtWidgets.QLabel(self.groupBox_crud)
+        self.label_telefono.setObjectName("label_telefono")
+        self.formLayout_crud.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.label_telefono)
+        self.entrada_telefono = QtWidgets.QLineEdit(self.groupBox_crud)
+        self.entrada_telefono.setMinimumSize(QtCore.QSize(0, 35))
+        self.entrada_telefono.setObjectName("entrada_telefono")
+        self.formLayout_crud.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.entrada_telefono)
+        self.label_activo = QtWidgets.QLabel(self.groupBox_crud)
+        self.label_activo.setObjectName("label_activo")
+        self.formLayout_crud.setWidget(3, QtWidgets.QFormLayout.LabelRole, self.label_activo)
+        self.checkbox_activo = QtWidgets.QCheckBox(self.groupBox_crud)
+        self.checkbox_activo.setChecked(True)
+        self.checkbox_activo.setObjectName("checkbox_activo")
+        self.formLayout_crud.setWidget(3, QtWidgets.QFormLayout.FieldRole, self.checkbox_activo)
+        self.gridLayout_main.addWidget(self.groupBox_crud, 2, 0, 1, 3)
+        self.boton_agregar = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_agregar.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_agregar.setFont(font)
+        self.boton_agregar.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_agregar.setObjectName("boton_agregar")
+        self.gridLayout_main.addWidget(self.boton_agregar, 3, 0, 1, 1)
+        self.boton_modificar = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_modificar.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_modificar.setFont(font)
+        self.boton_modificar.setStyleSheet("background-color: #3498db; color: white; border-radius: 8px;")
+        self.boton_modificar.setObjectName("boton_modificar")
+        self.gridLayout_main.addWidget(self.boton_modificar, 3, 1, 1, 1)
+        self.boton_eliminar = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_eliminar.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_eliminar.setFont(font)
+        self.boton_eliminar.setStyleSheet("background-color: #e74c3c; color: white; border-radius: 8px;")
+        self.boton_eliminar.setObjectName("boton_eliminar")
+        self.gridLayout_main.addWidget(self.boton_eliminar, 3, 2, 1, 1)
+        self.boton_volver_submenu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_submenu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_submenu.setFont(font)
+        self.boton_volver_submenu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_submenu.setObjectName("boton_volver_submenu")
+        self.gridLayout_main.addWidget(self.boton_volver_submenu, 4, 0, 1, 3)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "1.3 Gestión de Proveedores - Atai Sushi SIG"))
+        self.label_header.setText(_translate("MainWindow", "🚚 GESTIÓN DE PROVEEDORES"))
+        self.groupBox_crud.setTitle(_translate("MainWindow", "Detalles / Modificación"))
+        self.label_nombre.setText(_translate("MainWindow", "Nombre Proveedor:"))
+        self.label_contacto.setText(_translate("MainWindow", "Persona de Contacto:"))
+        self.label_telefono.setText(_translate("MainWindow", "Teléfono:"))
+        self.label_activo.setText(_translate("MainWindow", "Estado (Activo):"))
+        self.checkbox_activo.setText(_translate("MainWindow", "Proveedor Activo"))
+        self.boton_agregar.setText(_translate("MainWindow", "➕ AGREGAR NUEVO"))
+        self.boton_modificar.setText(_translate("MainWindow", "✏️ MODIFICAR SELECCIONADO"))
+        self.boton_eliminar.setText(_translate("MainWindow", "🗑️ ELIMINAR / INACTIVAR"))
+        self.boton_volver_submenu.setText(_translate("MainWindow", "⬅️ Volver al Submenú de Inventario"))
+
+
+FIRMA_UI = "b09fa58455d87279a46ecfd7849ba4352bd074b6"
+ClaseUi = Ui_MainWindow
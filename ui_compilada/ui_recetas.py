@@ -0,0 +1,183 @@
+# Generado desde Recetas.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Recetas.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1000, 750)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 3)
+        self.groupBox_seleccion_roll = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_seleccion_roll.setFont(font)
+        self.groupBox_seleccion_roll.setObjectName("groupBox_seleccion_roll")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.groupBox_seleccion_roll)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.label_roll = QtWidgets.QLabel(self.groupBox_seleccion_roll)
+        self.label_roll.setObjectName("label_roll")
+        self.horizontalLayout_2.addWidget(self.label_roll)
+        self.combo_productos = QtWidgets.QComboBox(self.groupBox_seleccion_roll)
+        self.combo_productos.setMinimumSize(QtCore.QSize(300, 35))
+        self.combo_productos.setStyleSheet("border: 1px solid #bdc3c7; border-radius: 5px; padding: 5px; background-color: white;")
+        self.combo_productos.setObjectName("combo_productos")
+        self.horizontalLayout_2.addWidget(self.combo_productos)
+        self.label_precio_venta_valor = QtWidgets.QLabel(self.groupBox_seleccion_roll)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_precio_venta_valor.setFont(font)
+        self.label_precio_venta_valor.setStyleSheet("color: #2980b9;")
+        self.label_precio_venta_valor.setObjectName("label_precio_venta_valor")
+        self.horizontalLayout_2.addWidget(self.label_precio_venta_valor)
+        self.label_cmv_actual = QtWidgets.QLabel(self.groupBox_seleccion_roll)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_cmv_actual.setFont(font)
+        self.label_cmv_actual.setStyleSheet("color: #d63031;")
+        self.label_cmv_actual.setObjectName("label_cmv_actual")
+        self.horizontalLayout_2.addWidget(self.label_cmv_actual)
+        self.label_margen_contribucion = QtWidgets.QLabel(self.groupBox_seleccion_roll)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_margen_contribucion.setFont(font)
+        self.label_margen_contribucion.setStyleSheet("color: #2ecc71;")
+        self.label_margen_contribucion.setObjectName("label_margen_contribucion")
+        self.horizontalLayout_2.addWidget(self.label_margen_contribucion)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem)
+        self.gridLayout_main.addWidget(self.groupBox_seleccion_roll, 1, 0, 1, 3)
+        self.groupBox_receta = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_receta.setFont(font)
+        self.groupBox_receta.setObjectName("groupBox_receta")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.groupBox_receta)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.tabla_receta = QtWidgets.QTableWidget(self.groupBox_receta)
+        self.tabla_receta.setMinimumSize(QtCore.QSize(0, 350))
+        self.tabla_receta.setStyleSheet("background-color: white; border: 1px solid #bdc3c7;")
+        self.tabla_receta.setObjectName("tabla_receta")
+        self.tabla_receta.setColumnCount(6)
+        self.tabla_receta.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_receta.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_receta.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_receta.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_receta.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_receta.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_receta.setHorizontalHeaderItem(5, item)
+        self.tabla_receta.horizontalHeader().setStretchLastSection(True)
+        self.verticalLayout.addWidget(self.tabla_receta)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.combo_insumo_nuevo = QtWidgets.QComboBox(self.groupBox_receta)
+        self.combo_insumo_nuevo.setMinimumSize(QtCore.QSize(250, 35))
+        self.combo_insumo_nuevo.setStyleSheet("border: 1px solid #bdc3c7; border-radius: 5px; padding: 5px;")
+        self.combo_insumo_nuevo.setObjectName("combo_insumo_nuevo")
+        self.horizontalLayout.addWidget(self.combo_insumo_nuevo)
+        self.entrada_cantidad_requerida = QtWidgets.QLineEdit(self.groupBox_receta)
+        self.entrada_cantidad_requerida.setMinimumSize(QtCore.QSize(150, 35))
+        self.entrada_cantidad_requerida.setObjectName("entrada_cantidad_requerida")
+        self.horizontalLayout.addWidget(self.entrada_cantidad_requerida)
+        self.boton_agregar_insumo = QtWidgets.QPushButton(self.groupBox_receta)
+        self.boton_agregar_insumo.setMinimumSize(QtCore.QSize(150, 35))
+        self.boton_agregar_insumo.setStyleSheet("background-color: #3498db; color: white; border-radius: 8px;")
+        self.boton_agregar_insumo.setObjectName("boton_agregar_insumo")
+        self.horizontalLayout.addWidget(self.boton_agregar_insumo)
+        self.boton_eliminar_insumo = QtWidgets.QPushButton(self.groupBox_receta)
+        self.boton_eliminar_insumo.setMinimumSize(QtCore.QSize(150, 35))
+        self.boton_eliminar_insumo.setStyleSheet("background-color: #e74c3c; color: white; border-radius: 8px;")
+        self.boton_eliminar_insumo.setObjectName("boton_eliminar_insumo")
+        self.horizontalLayout.addWidget(self.boton_eliminar_insumo)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem1)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+        self.gridLayout_main.addWidget(self.groupBox_receta, 2, 0, 1, 3)
+        self.boton_volver_submenu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_submenu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_submenu.setFont(font)
+        self.boton_volver_submenu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_submenu.setObjectName("boton_volver_submenu")
+        self.gridLayout_main.addWidget(self.boton_volver_submenu, 3, 0, 1, 3)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "1.2 Definición de Recetas y CMV - Atai Sushi SIG"))
+        self.label_header.setText(_translate("MainWindow", "🍚 DEFINICIÓN DE RECETAS Y CÁLCULO DE CMV"))
+        self.groupBox_seleccion_roll.setTitle(_translate("MainWindow", "Producto Final (Roll) y Costo de Venta"))
+        self.label_roll.setText(_translate("MainWindow", "Seleccionar Roll / Promoción:"))
+        self.label_precio_venta_valor.setText(_translate("MainWindow", "Precio Venta: $ 0"))
+        self.label_cmv_actual.setText(_translate("MainWindow", "CMV Estimado: $ 0"))
+        self.label_margen_contribucion.setText(_translate("MainWindow", "Margen Contribución: $ 0"))
+        self.groupBox_receta.setTitle(_translate("MainWindow", "Insumos que componen la Receta"))
+        item = self.tabla_receta.horizontalHeaderItem(0)
+        item.setText(_translate("MainWindow", "ID Receta"))
+        item = self.tabla_receta.horizontalHeaderItem(1)
+        item.setText(_translate("MainWindow", "ID Insumo"))
+        item = self.tabla_receta.horizontalHeaderItem(2)
+        item.setText(_translate("MainWindow", "Insumo"))
+        item = self.tabla_receta.horizontalHeaderItem(3)
+        item.setText(_translate("MainWindow", "Cantidad Requerida"))
+        item = self.tabla_receta.horizontalHeaderItem(4)
+        item.setText(_translate("MainWindow", "Unidad de Medida"))
+        item = self.tabla_receta.horizontalHeaderItem(5)
+        item.setText(_translate("MainWindow", "Costo Unitario (CMV)"))
+        self.entrada_cantidad_requerida.setPlaceholderText(_translate("MainWindow", "Cantidad (Ej: 0.180)"))
+        self.boton_agregar_insumo.setText(_translate("MainWindow", "➕ Agregar Insumo"))
+        self.boton_eliminar_insumo.setText(_translate("MainWindow", "❌ Eliminar Insumo"))
+        self.boton_volver_submenu.setText(_translate("MainWindow", "⬅️ Volver al Submenú de Inventario"))
+
+
+FIRMA_UI = "cc2a518131c944b99da4e419304e7a56931e095d"
+ClaseUi = Ui_MainWindow
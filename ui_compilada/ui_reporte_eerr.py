@@ -0,0 +1,136 @@
+# Generado desde Reporte_EERR.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Reporte_EERR.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(900, 750)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #6c5ce7; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 2)
+        self.groupBox_filtros = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_filtros.setFont(font)
+        self.groupBox_filtros.setObjectName("groupBox_filtros")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.groupBox_filtros)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label_desde = QtWidgets.QLabel(self.groupBox_filtros)
+        self.label_desde.setObjectName("label_desde")
+        self.horizontalLayout.addWidget(self.label_desde)
+        self.dateEdit_inicio = QtWidgets.QDateEdit(self.groupBox_filtros)
+        self.dateEdit_inicio.setMinimumSize(QtCore.QSize(150, 35))
+        self.dateEdit_inicio.setCalendarPopup(True)
+        self.dateEdit_inicio.setObjectName("dateEdit_inicio")
+        self.horizontalLayout.addWidget(self.dateEdit_inicio)
+        self.label_hasta = QtWidgets.QLabel(self.groupBox_filtros)
+        self.label_hasta.setObjectName("label_hasta")
+        self.horizontalLayout.addWidget(self.label_hasta)
+        self.dateEdit_fin = QtWidgets.QDateEdit(self.groupBox_filtros)
+        self.dateEdit_fin.setMinimumSize(QtCore.QSize(150, 35))
+        self.dateEdit_fin.setCalendarPopup(True)
+        self.dateEdit_fin.setObjectName("dateEdit_fin")
+        self.horizontalLayout.addWidget(self.dateEdit_fin)
+        self.boton_generar_reporte = QtWidgets.QPushButton(self.groupBox_filtros)
+        self.boton_generar_reporte.setMinimumSize(QtCore.QSize(150, 35))
+        self.boton_generar_reporte.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_generar_reporte.setObjectName("boton_generar_reporte")
+        self.horizontalLayout.addWidget(self.boton_generar_reporte)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.gridLayout_main.addWidget(self.groupBox_filtros, 1, 0, 1, 2)
+        self.tabla_eerr = QtWidgets.QTableWidget(self.centralwidget)
+        self.tabla_eerr.setMinimumSize(QtCore.QSize(0, 450))
+        self.tabla_eerr.setStyleSheet("background-color: white; border: 1px solid #bdc3c7; font-size: 14pt;")
+        self.tabla_eerr.setObjectName("tabla_eerr")
+        self.tabla_eerr.setColumnCount(2)
+        self.tabla_eerr.setRowCount(5)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_eerr.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_eerr.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_eerr.setVerticalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_eerr.setVerticalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_eerr.setVerticalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_eerr.setVerticalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tabla_eerr.setVerticalHeaderItem(4, item)
+        self.tabla_eerr.horizontalHeader().setVisible(False)
+        self.tabla_eerr.horizontalHeader().setStretchLastSection(True)
+        self.tabla_eerr.verticalHeader().setVisible(False)
+        self.gridLayout_main.addWidget(self.tabla_eerr, 2, 0, 1, 2)
+        self.boton_volver_submenu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_submenu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_submenu.setFont(font)
+        self.boton_volver_submenu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_submenu.setObjectName("boton_volver_submenu")
+        self.gridLayout_main.addWidget(self.boton_volver_submenu, 3, 0, 1, 2)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "4.1 Estado de Resultados (EERR) - Atai Sushi SIG"))
+        self.label_header.setText(_translate("MainWindow", "💵 4.1 REPORTE DE ESTADO DE RESULTADOS (EERR)"))
+        self.groupBox_filtros.setTitle(_translate("MainWindow", "Filtros de Período"))
+        self.label_desde.setText(_translate("MainWindow", "Fecha Inicio:"))
+        self.label_hasta.setText(_translate("MainWindow", "Fecha Fin:"))
+        self.boton_generar_reporte.setText(_translate("MainWindow", "📊 GENERAR REPORTE"))
+        item = self.tabla_eerr.horizontalHeaderItem(0)
+        item.setText(_translate("MainWindow", "Concepto"))
+        item = self.tabla_eerr.horizontalHeaderItem(1)
+        item.setText(_translate("MainWindow", "Monto (CLP)"))
+        item = self.tabla_eerr.verticalHeaderItem(0)
+        item.setText(_translate("MainWindow", "Ingresos"))
+        item = self.tabla_eerr.verticalHeaderItem(1)
+        item.setText(_translate("MainWindow", "Costo de Ventas (CMV)"))
+        item = self.tabla_eerr.verticalHeaderItem(2)
+        item.setText(_translate("MainWindow", "Margen Bruto"))
+        item = self.tabla_eerr.verticalHeaderItem(3)
+        item.setText(_translate("MainWindow", "Gastos Fijos"))
+        item = self.tabla_eerr.verticalHeaderItem(4)
+        item.setText(_translate("MainWindow", "Utilidad Neta"))
+        self.boton_volver_submenu.setText(_translate("MainWindow", "⬅️ Volver al Submenú de Reportes"))
+
+
+FIRMA_UI = "243fafeb1b6f27d9955e19b8d7464b7ed481054f"
+ClaseUi = Ui_MainWindow
@@ -0,0 +1,199 @@
+# Generado desde Reporte_KPIs.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Reporte_KPIs.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1200, 750)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #6c5ce7; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 3)
+        self.groupBox_filtros = QtWidgets.QGroupBox(self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.groupBox_filtros.setFont(font)
+        self.groupBox_filtros.setObjectName("groupBox_filtros")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.groupBox_filtros)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label_desde = QtWidgets.QLabel(self.groupBox_filtros)
+        self.label_desde.setObjectName("label_desde")
+        self.horizontalLayout.addWidget(self.label_desde)
+        self.dateEdit_inicio = QtWidgets.QDateEdit(self.groupBox_filtros)
+        self.dateEdit_inicio.setMinimumSize(QtCore.QSize(130, 35))
+        self.dateEdit_inicio.setCalendarPopup(True)
+        self.dateEdit_inicio.setObjectName("dateEdit_inicio")
+        self.horizontalLayout.addWidget(self.dateEdit_inicio)
+        self.label_hasta = QtWidgets.QLabel(self.groupBox_filtros)
+        self.label_hasta.setObjectName("label_hasta")
+        self.horizontalLayout.addWidget(self.label_hasta)
+        self.dateEdit_fin = QtWidgets.QDateEdit(self.groupBox_filtros)
+        self.dateEdit_fin.setMinimumSize(QtCore.QSize(130, 35))
+        self.dateEdit_fin.setCalendarPopup(True)
+        self.dateEdit_fin.setObjectName("dateEdit_fin")
+        self.horizontalLayout.addWidget(self.dateEdit_fin)
+        self.boton_generar_reporte = QtWidgets.QPushButton(self.groupBox_filtros)
+        self.boton_generar_reporte.setMinimumSize(QtCore.QSize(150, 35))
+        self.boton_generar_reporte.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_generar_reporte.setObjectName("boton_generar_reporte")
+        self.horizontalLayout.addWidget(self.boton_generar_reporte)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.gridLayout_main.addWidget(self.groupBox_filtros, 1, 0, 1, 3)
+        self.widget_kpi_quiebre = QtWidgets.QWidget(self.centralwidget)
+        self.widget_kpi_quiebre.setStyleSheet("background-color: white; border: 1px solid #bdc3c7; border-radius: 10px; padding: 15px;")
+        self.widget_kpi_quiebre.setObjectName("widget_kpi_quiebre")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.widget_kpi_quiebre)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.label_kpi_quiebre_titulo = QtWidgets.QLabel(self.widget_kpi_quiebre)
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_kpi_quiebre_titulo.setFont(font)
+        self.label_kpi_quiebre_titulo.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_quiebre_titulo.setObjectName("label_kpi_quiebre_titulo")
+        self.verticalLayout.addWidget(self.label_kpi_quiebre_titulo)
+        self.label_kpi_quiebre_valor = QtWidgets.QLabel(self.widget_kpi_quiebre)
+        font = QtGui.QFont()
+        font.setPointSize(36)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_kpi_quiebre_valor.setFont(font)
+        self.label_kpi_quiebre_valor.setStyleSheet("color: #e74c3c;")
+        self.label_kpi_quiebre_valor.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_quiebre_valor.setObjectName("label_kpi_quiebre_valor")
+        self.verticalLayout.addWidget(self.label_kpi_quiebre_valor)
+        self.label_kpi_quiebre_descripcion = QtWidgets.QLabel(self.widget_kpi_quiebre)
+        self.label_kpi_quiebre_descripcion.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_quiebre_descripcion.setWordWrap(True)
+        self.label_kpi_quiebre_descripcion.setObjectName("label_kpi_quiebre_descripcion")
+        self.verticalLayout.addWidget(self.label_kpi_quiebre_descripcion)
+        self.gridLayout_main.addWidget(self.widget_kpi_quiebre, 2, 0, 1, 1)
+        self.widget_kpi_rotacion = QtWidgets.QWidget(self.centralwidget)
+        self.widget_kpi_rotacion.setStyleSheet("background-color: white; border: 1px solid #bdc3c7; border-radius: 10px; padding: 15px;")
+        self.widget_kpi_rotacion.setObjectName("widget_kpi_rotacion")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.widget_kpi_rotacion)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.label_kpi_rotacion_titulo = QtWidgets.QLabel(self.widget_kpi_rotacion)
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_kpi_rotacion_titulo.setFont(font)
+        self.label_kpi_rotacion_titulo.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_rotacion_titulo.setObjectName("label_kpi_rotacion_titulo")
+        self.verticalLayout_2.addWidget(self.label_kpi_rotacion_titulo)
+        self.label_kpi_rotacion_valor = QtWidgets.QLabel(self.widget_kpi_rotacion)
+        font = QtGui.QFont()
+        font.setPointSize(36)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_kpi_rotacion_valor.setFont(font)
+        self.label_kpi_rotacion_valor.setStyleSheet("color: #f39c12;")
+        self.label_kpi_rotacion_valor.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_rotacion_valor.setObjectName("label_kpi_rotacion_valor")
+        self.verticalLayout_2.addWidget(self.label_kpi_rotacion_valor)
+        self.label_kpi_rotacion_descripcion = QtWidgets.QLabel(self.widget_kpi_rotacion)
+        self.label_kpi_rotacion_descripcion.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_rotacion_descripcion.setWordWrap(True)
+        self.label_kpi_rotacion_descripcion.setObjectName("label_kpi_rotacion_descripcion")
+        self.verticalLayout_2.addWidget(self.label_kpi_rotacion_descripcion)
+        self.gridLayout_main.addWidget(self.widget_kpi_rotacion, 2, 1, 1, 1)
+        self.widget_kpi_perdida = QtWidgets.QWidget(self.centralwidget)
+        self.widget_kpi_perdida.setStyleSheet("background-color: white; border: 1px solid #bdc3c7; border-radius: 10px; padding: 15px;")
+        self.widget_kpi_perdida.setObjectName("widget_kpi_perdida")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.widget_kpi_perdida)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.label_kpi_perdida_titulo = QtWidgets.QLabel(self.widget_kpi_perdida)
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_kpi_perdida_titulo.setFont(font)
+        self.label_kpi_perdida_titulo.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_perdida_titulo.setObjectName("label_kpi_perdida_titulo")
+        self.verticalLayout_3.addWidget(self.label_kpi_perdida_titulo)
+        self.label_kpi_perdida_valor = QtWidgets.QLabel(self.widget_kpi_perdida)
+        font = QtGui.QFont()
+        font.setPointSize(36)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_kpi_perdida_valor.setFont(font)
+        self.label_kpi_perdida_valor.setStyleSheet("color: #2980b9;")
+        self.label_kpi_perdida_valor.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_perdida_valor.setObjectName("label_kpi_perdida_valor")
+        self.verticalLayout_3.addWidget(self.label_kpi_perdida_valor)
+        self.label_kpi_perdida_descripcion = QtWidgets.QLabel(self.widget_kpi_perdida)
+        self.label_kpi_perdida_descripcion.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_kpi_perdida_descripcion.setWordWrap(True)
+        self.label_kpi_perdida_descripcion.setObjectName("label_kpi_perdida_descripcion")
+        self.verticalLayout_3.addWidget(self.label_kpi_perdida_descripcion)
+        self.gridLayout_main.addWidget(self.widget_kpi_perdida, 2, 2, 1, 1)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout_main.addItem(spacerItem1, 3, 0, 1, 3)
+        self.boton_volver_submenu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_submenu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_submenu.setFont(font)
+        self.boton_volver_submenu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_submenu.setObjectName("boton_volver_submenu")
+        self.gridLayout_main.addWidget(self.boton_volver_submenu, 4, 0, 1, 3)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "4.3 KPIs Operacionales de Inventario - Atai Sushi SIG"))
+        self.label_header.setText(_translate("MainWindow", "⚙️ 4.3 KPIs OPERACIONALES DE INVENTARIO"))
+        self.groupBox_filtros.setTitle(_translate("MainWindow", "Filtros de Período y Ejecución"))
+        self.label_desde.setText(_translate("MainWindow", "Fecha Inicio:"))
+        self.label_hasta.setText(_translate("MainWindow", "Fecha Fin:"))
+        self.boton_generar_reporte.setText(_translate("MainWindow", "📊 GENERAR REPORTE"))
+        self.label_kpi_quiebre_titulo.setText(_translate("MainWindow", "1. TASA DE QUIEBRE DE STOCK"))
+        self.label_kpi_quiebre_valor.setText(_translate("MainWindow", "-- %"))
+        self.label_kpi_quiebre_descripcion.setText(_translate("MainWindow", "Mide la frecuencia con que faltan insumos críticos para producir rollos. (Objetivo: 0%)"))
+        self.label_kpi_rotacion_titulo.setText(_translate("MainWindow", "2. ROTACIÓN DE INVENTARIO"))
+        self.label_kpi_rotacion_valor.setText(_translate("MainWindow", "-- veces"))
+        self.label_kpi_rotacion_descripcion.setText(_translate("MainWindow", "Indica cuántas veces se renueva el stock en el período. (Alta rotación es buena para perecederos)."))
+        self.label_kpi_perdida_titulo.setText(_translate("MainWindow", "3. PORCENTAJE DE PÉRDIDA"))
+        self.label_kpi_perdida_valor.setText(_translate("MainWindow", "-- %"))
+        self.label_kpi_perdida_descripcion.setText(_translate("MainWindow", "Mide el valor de las pérdidas por merma y deterioro (registradas manualmente) respecto al total de compras."))
+        self.boton_volver_submenu.setText(_translate("MainWindow", "⬅️ Volver al Submenú de Reportes"))
+
+
+FIRMA_UI = "9ffab1ef986ed35b79240aff2ead9c07eaf67582"
+ClaseUi = Ui_MainWindow
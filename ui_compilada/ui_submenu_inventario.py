@@ -0,0 +1,140 @@
+# Generado desde Submenu_Inventario.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Submenu_Inventario.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1019, 600)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 3)
+        spacerItem = QtWidgets.QSpacerItem(20, 30, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout_main.addItem(spacerItem, 1, 0, 1, 3)
+        self.widget_card_stock = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_stock.setStyleSheet("background-color: white; border: 2px solid #2ecc71; border-radius: 10px; padding: 10px;")
+        self.widget_card_stock.setObjectName("widget_card_stock")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.widget_card_stock)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.label_icon_stock = QtWidgets.QLabel(self.widget_card_stock)
+        font = QtGui.QFont()
+        font.setPointSize(28)
+        self.label_icon_stock.setFont(font)
+        self.label_icon_stock.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_stock.setObjectName("label_icon_stock")
+        self.verticalLayout_2.addWidget(self.label_icon_stock)
+        self.boton_control_stock = QtWidgets.QPushButton(self.widget_card_stock)
+        self.boton_control_stock.setMinimumSize(QtCore.QSize(0, 65))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_control_stock.setFont(font)
+        self.boton_control_stock.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_control_stock.setObjectName("boton_control_stock")
+        self.verticalLayout_2.addWidget(self.boton_control_stock)
+        self.gridLayout_main.addWidget(self.widget_card_stock, 2, 0, 1, 1)
+        self.widget_card_recetas = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_recetas.setStyleSheet("background-color: white; border: 2px solid #2ecc71; border-radius: 10px; padding: 10px;")
+        self.widget_card_recetas.setObjectName("widget_card_recetas")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.widget_card_recetas)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.label_icon_recetas = QtWidgets.QLabel(self.widget_card_recetas)
+        font = QtGui.QFont()
+        font.setPointSize(28)
+        self.label_icon_recetas.setFont(font)
+        self.label_icon_recetas.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_recetas.setObjectName("label_icon_recetas")
+        self.verticalLayout_3.addWidget(self.label_icon_recetas)
+        self.boton_config_recetas = QtWidgets.QPushButton(self.widget_card_recetas)
+        self.boton_config_recetas.setMinimumSize(QtCore.QSize(0, 65))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_config_recetas.setFont(font)
+        self.boton_config_recetas.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_config_recetas.setObjectName("boton_config_recetas")
+        self.verticalLayout_3.addWidget(self.boton_config_recetas)
+        self.gridLayout_main.addWidget(self.widget_card_recetas, 2, 1, 1, 1)
+        self.widget_card_proveedores = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_proveedores.setStyleSheet("background-color: white; border: 2px solid #2ecc71; border-radius: 10px; padding: 10px;")
+        self.widget_card_proveedores.setObjectName("widget_card_proveedores")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.widget_card_proveedores)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.label_icon_proveedores = QtWidgets.QLabel(self.widget_card_proveedores)
+        font = QtGui.QFont()
+        font.setPointSize(28)
+        self.label_icon_proveedores.setFont(font)
+        self.label_icon_proveedores.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_proveedores.setObjectName("label_icon_proveedores")
+        self.verticalLayout_4.addWidget(self.label_icon_proveedores)
+        self.boton_gestion_proveedores = QtWidgets.QPushButton(self.widget_card_proveedores)
+        self.boton_gestion_proveedores.setMinimumSize(QtCore.QSize(0, 65))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_gestion_proveedores.setFont(font)
+        self.boton_gestion_proveedores.setStyleSheet("background-color: #2ecc71; color: white; border-radius: 8px;")
+        self.boton_gestion_proveedores.setObjectName("boton_gestion_proveedores")
+        self.verticalLayout_4.addWidget(self.boton_gestion_proveedores)
+        self.gridLayout_main.addWidget(self.widget_card_proveedores, 2, 2, 1, 1)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout_main.addItem(spacerItem1, 3, 1, 1, 1)
+        self.boton_volver_menu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_menu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_menu.setFont(font)
+        self.boton_volver_menu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_menu.setObjectName("boton_volver_menu")
+        self.gridLayout_main.addWidget(self.boton_volver_menu, 4, 0, 1, 3)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Submenú Inventario - Atai Sushi SIG"))
+        self.label_header.setText(_translate("MainWindow", "🍣 MÓDULO 1: GESTIÓN DE INVENTARIO Y COSTOS"))
+        self.label_icon_stock.setText(_translate("MainWindow", "📦"))
+        self.boton_control_stock.setText(_translate("MainWindow", "1. Control de Stock y Alertas"))
+        self.label_icon_recetas.setText(_translate("MainWindow", "🍚"))
+        self.boton_config_recetas.setText(_translate("MainWindow", "2. Definición de Recetas "))
+        self.label_icon_proveedores.setText(_translate("MainWindow", "🚚"))
+        self.boton_gestion_proveedores.setText(_translate("MainWindow", "3. Gestión de Proveedores"))
+        self.boton_volver_menu.setText(_translate("MainWindow", "⬅️ Volver al Menú Principal"))
+
+
+FIRMA_UI = "972c5c8911ad37e54a380427d1741d6bddb7e476"
+ClaseUi = Ui_MainWindow
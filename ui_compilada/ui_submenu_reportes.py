@@ -0,0 +1,198 @@
+# Generado desde Submenu_Reportes.ui con `python mantenimiento.py compilar-ui`. No editar a mano.
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Submenu_Reportes.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1191, 650)
+        MainWindow.setStyleSheet("background-color: #f4f7f6;")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout_main = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout_main.setObjectName("gridLayout_main")
+        self.widget_card_eerr = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_eerr.setStyleSheet("background-color: white; border: 2px solid #6c5ce7; border-radius: 10px; padding: 10px;")
+        self.widget_card_eerr.setObjectName("widget_card_eerr")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.widget_card_eerr)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.label_icon_eerr = QtWidgets.QLabel(self.widget_card_eerr)
+        font = QtGui.QFont()
+        font.setPointSize(28)
+        self.label_icon_eerr.setFont(font)
+        self.label_icon_eerr.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_eerr.setObjectName("label_icon_eerr")
+        self.verticalLayout_2.addWidget(self.label_icon_eerr)
+        self.boton_estado_resultados = QtWidgets.QPushButton(self.widget_card_eerr)
+        self.boton_estado_resultados.setMinimumSize(QtCore.QSize(0, 65))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_estado_resultados.setFont(font)
+        self.boton_estado_resultados.setStyleSheet("background-color: #6c5ce7; color: white; border-radius: 8px;")
+        self.boton_estado_resultados.setObjectName("boton_estado_resultados")
+        self.verticalLayout_2.addWidget(self.boton_estado_resultados)
+        self.gridLayout_main.addWidget(self.widget_card_eerr, 2, 0, 1, 1)
+        self.widget_card_kpis = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_kpis.setStyleSheet("background-color: white; border: 2px solid #6c5ce7; border-radius: 10px; padding: 10px;")
+        self.widget_card_kpis.setObjectName("widget_card_kpis")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.widget_card_kpis)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.label_icon_kpis = QtWidgets.QLabel(self.widget_card_kpis)
+        font = QtGui.QFont()
+        font.setPointSize(28)
+        self.label_icon_kpis.setFont(font)
+        self.label_icon_kpis.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_kpis.setObjectName("label_icon_kpis")
+        self.verticalLayout_4.addWidget(self.label_icon_kpis)
+        self.boton_kpis_operacionales = QtWidgets.QPushButton(self.widget_card_kpis)
+        self.boton_kpis_operacionales.setMinimumSize(QtCore.QSize(0, 65))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_kpis_operacionales.setFont(font)
+        self.boton_kpis_operacionales.setStyleSheet("background-color: #6c5ce7; color: white; border-radius: 8px;")
+        self.boton_kpis_operacionales.setObjectName("boton_kpis_operacionales")
+        self.verticalLayout_4.addWidget(self.boton_kpis_operacionales)
+        self.gridLayout_main.addWidget(self.widget_card_kpis, 2, 2, 1, 1)
+        self.widget_card_margen = QtWidgets.QWidget(self.centralwidget)
+        self.widget_card_margen.setStyleSheet("background-color: white; border: 2px solid #6c5ce7; border-radius: 10px; padding: 10px;")
+        self.widget_card_margen.setObjectName("widget_card_margen")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.widget_card_margen)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.label_icon_margen = QtWidgets.QLabel(self.widget_card_margen)
+        font = QtGui.QFont()
+        font.setPointSize(28)
+        self.label_icon_margen.setFont(font)
+        self.label_icon_margen.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_icon_margen.setObjectName("label_icon_margen")
+        self.verticalLayout_3.addWidget(self.label_icon_margen)
+        self.boton_analisis_margen = QtWidgets.QPushButton(self.widget_card_margen)
+        self.boton_analisis_margen.setMinimumSize(QtCore.QSize(0, 65))
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_analisis_margen.setFont(font)
+        self.boton_analisis_margen.setStyleSheet("background-color: #6c5ce7; color: white; border-radius: 8px;")
+        self.boton_analisis_margen.setObjectName("boton_analisis_margen")
+        self.verticalLayout_3.addWidget(self.boton_analisis_margen)
+        self.gridLayout_main.addWidget(self.widget_card_margen, 2, 1, 1, 1)
+        self.horizontalLayout_analisis = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_analisis.setObjectName("horizontalLayout_analisis")
+        self.boton_analisis_canasta = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_analisis_canasta.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_analisis_canasta.setFont(font)
+        self.boton_analisis_canasta.setStyleSheet("background-color: #a29bfe; color: white; border-radius: 8px;")
+        self.boton_analisis_canasta.setObjectName("boton_analisis_canasta")
+        self.horizontalLayout_analisis.addWidget(self.boton_analisis_canasta)
+        self.boton_pronostico_reposicion = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_pronostico_reposicion.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_pronostico_reposicion.setFont(font)
+        self.boton_pronostico_reposicion.setStyleSheet("background-color: #00b894; color: white; border-radius: 8px;")
+        self.boton_pronostico_reposicion.setObjectName("boton_pronostico_reposicion")
+        self.horizontalLayout_analisis.addWidget(self.boton_pronostico_reposicion)
+        self.boton_costeo_menu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_costeo_menu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_costeo_menu.setFont(font)
+        self.boton_costeo_menu.setStyleSheet("background-color: #fd79a8; color: white; border-radius: 8px;")
+        self.boton_costeo_menu.setObjectName("boton_costeo_menu")
+        self.horizontalLayout_analisis.addWidget(self.boton_costeo_menu)
+        self.boton_diagnostico_consultas = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_diagnostico_consultas.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_diagnostico_consultas.setFont(font)
+        self.boton_diagnostico_consultas.setStyleSheet("background-color: #636e72; color: white; border-radius: 8px;")
+        self.boton_diagnostico_consultas.setObjectName("boton_diagnostico_consultas")
+        self.horizontalLayout_analisis.addWidget(self.boton_diagnostico_consultas)
+        self.boton_comparativo_periodos = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_comparativo_periodos.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_comparativo_periodos.setFont(font)
+        self.boton_comparativo_periodos.setStyleSheet("background-color: #0984e3; color: white; border-radius: 8px;")
+        self.boton_comparativo_periodos.setObjectName("boton_comparativo_periodos")
+        self.horizontalLayout_analisis.addWidget(self.boton_comparativo_periodos)
+        self.gridLayout_main.addLayout(self.horizontalLayout_analisis, 3, 0, 1, 3)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout_main.addItem(spacerItem, 4, 0, 1, 3)
+        self.boton_volver_menu = QtWidgets.QPushButton(self.centralwidget)
+        self.boton_volver_menu.setMinimumSize(QtCore.QSize(0, 45))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.boton_volver_menu.setFont(font)
+        self.boton_volver_menu.setStyleSheet("background-color: #95a5a6; color: white; border-radius: 8px;")
+        self.boton_volver_menu.setObjectName("boton_volver_menu")
+        self.gridLayout_main.addWidget(self.boton_volver_menu, 5, 0, 1, 3)
+        self.label_header = QtWidgets.QLabel(self.centralwidget)
+        self.label_header.setMinimumSize(QtCore.QSize(0, 70))
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI Black")
+        font.setPointSize(20)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_header.setFont(font)
+        self.label_header.setStyleSheet("background-color: #6c5ce7; color: white; border-radius: 10px; padding-left: 20px;")
+        self.label_header.setObjectName("label_header")
+        self.gridLayout_main.addWidget(self.label_header, 0, 0, 1, 3)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout_main.addItem(spacerItem1, 1, 1, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Submenú Reportes Administrativos - Atai Sushi SIG"))
+        self.label_icon_eerr.setText(_translate("MainWindow", "💵"))
+        self.boton_estado_resultados.setText(_translate("MainWindow", "1. Estado de Resultados (EERR)"))
+        self.label_icon_kpis.setText(_translate("MainWindow", "⚙️"))
+        self.boton_kpis_operacionales.setText(_translate("MainWindow", "3. KPIs Operacionales de Inventario"))
+        self.label_icon_margen.setText(_translate("MainWindow", "🏷️"))
+        self.boton_analisis_margen.setText(_translate("MainWindow", "2. Análisis de Margen y Top Ventas"))
+        self.boton_analisis_canasta.setText(_translate("MainWindow", "🛒 Análisis de Canasta y Ticket Promedio"))
+        self.boton_pronostico_reposicion.setText(_translate("MainWindow", "📈 Pronóstico de Consumo y Reposición"))
+        self.boton_costeo_menu.setText(_translate("MainWindow", "🍣 Costeo de Menú y Simulación de Costos"))
+        self.boton_diagnostico_consultas.setText(_translate("MainWindow", "🩺 Diagnóstico de Consultas"))
+        self.boton_comparativo_periodos.setText(_translate("MainWindow", "📅 Comparativo entre Períodos"))
+        self.boton_volver_menu.setText(_translate("MainWindow", "⬅️ Volver al Menú Principal"))
+        self.label_header.setText(_translate("MainWindow", "📈 MÓDULO 4: REPORTES ADMINISTRATIVOS Y FINANCIEROS"))
+
+
+FIRMA_UI = "cf6b22191434ef1d9adbce091e7d39383a1fcab3"
+ClaseUi = Ui_MainWindow